@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de exportação do histórico de operações - Environment Dev
+
+Preenche um banco de histórico sintético e mede tempo e pico de memória
+(tracemalloc) das exportações em streaming para tamanhos crescentes; o pico
+deve ficar praticamente constante entre 10 mil e 1 milhão de registros.
+
+Uso: python benchmark_history_export.py [--records 10000 100000 1000000] [--formats json csv zip]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from core.operation_history_reporting_system import (
+    RECORD_COLUMNS, OperationHistoryReportingSystem, ReportFormat
+)
+
+STATUSES = ["completed", "failed", "cancelled", "running"]
+
+
+def populate(system: OperationHistoryReportingSystem, records: int) -> None:
+    """Insere `records` registros distribuídos ao longo de um ano"""
+    start = datetime.now() - timedelta(days=365)
+    step = timedelta(days=365) / records
+    details = json.dumps(["Downloading", "Extracting", "Configuring"])
+
+    def rows():
+        for i in range(records):
+            start_time = start + step * i
+            yield (
+                f"op_{i:08d}", "installation", STATUSES[i % len(STATUSES)], f"component_{i % 200}",
+                f"Installing component_{i % 200}", "Benchmark record",
+                start_time.isoformat(" "), (start_time + timedelta(seconds=30)).isoformat(" "),
+                30.0, 100.0, "Done", 3, 3, details, "[]",
+                json.dumps(["Checksum mismatch"]) if i % 4 == 1 else "[]",
+                "null", "{}", None, None, "{}"
+            )
+
+    with system._get_connection() as connection:
+        connection.executemany(
+            f"INSERT INTO operation_records ({', '.join(RECORD_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(RECORD_COLUMNS))})",
+            rows()
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--formats", nargs="+", default=["json", "csv", "zip"],
+                        choices=[export_format.value for export_format in ReportFormat])
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="history_export_bench_"))
+    try:
+        for records in args.records:
+            system = OperationHistoryReportingSystem(database_path=str(work / f"history_{records}.db"))
+            try:
+                start = time.perf_counter()
+                populate(system, records)
+                print(f"\n{records:,} registros (inseridos em {time.perf_counter() - start:.1f}s)")
+
+                for value in args.formats:
+                    output_path = work / f"export_{records}.{value}"
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    result = system.create_report_export_functionality_for_troubleshooting(
+                        ReportFormat(value), output_path=str(output_path))
+                    elapsed = time.perf_counter() - start
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                    print(f"  {value:<5} {elapsed:8.2f}s  pico {peak / 2**20:7.2f} MiB  "
+                          f"arquivo {result.file_size / 2**20 if result.success else 0:9.1f} MiB  "
+                          f"{result.records_exported:,} registros")
+                    os.remove(output_path)
+            finally:
+                system.shutdown()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
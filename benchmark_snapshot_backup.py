@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de backups de transação - Environment Dev
+
+Compara o backup atual por shutil.copytree com o SnapshotBackupStore
+(reflink/hardlink/cópia com deduplicação) numa árvore sintética, incluindo
+o rollback de uma pequena alteração.
+
+Uso: python benchmark_snapshot_backup.py [--files 50000] [--size 4096]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from core.snapshot_backup import SnapshotBackupStore, replace_file_contents
+
+
+def create_tree(root: Path, files: int, size: int) -> None:
+    """Cria uma árvore com `files` arquivos distribuídos em subdiretórios"""
+    payload = os.urandom(size)
+    for i in range(files):
+        directory = root / f"pkg{i % 100:02d}" / f"mod{(i // 100) % 50:02d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        # Metade dos arquivos com conteúdo repetido (como DLLs/headers duplicados num SDK)
+        content = payload if i % 2 else payload + i.to_bytes(4, 'little')
+        (directory / f"file{i}.bin").write_bytes(content)
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"  {label:<40} {time.perf_counter() - start:8.2f}s")
+    return result
+
+
+def directory_size(path: Path) -> int:
+    seen = set()
+    total = 0
+    for current, _, filenames in os.walk(path):
+        for name in filenames:
+            st = os.stat(os.path.join(current, name))
+            if st.st_ino not in seen:
+                seen.add(st.st_ino)
+                total += st.st_size
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--size", type=int, default=4096)
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="snapshot_bench_"))
+    try:
+        tree = work / "sdk"
+        print(f"Criando árvore sintética: {args.files} arquivos de ~{args.size} bytes")
+        create_tree(tree, args.files, args.size)
+        config = next(tree.rglob("*.bin"))
+
+        print("\ncopytree (implementação anterior)")
+        timed("backup", lambda: shutil.copytree(tree, work / "copytree_backup"))
+        print(f"  {'espaço usado':<40} {directory_size(work / 'copytree_backup') / 2**20:8.1f}MB")
+        replace_file_contents(str(config), "edit")
+
+        def restore_copytree():
+            shutil.rmtree(tree)
+            shutil.copytree(work / "copytree_backup", tree)
+        timed("rollback (rmtree + copytree)", restore_copytree)
+
+        print("\nSnapshotBackupStore")
+        store = SnapshotBackupStore(str(work / "store"))
+        manifest = timed("backup (primeira transação)",
+                         lambda: store.snapshot(str(tree), str(work / "tx1"), copy_on_modify=True))
+        timed("backup (segunda transação, deduplicada)",
+              lambda: store.snapshot(str(tree), str(work / "tx2"), copy_on_modify=True))
+        print(f"  {'objetos armazenados':<40} {len(store._load_index()['objects']):8d}")
+        print(f"  {'métodos':<40} {store.stats}")
+        replace_file_contents(str(config), "edit")
+        stats = timed("rollback (apenas arquivos alterados)", lambda: store.restore(manifest, str(tree)))
+        print(f"  {'arquivos restaurados / inalterados':<40} {stats.restored} / {stats.unchanged}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
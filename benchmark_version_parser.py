@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do parser de versões unificado - Environment Dev
+
+Compara a vazão de interpretação, comparação e verificação de restrições do
+parser unificado (core.version_parser, com cache LRU) com a implementação
+anterior, em que cada chamada reinterpretava a string por regex e cada
+restrição era recompilada pelo packaging. As mesmas versões são repetidas
+várias vezes, como acontece na análise de conflitos.
+
+Uso: python benchmark_version_parser.py [--versions 1000] [--repeat 20]
+"""
+
+import argparse
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import packaging.specifiers as pkg_specifiers
+import packaging.version as pkg_version
+
+from core import version_parser
+from core.version_manager import VersionManager
+
+
+@dataclass
+class LegacyParsedVersion:
+    """Versão como era produzida antes do parser unificado"""
+    major: int
+    minor: int
+    patch: int
+    prerelease: Optional[str]
+    build: Optional[str]
+    original: str
+    format_type: str
+
+
+class LegacyVersionParser:
+    """Reprodução do VersionManager anterior: regex a cada chamada, sem cache"""
+
+    def __init__(self):
+        self.logger = logging.getLogger("benchmark.legacy")
+        self.patterns = {
+            "semantic_full": re.compile(
+                r'^(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)'
+                r'(?:-(?P<prerelease>[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?'
+                r'(?:\+(?P<build>[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?$'
+            ),
+            "windows_style": re.compile(
+                r'^(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)'
+                r'(?:\.(?P<extra>\w+))?(?:\.(?P<build>\d+))?$'
+            ),
+            "simple": re.compile(r'^(?P<major>\d+)\.(?P<minor>\d+)$'),
+            "single": re.compile(r'^(?P<major>\d+)$'),
+        }
+
+    def parse_version(self, version_str: str) -> Optional[LegacyParsedVersion]:
+        clean_version = version_str.strip()
+        for format_type, pattern in self.patterns.items():
+            match = pattern.match(clean_version)
+            if match:
+                groups = match.groupdict()
+                prerelease = groups.get('prerelease')
+                if format_type == "windows_style":
+                    extra = groups.get('extra')
+                    if extra and extra != 'windows':
+                        prerelease = extra
+                parsed = LegacyParsedVersion(
+                    int(groups.get('major', 0)), int(groups.get('minor') or 0), int(groups.get('patch') or 0),
+                    prerelease, groups.get('build'), version_str, format_type
+                )
+                self.logger.debug(f"Versão parseada: {version_str} -> {parsed}")
+                return parsed
+        return None
+
+    def compare_versions(self, version1: str, version2: str) -> int:
+        v1 = self.parse_version(version1)
+        v2 = self.parse_version(version2)
+        if v1.major != v2.major:
+            return 1 if v1.major > v2.major else -1
+        if v1.minor != v2.minor:
+            return 1 if v1.minor > v2.minor else -1
+        if v1.patch != v2.patch:
+            return 1 if v1.patch > v2.patch else -1
+        if v1.prerelease and not v2.prerelease:
+            return -1
+        if not v1.prerelease and v2.prerelease:
+            return 1
+        if v1.prerelease and v2.prerelease and v1.prerelease != v2.prerelease:
+            return 1 if v1.prerelease > v2.prerelease else -1
+        return 0
+
+
+def legacy_matches(specifier: str, version: str) -> bool:
+    """Verificação de restrição anterior: packaging sem cache"""
+    try:
+        return pkg_version.Version(version) in pkg_specifiers.SpecifierSet(specifier)
+    except Exception:
+        return False
+
+
+def make_versions(count: int, rng: random.Random) -> List[str]:
+    """Gera `count` versões distintas nos formatos suportados"""
+    versions = set()
+    while len(versions) < count:
+        major, minor, patch = rng.randint(0, 30), rng.randint(0, 30), rng.randint(0, 50)
+        kind = rng.random()
+        if kind < 0.6:
+            versions.add(f"{major}.{minor}.{patch}")
+        elif kind < 0.75:
+            versions.add(f"{major}.{minor}.{patch}-rc.{rng.randint(1, 5)}")
+        elif kind < 0.9:
+            versions.add(f"{major}.{minor}.{patch}.windows.{rng.randint(1, 3)}")
+        else:
+            versions.add(f"{major}.{minor}")
+    return sorted(versions)
+
+
+def measure(label: str, operations: int, function: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<30} {elapsed:8.3f}s  {operations / elapsed:12,.0f} op/s  "
+          f"{elapsed / operations * 1e6:8.2f} us/op")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--versions", type=int, default=1000, help="versões distintas")
+    parser.add_argument("--repeat", type=int, default=20, help="vezes que cada versão é reutilizada")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    versions = make_versions(args.versions, rng)
+    workload = versions * args.repeat
+    rng.shuffle(workload)
+    pairs = list(zip(workload, workload[1:] + workload[:1]))
+    specifiers = [">=1.0", "<20", ">=2.5,<15", "!=3.0.0", "~=4.2", "==7.1.*"]
+    checks = [(specifiers[i % len(specifiers)], version) for i, version in enumerate(workload)]
+    # O packaging não aceita o formato Windows; a comparação usa só as versões que ele entende
+    pep440_checks = [(spec, version) for spec, version in checks if "windows" not in version]
+
+    legacy = LegacyVersionParser()
+    manager = VersionManager()
+    print(f"{len(versions):,} versões distintas, cada uma usada {args.repeat}x")
+
+    print("\nInterpretação")
+    old = measure("anterior (regex por chamada)", len(workload),
+                  lambda: [legacy.parse_version(v) for v in workload])
+    version_parser.clear_caches()
+    measure("unificado, cache frio", len(versions),
+            lambda: [version_parser.parse_version(v) for v in versions])
+    new = measure("unificado, carga repetida", len(workload),
+                  lambda: [version_parser.parse_version(v) for v in workload])
+    print(f"  ganho: {old / new:.1f}x")
+
+    print("\nComparação (VersionManager.compare_versions)")
+    old = measure("anterior", len(pairs), lambda: [legacy.compare_versions(a, b) for a, b in pairs])
+    new = measure("unificado", len(pairs), lambda: [manager.compare_versions(a, b) for a, b in pairs])
+    print(f"  ganho: {old / new:.1f}x")
+
+    print("\nRestrições")
+    old = measure("anterior (packaging sem cache)", len(pep440_checks),
+                  lambda: [legacy_matches(s, v) for s, v in pep440_checks])
+    new = measure("unificado (compilada)", len(pep440_checks),
+                  lambda: [version_parser.version_matches(s, v) for s, v in pep440_checks])
+    print(f"  ganho: {old / new:.1f}x")
+
+    info = version_parser.cache_info()
+    print(f"\nCache de versões: {info['versions']['hits']:,} acertos, {info['versions']['misses']:,} faltas; "
+          f"restrições: {info['constraints']['currsize']} compiladas")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,14 @@ Este módulo gerencia o carregamento dos arquivos YAML de componentes
 
 import os
 import sys
+import copy
 import yaml
 import glob
+import json
+import pickle
+import hashlib
 import logging
+import threading
 from pathlib import Path
 import jsonschema
 
@@ -102,10 +107,28 @@ COMPONENT_SCHEMA = {
     "required": ["description", "install_method"]
 }
 
+# Parser C da PyYAML quando disponível (mesma semântica de safe_load)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Versão do formato do catálogo compilado
+CATALOG_FORMAT_VERSION = 1
+
+_validator = None
+
+
+def get_component_validator():
+    """Retorna o validador do schema, compilado uma única vez"""
+    global _validator
+    if _validator is None:
+        validator_class = jsonschema.validators.validator_for(COMPONENT_SCHEMA)
+        validator_class.check_schema(COMPONENT_SCHEMA)
+        _validator = validator_class(COMPONENT_SCHEMA)
+    return _validator
+
 def validate_component(name, component_data):
     """Valida um componente contra o schema"""
     try:
-        jsonschema.validate(instance=component_data, schema=COMPONENT_SCHEMA)
+        get_component_validator().validate(component_data)
         return True
     except jsonschema.exceptions.ValidationError as e:
         logger.error(f"Erro de validação no componente '{name}': {e}")
@@ -115,7 +138,7 @@ def load_yaml_file(file_path):
     """Carrega um arquivo YAML"""
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            return yaml.safe_load(file)
+            return yaml.load(file, Loader=_YAML_LOADER)
     except yaml.YAMLError as e:
         logger.error(f"Erro ao analisar YAML em {file_path}: {e}")
         return None
@@ -123,6 +146,199 @@ def load_yaml_file(file_path):
         logger.error(f"Erro ao ler arquivo {file_path}: {e}")
         return None
 
+
+class ComponentCatalog:
+    """Catálogo compilado dos arquivos YAML de componentes.
+
+    Cada arquivo é analisado e validado uma única vez; o resultado fica em
+    memória e é persistido em um blob pickle. Um arquivo só é reanalisado
+    quando seu tamanho/mtime muda e o hash SHA-256 do conteúdo também.
+    """
+
+    def __init__(self, components_dir=None, cache_file=None):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        self.components_dir = components_dir or os.path.join(script_dir, "components")
+        self.cache_file = Path(cache_file) if cache_file else Path.cwd() / "cache" / "component_catalog.pickle"
+        self._schema_hash = hashlib.sha256(
+            json.dumps(COMPONENT_SCHEMA, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+        self._lock = threading.RLock()
+        self._entries = None
+        self._dirty = False
+        self._snapshot = None
+        self.stats = {"files_parsed": 0, "files_reused": 0}
+
+    def get_components(self):
+        """Retorna os componentes válidos de todos os arquivos YAML (cópia independente)"""
+        with self._lock:
+            yaml_files = sorted(glob.glob(os.path.join(self.components_dir, "*.yaml")))
+            changed = self._refresh(yaml_files)
+            changed = self._drop_removed_files(yaml_files) or changed
+            if changed or self._snapshot is None:
+                components = {}
+                for yaml_file in yaml_files:
+                    entry = self._entries.get(self._key(yaml_file))
+                    if entry:
+                        components.update(entry["components"])
+                self._snapshot = pickle.dumps(components, protocol=pickle.HIGHEST_PROTOCOL)
+            self.save()
+            # Desserializar o snapshot é mais rápido que deepcopy e isola os chamadores
+            return pickle.loads(self._snapshot)
+
+    def load_file(self, file_path):
+        """Retorna o conteúdo analisado (sem validação) de um arquivo YAML qualquer"""
+        with self._lock:
+            if self._refresh([file_path]):
+                self._snapshot = None
+            self.save()
+            entry = self._entries.get(self._key(file_path))
+            return copy.deepcopy(entry["data"]) if entry else None
+
+    def invalidate(self):
+        """Descarta o catálogo em memória e o blob persistido"""
+        with self._lock:
+            self._entries = {}
+            self._snapshot = None
+            self._dirty = False
+            try:
+                self.cache_file.unlink()
+            except OSError:
+                pass
+
+    def save(self):
+        """Persiste o catálogo se houver alterações"""
+        with self._lock:
+            if not self._dirty:
+                return
+            blob = {
+                "version": CATALOG_FORMAT_VERSION,
+                "schema_hash": self._schema_hash,
+                "files": self._entries,
+            }
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = self.cache_file.with_suffix(".tmp")
+                with open(temp_file, 'wb') as f:
+                    pickle.dump(blob, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_file, self.cache_file)
+                self._dirty = False
+            except Exception as e:
+                logger.warning(f"Erro ao salvar catálogo de componentes: {e}")
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def _ensure_loaded(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'rb') as f:
+                blob = pickle.load(f)
+            # Catálogo de outro formato ou schema precisa ser revalidado
+            if blob.get("version") == CATALOG_FORMAT_VERSION and blob.get("schema_hash") == self._schema_hash:
+                self._entries = blob.get("files", {})
+        except Exception as e:
+            logger.warning(f"Erro ao carregar catálogo de componentes: {e}")
+
+    def _refresh(self, yaml_files):
+        """Recompila os arquivos alterados; retorna True se algo mudou"""
+        self._ensure_loaded()
+        changed = False
+        for yaml_file in yaml_files:
+            key = self._key(yaml_file)
+            entry = self._entries.get(key)
+            try:
+                stat_result = os.stat(yaml_file)
+            except OSError:
+                if self._entries.pop(key, None) is not None:
+                    self._dirty = changed = True
+                continue
+
+            if entry and entry["mtime_ns"] == stat_result.st_mtime_ns and entry["size"] == stat_result.st_size:
+                self.stats["files_reused"] += 1
+                continue
+
+            try:
+                with open(yaml_file, 'rb') as f:
+                    content = f.read()
+            except Exception as e:
+                logger.error(f"Erro ao ler arquivo {yaml_file}: {e}")
+                continue
+
+            content_hash = hashlib.sha256(content).hexdigest()
+            if entry and entry["sha256"] == content_hash:
+                # Apenas o mtime mudou (checkout, cópia): reaproveitar a compilação
+                entry["mtime_ns"], entry["size"] = stat_result.st_mtime_ns, stat_result.st_size
+                self._dirty = True
+                self.stats["files_reused"] += 1
+                continue
+
+            self._entries[key] = self._compile(yaml_file, content, content_hash, stat_result)
+            self._dirty = changed = True
+            self.stats["files_parsed"] += 1
+        return changed
+
+    def _drop_removed_files(self, yaml_files):
+        """Descarta entradas de arquivos que saíram do diretório de componentes; retorna True se algo mudou"""
+        directory = self._key(self.components_dir)
+        current = {self._key(yaml_file) for yaml_file in yaml_files}
+        # Arquivos carregados por load_file fora do diretório não são afetados
+        removed = [key for key in self._entries
+                   if key not in current and os.path.dirname(key) == directory and key.endswith(".yaml")]
+        for key in removed:
+            del self._entries[key]
+        if removed:
+            self._dirty = True
+        return bool(removed)
+
+    def _compile(self, yaml_file, content, content_hash, stat_result):
+        """Analisa e valida um arquivo YAML"""
+        logger.info(f"Carregando {yaml_file}")
+        try:
+            data = yaml.load(content.decode('utf-8'), Loader=_YAML_LOADER)
+        except (yaml.YAMLError, UnicodeDecodeError) as e:
+            logger.error(f"Erro ao analisar YAML em {yaml_file}: {e}")
+            data = None
+
+        components = {}
+        if not data:
+            logger.error(f"Falha ao carregar {yaml_file}")
+        elif isinstance(data, dict):
+            for component_name, component_data in data.items():
+                if component_name.startswith('_'):
+                    continue
+                if validate_component(component_name, component_data):
+                    components[component_name] = component_data
+                else:
+                    logger.warning(f"Componente '{component_name}' ignorado devido a erros de validação")
+            logger.info(f"Carregados {len(components)} componentes válidos de {yaml_file}")
+
+        return {
+            "mtime_ns": stat_result.st_mtime_ns,
+            "size": stat_result.st_size,
+            "sha256": content_hash,
+            "data": data,
+            "components": components,
+        }
+
+
+# Instância global do catálogo
+_catalog_instance = None
+_catalog_lock = threading.Lock()
+
+
+def get_component_catalog():
+    """Retorna a instância global do catálogo de componentes"""
+    global _catalog_instance
+    with _catalog_lock:
+        if _catalog_instance is None:
+            _catalog_instance = ComponentCatalog()
+        return _catalog_instance
+
 def load_all_components():
     """Carrega todos os componentes de todos os arquivos YAML na pasta config/components, runtimes Python e módulos core"""
     components = {}
@@ -130,32 +346,9 @@ def load_all_components():
     components_dir = os.path.join(script_dir, "components")
     core_dir = os.path.join(os.path.dirname(script_dir), "core")
     
-    # Carregar componentes YAML
+    # Carregar componentes YAML (catálogo compilado, reanalisa só arquivos alterados)
     if os.path.exists(components_dir):
-        yaml_files = glob.glob(os.path.join(components_dir, "*.yaml"))
-        if yaml_files:
-            logger.info(f"Encontrados {len(yaml_files)} arquivos YAML")
-            
-            for yaml_file in yaml_files:
-                logger.info(f"Carregando {yaml_file}")
-                file_data = load_yaml_file(yaml_file)
-                
-                if not file_data:
-                    logger.error(f"Falha ao carregar {yaml_file}")
-                    continue
-                
-                valid_components = 0
-                for component_name, component_data in file_data.items():
-                    if component_name.startswith('_'):
-                        continue
-                        
-                    if validate_component(component_name, component_data):
-                        components[component_name] = component_data
-                        valid_components += 1
-                    else:
-                        logger.warning(f"Componente '{component_name}' ignorado devido a erros de validação")
-                
-                logger.info(f"Carregados {valid_components} componentes válidos de {yaml_file}")
+        components.update(get_component_catalog().get_components())
     
     # Carregar runtimes Python
     runtimes_dir = os.path.join(core_dir, "runtimes")
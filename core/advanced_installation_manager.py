@@ -24,6 +24,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
 
 from core.error_handler import EnvDevError, ErrorSeverity, ErrorCategory
+from core.snapshot_backup import get_snapshot_store, merge_directory, replace_file_contents
 
 logger = logging.getLogger(__name__)
 
@@ -132,6 +133,9 @@ class AtomicTransaction:
         # Create transaction directory
         self.transaction_dir = os.path.join(base_path, "transactions", transaction_id)
         os.makedirs(self.transaction_dir, exist_ok=True)
+        
+        # Content-addressed backup store shared by all transactions under base_path
+        self.snapshot_store = get_snapshot_store(os.path.join(base_path, "rollback", "snapshots"))
     
     def begin(self) -> bool:
         """Begin atomic transaction"""
@@ -159,19 +163,26 @@ class AtomicTransaction:
             )
             return True
     
-    def create_backup(self, file_path: str) -> Optional[str]:
-        """Create backup of file/directory before modification"""
+    def create_backup(self, file_path: str, copy_on_modify: bool = False) -> Optional[str]:
+        """
+        Create backup of file/directory before modification
+        
+        Content goes to the shared snapshot store (reflink, hardlink or copy,
+        deduplicated by hash). Directories are backed up as a manifest.
+        
+        Args:
+            file_path: File or directory to back up
+            copy_on_modify: The caller replaces files instead of writing in
+                place, so hardlinks may be used
+        """
         try:
             if not os.path.exists(file_path):
                 return None
             
             backup_name = f"backup_{uuid.uuid4().hex[:8]}_{os.path.basename(file_path)}"
-            backup_path = os.path.join(self.transaction_dir, backup_name)
-            
-            if os.path.isdir(file_path):
-                shutil.copytree(file_path, backup_path)
-            else:
-                shutil.copy2(file_path, backup_path)
+            backup_path = self.snapshot_store.snapshot(
+                file_path, os.path.join(self.transaction_dir, backup_name), copy_on_modify=copy_on_modify
+            )
             
             self.rollback_info.backup_paths.append(backup_path)
             self.logger.debug(f"Created backup: {file_path} -> {backup_path}")
@@ -212,14 +223,10 @@ class AtomicTransaction:
             
             # Create backup if file exists
             if os.path.exists(target_path):
-                operation.backup_path = self.create_backup(target_path)
+                operation.backup_path = self.create_backup(target_path, copy_on_modify=True)
             
-            # Create directory if needed
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            
-            # Write file
-            with open(target_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write file (replaced, never rewritten in place)
+            replace_file_contents(target_path, content)
             
             operation.completed = True
             self.rollback_info.installed_files.append(target_path)
@@ -255,16 +262,15 @@ class AtomicTransaction:
             new_content = operation.new_value
             
             # Create backup
-            operation.backup_path = self.create_backup(target_path)
+            operation.backup_path = self.create_backup(target_path, copy_on_modify=True)
             
             # Read original content
             if os.path.exists(target_path):
                 with open(target_path, 'r', encoding='utf-8') as f:
                     operation.original_value = f.read()
             
-            # Write new content
-            with open(target_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            # Write new content (replaced, never rewritten in place)
+            replace_file_contents(target_path, new_content)
             
             operation.completed = True
             self.rollback_info.modified_files.append(target_path)
@@ -338,18 +344,27 @@ class AtomicTransaction:
             archive_path = operation.metadata.get('archive_path')
             extract_path = operation.target_path
             
+            existed = os.path.exists(extract_path)
+            
             # Create backup if directory exists and is not empty
-            if os.path.exists(extract_path) and os.listdir(extract_path):
-                operation.backup_path = self.create_backup(extract_path)
+            if existed and os.listdir(extract_path):
+                operation.backup_path = self.create_backup(extract_path, copy_on_modify=True)
             
-            # Extract archive
+            # Extract into a staging directory and move the files into place by
+            # rename, so hardlinked backups of overwritten files stay intact
             from utils.extractor import extract_archive
-            if extract_archive(archive_path, extract_path):
-                operation.completed = True
+            staging_path = f"{extract_path.rstrip(os.sep)}.staging-{uuid.uuid4().hex[:8]}"
+            try:
+                if not extract_archive(archive_path, staging_path):
+                    return False
+                merge_directory(staging_path, extract_path)
+            finally:
+                shutil.rmtree(staging_path, ignore_errors=True)
+            
+            operation.completed = True
+            if not existed:
                 self.rollback_info.created_directories.append(extract_path)
-                return True
-            else:
-                return False
+            return True
                 
         except Exception as e:
             self.logger.error(f"Failed to extract archive: {e}")
@@ -469,7 +484,7 @@ class AtomicTransaction:
             
             if operation.backup_path and os.path.exists(operation.backup_path):
                 # Restore from backup
-                shutil.copy2(operation.backup_path, target_path)
+                self.snapshot_store.restore(operation.backup_path, target_path)
                 self.logger.debug(f"Restored file from backup: {target_path}")
             else:
                 # Remove created file
@@ -510,7 +525,7 @@ class AtomicTransaction:
             
             if operation.backup_path and os.path.exists(operation.backup_path):
                 # Restore from backup
-                shutil.copy2(operation.backup_path, target_path)
+                self.snapshot_store.restore(operation.backup_path, target_path)
                 self.logger.debug(f"Restored modified file from backup: {target_path}")
             elif operation.original_value is not None:
                 # Restore original content
@@ -579,11 +594,15 @@ class AtomicTransaction:
             target_path = operation.target_path
             
             if operation.backup_path and os.path.exists(operation.backup_path):
-                # Restore from backup
-                if os.path.exists(target_path):
-                    shutil.rmtree(target_path)
-                shutil.copytree(operation.backup_path, target_path)
-                self.logger.debug(f"Restored extracted directory from backup: {target_path}")
+                # Restore from backup (only files changed since the snapshot are rewritten)
+                stats = self.snapshot_store.restore(operation.backup_path, target_path)
+                if not stats.success:
+                    self.logger.error(f"Failed to restore {stats.failed} files in {target_path}")
+                    return False
+                self.logger.debug(
+                    f"Restored extracted directory from backup: {target_path} "
+                    f"({stats.restored} restored, {stats.removed} removed, {stats.unchanged} unchanged)"
+                )
             else:
                 # Remove extracted directory
                 if os.path.exists(target_path) and os.path.isdir(target_path):
@@ -1316,6 +1335,13 @@ class AdvancedInstallationManager:
             
             self.logger.info(f"Cleaned up {cleaned_count} old transactions")
             
+            # Drop backup content no longer referenced by any transaction
+            if cleaned_count:
+                store = get_snapshot_store(os.path.join(self.rollback_dir, "snapshots"))
+                remaining = [os.path.join(self.transactions_dir, item) for item in os.listdir(self.transactions_dir)]
+                removed_objects = store.collect_garbage(remaining)
+                self.logger.debug(f"Removed {removed_objects} unreferenced backup objects")
+            
         except Exception as e:
             self.logger.error(f"Error during transaction cleanup: {e}")
         
@@ -10,6 +10,7 @@ import json
 import csv
 import sqlite3
 import threading
+import queue
 import time
 import psutil
 import os
@@ -23,6 +24,7 @@ import gzip
 import shutil
 from collections import defaultdict, deque
 import re
+import base64
 
 # Import notification manager for integration
 from env_dev.core.notification_manager import (
@@ -149,6 +151,13 @@ class AdvancedLogHandler(logging.Handler):
             # Fallback to prevent logging loops
             print(f"Error in AdvancedLogHandler: {e}", file=sys.stderr)
     
+    def flush(self):
+        """Wait until queued entries are persisted"""
+        try:
+            self.log_manager.flush()
+        except Exception as e:
+            print(f"Error flushing AdvancedLogHandler: {e}", file=sys.stderr)
+    
     def _determine_category(self, record) -> LogCategory:
         """Determine log category based on record information"""
         logger_name = record.name.lower()
@@ -321,19 +330,79 @@ class PerformanceMonitor:
             }
         }
 
+class _FlushRequest:
+    """Marker placed on the write queue to request a synchronous flush"""
+    
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
 class LogDatabase:
-    """SQLite database for log storage and searching"""
+    """SQLite database for log storage and searching
+    
+    Writes are queued and persisted by a background writer thread in batches
+    (``executemany`` + a single commit) every ``batch_size`` records or
+    ``flush_interval`` seconds, whichever comes first. When the queue is full
+    callers wait up to ``enqueue_timeout`` seconds and the entry is then
+    dropped and counted in ``dropped_entries``. Entries added after ``close``
+    are dropped and counted the same way.
+    """
     
-    def __init__(self, db_path: str):
+    _INSERT_LOG_SQL = '''
+        INSERT INTO log_entries (
+            timestamp, level, category, logger_name, message, module, function,
+            line_number, thread_id, process_id, operation_id, component, user_id,
+            session_id, tags, metadata, stack_trace, performance_data
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    _INSERT_METRICS_SQL = '''
+        INSERT INTO performance_metrics (
+            timestamp, cpu_percent, memory_percent, memory_used_mb,
+            disk_io_read_mb, disk_io_write_mb, network_sent_mb, network_recv_mb,
+            active_threads, open_files, operation_id, component
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    def __init__(self, db_path: str,
+                 batch_size: int = 200,
+                 flush_interval: float = 0.25,
+                 max_queue_size: int = 10000,
+                 enqueue_timeout: float = 0.05,
+                 flush_timeout: float = 5.0,
+                 enable_fts: bool = True):
         self.db_path = db_path
         self.connection = None
         self.lock = threading.Lock()
+        self.enable_fts = enable_fts
+        self.fts_enabled = False
+        
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.flush_timeout = flush_timeout
+        self.dropped_entries = 0
+        self.written_entries = 0
+        self._stats_lock = threading.Lock()
+        self._write_queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._warned_closed = False
+        
         self._initialize_database()
+        
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="LogDatabaseWriter", daemon=True
+        )
+        self._writer_thread.start()
     
     def _initialize_database(self):
         """Initialize the database schema"""
         with self.lock:
             self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            # WAL lets readers run while the writer thread commits batches,
+            # and synchronous=NORMAL avoids an fsync on every commit
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
             self.connection.execute('''
                 CREATE TABLE IF NOT EXISTS log_entries (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -383,63 +452,194 @@ class LogDatabase:
             self.connection.execute('CREATE INDEX IF NOT EXISTS idx_operation_id ON log_entries(operation_id)')
             self.connection.execute('CREATE INDEX IF NOT EXISTS idx_component ON log_entries(component)')
             
+            if self.enable_fts:
+                self.fts_enabled = self._initialize_fts()
+            
             self.connection.commit()
     
-    def add_log_entry(self, entry: LogEntry):
-        """Add a log entry to the database"""
-        with self.lock:
+    def _initialize_fts(self) -> bool:
+        """Create the FTS5 index over log_entries, backfilling existing rows
+        
+        Returns False when the SQLite build has no FTS5 support, in which case
+        searches fall back to LIKE scans.
+        """
+        existed = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'log_entries_fts'"
+        ).fetchone() is not None
+        
+        try:
             self.connection.execute('''
-                INSERT INTO log_entries (
-                    timestamp, level, category, logger_name, message, module, function,
-                    line_number, thread_id, process_id, operation_id, component, user_id,
-                    session_id, tags, metadata, stack_trace, performance_data
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                entry.timestamp.isoformat(),
-                entry.level.value,
-                entry.category.value,
-                entry.logger_name,
-                entry.message,
-                entry.module,
-                entry.function,
-                entry.line_number,
-                entry.thread_id,
-                entry.process_id,
-                entry.operation_id,
-                entry.component,
-                entry.user_id,
-                entry.session_id,
-                json.dumps(entry.tags),
-                json.dumps(entry.metadata),
-                entry.stack_trace,
-                json.dumps(entry.performance_data) if entry.performance_data else None
-            ))
-            self.connection.commit()
+                CREATE VIRTUAL TABLE IF NOT EXISTS log_entries_fts USING fts5(
+                    message, logger_name, component,
+                    content='log_entries', content_rowid='id'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 unavailable, log search will use LIKE: {e}", file=sys.stderr)
+            return False
+        
+        # Indexed terms, used to tell word prefixes from substrings in searches
+        self.connection.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS log_entries_fts_vocab USING fts5vocab(log_entries_fts, 'row')"
+        )
+        
+        self.connection.executescript('''
+            CREATE TRIGGER IF NOT EXISTS log_entries_fts_ai AFTER INSERT ON log_entries BEGIN
+                INSERT INTO log_entries_fts(rowid, message, logger_name, component)
+                VALUES (new.id, new.message, new.logger_name, new.component);
+            END;
+            CREATE TRIGGER IF NOT EXISTS log_entries_fts_ad AFTER DELETE ON log_entries BEGIN
+                INSERT INTO log_entries_fts(log_entries_fts, rowid, message, logger_name, component)
+                VALUES ('delete', old.id, old.message, old.logger_name, old.component);
+            END;
+            CREATE TRIGGER IF NOT EXISTS log_entries_fts_au AFTER UPDATE ON log_entries BEGIN
+                INSERT INTO log_entries_fts(log_entries_fts, rowid, message, logger_name, component)
+                VALUES ('delete', old.id, old.message, old.logger_name, old.component);
+                INSERT INTO log_entries_fts(rowid, message, logger_name, component)
+                VALUES (new.id, new.message, new.logger_name, new.component);
+            END;
+        ''')
+        
+        if not existed:
+            # Migration: index rows written before the FTS table existed
+            self.connection.execute("INSERT INTO log_entries_fts(log_entries_fts) VALUES ('rebuild')")
+        
+        return True
+    
+    def add_log_entry(self, entry: LogEntry):
+        """Queue a log entry for insertion"""
+        self._enqueue(self._INSERT_LOG_SQL, (
+            entry.timestamp.isoformat(),
+            entry.level.value,
+            entry.category.value,
+            entry.logger_name,
+            entry.message,
+            entry.module,
+            entry.function,
+            entry.line_number,
+            entry.thread_id,
+            entry.process_id,
+            entry.operation_id,
+            entry.component,
+            entry.user_id,
+            entry.session_id,
+            json.dumps(entry.tags),
+            json.dumps(entry.metadata),
+            entry.stack_trace,
+            json.dumps(entry.performance_data) if entry.performance_data else None
+        ))
     
     def add_performance_metrics(self, metrics: PerformanceMetrics):
-        """Add performance metrics to the database"""
-        with self.lock:
-            self.connection.execute('''
-                INSERT INTO performance_metrics (
-                    timestamp, cpu_percent, memory_percent, memory_used_mb,
-                    disk_io_read_mb, disk_io_write_mb, network_sent_mb, network_recv_mb,
-                    active_threads, open_files, operation_id, component
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                metrics.timestamp.isoformat(),
-                metrics.cpu_percent,
-                metrics.memory_percent,
-                metrics.memory_used_mb,
-                metrics.disk_io_read_mb,
-                metrics.disk_io_write_mb,
-                metrics.network_sent_mb,
-                metrics.network_recv_mb,
-                metrics.active_threads,
-                metrics.open_files,
-                metrics.operation_id,
-                metrics.component
-            ))
-            self.connection.commit()
+        """Queue performance metrics for insertion"""
+        self._enqueue(self._INSERT_METRICS_SQL, (
+            metrics.timestamp.isoformat(),
+            metrics.cpu_percent,
+            metrics.memory_percent,
+            metrics.memory_used_mb,
+            metrics.disk_io_read_mb,
+            metrics.disk_io_write_mb,
+            metrics.network_sent_mb,
+            metrics.network_recv_mb,
+            metrics.active_threads,
+            metrics.open_files,
+            metrics.operation_id,
+            metrics.component
+        ))
+    
+    def _enqueue(self, sql: str, params: tuple):
+        """Put a row on the write queue, dropping it if the queue stays full"""
+        if self._closed:
+            self._drop_after_close(1)
+            return
+        try:
+            self._write_queue.put((sql, params), timeout=self.enqueue_timeout)
+        except queue.Full:
+            self._count_dropped(1)
+    
+    def _count_dropped(self, count: int):
+        with self._stats_lock:
+            self.dropped_entries += count
+    
+    def _drop_after_close(self, count: int):
+        """Count entries written after close, warning once on stderr"""
+        self._count_dropped(count)
+        with self._stats_lock:
+            warn, self._warned_closed = not self._warned_closed, True
+        if warn:
+            # Never log from here: the handler would call back into this database
+            print(f"LogDatabase {self.db_path} is closed; dropping log entries", file=sys.stderr)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every entry queued so far has been committed
+        
+        Args:
+            timeout: Seconds to wait (default: ``flush_timeout``)
+        
+        Returns:
+            True if the entries were committed within the timeout
+        """
+        if self._closed or not self._writer_thread.is_alive():
+            return False
+        timeout = self.flush_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        request = _FlushRequest()
+        try:
+            self._write_queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(max(0.0, deadline - time.monotonic()))
+    
+    def _writer_loop(self):
+        """Background thread that persists queued rows in batches"""
+        pending: List[Tuple[str, tuple]] = []
+        deadline = None
+        
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._write_queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            
+            if isinstance(item, _FlushRequest):
+                self._write_batch(pending)
+                pending, deadline = [], None
+                item.done.set()
+                if item.stop:
+                    return
+                continue
+            
+            if item is not None:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            
+            if len(pending) >= self.batch_size or (
+                    pending and time.monotonic() >= deadline):
+                self._write_batch(pending)
+                pending, deadline = [], None
+    
+    def _write_batch(self, rows: List[Tuple[str, tuple]]):
+        """Insert a batch of rows with one executemany per statement and a single commit"""
+        if not rows:
+            return
+        grouped: Dict[str, List[tuple]] = defaultdict(list)
+        for sql, params in rows:
+            grouped[sql].append(params)
+        
+        try:
+            with self.lock:
+                if self.connection is None:
+                    self._count_dropped(len(rows))
+                    return
+                for sql, params_list in grouped.items():
+                    self.connection.executemany(sql, params_list)
+                self.connection.commit()
+            self.written_entries += len(rows)
+        except Exception as e:
+            # Never log from here: the handler would feed this thread again
+            self._count_dropped(len(rows))
+            print(f"Error writing log batch: {e}", file=sys.stderr)
     
     def search_logs(self,
                    query: Optional[str] = None,
@@ -449,67 +649,185 @@ class LogDatabase:
                    end_time: Optional[datetime] = None,
                    operation_id: Optional[str] = None,
                    component: Optional[str] = None,
-                   limit: int = 1000) -> List[Dict[str, Any]]:
+                   limit: int = 1000,
+                   cursor: Optional[str] = None,
+                   order_by: str = "time") -> List[Dict[str, Any]]:
         """Search logs with various filters"""
+        return self.search_logs_page(
+            query=query, levels=levels, categories=categories,
+            start_time=start_time, end_time=end_time,
+            operation_id=operation_id, component=component,
+            limit=limit, cursor=cursor, order_by=order_by
+        )['results']
+    
+    def search_logs_page(self,
+                         query: Optional[str] = None,
+                         levels: Optional[List[LogLevel]] = None,
+                         categories: Optional[List[LogCategory]] = None,
+                         start_time: Optional[datetime] = None,
+                         end_time: Optional[datetime] = None,
+                         operation_id: Optional[str] = None,
+                         component: Optional[str] = None,
+                         limit: int = 100,
+                         cursor: Optional[str] = None,
+                         order_by: str = "time") -> Dict[str, Any]:
+        """Search logs returning one page of results plus a cursor for the next
+        
+        Args:
+            query: Free text matched against message, logger name and component.
+                With FTS5, each word that starts an indexed word matches word
+                prefixes through the index ("inst" finds "installing"); other
+                words match as substrings with LIKE ("rror" finds "Error").
+                All words must match.
+            order_by: "time" (newest first) or "relevance" (bm25 rank, only
+                with a query and FTS5 available)
+            cursor: Opaque value returned as ``next_cursor`` by the previous page
+        
+        Returns:
+            Dict with ``results`` and ``next_cursor`` (None on the last page)
+        """
+        if order_by not in ("time", "relevance"):
+            raise ValueError(f"Unsupported order_by: {order_by}")
+        
+        self.flush()
+        
         with self.lock:
-            sql = "SELECT * FROM log_entries WHERE 1=1"
-            params = []
+            if query and self.fts_enabled:
+                fts_query, like_terms = self._plan_text_search(query)
+            else:
+                fts_query, like_terms = None, [query] if query else []
+            by_relevance = order_by == "relevance" and fts_query is not None
+            
+            if by_relevance:
+                sql = ("SELECT log_entries.*, bm25(log_entries_fts) AS rank "
+                       "FROM log_entries_fts JOIN log_entries ON log_entries.id = log_entries_fts.rowid "
+                       "WHERE log_entries_fts MATCH ?")
+                params: List[Any] = [fts_query]
+            else:
+                sql = "SELECT * FROM log_entries WHERE 1=1"
+                params = []
+                if fts_query is not None:
+                    sql += " AND id IN (SELECT rowid FROM log_entries_fts WHERE log_entries_fts MATCH ?)"
+                    params.append(fts_query)
             
-            if query:
-                sql += " AND (message LIKE ? OR logger_name LIKE ? OR component LIKE ?)"
-                query_param = f"%{query}%"
+            for term in like_terms:
+                sql += (" AND (log_entries.message LIKE ? OR log_entries.logger_name LIKE ?"
+                        " OR log_entries.component LIKE ?)")
+                query_param = f"%{term}%"
                 params.extend([query_param, query_param, query_param])
             
             if levels:
                 level_values = [level.value for level in levels]
                 placeholders = ','.join(['?' for _ in level_values])
-                sql += f" AND level IN ({placeholders})"
+                sql += f" AND log_entries.level IN ({placeholders})"
                 params.extend(level_values)
             
             if categories:
                 category_values = [cat.value for cat in categories]
                 placeholders = ','.join(['?' for _ in category_values])
-                sql += f" AND category IN ({placeholders})"
+                sql += f" AND log_entries.category IN ({placeholders})"
                 params.extend(category_values)
             
             if start_time:
-                sql += " AND timestamp >= ?"
+                sql += " AND log_entries.timestamp >= ?"
                 params.append(start_time.isoformat())
             
             if end_time:
-                sql += " AND timestamp <= ?"
+                sql += " AND log_entries.timestamp <= ?"
                 params.append(end_time.isoformat())
             
             if operation_id:
-                sql += " AND operation_id = ?"
+                sql += " AND log_entries.operation_id = ?"
                 params.append(operation_id)
             
             if component:
-                sql += " AND component = ?"
+                sql += " AND log_entries.component = ?"
                 params.append(component)
             
-            sql += " ORDER BY timestamp DESC LIMIT ?"
-            params.append(limit)
+            position = self._decode_cursor(cursor, "relevance" if by_relevance else "time")
+            if by_relevance:
+                # bm25 cannot be filtered on directly, so page over the ranked subquery
+                sql = f"SELECT * FROM ({sql})"
+                if position:
+                    sql += " WHERE (rank > ? OR (rank = ? AND id > ?))"
+                    params.extend([position[0], position[0], position[1]])
+                sql += " ORDER BY rank, id LIMIT ?"
+            else:
+                if position:
+                    sql += " AND (timestamp < ? OR (timestamp = ? AND id < ?))"
+                    params.extend([position[0], position[0], position[1]])
+                sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+            params.append(limit + 1)
             
-            cursor = self.connection.execute(sql, params)
-            columns = [description[0] for description in cursor.description]
-            
-            results = []
-            for row in cursor.fetchall():
-                result = dict(zip(columns, row))
-                # Parse JSON fields
-                if result['tags']:
-                    result['tags'] = json.loads(result['tags'])
-                if result['metadata']:
-                    result['metadata'] = json.loads(result['metadata'])
-                if result['performance_data']:
-                    result['performance_data'] = json.loads(result['performance_data'])
-                results.append(result)
-            
-            return results
+            db_cursor = self.connection.execute(sql, params)
+            columns = [description[0] for description in db_cursor.description]
+            rows = db_cursor.fetchall()
+        
+        results = []
+        for row in rows[:limit]:
+            result = dict(zip(columns, row))
+            # Parse JSON fields
+            if result['tags']:
+                result['tags'] = json.loads(result['tags'])
+            if result['metadata']:
+                result['metadata'] = json.loads(result['metadata'])
+            if result['performance_data']:
+                result['performance_data'] = json.loads(result['performance_data'])
+            results.append(result)
+        
+        next_cursor = None
+        if len(rows) > limit and results:
+            last = results[-1]
+            key = last['rank'] if by_relevance else last['timestamp']
+            next_cursor = self._encode_cursor("relevance" if by_relevance else "time", key, last['id'])
+        
+        return {'results': results, 'next_cursor': next_cursor}
+    
+    def _plan_text_search(self, query: str) -> Tuple[Optional[str], List[str]]:
+        """Split free text into an FTS5 prefix query and LIKE substring terms
+        
+        Words that start some indexed word go to FTS5 as quoted prefix terms;
+        the rest are returned for LIKE. Must be called with ``self.lock`` held.
+        
+        Returns:
+            (FTS5 query or None, terms to match with LIKE)
+        """
+        terms = re.findall(r'\w+', query, flags=re.UNICODE)
+        if not terms:
+            return None, [query]
+        
+        fts_terms, like_terms = [], []
+        for term in terms:
+            folded = term.lower()
+            indexed = self.connection.execute(
+                "SELECT 1 FROM log_entries_fts_vocab WHERE term >= ? AND term < ? LIMIT 1",
+                (folded, folded + '\U0010ffff')
+            ).fetchone()
+            (fts_terms if indexed else like_terms).append(term)
+        
+        fts_query = ' '.join('"{}"*'.format(term.replace('"', '""')) for term in fts_terms)
+        return fts_query or None, like_terms
+    
+    @staticmethod
+    def _encode_cursor(order: str, key: Any, row_id: int) -> str:
+        payload = json.dumps([order, key, row_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+    
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str], order: str) -> Optional[Tuple[Any, int]]:
+        if not cursor:
+            return None
+        try:
+            cursor_order, key, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except Exception:
+            raise ValueError("Invalid search cursor")
+        if cursor_order != order:
+            raise ValueError("Search cursor does not match the requested ordering")
+        return key, row_id
     
     def get_log_statistics(self, time_range: Optional[timedelta] = None) -> Dict[str, Any]:
         """Get log statistics"""
+        self.flush()
         with self.lock:
             sql = "SELECT level, category, COUNT(*) as count FROM log_entries"
             params = []
@@ -540,6 +858,7 @@ class LogDatabase:
     
     def cleanup_old_logs(self, older_than: timedelta):
         """Remove logs older than specified time"""
+        self.flush()
         with self.lock:
             cutoff_time = datetime.now() - older_than
             
@@ -560,8 +879,40 @@ class LogDatabase:
             # Vacuum to reclaim space
             self.connection.execute("VACUUM")
     
-    def close(self):
-        """Close the database connection"""
+    def close(self, timeout: Optional[float] = None):
+        """Flush pending entries, stop the writer thread and close the connection
+        
+        Args:
+            timeout: Seconds to wait for the writer (default: ``flush_timeout``)
+        """
+        if not self._closed:
+            self._closed = True
+            timeout = self.flush_timeout if timeout is None else timeout
+            if self._writer_thread.is_alive():
+                request = _FlushRequest(stop=True)
+                try:
+                    self._write_queue.put(request, timeout=timeout)
+                    self._writer_thread.join(timeout)
+                except queue.Full:
+                    pass
+            
+            # Rows that raced with close or that the writer did not reach in time
+            leftover = 0
+            while True:
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, _FlushRequest):
+                    item.done.set()
+                else:
+                    leftover += 1
+            if leftover:
+                self._drop_after_close(leftover)
+            if self._writer_thread.is_alive():
+                # The stop request may have been drained above
+                self._write_queue.put_nowait(_FlushRequest(stop=True))
+        
         with self.lock:
             if self.connection:
                 self.connection.close()
@@ -932,10 +1283,18 @@ class AdvancedLogManager:
         """Add performance metrics"""
         self.database.add_performance_metrics(metrics)
     
+    def flush(self) -> bool:
+        """Persist every log entry queued so far"""
+        return self.database.flush()
+    
     def search_logs(self, **kwargs) -> List[Dict[str, Any]]:
         """Search logs with filters"""
         return self.database.search_logs(**kwargs)
     
+    def search_logs_page(self, **kwargs) -> Dict[str, Any]:
+        """Search logs one page at a time (see LogDatabase.search_logs_page)"""
+        return self.database.search_logs_page(**kwargs)
+    
     def get_log_statistics(self, time_range: Optional[timedelta] = None) -> Dict[str, Any]:
         """Get log statistics"""
         return self.database.get_log_statistics(time_range)
@@ -986,11 +1345,15 @@ class AdvancedLogManager:
         if self.report_generator:
             self.report_generator.stop_auto_generation()
         
-        self.database.close()
-        
-        # Remove handler from root logger
+        # Remove handler from root logger before draining the write queue
         root_logger = logging.getLogger()
         root_logger.removeHandler(self.log_handler)
+        
+        self.database.close()
+        
+        if self.database.dropped_entries:
+            print(f"AdvancedLogManager dropped {self.database.dropped_entries} log entries",
+                  file=sys.stderr)
 
 # Global advanced log manager instance
 _advanced_log_manager: Optional[AdvancedLogManager] = None
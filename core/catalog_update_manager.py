@@ -8,7 +8,6 @@ gerenciamento de mirrors e sistema de fallback
 import os
 import json
 import logging
-import hashlib
 import time
 import threading
 from pathlib import Path
@@ -16,7 +15,6 @@ from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
-import requests
 from urllib.parse import urljoin, urlparse
 import tempfile
 import shutil
@@ -25,6 +23,8 @@ import tarfile
 
 from .security_manager import SecurityManager, SecurityLevel
 from .runtime_catalog_manager import RuntimeCatalogManager
+from utils.hash_utils import hashing_service
+from utils.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -603,7 +603,7 @@ class CatalogUpdateManager:
             
             # Fazer requisição
             start_time = time.time()
-            response = requests.get(check_url, timeout=30)
+            response = get_http_client().get(check_url, timeout=30, revalidate=True)
             response_time = time.time() - start_time
             
             response.raise_for_status()
@@ -701,34 +701,35 @@ class CatalogUpdateManager:
             download_path = self.cache_directory / f"update_{update_info.version}.tmp"
             
             # Download com progresso
-            response = requests.get(url, stream=True, timeout=self.download_timeout)
-            response.raise_for_status()
-            
-            downloaded_bytes = 0
-            start_time = time.time()
-            
-            with open(download_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if self._stop_event.is_set():
-                        return False
-                    
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_bytes += len(chunk)
+            response = get_http_client().get(url, stream=True, timeout=self.download_timeout)
+            with response:
+                response.raise_for_status()
+                
+                downloaded_bytes = 0
+                start_time = time.time()
+                
+                with open(download_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        if self._stop_event.is_set():
+                            return False
                         
-                        # Atualizar progresso
-                        elapsed_time = time.time() - start_time
-                        if elapsed_time > 0:
-                            speed_kbps = (downloaded_bytes / 1024) / elapsed_time
-                            self.update_progress.speed_kbps = speed_kbps
+                        if chunk:
+                            f.write(chunk)
+                            downloaded_bytes += len(chunk)
                             
-                            if speed_kbps > 0:
-                                remaining_bytes = update_info.size - downloaded_bytes
-                                eta_seconds = (remaining_bytes / 1024) / speed_kbps
-                                self.update_progress.eta_seconds = int(eta_seconds)
-                        
-                        self.update_progress.downloaded_bytes = downloaded_bytes
-                        self.update_progress.progress_percent = (downloaded_bytes / update_info.size) * 100
+                            # Atualizar progresso
+                            elapsed_time = time.time() - start_time
+                            if elapsed_time > 0:
+                                speed_kbps = (downloaded_bytes / 1024) / elapsed_time
+                                self.update_progress.speed_kbps = speed_kbps
+                                
+                                if speed_kbps > 0:
+                                    remaining_bytes = update_info.size - downloaded_bytes
+                                    eta_seconds = (remaining_bytes / 1024) / speed_kbps
+                                    self.update_progress.eta_seconds = int(eta_seconds)
+                            
+                            self.update_progress.downloaded_bytes = downloaded_bytes
+                            self.update_progress.progress_percent = (downloaded_bytes / update_info.size) * 100
             
             # Verificar checksum
             if not self._verify_checksum(download_path, update_info.checksum):
@@ -760,12 +761,7 @@ class CatalogUpdateManager:
             bool: True se checksum é válido
         """
         try:
-            hasher = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
-            
-            actual_checksum = hasher.hexdigest()
+            actual_checksum = hashing_service.hash_file(file_path, 'sha256')['sha256']
             return actual_checksum.lower() == expected_checksum.lower()
             
         except Exception as e:
@@ -784,7 +780,7 @@ class CatalogUpdateManager:
         """
         try:
             test_url = urljoin(mirror.url, "health")
-            response = requests.head(test_url, timeout=10)
+            response = get_http_client().head(test_url, timeout=10)
             return response.status_code < 400
         except:
             return False
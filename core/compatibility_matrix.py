@@ -9,12 +9,15 @@ import logging
 import json
 import re
 import yaml
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Dict, List, Optional, Any, Tuple, Set, FrozenSet
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-import packaging.version as pkg_version
-import packaging.specifiers as pkg_specifiers
+
+try:
+    from .version_parser import version_matches
+except ImportError:
+    from version_parser import version_matches
 
 class CompatibilityLevel(Enum):
     """Níveis de compatibilidade"""
@@ -56,11 +59,7 @@ class VersionConstraint:
     
     def matches(self, version: str) -> bool:
         """Verifica se uma versão atende à restrição"""
-        try:
-            spec = pkg_specifiers.SpecifierSet(self.specifier)
-            return pkg_version.Version(version) in spec
-        except Exception:
-            return False
+        return version_matches(self.specifier, version)
 
 @dataclass
 class CompatibilityRule:
@@ -127,6 +126,12 @@ class CompatibilityMatrix:
         
         # Cache de compatibilidade
         self.compatibility_cache: Dict[str, CompatibilityLevel] = {}
+        self._cache_keys_by_component: Dict[str, Set[str]] = {}
+        
+        # Índice de regras por par não ordenado de componentes
+        self._rule_index: Dict[FrozenSet[str], List[CompatibilityRule]] = {}
+        self._incompatible_partners: Dict[str, Set[str]] = {}
+        self._indexed_rules = 0
         
         # Carregar dados
         self.load_compatibility_data()
@@ -191,6 +196,26 @@ class CompatibilityMatrix:
                 )
             
             self.compatibility_rules.append(rule)
+            self._index_rule(rule)
+    
+    def _index_rule(self, rule: CompatibilityRule):
+        """Adiciona uma regra ao índice por par de componentes"""
+        pair = frozenset((rule.component_a, rule.component_b))
+        self._rule_index.setdefault(pair, []).append(rule)
+        if rule.compatibility == CompatibilityLevel.INCOMPATIBLE:
+            self._incompatible_partners.setdefault(rule.component_a, set()).add(rule.component_b)
+            self._incompatible_partners.setdefault(rule.component_b, set()).add(rule.component_a)
+        self._indexed_rules += 1
+    
+    def _ensure_rule_index(self):
+        """Reconstrói o índice se compatibility_rules foi alterada diretamente"""
+        if self._indexed_rules == len(self.compatibility_rules):
+            return
+        self._rule_index = {}
+        self._incompatible_partners = {}
+        self._indexed_rules = 0
+        for rule in self.compatibility_rules:
+            self._index_rule(rule)
     
     def _load_component_profiles(self, file_path: Path):
         """Carrega perfis de componentes"""
@@ -283,6 +308,8 @@ class CompatibilityMatrix:
         
         # Salvar no cache
         self.compatibility_cache[cache_key] = compatibility
+        for component in (component_a, component_b):
+            self._cache_keys_by_component.setdefault(component, set()).add(cache_key)
         
         return compatibility
     
@@ -290,13 +317,10 @@ class CompatibilityMatrix:
                                component_b: str, version_b: str,
                                platform: Optional[str] = None) -> CompatibilityLevel:
         """Busca regra de compatibilidade específica"""
+        self._ensure_rule_index()
         
-        for rule in self.compatibility_rules:
-            # Verificar se os componentes correspondem (em qualquer ordem)
-            if not ((rule.component_a == component_a and rule.component_b == component_b) or
-                   (rule.component_a == component_b and rule.component_b == component_a)):
-                continue
-            
+        # Apenas regras deste par de componentes (em qualquer ordem), na ordem de cadastro
+        for rule in self._rule_index.get(frozenset((component_a, component_b)), ()):
             # Verificar plataforma
             if rule.platform and platform and rule.platform != platform:
                 continue
@@ -395,22 +419,22 @@ class CompatibilityMatrix:
             if all(comp in installed_components for comp in conflict.components):
                 conflicts.append(conflict)
         
-        # Verificar conflitos por compatibilidade
-        components = list(installed_components.items())
-        for i, (comp_a, ver_a) in enumerate(components):
-            for comp_b, ver_b in components[i+1:]:
-                compatibility = self.check_compatibility(comp_a, ver_a, comp_b, ver_b, platform)
-                
-                if compatibility == CompatibilityLevel.INCOMPATIBLE:
-                    conflict = ConflictDetection(
-                        conflict_id=f"incompatible_{comp_a}_{comp_b}",
-                        type=ConflictType.VERSION_CONFLICT,
-                        components=[comp_a, comp_b],
-                        description=f"Incompatibilidade detectada entre {comp_a} {ver_a} e {comp_b} {ver_b}",
-                        severity="high",
-                        detection_method="matrix_analysis"
-                    )
-                    conflicts.append(conflict)
+        # Verificar conflitos por compatibilidade (apenas pares que podem ser incompatíveis)
+        for comp_a, comp_b in self._incompatibility_candidates(installed_components):
+            ver_a = installed_components[comp_a]
+            ver_b = installed_components[comp_b]
+            compatibility = self.check_compatibility(comp_a, ver_a, comp_b, ver_b, platform)
+            
+            if compatibility == CompatibilityLevel.INCOMPATIBLE:
+                conflict = ConflictDetection(
+                    conflict_id=f"incompatible_{comp_a}_{comp_b}",
+                    type=ConflictType.VERSION_CONFLICT,
+                    components=[comp_a, comp_b],
+                    description=f"Incompatibilidade detectada entre {comp_a} {ver_a} e {comp_b} {ver_b}",
+                    severity="high",
+                    detection_method="matrix_analysis"
+                )
+                conflicts.append(conflict)
         
         # Verificar conflitos de dependências
         dependency_conflicts = self._detect_dependency_conflicts(installed_components)
@@ -422,6 +446,33 @@ class CompatibilityMatrix:
         
         return conflicts
     
+    def _incompatibility_candidates(self, installed_components: Dict[str, str]) -> List[Tuple[str, str]]:
+        """
+        Pares que podem resultar em INCOMPATIBLE, na ordem dos componentes
+        
+        Só há incompatibilidade por regra INCOMPATIBLE cadastrada para o par ou
+        por conflicts_with/requires nos perfis, então os demais pares são ignorados.
+        """
+        self._ensure_rule_index()
+        position = {component: index for index, component in enumerate(installed_components)}
+        candidates: Set[Tuple[str, str]] = set()
+        
+        def add(first: str, second: str):
+            if first != second and first in position and second in position:
+                candidates.add((first, second) if position[first] < position[second] else (second, first))
+        
+        for component in installed_components:
+            for other in self._incompatible_partners.get(component, ()):
+                add(component, other)
+            profile = self.component_profiles.get(component)
+            if profile:
+                for other in profile.conflicts_with:
+                    add(component, other)
+                for other in profile.requires:
+                    add(component, other)
+        
+        return sorted(candidates, key=lambda pair: (position[pair[0]], position[pair[1]]))
+    
     def _detect_dependency_conflicts(self, installed_components: Dict[str, str]) -> List[ConflictDetection]:
         """Detecta conflitos de dependências"""
         conflicts = []
@@ -618,7 +669,9 @@ class CompatibilityMatrix:
     
     def add_compatibility_rule(self, rule: CompatibilityRule):
         """Adiciona nova regra de compatibilidade"""
+        self._ensure_rule_index()
         self.compatibility_rules.append(rule)
+        self._index_rule(rule)
         # Limpar cache relacionado
         self._clear_compatibility_cache(rule.component_a, rule.component_b)
     
@@ -630,13 +683,9 @@ class CompatibilityMatrix:
     
     def _clear_compatibility_cache(self, *components):
         """Limpa cache de compatibilidade para componentes específicos"""
-        keys_to_remove = []
-        for key in self.compatibility_cache.keys():
-            if any(comp in key for comp in components):
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del self.compatibility_cache[key]
+        for component in components:
+            for key in self._cache_keys_by_component.pop(component, set()):
+                self.compatibility_cache.pop(key, None)
     
     def export_compatibility_data(self, output_dir: Path):
         """Exporta dados de compatibilidade"""
@@ -23,6 +23,12 @@ from .configuration_manager import ConfigurationManager
 from .download_manager import DownloadManager
 from .storage_manager import StorageManager
 
+# Catálogo compilado compartilhado (evita reanalisar os mesmos YAML)
+try:
+    from config.loader import get_component_catalog
+except ImportError:
+    get_component_catalog = None
+
 class ComponentType(Enum):
     """Tipos de componentes"""
     RETRO_DEVKIT = "retro_devkit"
@@ -110,8 +116,11 @@ class ComponentManager:
     def _load_component_file(self, yaml_file: Path) -> bool:
         """Carrega componentes de um arquivo YAML"""
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            if get_component_catalog is not None:
+                data = get_component_catalog().load_file(yaml_file)
+            else:
+                with open(yaml_file, 'r', encoding='utf-8') as f:
+                    data = yaml.safe_load(f)
                 
             if not data:
                 return True
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de conflitos entre componentes
+Mantém índices invertidos (conflitos explícitos, recursos compartilhados e
+software base/versão) para que a verificação de conflitos de um lote visite
+apenas os pares que de fato compartilham algo, em vez de todos os pares.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tipos de conflito em ordem de prioridade (o primeiro encontrado num par vence)
+CONFLICT_PRIORITY = ("explicit", "path", "port", "env_var", "path_entry", "version")
+
+# Chave de recurso: (tipo, identificador)
+ResourceKey = Tuple[str, str]
+
+
+@dataclass
+class PairConflict:
+    """Conflito detectado entre dois componentes de um lote"""
+    component1: str
+    component2: str
+    conflict_type: str
+    resources: List[str] = field(default_factory=list)
+
+
+def _normalize_path(path: str) -> str:
+    return str(path).replace('/', '\\').rstrip('\\').lower()
+
+
+def extract_resources(config: Dict[str, Any]) -> Dict[ResourceKey, Optional[str]]:
+    """
+    Recursos declarados por um componente
+
+    Returns:
+        Dict: (tipo, identificador) -> valor (apenas variáveis de ambiente têm valor)
+    """
+    resources: Dict[ResourceKey, Optional[str]] = {}
+
+    for path in config.get('install_paths', None) or []:
+        resources[("path", str(path))] = None
+
+    for port in config.get('ports', None) or []:
+        resources[("port", str(port))] = None
+
+    variables = config.get('environment_variables', None) or {}
+    if isinstance(variables, dict):
+        for name, value in variables.items():
+            if str(name).upper() == 'PATH':
+                for entry in str(value).split(';'):
+                    if entry.strip():
+                        resources[("path_entry", _normalize_path(entry.strip()))] = None
+            else:
+                resources[("env_var", str(name).upper())] = str(value)
+
+    return resources
+
+
+class ConflictIndex:
+    """
+    Índice incremental de conflitos entre componentes.
+
+    ``update`` reindexa um componente apenas quando a sua configuração mudou;
+    ``find_conflicts`` usa os índices invertidos para gerar só os pares
+    candidatos, de modo que o custo de um lote é proporcional ao número de
+    componentes mais o número de pares que realmente compartilham algo.
+    """
+
+    def __init__(self):
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._declared: Dict[str, Set[str]] = {}
+        self._declared_by: Dict[str, Set[str]] = {}
+        self._resources: Dict[str, Dict[ResourceKey, Optional[str]]] = {}
+        self._base_software: Dict[str, Tuple[str, str]] = {}
+
+    def __contains__(self, component: str) -> bool:
+        return component in self._configs
+
+    def update(self, component: str, config: Optional[Dict[str, Any]]) -> bool:
+        """
+        Indexa (ou reindexa) um componente
+
+        Returns:
+            bool: True se o índice foi alterado
+        """
+        config = config or {}
+        if component in self._configs and self._configs[component] == config:
+            return False
+
+        self.remove(component)
+        self._configs[component] = config
+
+        declared = set(config.get('conflicts', None) or [])
+        declared.discard(component)
+        self._declared[component] = declared
+        for other in declared:
+            self._declared_by.setdefault(other, set()).add(component)
+
+        self._resources[component] = extract_resources(config)
+
+        base = config.get('base_software')
+        version = config.get('version', '')
+        if base and version:
+            self._base_software[component] = (str(base), str(version))
+        return True
+
+    def remove(self, component: str) -> None:
+        """Remove um componente do índice"""
+        if self._configs.pop(component, None) is None:
+            return
+        for other in self._declared.pop(component, set()):
+            partners = self._declared_by.get(other)
+            if partners:
+                partners.discard(component)
+                if not partners:
+                    del self._declared_by[other]
+        self._resources.pop(component, None)
+        self._base_software.pop(component, None)
+
+    def find_conflicts(self, components: List[str]) -> List[PairConflict]:
+        """
+        Conflitos entre os componentes de um lote (um por par, na ordem do lote)
+
+        Args:
+            components: Componentes do lote (devem ter sido indexados com update)
+        """
+        position: Dict[str, int] = {}
+        for component in components:
+            position.setdefault(component, len(position))
+
+        candidates: Dict[Tuple[str, str], Dict[str, List[str]]] = {}
+
+        def add(first: str, second: str, conflict_type: str, resource: Optional[str] = None) -> None:
+            if first == second:
+                return
+            pair = (first, second) if position[first] < position[second] else (second, first)
+            kinds = candidates.setdefault(pair, {})
+            resources = kinds.setdefault(conflict_type, [])
+            if resource is not None and resource not in resources:
+                resources.append(resource)
+
+        # Conflitos explícitos (em qualquer direção)
+        for component in position:
+            for other in self._declared.get(component, ()):
+                if other in position:
+                    add(component, other, "explicit")
+
+        # Recursos compartilhados
+        owners: Dict[ResourceKey, List[str]] = {}
+        for component in position:
+            for key in self._resources.get(component, ()):
+                owners.setdefault(key, []).append(component)
+        for key, sharing in owners.items():
+            if len(sharing) < 2:
+                continue
+            kind, name = key
+            for first, second in self._pairs(sharing):
+                if kind == "env_var" and self._resources[first][key] == self._resources[second][key]:
+                    # Mesmo valor para a mesma variável não conflita
+                    continue
+                add(first, second, kind, name)
+
+        # Mesmo software base em versões diferentes
+        by_base: Dict[str, List[str]] = {}
+        for component in position:
+            if component in self._base_software:
+                by_base.setdefault(self._base_software[component][0], []).append(component)
+        for sharing in by_base.values():
+            for first, second in self._pairs(sharing):
+                if self._base_software[first][1] != self._base_software[second][1]:
+                    add(first, second, "version")
+
+        conflicts = []
+        for pair in sorted(candidates, key=lambda p: (position[p[0]], position[p[1]])):
+            kinds = candidates[pair]
+            conflict_type = next(kind for kind in CONFLICT_PRIORITY if kind in kinds)
+            conflicts.append(PairConflict(pair[0], pair[1], conflict_type, kinds[conflict_type]))
+        return conflicts
+
+    @staticmethod
+    def _pairs(items: List[str]) -> Iterator[Tuple[str, str]]:
+        for i, first in enumerate(items):
+            for second in items[i + 1:]:
+                yield first, second
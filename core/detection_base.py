@@ -79,6 +79,13 @@ class DetectedApplication:
 class DetectionStrategy(ABC):
     """Abstract base class for application detection strategies."""
     
+    # When True, the scheduler may call detect_applications once per target app
+    # (each call runs its own probes) instead of once for the whole list.
+    per_app_probes: bool = False
+    
+    # Default timeout in seconds used by the scheduler (None = scheduler default)
+    timeout_seconds: Optional[float] = None
+    
     def __init__(self):
         import logging
         self.logger = logging.getLogger(f"detection_{self.__class__.__name__.lower()}")
@@ -16,7 +16,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from threading import Lock
+from threading import RLock
+from collections import OrderedDict
 
 
 @dataclass
@@ -39,22 +40,37 @@ class CacheEntry:
 
 
 class DetectionCache:
-    """Sistema de cache para resultados de detecção de aplicações."""
+    """Sistema de cache para resultados de detecção de aplicações.
     
-    def __init__(self, cache_dir: Optional[Path] = None, use_sqlite: bool = True):
+    As entradas ficam num LRU limitado em memória e são carregadas sob
+    demanda da persistência. Apenas as entradas alteradas (marcadas como
+    sujas) são gravadas, via UPSERT numa única transação.
+    """
+    
+    def __init__(self, cache_dir: Optional[Path] = None, use_sqlite: bool = True,
+                 max_memory_entries: int = 1000, write_batch_size: Optional[int] = None):
         """Inicializa o sistema de cache.
         
         Args:
             cache_dir: Diretório para armazenar arquivos de cache
             use_sqlite: Se True, usa SQLite; se False, usa JSON
+            max_memory_entries: Limite de entradas mantidas em memória (LRU)
+            write_batch_size: Número de entradas sujas que dispara a gravação
+                (padrão: 1 no SQLite, 10 no JSON)
         """
         self.logger = logging.getLogger(__name__)
         self.cache_dir = cache_dir or Path.cwd() / "cache"
         self.cache_dir.mkdir(exist_ok=True)
         
         self.use_sqlite = use_sqlite
-        self._memory_cache: Dict[str, CacheEntry] = {}
-        self._cache_lock = Lock()
+        self.max_memory_entries = max(1, max_memory_entries)
+        self.write_batch_size = write_batch_size or (1 if use_sqlite else 10)
+        self._memory_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # app_name -> entrada a gravar, ou None para remover
+        self._dirty: Dict[str, Optional[CacheEntry]] = {}
+        self._cache_lock = RLock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._json_entries: Optional[Dict[str, Dict[str, Any]]] = None
         
         # Configurações padrão de TTL (em segundos)
         self.default_ttl_config = {
@@ -70,7 +86,10 @@ class DetectionCache:
             "hits": 0,
             "misses": 0,
             "invalidations": 0,
-            "expirations": 0
+            "expirations": 0,
+            "evictions": 0,
+            "lazy_loads": 0,
+            "rows_written": 0
         }
         
         # Inicializar persistência
@@ -79,15 +98,18 @@ class DetectionCache:
         else:
             self.cache_file = self.cache_dir / "detection_cache.json"
         
-        # Carregar cache existente
+        # Preparar cache existente (as entradas são carregadas sob demanda)
         self._load_cache()
     
     def _init_sqlite(self):
         """Inicializa o banco SQLite para cache."""
         self.db_path = self.cache_dir / "detection_cache.db"
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute("""
                 CREATE TABLE IF NOT EXISTS cache_entries (
                     app_name TEXT PRIMARY KEY,
                     result TEXT NOT NULL,
@@ -98,100 +120,158 @@ class DetectionCache:
                 )
             """)
             
-            conn.execute("""
+            self._connection.execute("""
                 CREATE INDEX IF NOT EXISTS idx_timestamp 
                 ON cache_entries(timestamp)
             """)
     
     def _load_cache(self):
-        """Carrega cache da persistência."""
+        """Remove da persistência as entradas já expiradas."""
         try:
             if self.use_sqlite:
-                self._load_from_sqlite()
-            else:
-                self._load_from_json()
-            
-            # Limpar entradas expiradas após carregar
-            self.clear_expired_cache()
-            
+                with self._cache_lock, self._connection:
+                    self._connection.execute(
+                        "DELETE FROM cache_entries WHERE timestamp + ttl_seconds < ?",
+                        (time.time(),)
+                    )
         except Exception as e:
             self.logger.warning(f"Erro ao carregar cache: {e}")
     
-    def _load_from_sqlite(self):
-        """Carrega cache do SQLite."""
-        if not self.db_path.exists():
-            return
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT * FROM cache_entries"
-            )
-            
-            for row in cursor.fetchall():
-                app_name, result_json, timestamp, ttl, method, confidence = row
-                
-                entry = CacheEntry(
-                    app_name=app_name,
-                    result=json.loads(result_json),
-                    timestamp=timestamp,
-                    ttl_seconds=ttl,
-                    detection_method=method,
-                    confidence_level=confidence
-                )
-                
-                self._memory_cache[app_name] = entry
+    def _load_from_sqlite(self, app_name: str) -> Optional[CacheEntry]:
+        """Carrega uma única entrada do SQLite."""
+        row = self._connection.execute(
+            "SELECT app_name, result, timestamp, ttl_seconds, detection_method, confidence_level "
+            "FROM cache_entries WHERE app_name = ?",
+            (app_name,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        app_name, result_json, timestamp, ttl, method, confidence = row
+        return CacheEntry(
+            app_name=app_name,
+            result=json.loads(result_json),
+            timestamp=timestamp,
+            ttl_seconds=ttl,
+            detection_method=method,
+            confidence_level=confidence
+        )
+    
+    def _get_json_entries(self) -> Dict[str, Dict[str, Any]]:
+        """Lê o arquivo JSON na primeira necessidade (dados brutos, sem CacheEntry)."""
+        if self._json_entries is None:
+            self._json_entries = {}
+            if self.cache_file.exists():
+                try:
+                    with open(self.cache_file, 'r', encoding='utf-8') as f:
+                        self._json_entries = json.load(f)
+                except Exception as e:
+                    self.logger.warning(f"Erro ao carregar cache: {e}")
+        return self._json_entries
+    
+    def _load_from_json(self, app_name: str) -> Optional[CacheEntry]:
+        """Carrega uma única entrada do arquivo JSON."""
+        entry_data = self._get_json_entries().get(app_name)
+        return CacheEntry(**entry_data) if entry_data else None
     
-    def _load_from_json(self):
-        """Carrega cache do arquivo JSON."""
-        if not self.cache_file.exists():
-            return
+    def _load_entry(self, app_name: str) -> Optional[CacheEntry]:
+        """Obtém entrada da memória ou, sob demanda, da persistência."""
+        entry = self._memory_cache.get(app_name)
+        if entry is not None:
+            self._memory_cache.move_to_end(app_name)
+            return entry
         
-        with open(self.cache_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if app_name in self._dirty:
+            # Removida (None) ou ainda não gravada após ser expulsa da memória
+            entry = self._dirty[app_name]
+        else:
+            try:
+                entry = self._load_from_sqlite(app_name) if self.use_sqlite else self._load_from_json(app_name)
+            except Exception as e:
+                self.logger.warning(f"Erro ao carregar entrada {app_name} do cache: {e}")
+                entry = None
+            if entry is not None:
+                self.metrics["lazy_loads"] += 1
         
-        for app_name, entry_data in data.items():
-            entry = CacheEntry(**entry_data)
-            self._memory_cache[app_name] = entry
+        if entry is not None:
+            self._remember(entry)
+        return entry
+    
+    def _remember(self, entry: CacheEntry):
+        """Coloca entrada no LRU em memória, expulsando a menos usada."""
+        self._memory_cache[entry.app_name] = entry
+        self._memory_cache.move_to_end(entry.app_name)
+        while len(self._memory_cache) > self.max_memory_entries:
+            self._memory_cache.popitem(last=False)
+            self.metrics["evictions"] += 1
     
     def _save_cache(self):
-        """Salva cache na persistência."""
-        try:
-            if self.use_sqlite:
-                self._save_to_sqlite()
-            else:
-                self._save_to_json()
-        except Exception as e:
-            self.logger.error(f"Erro ao salvar cache: {e}")
+        """Grava na persistência apenas as entradas alteradas."""
+        with self._cache_lock:
+            if not self._dirty:
+                return
+            dirty = dict(self._dirty)
+            try:
+                if self.use_sqlite:
+                    self._save_to_sqlite(dirty)
+                else:
+                    self._save_to_json(dirty)
+                self._dirty.clear()
+                self.metrics["rows_written"] += len(dirty)
+            except Exception as e:
+                self.logger.error(f"Erro ao salvar cache: {e}")
     
-    def _save_to_sqlite(self):
-        """Salva cache no SQLite."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Limpar tabela
-            conn.execute("DELETE FROM cache_entries")
-            
-            # Inserir entradas atuais
-            for entry in self._memory_cache.values():
-                conn.execute("""
+    def _save_to_sqlite(self, dirty: Dict[str, Optional[CacheEntry]]):
+        """Aplica UPSERT/DELETE das entradas sujas numa única transação."""
+        upserts = [
+            (
+                entry.app_name,
+                json.dumps(entry.result),
+                entry.timestamp,
+                entry.ttl_seconds,
+                entry.detection_method,
+                entry.confidence_level
+            )
+            for entry in dirty.values() if entry is not None
+        ]
+        deletions = [(app_name,) for app_name, entry in dirty.items() if entry is None]
+        
+        with self._connection:
+            if deletions:
+                self._connection.executemany("DELETE FROM cache_entries WHERE app_name = ?", deletions)
+            if upserts:
+                self._connection.executemany("""
                     INSERT INTO cache_entries 
                     (app_name, result, timestamp, ttl_seconds, detection_method, confidence_level)
                     VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    entry.app_name,
-                    json.dumps(entry.result),
-                    entry.timestamp,
-                    entry.ttl_seconds,
-                    entry.detection_method,
-                    entry.confidence_level
-                ))
+                    ON CONFLICT(app_name) DO UPDATE SET
+                        result = excluded.result,
+                        timestamp = excluded.timestamp,
+                        ttl_seconds = excluded.ttl_seconds,
+                        detection_method = excluded.detection_method,
+                        confidence_level = excluded.confidence_level
+                """, upserts)
     
-    def _save_to_json(self):
-        """Salva cache no arquivo JSON."""
-        data = {}
-        for app_name, entry in self._memory_cache.items():
-            data[app_name] = asdict(entry)
-        
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    def _save_to_json(self, dirty: Dict[str, Optional[CacheEntry]]):
+        """Aplica as entradas sujas e regrava o arquivo JSON compacto."""
+        data = self._get_json_entries()
+        for app_name, entry in dirty.items():
+            if entry is None:
+                data.pop(app_name, None)
+            else:
+                data[app_name] = asdict(entry)
+        
+        temp_file = self.cache_file.with_suffix(".tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        temp_file.replace(self.cache_file)
+    
+    def _persisted_names(self) -> List[str]:
+        """Lista os nomes de todas as entradas persistidas (após gravar as sujas)."""
+        self._save_cache()
+        if self.use_sqlite:
+            return [row[0] for row in self._connection.execute("SELECT app_name FROM cache_entries")]
+        return list(self._get_json_entries().keys())
     
     def get_ttl_for_app(self, app_name: str, app_type: str = "default") -> int:
         """Obtém TTL configurado para um tipo de aplicação.
@@ -215,7 +295,7 @@ class DetectionCache:
             Resultado do cache ou None se não encontrado/expirado
         """
         with self._cache_lock:
-            entry = self._memory_cache.get(app_name)
+            entry = self._load_entry(app_name)
             
             if entry is None:
                 self.metrics["misses"] += 1
@@ -224,6 +304,7 @@ class DetectionCache:
             if entry.is_expired():
                 self.logger.debug(f"Cache expirado para {app_name}")
                 del self._memory_cache[app_name]
+                self._dirty[app_name] = None
                 self.metrics["expirations"] += 1
                 self.metrics["misses"] += 1
                 return None
@@ -256,12 +337,13 @@ class DetectionCache:
         )
         
         with self._cache_lock:
-            self._memory_cache[app_name] = entry
+            self._remember(entry)
+            self._dirty[app_name] = entry
+            should_save = len(self._dirty) >= self.write_batch_size
         
         self.logger.debug(f"Resultado cacheado para {app_name} (TTL: {ttl}s)")
         
-        # Salvar periodicamente (a cada 10 entradas)
-        if len(self._memory_cache) % 10 == 0:
+        if should_save:
             self._save_cache()
     
     def invalidate_cache(self, app_name: str) -> bool:
@@ -274,12 +356,16 @@ class DetectionCache:
             True se a entrada foi removida
         """
         with self._cache_lock:
-            if app_name in self._memory_cache:
-                del self._memory_cache[app_name]
-                self.metrics["invalidations"] += 1
-                self.logger.debug(f"Cache invalidado para {app_name}")
-                return True
-            return False
+            if self._load_entry(app_name) is None:
+                return False
+            
+            del self._memory_cache[app_name]
+            self._dirty[app_name] = None
+            self.metrics["invalidations"] += 1
+            self.logger.debug(f"Cache invalidado para {app_name}")
+        
+        self._save_cache()
+        return True
     
     def clear_expired_cache(self) -> int:
         """Remove todas as entradas expiradas do cache.
@@ -287,15 +373,27 @@ class DetectionCache:
         Returns:
             Número de entradas removidas
         """
-        expired_keys = []
-        
         with self._cache_lock:
-            for app_name, entry in self._memory_cache.items():
-                if entry.is_expired():
-                    expired_keys.append(app_name)
+            self._save_cache()
+            now = time.time()
+            
+            expired_keys = {app_name for app_name, entry in self._memory_cache.items()
+                            if entry.is_expired()}
+            if self.use_sqlite:
+                expired_keys.update(row[0] for row in self._connection.execute(
+                    "SELECT app_name FROM cache_entries WHERE timestamp + ttl_seconds < ?", (now,)
+                ))
+            else:
+                expired_keys.update(
+                    app_name for app_name, data in self._get_json_entries().items()
+                    if now - data["timestamp"] > data["ttl_seconds"]
+                )
             
             for key in expired_keys:
-                del self._memory_cache[key]
+                self._memory_cache.pop(key, None)
+                self._dirty[key] = None
+        
+        self._save_cache()
         
         if expired_keys:
             self.logger.info(f"Removidas {len(expired_keys)} entradas expiradas do cache")
@@ -306,8 +404,18 @@ class DetectionCache:
     def clear_all_cache(self) -> None:
         """Limpa todo o cache."""
         with self._cache_lock:
-            count = len(self._memory_cache)
+            count = len(set(self._persisted_names()) | set(self._memory_cache))
             self._memory_cache.clear()
+            self._dirty.clear()
+            try:
+                if self.use_sqlite:
+                    with self._connection:
+                        self._connection.execute("DELETE FROM cache_entries")
+                else:
+                    self._json_entries = {}
+                    self._save_to_json({})
+            except Exception as e:
+                self.logger.error(f"Erro ao limpar cache persistido: {e}")
         
         self.logger.info(f"Cache completamente limpo ({count} entradas removidas)")
     
@@ -322,12 +430,18 @@ class DetectionCache:
             hit_rate = (self.metrics["hits"] / total_requests * 100) if total_requests > 0 else 0
             
             return {
-                "total_entries": len(self._memory_cache),
+                "total_entries": len(set(self._persisted_names()) | set(self._memory_cache)),
+                "memory_entries": len(self._memory_cache),
+                "max_memory_entries": self.max_memory_entries,
+                "pending_writes": len(self._dirty),
                 "hits": self.metrics["hits"],
                 "misses": self.metrics["misses"],
                 "hit_rate_percent": round(hit_rate, 2),
                 "invalidations": self.metrics["invalidations"],
                 "expirations": self.metrics["expirations"],
+                "evictions": self.metrics["evictions"],
+                "lazy_loads": self.metrics["lazy_loads"],
+                "rows_written": self.metrics["rows_written"],
                 "total_requests": total_requests
             }
     
@@ -338,15 +452,31 @@ class DetectionCache:
             Lista com informações das entradas
         """
         with self._cache_lock:
+            self._save_cache()
+            
+            # Metadados apenas: os resultados não são desserializados
+            if self.use_sqlite:
+                rows = self._connection.execute(
+                    "SELECT app_name, timestamp, ttl_seconds, detection_method, confidence_level "
+                    "FROM cache_entries"
+                ).fetchall()
+            else:
+                rows = [
+                    (name, data["timestamp"], data["ttl_seconds"],
+                     data["detection_method"], data["confidence_level"])
+                    for name, data in self._get_json_entries().items()
+                ]
+            
             entries = []
-            for entry in self._memory_cache.values():
+            now = time.time()
+            for app_name, timestamp, ttl, method, confidence in rows:
                 entries.append({
-                    "app_name": entry.app_name,
-                    "detection_method": entry.detection_method,
-                    "confidence_level": entry.confidence_level,
-                    "cached_at": datetime.fromtimestamp(entry.timestamp).isoformat(),
-                    "expires_at": entry.expires_at().isoformat(),
-                    "is_expired": entry.is_expired()
+                    "app_name": app_name,
+                    "detection_method": method,
+                    "confidence_level": confidence,
+                    "cached_at": datetime.fromtimestamp(timestamp).isoformat(),
+                    "expires_at": datetime.fromtimestamp(timestamp + ttl).isoformat(),
+                    "is_expired": now - timestamp > ttl
                 })
             
             return sorted(entries, key=lambda x: x["cached_at"], reverse=True)
@@ -364,6 +494,10 @@ class DetectionCache:
     def save_and_close(self) -> None:
         """Salva cache e fecha recursos."""
         self._save_cache()
+        with self._cache_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
         self.logger.info("Cache salvo e recursos fechados")
 
 
@@ -27,6 +27,9 @@ except ImportError:
 
 from .detection_base import DetectionStrategy, DetectedApplication, DetectionMethod, ApplicationStatus
 from .detection_cache import get_detection_cache
+from .filesystem_index import get_filesystem_index
+from .detection_scheduler import DetectionScheduler
+from .version_probe import get_version_probe_service, extract_version, read_file_version
 from .microsoft_store_detection import MicrosoftStoreDetectionStrategy
 from .yaml_component_detection import YAMLComponentDetectionStrategy
 from .intelligent_update_checker import get_intelligent_update_checker, UpdateRecommendation
@@ -35,6 +38,19 @@ from .intelligent_update_checker import get_intelligent_update_checker, UpdateRe
 # Classes base movidas para detection_base.py
 
 
+# Command line tools whose version command is safe to run during a scan;
+# other executables are GUI apps and only have their PE version read
+CLI_VERSION_ARGS = {
+    "git.exe": ("--version",),
+    "python.exe": ("--version",),
+    "python3.exe": ("--version",),
+    "node.exe": ("--version",),
+    "java.exe": ("-version",),
+    "javac.exe": ("-version",),
+    "dotnet.exe": ("--version",),
+}
+
+
 @dataclass
 class DetectionResult:
     """Result of application detection process."""
@@ -157,28 +173,51 @@ class ExecutableScanStrategy(DetectionStrategy):
         """Detect applications by scanning for executables."""
         detected = []
         
+        patterns = self._get_target_patterns(target_apps)
+        if not patterns:
+            return detected
+        
+        # One walk per root matches every executable name at once
+        basenames = {executable for executables in patterns.values() for executable in executables}
+        try:
+            matches_by_root = get_filesystem_index().find(self.scan_paths, basenames)
+        except Exception as e:
+            self.logger.error(f"Error scanning executables: {e}")
+            return detected
+        
         for scan_path in self.scan_paths:
-            if scan_path.exists():
-                detected.extend(self._scan_directory(scan_path, target_apps))
+            if scan_path in matches_by_root:
+                detected.extend(self._scan_directory(scan_path, target_apps, matches_by_root[scan_path]))
         
         return detected
     
-    def _scan_directory(self, directory: Path, target_apps: Optional[List[str]]) -> List[DetectedApplication]:
+    def _get_target_patterns(self, target_apps: Optional[List[str]]) -> Dict[str, List[str]]:
+        """Return the executable patterns requested by target_apps."""
+        if not target_apps:
+            return dict(self.executable_patterns)
+        targets = {app.lower() for app in target_apps}
+        return {name: executables for name, executables in self.executable_patterns.items()
+                if name in targets}
+    
+    def _scan_directory(self, directory: Path, target_apps: Optional[List[str]],
+                        matches: Optional[Dict[str, List[Path]]] = None) -> List[DetectedApplication]:
         """Scan directory for application executables."""
         detected = []
         
         try:
-            for pattern_name, executables in self.executable_patterns.items():
-                if target_apps and pattern_name not in [app.lower() for app in target_apps]:
-                    continue
-                
+            if matches is None:
+                matches = get_filesystem_index().find(
+                    [directory],
+                    {exe for exes in self._get_target_patterns(target_apps).values() for exe in exes}
+                ).get(directory, {})
+            
+            for pattern_name, executables in self._get_target_patterns(target_apps).items():
                 for executable in executables:
-                    for exe_path in directory.rglob(executable):
-                        if exe_path.is_file():
-                            app_info = self._create_application_info(exe_path, pattern_name)
-                            if app_info:
-                                detected.append(app_info)
-                                break  # Found one instance, move to next pattern
+                    for exe_path in matches.get(executable.lower(), []):
+                        app_info = self._create_application_info(exe_path, pattern_name)
+                        if app_info:
+                            detected.append(app_info)
+                            break  # Found one instance, move to next pattern
         except Exception as e:
             self.logger.error(f"Error scanning directory {directory}: {e}")
         
@@ -203,30 +242,21 @@ class ExecutableScanStrategy(DetectionStrategy):
             return None
     
     def _get_executable_version(self, exe_path: Path) -> str:
-        """Get version information from executable."""
-        try:
-            # Try to get version using subprocess
-            result = subprocess.run(
-                [str(exe_path), "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0,
-                stdin=subprocess.DEVNULL,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            
-            if result.returncode == 0:
-                version_text = result.stdout.strip()
-                # Extract version number using regex
-                version_match = re.search(r'(\d+\.\d+(?:\.\d+)*)', version_text)
-                if version_match:
-                    return version_match.group(1)
-        except Exception:
-            pass
+        """Get version information from executable.
+        
+        Only known command line tools are run; anything else (browsers,
+        editors) would open a window, so its PE version resource is read.
+        """
+        version_args = CLI_VERSION_ARGS.get(exe_path.name.lower())
+        if version_args:
+            result = get_version_probe_service().probe(str(exe_path), version_args, timeout=5)
+            if result.ok:
+                # java -version writes to stderr
+                version = extract_version(result.output.strip())
+                if version:
+                    return version
         
-        return "unknown"
+        return read_file_version(str(exe_path)) or "unknown"
     
     def get_method_name(self) -> DetectionMethod:
         return DetectionMethod.EXECUTABLE_SCAN
@@ -235,6 +265,8 @@ class ExecutableScanStrategy(DetectionStrategy):
 class PathBasedDetectionStrategy(DetectionStrategy):
     """PATH environment variable-based detection."""
     
+    per_app_probes = True
+    
     def detect_applications(self, target_apps: Optional[List[str]] = None) -> List[DetectedApplication]:
         """Detect applications available in PATH."""
         detected = []
@@ -287,33 +319,14 @@ class PathBasedDetectionStrategy(DetectionStrategy):
     
     def _get_tool_version(self, tool_name: str) -> str:
         """Get version of tool using common version commands."""
-        version_commands = [
-            [tool_name, "--version"],
-            [tool_name, "-version"],
-            [tool_name, "-V"]
-        ]
+        probe_service = get_version_probe_service()
         
-        for cmd in version_commands:
-            try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0,
-                    stdin=subprocess.DEVNULL,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-                
-                if result.returncode == 0:
-                    version_text = result.stdout.strip()
-                    # Extract version number
-                    version_match = re.search(r'(\d+\.\d+(?:\.\d+)*)', version_text)
-                    if version_match:
-                        return version_match.group(1)
-            except Exception:
-                continue
+        for args in (["--version"], ["-version"], ["-V"]):
+            result = probe_service.probe(tool_name, args, timeout=5)
+            if result.ok:
+                version = extract_version(result.stdout.strip())
+                if version:
+                    return version
         
         return "unknown"
     
@@ -324,6 +337,8 @@ class PathBasedDetectionStrategy(DetectionStrategy):
 class CustomApplicationDetectionStrategy(DetectionStrategy):
     """Custom detection strategy for specific applications with known paths."""
     
+    per_app_probes = True
+    
     def __init__(self):
         super().__init__()
         # Configurações dos aplicativos customizados
@@ -802,34 +817,21 @@ class CustomApplicationDetectionStrategy(DetectionStrategy):
         if not version_command:
             return self._get_file_version(exe_path)
         
-        try:
-            # Tentar comando de versão
-            cmd = [exe_path] + version_command
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10,
-                creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0,
-                stdin=subprocess.DEVNULL,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
+        # Tentar comando de versão (resultado memorizado pelo serviço de probes)
+        result = get_version_probe_service().probe(exe_path, version_command, timeout=10)
+        if result.ok:
+            version_text = result.stdout.strip()
+            # Extrair número da versão usando regex
+            version = extract_version(version_text, r'(\d+\.\d+(?:\.\d+)*(?:-[\w\.-]+)?)')
+            if version:
+                return version
             
-            if result.returncode == 0:
-                version_text = result.stdout.strip()
-                # Extrair número da versão usando regex
-                version_match = re.search(r'(\d+\.\d+(?:\.\d+)*(?:-[\w\.-]+)?)', version_text)
-                if version_match:
-                    return version_match.group(1)
-                
-                # Se não encontrou padrão, retornar primeira linha não vazia
-                lines = [line.strip() for line in version_text.split('\n') if line.strip()]
-                if lines:
-                    return lines[0][:50]  # Limitar tamanho
-        
-        except Exception as e:
-            self.logger.debug(f"Version command failed for {exe_path}: {e}")
+            # Se não encontrou padrão, retornar primeira linha não vazia
+            lines = [line.strip() for line in version_text.split('\n') if line.strip()]
+            if lines:
+                return lines[0][:50]  # Limitar tamanho
+        elif result.error:
+            self.logger.debug(f"Version command failed for {exe_path}: {result.error}")
         
         # Fallback para versão do arquivo
         return self._get_file_version(exe_path)
@@ -988,7 +990,9 @@ class CustomApplicationDetectionStrategy(DetectionStrategy):
 class DetectionEngine:
     """Main detection engine that coordinates multiple detection strategies."""
     
-    def __init__(self, use_cache: bool = True, enable_updates: bool = True):
+    def __init__(self, use_cache: bool = True, enable_updates: bool = True,
+                 max_probe_workers: int = 4,
+                 strategy_timeouts: Optional[Dict[str, float]] = None):
         self.logger = logging.getLogger("detection_engine")
         self.strategies = [
             RegistryDetectionStrategy(),
@@ -998,6 +1002,10 @@ class DetectionEngine:
             CustomApplicationDetectionStrategy(),  # Aplicações hardcoded
             YAMLComponentDetectionStrategy()  # Componentes YAML com verify_actions
         ]
+        self.scheduler = DetectionScheduler(
+            max_probe_workers=max_probe_workers,
+            strategy_timeouts=strategy_timeouts
+        )
         self.use_cache = use_cache
         self.enable_updates = enable_updates
         if self.use_cache:
@@ -1064,19 +1072,13 @@ class DetectionEngine:
         
         # Executar detecção para aplicações não cacheadas
         if not self.use_cache or not self.cache or target_apps_for_detection:
-            # Run each detection strategy
-            for strategy in self.strategies:
-                try:
-                    self.logger.info(f"Running {strategy.get_method_name().value} detection...")
-                    detected = strategy.detect_applications(target_apps_for_detection)
-                    all_detected.extend(detected)
-                    
-                    result.detection_summary[strategy.get_method_name().value] = len(detected)
-                    
-                except Exception as e:
-                    error_msg = f"Detection strategy {strategy.get_method_name().value} failed: {e}"
-                    self.logger.error(error_msg)
-                    result.errors.append(error_msg)
+            # Run detection strategies concurrently
+            for run in self.scheduler.run(self.strategies, target_apps_for_detection):
+                all_detected.extend(run.detections)
+                result.detection_summary[run.label] = len(run.detections)
+                result.detection_summary[f"{run.label}_time_ms"] = int(run.elapsed_seconds * 1000)
+                if run.error:
+                    result.errors.append(run.error)
         
         # Merge and deduplicate results
         result.applications = self._merge_detections(all_detected)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Detection Scheduler
+Runs detection strategies concurrently, with per-app probes in a bounded pool.
+"""
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .detection_base import DetectionStrategy, DetectedApplication
+
+
+DEFAULT_STRATEGY_TIMEOUT = 60.0
+DEFAULT_HIGH_CONFIDENCE_THRESHOLD = 0.95
+
+
+def normalize_app_name(name: str) -> str:
+    """Normalize an application name for exact comparison ("Node.js" -> "nodejs")."""
+    name = name.lower()
+    if name.endswith(".exe"):
+        name = name[:-4]
+    return re.sub(r"[^a-z0-9]", "", name)
+
+
+@dataclass
+class StrategyRun:
+    """Outcome of a single strategy within a scheduled detection run.
+
+    ``method`` may be shared by several strategies; ``label`` is unique within
+    a run (the method, qualified by the strategy class when shared).
+    """
+    method: str
+    label: str = ""
+    detections: List[DetectedApplication] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    timed_out: bool = False
+    error: Optional[str] = None
+    skipped_probes: int = 0
+
+
+class _RunState:
+    """Shared state between the strategy runners of one detection run."""
+
+    def __init__(self, target_apps: Optional[List[str]], threshold: float):
+        self.lock = threading.Lock()
+        self.targets = {normalize_app_name(app) for app in target_apps} if target_apps else set()
+        self.threshold = threshold
+        self.resolved: set = set()
+        self.cancelled: set = set()
+        # Keyed by strategy index: several strategies may share a method name
+        self.runs: Dict[int, StrategyRun] = {}
+
+    def is_resolved(self, app: str) -> bool:
+        with self.lock:
+            return normalize_app_name(app) in self.resolved
+
+    def is_cancelled(self, index: int) -> bool:
+        with self.lock:
+            return index in self.cancelled
+
+    def report(self, index: int, detections: List[DetectedApplication]) -> None:
+        """Record detections unless the strategy was already cut off."""
+        with self.lock:
+            if index in self.cancelled:
+                return
+            self.runs[index].detections.extend(detections)
+            for detection in detections:
+                if detection.confidence < self.threshold:
+                    continue
+                # Exact match only: "GitHub Desktop" must not resolve "git"
+                name = normalize_app_name(detection.name)
+                if name in self.targets:
+                    self.resolved.add(name)
+
+
+class DetectionScheduler:
+    """Runs detection strategies concurrently with timeouts and early cut-off.
+
+    Strategies that set ``per_app_probes`` are split into one probe per target
+    app, executed in a shared bounded pool. Probes for an app are skipped once
+    any strategy reports a detection for it at or above
+    ``high_confidence_threshold``. A strategy that exceeds its timeout is
+    cancelled: its pending probes are dropped and late results are ignored.
+    """
+
+    def __init__(self,
+                 max_probe_workers: int = 4,
+                 default_timeout: float = DEFAULT_STRATEGY_TIMEOUT,
+                 strategy_timeouts: Optional[Dict[str, float]] = None,
+                 high_confidence_threshold: float = DEFAULT_HIGH_CONFIDENCE_THRESHOLD):
+        self.logger = logging.getLogger("detection_scheduler")
+        self.max_probe_workers = max(1, max_probe_workers)
+        self.default_timeout = default_timeout
+        self.strategy_timeouts = dict(strategy_timeouts or {})
+        self.high_confidence_threshold = high_confidence_threshold
+
+    def get_timeout(self, strategy: DetectionStrategy) -> float:
+        """Timeout for a strategy: explicit override, strategy default, then global default."""
+        method = strategy.get_method_name().value
+        if method in self.strategy_timeouts:
+            return self.strategy_timeouts[method]
+        # Duck-typed strategies (e.g. MicrosoftStoreDetectionStrategy) may not define it
+        timeout_seconds = getattr(strategy, "timeout_seconds", None)
+        if timeout_seconds is not None:
+            return timeout_seconds
+        return self.default_timeout
+
+    def run(self, strategies: List[DetectionStrategy],
+            target_apps: Optional[List[str]] = None) -> List[StrategyRun]:
+        """Run all strategies and return one StrategyRun per strategy, in input order."""
+        state = _RunState(target_apps, self.high_confidence_threshold)
+        methods = [strategy.get_method_name().value for strategy in strategies]
+        for index, (strategy, method) in enumerate(zip(strategies, methods)):
+            label = method if methods.count(method) == 1 else f"{method}:{type(strategy).__name__}"
+            state.runs[index] = StrategyRun(method=method, label=label)
+
+        strategy_pool = ThreadPoolExecutor(max_workers=max(1, len(strategies)),
+                                           thread_name_prefix="detect-strategy")
+        probe_pool = ThreadPoolExecutor(max_workers=self.max_probe_workers,
+                                        thread_name_prefix="detect-probe")
+        start = time.perf_counter()
+        try:
+            futures = [
+                strategy_pool.submit(self._run_strategy, index, strategy, target_apps,
+                                     state, probe_pool, start)
+                for index, strategy in enumerate(strategies)
+            ]
+
+            for index, (strategy, future) in enumerate(zip(strategies, futures)):
+                run = state.runs[index]
+                try:
+                    remaining = start + self.get_timeout(strategy) - time.perf_counter()
+                    future.result(timeout=max(0.0, remaining))
+                    run.elapsed_seconds = run.elapsed_seconds or (time.perf_counter() - start)
+                except FutureTimeoutError:
+                    with state.lock:
+                        state.cancelled.add(index)
+                    future.cancel()
+                    run.timed_out = True
+                    run.elapsed_seconds = time.perf_counter() - start
+                    run.error = f"Detection strategy {run.label} timed out after {self.get_timeout(strategy):.1f}s"
+                    self.logger.warning(run.error)
+                except Exception as e:
+                    run.error = f"Detection strategy {run.label} failed: {e}"
+                    run.elapsed_seconds = time.perf_counter() - start
+                    self.logger.error(run.error)
+        finally:
+            # Do not wait for cancelled work; subprocess probes carry their own timeouts
+            strategy_pool.shutdown(wait=False, cancel_futures=True)
+            probe_pool.shutdown(wait=False, cancel_futures=True)
+
+        with state.lock:
+            return [state.runs[index] for index in range(len(strategies))]
+
+    def _run_strategy(self, index: int, strategy: DetectionStrategy, target_apps: Optional[List[str]],
+                      state: _RunState, probe_pool: ThreadPoolExecutor, start: float) -> None:
+        """Execute one strategy, either whole or as per-app probes."""
+        run = state.runs[index]
+        self.logger.info(f"Running {run.label} detection...")
+
+        if not (getattr(strategy, "per_app_probes", False) and target_apps):
+            detections = strategy.detect_applications(target_apps)
+            state.report(index, detections)
+            if not state.is_cancelled(index):
+                run.elapsed_seconds = time.perf_counter() - start
+            return
+
+        def probe(app: str) -> None:
+            if state.is_cancelled(index) or state.is_resolved(app):
+                with state.lock:
+                    run.skipped_probes += 1
+                return
+            # Report from the worker so the next queued probe sees the result
+            state.report(index, strategy.detect_applications([app]))
+
+        probes = {probe_pool.submit(probe, app): app for app in target_apps}
+        try:
+            for future in as_completed(probes):
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.debug(f"{run.label} probe for {probes[future]} failed: {e}")
+                if state.is_cancelled(index):
+                    break
+        finally:
+            for future in probes:
+                future.cancel()
+        if not state.is_cancelled(index):
+            run.elapsed_seconds = time.perf_counter() - start
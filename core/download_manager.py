@@ -10,7 +10,6 @@ import logging
 import requests
 import threading
 import time
-import hashlib
 from pathlib import Path
 from typing import Dict, Optional, Callable, Tuple, List, Union
 from urllib.parse import urlparse, urljoin
@@ -19,7 +18,12 @@ from enum import Enum
 from datetime import datetime
 
 from utils.checksum_manager import checksum_manager
+from utils.hash_utils import hashing_service
+from utils.http_client import HttpClient, get_http_client
 from core.error_handler import EnvDevError, ErrorSeverity, ErrorCategory
+from core.progress_bus import (
+    ProgressBus, ProgressEvent, STATUS_COMPLETED, STATUS_FAILED, get_progress_bus, new_operation_id
+)
 from utils.network import test_internet_connection
 from utils.mirror_manager import (
     load_mirrors_config, find_best_mirror, generate_alternative_urls,
@@ -28,6 +32,9 @@ from utils.mirror_manager import (
 
 logger = logging.getLogger(__name__)
 
+# Tamanho de leitura por iteração; blocos maiores reduzem o custo por byte do laço
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
 class DownloadStatus(Enum):
     """Status do download"""
     PENDING = "pending"
@@ -148,9 +155,12 @@ class DownloadManager:
     - 2.3: Relatório específico de erro e sugestão de download manual
     """
     
-    def __init__(self, max_concurrent_downloads: int = 3, chunk_size: int = 8192):
+    def __init__(self, max_concurrent_downloads: int = 3, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 progress_bus: Optional[ProgressBus] = None, http_client: Optional[HttpClient] = None):
         self.max_concurrent_downloads = max_concurrent_downloads
         self.chunk_size = chunk_size
+        self.progress_bus = progress_bus or get_progress_bus()
+        self.http_client = http_client or get_http_client()
         self.active_downloads: Dict[str, DownloadInfo] = {}
         self.download_lock = threading.Lock()
         self.mirrors_config = {}
@@ -224,7 +234,7 @@ class DownloadManager:
         return urls
 
     def download_with_mirrors(self, url: str, expected_hash: str, 
-                             algorithm: str = 'sha256') -> DownloadResult:
+                             algorithm: str = 'sha256', operation_id: Optional[str] = None) -> DownloadResult:
         """
         Baixa arquivo usando sistema de mirrors automático (Requisito 2.5)
         
@@ -232,11 +242,13 @@ class DownloadManager:
             url: URL principal para download
             expected_hash: Hash esperado para verificação
             algorithm: Algoritmo de hash
+            operation_id: Id da operação no barramento de progresso (padrão: novo id)
             
         Returns:
             DownloadResult com informações do download
         """
         start_time = time.time()
+        operation_id = operation_id or new_operation_id()
         
         # Verifica conectividade antes de tentar mirrors
         if not test_internet_connection():
@@ -260,25 +272,27 @@ class DownloadManager:
             # Se o melhor mirror é diferente da URL original, usa o mirror
             if best_url != url:
                 logger.info(f"Usando mirror automático: {best_url}")
-                result = self.download_with_retry(best_url, expected_hash, algorithm=algorithm)
+                result = self.download_with_retry(best_url, expected_hash, algorithm=algorithm,
+                                                  operation_id=operation_id)
                 if result.success:
                     result.message += f" (via mirror: {best_url})"
                     return result
             
             # Tenta com a URL original
-            result = self.download_with_retry(url, expected_hash, algorithm=algorithm)
+            result = self.download_with_retry(url, expected_hash, algorithm=algorithm, operation_id=operation_id)
             if result.success:
                 return result
             
             # Se falhou com a URL original, tenta com mirrors alternativos
             logger.warning(f"Falha na URL original, tentando mirrors alternativos...")
             
-            for alt_url in alternative_urls[1:]:  # Pula a primeira que é a original
-                if alt_url == best_url:  # Já tentamos o melhor mirror
+            for alt_url in alternative_urls:
+                if alt_url in (url, best_url):  # Já tentamos a original e o melhor mirror
                     continue
                     
                 logger.info(f"Tentando mirror alternativo: {alt_url}")
-                result = self.download_with_retry(alt_url, expected_hash, algorithm=algorithm)
+                result = self.download_with_retry(alt_url, expected_hash, algorithm=algorithm,
+                                                  operation_id=operation_id)
                 
                 if result.success:
                     result.message += f" (via mirror alternativo: {alt_url})"
@@ -297,7 +311,7 @@ class DownloadManager:
         except Exception as e:
             logger.error(f"Erro no sistema de mirrors: {e}")
             # Fallback para download direto
-            return self.download_with_retry(url, expected_hash, algorithm=algorithm)
+            return self.download_with_retry(url, expected_hash, algorithm=algorithm, operation_id=operation_id)
 
     def check_connectivity_and_mirrors(self, url: str) -> Dict[str, bool]:
         """
@@ -332,7 +346,7 @@ class DownloadManager:
         return connectivity_status
     
     def download_with_verification(self, url: str, expected_hash: str, 
-                                  algorithm: str = 'sha256') -> DownloadResult:
+                                  algorithm: str = 'sha256', operation_id: Optional[str] = None) -> DownloadResult:
         """
         Baixa arquivo com verificação obrigatória de hash (Requisito 2.1)
         
@@ -340,6 +354,7 @@ class DownloadManager:
             url: URL para download
             expected_hash: Hash esperado para verificação
             algorithm: Algoritmo de hash (padrão: sha256)
+            operation_id: Id da operação no barramento de progresso (padrão: novo id)
             
         Returns:
             DownloadResult com informações completas do download
@@ -362,7 +377,7 @@ class DownloadManager:
         try:
             # Executa download
             download_success, error_msg = self._download_from_url(
-                url, temp_file_path, component_name
+                url, temp_file_path, component_name, operation_id=operation_id
             )
             
             if not download_success:
@@ -415,7 +430,8 @@ class DownloadManager:
             )
 
     def download_with_retry(self, url: str, expected_hash: str, 
-                           max_retries: int = 3, algorithm: str = 'sha256') -> DownloadResult:
+                           max_retries: int = 3, algorithm: str = 'sha256',
+                           operation_id: Optional[str] = None) -> DownloadResult:
         """
         Baixa arquivo com retry automático para falhas de verificação (Requisito 2.2)
         
@@ -424,16 +440,18 @@ class DownloadManager:
             expected_hash: Hash esperado
             max_retries: Número máximo de tentativas (padrão: 3)
             algorithm: Algoritmo de hash
+            operation_id: Id da operação no barramento de progresso, mantido entre tentativas
             
         Returns:
             DownloadResult com informações de retry
         """
         last_result = None
+        operation_id = operation_id or new_operation_id()
         
         for attempt in range(max_retries):
             logger.info(f"Tentativa de download {attempt + 1}/{max_retries}: {url}")
             
-            result = self.download_with_verification(url, expected_hash, algorithm)
+            result = self.download_with_verification(url, expected_hash, algorithm, operation_id=operation_id)
             last_result = result
             result.retry_count = attempt
             
@@ -463,7 +481,8 @@ class DownloadManager:
         )
 
     def download_file(self, component_data: Dict, download_dir: str, 
-                     progress_callback: Optional[Callable[[DownloadProgress], None]] = None) -> DownloadResult:
+                     progress_callback: Optional[Callable[[DownloadProgress], None]] = None,
+                     operation_id: Optional[str] = None) -> DownloadResult:
         """
         Interface principal para download de componentes com verificação obrigatória
         
@@ -471,11 +490,14 @@ class DownloadManager:
             component_data: Dados do componente com informações de checksum
             download_dir: Diretório de destino
             progress_callback: Callback para progresso
+            operation_id: Id da operação no barramento de progresso; passe o id
+                de uma operação do NotificationManager para acompanhá-la (padrão: novo id)
             
         Returns:
             DownloadResult com informações completas
         """
         component_name = component_data.get('name', 'unknown')
+        operation_id = operation_id or new_operation_id()
         
         # Verifica conectividade
         if not test_internet_connection():
@@ -524,7 +546,8 @@ class DownloadManager:
         primary_url = download_urls[0] if download_urls else None
         if primary_url:
             logger.info(f"Tentando download com sistema de mirrors para: {primary_url}")
-            result = self.download_with_mirrors(primary_url, expected_hash, algorithm=algorithm)
+            result = self.download_with_mirrors(primary_url, expected_hash, algorithm=algorithm,
+                                                operation_id=operation_id)
             
             if result.success:
                 # Move arquivo para diretório final
@@ -546,7 +569,7 @@ class DownloadManager:
             for url_index, url in enumerate(download_urls[1:], 2):
                 logger.info(f"Tentando URL {url_index}/{len(download_urls)}: {url}")
                 
-                result = self.download_with_retry(url, expected_hash, algorithm=algorithm)
+                result = self.download_with_retry(url, expected_hash, algorithm=algorithm, operation_id=operation_id)
                 
                 if result.success:
                     # Move arquivo para diretório final
@@ -570,7 +593,8 @@ class DownloadManager:
         )
     
     def _download_from_url(self, url: str, file_path: str, component_name: str,
-                          progress_callback: Optional[Callable[[DownloadProgress], None]] = None) -> Tuple[bool, str]:
+                          progress_callback: Optional[Callable[[DownloadProgress], None]] = None,
+                          operation_id: Optional[str] = None) -> Tuple[bool, str]:
         """
         Executa download de uma URL específica com tracking detalhado de progresso
         
@@ -579,100 +603,73 @@ class DownloadManager:
             file_path: Caminho do arquivo de destino
             component_name: Nome do componente
             progress_callback: Callback de progresso
+            operation_id: Id da operação no barramento de progresso (padrão: novo id)
             
         Returns:
             Tupla (sucesso, mensagem_erro)
         """
+        operation_id = operation_id or new_operation_id()
         try:
             # Inicia requisição
             headers = {
                 'User-Agent': 'Environment-Dev-Script/1.0'
             }
             
-            response = requests.get(url, headers=headers, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            # Obtém tamanho total
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded_size = 0
-            start_time = datetime.now()
-            last_update_time = start_time
-            chunk_count = 0
-            
-            # Cria objeto de progresso inicial
-            progress = DownloadProgress(
-                total_size=total_size,
-                downloaded_size=0,
-                speed=0,
-                eta=0,
-                percentage=0,
-                status=DownloadStatus.DOWNLOADING,
-                message=f"Iniciando download de {component_name}...",
-                start_time=start_time,
-                url=url,
-                component_name=component_name
-            )
-            
-            # Log detalhado do início do download
-            logger.info(f"Iniciando download: {url}")
-            logger.info(f"Tamanho do arquivo: {progress.format_size(total_size) if total_size > 0 else 'Desconhecido'}")
-            
-            # Atualiza progresso inicial
-            if progress_callback:
-                progress_callback(progress)
-            
-            # Download em chunks com tracking detalhado
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=self.chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        chunk_count += 1
-                        
-                        current_time = datetime.now()
-                        elapsed_time = (current_time - start_time).total_seconds()
-                        
-                        # Calcula progresso detalhado
-                        if progress_callback and total_size > 0:
-                            # Velocidade instantânea (baseada no último chunk)
-                            time_since_last_update = (current_time - last_update_time).total_seconds()
-                            instantaneous_speed = len(chunk) / time_since_last_update if time_since_last_update > 0 else 0
-                            
-                            # Velocidade média geral
-                            average_speed = downloaded_size / elapsed_time if elapsed_time > 0 else 0
-                            
-                            # Atualiza objeto de progresso
-                            progress.downloaded_size = downloaded_size
-                            progress.elapsed_time = elapsed_time
-                            progress.instantaneous_speed = instantaneous_speed
-                            progress.chunk_count = chunk_count
-                            progress.last_update_time = current_time
-                            progress.percentage = (downloaded_size / total_size) * 100
-                            
-                            # Atualiza histórico de velocidade para média móvel
-                            progress.update_speed_history(instantaneous_speed)
-                            
-                            # Calcula ETA baseado na velocidade média móvel
-                            if progress.average_speed > 0:
-                                progress.eta = (total_size - downloaded_size) / progress.average_speed
-                            else:
-                                progress.eta = 0
-                            
-                            progress.speed = progress.average_speed
-                            progress.message = f"Baixando {component_name}... {progress.get_detailed_status()}"
+            response = self.http_client.get(url, headers=headers, stream=True, timeout=30)
+            # Fechar a resposta devolve a vaga do host ao cliente HTTP
+            with response:
+                response.raise_for_status()
+                
+                # Obtém tamanho total
+                total_size = int(response.headers.get('content-length', 0))
+                downloaded_size = 0
+                start_time = datetime.now()
+                start_clock = time.monotonic()
+                chunk_count = 0
+                
+                # Cria objeto de progresso inicial
+                progress = DownloadProgress(
+                    total_size=total_size,
+                    downloaded_size=0,
+                    speed=0,
+                    eta=0,
+                    percentage=0,
+                    status=DownloadStatus.DOWNLOADING,
+                    message=f"Iniciando download de {component_name}...",
+                    start_time=start_time,
+                    url=url,
+                    component_name=component_name
+                )
+                
+                # Log detalhado do início do download
+                logger.info(f"Iniciando download: {url}")
+                logger.info(f"Tamanho do arquivo: {progress.format_size(total_size) if total_size > 0 else 'Desconhecido'}")
+                
+                # Atualiza progresso inicial
+                if progress_callback:
+                    progress_callback(progress)
+                self.progress_bus.begin(operation_id, total_size, component_name=component_name, url=url)
+                
+                # Download em chunks; o barramento agrega os bytes e só devolve um
+                # evento (velocidade EWMA e ETA já calculados) a cada intervalo de publicação
+                with open(file_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        if chunk:
+                            f.write(chunk)
+                            downloaded_size += len(chunk)
+                            chunk_count += 1
                             
-                            # Callback de progresso (limitado para não sobrecarregar)
-                            if chunk_count % 10 == 0 or time_since_last_update >= 0.5:  # Atualiza a cada 10 chunks ou 0.5s
+                            event = self.progress_bus.report(operation_id, downloaded_size)
+                            if event is not None and progress_callback and total_size > 0:
+                                self._apply_progress_event(progress, event, chunk_count)
                                 progress_callback(progress)
-                                last_update_time = current_time
                                 
                                 # Log detalhado a cada 5% de progresso
                                 if int(progress.percentage) % 5 == 0 and int(progress.percentage) > 0:
                                     logger.debug(f"Download {component_name}: {progress.get_detailed_status()}")
             
             # Calcula estatísticas finais
-            final_time = datetime.now()
-            total_elapsed = (final_time - start_time).total_seconds()
+            total_elapsed = time.monotonic() - start_clock
             final_speed = downloaded_size / total_elapsed if total_elapsed > 0 else 0
             
             # Log detalhado da conclusão
@@ -682,6 +679,9 @@ class DownloadManager:
             logger.info(f"Velocidade média: {progress.format_speed(final_speed)}")
             logger.info(f"Chunks processados: {chunk_count}")
             
+            completion_message = f"Download de {component_name} concluído - {progress.format_size(downloaded_size)} em {progress.format_time(total_elapsed)}"
+            self.progress_bus.finish(operation_id, STATUS_COMPLETED, completion_message, bytes_done=downloaded_size)
+            
             # Progresso final
             if progress_callback:
                 progress.downloaded_size = downloaded_size
@@ -691,23 +691,35 @@ class DownloadManager:
                 progress.eta = 0
                 progress.percentage = 100
                 progress.status = DownloadStatus.COMPLETED
-                progress.message = f"Download de {component_name} concluído - {progress.format_size(downloaded_size)} em {progress.format_time(total_elapsed)}"
+                progress.message = completion_message
                 progress_callback(progress)
             
             return True, ""
             
         except requests.exceptions.RequestException as e:
             error_msg = f"Erro de rede: {e}"
-            logger.error(f"Falha no download de {component_name}: {error_msg}")
-            return False, error_msg
         except IOError as e:
             error_msg = f"Erro de E/S: {e}"
-            logger.error(f"Falha no download de {component_name}: {error_msg}")
-            return False, error_msg
         except Exception as e:
             error_msg = f"Erro inesperado: {e}"
-            logger.error(f"Falha no download de {component_name}: {error_msg}")
-            return False, error_msg
+        
+        logger.error(f"Falha no download de {component_name}: {error_msg}")
+        self.progress_bus.finish(operation_id, STATUS_FAILED, error_msg)
+        return False, error_msg
+    
+    def _apply_progress_event(self, progress: DownloadProgress, event: ProgressEvent, chunk_count: int) -> None:
+        """Copia um tick do barramento para o DownloadProgress do download"""
+        progress.downloaded_size = event.bytes_done
+        progress.elapsed_time = event.elapsed
+        progress.instantaneous_speed = event.speed
+        progress.chunk_count = chunk_count
+        progress.last_update_time = datetime.now()
+        progress.percentage = event.percentage
+        progress.update_speed_history(event.speed)
+        progress.average_speed = event.speed
+        progress.speed = event.speed
+        progress.eta = event.eta or 0
+        progress.message = f"Baixando {progress.component_name}... {progress.get_detailed_status()}"
     
     def cleanup_failed_downloads(self, directory: str = None) -> List[str]:
         """
@@ -961,23 +973,10 @@ class DownloadManager:
         Returns:
             Hash hexadecimal do arquivo
         """
-        hash_algorithms = {
-            'md5': hashlib.md5,
-            'sha1': hashlib.sha1,
-            'sha256': hashlib.sha256,
-            'sha512': hashlib.sha512
-        }
-        
-        if algorithm.lower() not in hash_algorithms:
+        if algorithm.lower() not in ('md5', 'sha1', 'sha256', 'sha512'):
             raise ValueError(f"Algoritmo {algorithm} não suportado")
         
-        hash_func = hash_algorithms[algorithm.lower()]()
-        
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hash_func.update(chunk)
-        
-        return hash_func.hexdigest()
+        return hashing_service.hash_file(file_path, algorithm.lower())[algorithm.lower()]
 
     def _generate_failure_report(self, url: str, last_result: DownloadResult, 
                                 max_retries: int) -> str:
@@ -1114,13 +1113,7 @@ class DownloadManager:
         Returns:
             Hash calculado em hexadecimal
         """
-        hash_obj = hashlib.new(algorithm.lower())
-        
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hash_obj.update(chunk)
-        
-        return hash_obj.hexdigest()
+        return hashing_service.hash_file(file_path, algorithm.lower())[algorithm.lower()]
 
 
 # Instância global do gerenciador de downloads
@@ -5,6 +5,7 @@ Environment Contamination Detector - Sistema de Detecção de Ambiente Contamina
 Detecta problemas no ambiente de desenvolvimento que podem afetar instalações e funcionamento.
 """
 
+import fnmatch
 import logging
 import os
 import sys
@@ -12,15 +13,24 @@ import json
 import subprocess
 import time
 import winreg
-import hashlib
 from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 import psutil
 import threading
+import yaml
 from collections import defaultdict, Counter
 
+from utils.hash_utils import hashing_service
+
+try:
+    from .signature_matcher import SignatureMatcher, signature_fingerprint
+    from .snapshot_diff import DirectoryTreeIndex, RecordStore, SectionDiff, SnapshotRecords, diff_snapshots
+except ImportError:
+    from signature_matcher import SignatureMatcher, signature_fingerprint
+    from snapshot_diff import DirectoryTreeIndex, RecordStore, SectionDiff, SnapshotRecords, diff_snapshots
+
 class ContaminationType(Enum):
     """Tipos de contaminação"""
     MALICIOUS_PROCESS = "malicious_process"
@@ -64,6 +74,7 @@ class ContaminationSignature:
     severity: SeverityLevel = SeverityLevel.MEDIUM
     description: str = ""
     remediation: List[str] = field(default_factory=list)
+    exclusions: List[str] = field(default_factory=list)
 
 @dataclass
 class ContaminationDetection:
@@ -89,6 +100,15 @@ class SystemSnapshot:
     registry_keys: Dict[str, Any] = field(default_factory=dict)
     file_system_state: Dict[str, Any] = field(default_factory=dict)
     performance_metrics: Dict[str, float] = field(default_factory=dict)
+    records: Optional[SnapshotRecords] = None
+
+# Processos padrão do Windows (sistema e segurança nativa), nunca tratados como contaminação
+STOCK_WINDOWS_PROCESSES = frozenset({
+    "system", "smss.exe", "csrss.exe", "wininit.exe", "winlogon.exe", "services.exe", "lsass.exe",
+    "svchost.exe", "explorer.exe", "dwm.exe", "sihost.exe", "taskhostw.exe", "runtimebroker.exe",
+    "securityhealthservice.exe", "securityhealthsystray.exe", "msmpeng.exe", "nissrv.exe",
+    "mpdefendercoreservice.exe", "mpcmdrun.exe", "smartscreen.exe",
+})
 
 class EnvironmentContaminationDetector:
     """Detector de contaminação do ambiente"""
@@ -99,16 +119,24 @@ class EnvironmentContaminationDetector:
         
         # Assinaturas de contaminação
         self.contamination_signatures: List[ContaminationSignature] = []
+        self.signature_matcher: Optional[SignatureMatcher] = None
         self.load_contamination_signatures()
+        self.load_signature_file()
         
         # Baseline do sistema
         self.system_baseline: Optional[SystemSnapshot] = None
         self.monitoring_active = False
         self.monitoring_thread: Optional[threading.Thread] = None
         
+        # Snapshots incrementais
+        self.record_store = RecordStore()
+        self.fs_index = DirectoryTreeIndex()
+        self.previous_snapshot: Optional[SystemSnapshot] = None
+        self.last_snapshot_diff: Dict[str, SectionDiff] = {}
+        
         # Cache de detecções
         self.detection_cache: Dict[str, ContaminationDetection] = {}
-        self.whitelist: Set[str] = set()
+        self.whitelist: Set[str] = set(STOCK_WINDOWS_PROCESSES)
         
         # Métricas de performance
         self.performance_history: List[Dict[str, float]] = []
@@ -116,6 +144,7 @@ class EnvironmentContaminationDetector:
         
         # Carregar configurações
         self.load_configuration()
+        self.compile_signatures()
     
     def load_contamination_signatures(self):
         """Carrega assinaturas de contaminação"""
@@ -188,7 +217,8 @@ class EnvironmentContaminationDetector:
                         indicators=sig_data.get('indicators', {}),
                         severity=SeverityLevel(sig_data.get('severity', 'medium')),
                         description=sig_data.get('description', ''),
-                        remediation=sig_data.get('remediation', [])
+                        remediation=sig_data.get('remediation', []),
+                        exclusions=sig_data.get('exclusions', [])
                     )
                     self.contamination_signatures.append(signature)
                 
@@ -197,10 +227,83 @@ class EnvironmentContaminationDetector:
             except Exception as e:
                 self.logger.warning(f"Erro ao carregar configuração: {e}")
     
+    def load_signature_file(self):
+        """Carrega assinaturas por nome de processo de contamination_signatures.yaml"""
+        signature_file = self.config_dir / "contamination_signatures.yaml"
+        if not signature_file.exists():
+            return
+        
+        sections = {
+            'malicious_processes': ContaminationType.MALICIOUS_PROCESS,
+            'conflicting_software': ContaminationType.CONFLICTING_SOFTWARE
+        }
+        
+        try:
+            with open(signature_file, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f) or {}
+            
+            loaded = 0
+            for section, sig_type in sections.items():
+                for sig_data in data.get(section) or []:
+                    # Apenas assinaturas por nome de processo; os demais métodos
+                    # (comportamento, serviços, rede) não são avaliáveis aqui
+                    if sig_data.get('detection_method') != 'process_name':
+                        continue
+                    patterns = [p for p in sig_data.get('patterns') or [] if isinstance(p, str)]
+                    exclusions = sig_data.get('exclusions') or []
+                    if not patterns:
+                        continue
+                    if not all(isinstance(e, str) for e in exclusions):
+                        # Ignorar uma exclusão (ex.: combination) ampliaria a assinatura
+                        self.logger.debug(f"Assinatura {sig_data['name']} ignorada: exclusões não suportadas")
+                        continue
+                    indicators = {}
+                    if sig_type == ContaminationType.CONFLICTING_SOFTWARE:
+                        # Conflito: mais de conflict_threshold programas distintos (padrão: mais de um)
+                        indicators['conflict_count'] = f">{sig_data.get('conflict_threshold', 1)}"
+                    self.contamination_signatures.append(ContaminationSignature(
+                        name=sig_data['name'],
+                        type=sig_type,
+                        patterns=patterns,
+                        indicators=indicators,
+                        severity=SeverityLevel(sig_data.get('severity', 'medium')),
+                        description=sig_data.get('description', ''),
+                        remediation=sig_data.get('remediation', []),
+                        exclusions=exclusions
+                    ))
+                    loaded += 1
+            
+            self.logger.info(f"Assinaturas carregadas de {signature_file.name}: {loaded}")
+            
+        except Exception as e:
+            self.logger.warning(f"Erro ao carregar assinaturas: {e}")
+    
+    def compile_signatures(self):
+        """Compila as assinaturas no matcher (padrões literais e regex combinadas por tipo)"""
+        self.signature_matcher = SignatureMatcher(self.contamination_signatures)
+    
+    def _ensure_signature_matcher(self) -> SignatureMatcher:
+        """Recompila o matcher se contamination_signatures (ou o conteúdo de uma assinatura) mudou"""
+        if (self.signature_matcher is None or
+                self.signature_matcher.fingerprint != signature_fingerprint(self.contamination_signatures)):
+            self.compile_signatures()
+        return self.signature_matcher
+    
     def create_system_baseline(self) -> SystemSnapshot:
         """Cria baseline do sistema"""
         self.logger.info("Criando baseline do sistema...")
         
+        snapshot = self._capture_snapshot()
+        
+        self.system_baseline = snapshot
+        self.previous_snapshot = snapshot
+        self.record_store.retain([snapshot.records])
+        self.logger.info("Baseline do sistema criado")
+        
+        return snapshot
+    
+    def _capture_snapshot(self) -> SystemSnapshot:
+        """Captura o estado atual e o indexa em registros compactos"""
         snapshot = SystemSnapshot(
             timestamp=time.time(),
             processes=self._capture_processes(),
@@ -210,12 +313,46 @@ class EnvironmentContaminationDetector:
             file_system_state=self._capture_file_system_state(),
             performance_metrics=self._capture_performance_metrics()
         )
-        
-        self.system_baseline = snapshot
-        self.logger.info("Baseline do sistema criado")
-        
+        snapshot.records = self._build_snapshot_records(snapshot)
         return snapshot
     
+    def _build_snapshot_records(self, snapshot: SystemSnapshot) -> SnapshotRecords:
+        """
+        Converte o snapshot em registros ordenados e endereçados por conteúdo
+        
+        Campos voláteis (pid, uso de CPU/memória, métricas) ficam de fora para
+        que só mudanças reais apareçam no diff.
+        """
+        processes: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for proc in snapshot.processes:
+            processes[proc.get('name') or ''].append((proc.get('exe') or '', proc.get('exe_hash') or ''))
+        
+        connections = {}
+        for conn in snapshot.network_connections:
+            laddr = conn.get('laddr') or {}
+            raddr = conn.get('raddr') or {}
+            key = f"{laddr.get('ip')}:{laddr.get('port')}>{raddr.get('ip')}:{raddr.get('port')}"
+            connections[key] = {'status': conn.get('status'), 'pid': conn.get('pid')}
+        
+        registry = {}
+        for key_path, values in snapshot.registry_keys.items():
+            for name, data in values.items():
+                registry[f"{key_path}\\{name}"] = data
+        
+        return SnapshotRecords.build(snapshot.timestamp, {
+            'processes': {name: sorted(set(entries)) for name, entries in processes.items()},
+            'network_connections': connections,
+            'environment_variables': snapshot.environment_variables,
+            'registry_keys': registry,
+            'file_system_state': snapshot.file_system_state
+        }, self.record_store)
+    
+    def _snapshot_records(self, snapshot: SystemSnapshot) -> SnapshotRecords:
+        """Registros do snapshot (criados sob demanda para snapshots montados externamente)"""
+        if snapshot.records is None:
+            snapshot.records = self._build_snapshot_records(snapshot)
+        return snapshot.records
+    
     def _capture_processes(self) -> List[Dict[str, Any]]:
         """Captura informações de processos"""
         processes = []
@@ -226,11 +363,6 @@ class EnvironmentContaminationDetector:
                     proc_info = proc.info
                     proc_info['create_time'] = proc.create_time()
                     proc_info['status'] = proc.status()
-                    
-                    # Calcular hash do executável
-                    if proc_info['exe']:
-                        proc_info['exe_hash'] = self._calculate_file_hash(proc_info['exe'])
-                    
                     processes.append(proc_info)
                     
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
@@ -239,6 +371,18 @@ class EnvironmentContaminationDetector:
         except Exception as e:
             self.logger.warning(f"Erro ao capturar processos: {e}")
         
+        # Hash dos executáveis em lote: leitura em blocos e cache por (inode, tamanho, mtime),
+        # de modo que executáveis inalterados custam apenas um stat por ciclo
+        executables = {proc['exe'] for proc in processes if proc.get('exe')}
+        try:
+            hashes = hashing_service.hash_files(executables, 'sha256')
+        except Exception as e:
+            self.logger.warning(f"Erro ao calcular hash dos executáveis: {e}")
+            hashes = {}
+        for proc in processes:
+            if proc.get('exe'):
+                proc['exe_hash'] = hashes.get(proc['exe'], {}).get('sha256')
+        
         return processes
     
     def _capture_network_connections(self) -> List[Dict[str, Any]]:
@@ -319,7 +463,7 @@ class EnvironmentContaminationDetector:
         fs_state = {}
         
         # Verificar diretórios importantes
-        important_dirs = [
+        important_dirs = list(dict.fromkeys([
             os.environ.get('TEMP', ''),
             os.environ.get('TMP', ''),
             os.environ.get('APPDATA', ''),
@@ -327,16 +471,13 @@ class EnvironmentContaminationDetector:
             'C:\\Windows\\System32',
             'C:\\Program Files',
             'C:\\Program Files (x86)'
-        ]
+        ]))
         
         for dir_path in important_dirs:
             if dir_path and os.path.exists(dir_path):
                 try:
-                    fs_state[dir_path] = {
-                        'file_count': self._count_files(dir_path),
-                        'total_size': self._get_directory_size(dir_path),
-                        'last_modified': os.path.getmtime(dir_path)
-                    }
+                    # Subárvores com mtime inalterado são reaproveitadas do índice
+                    fs_state[dir_path] = self.fs_index.scan(dir_path)
                 except Exception as e:
                     self.logger.warning(f"Erro ao analisar diretório {dir_path}: {e}")
         
@@ -365,16 +506,19 @@ class EnvironmentContaminationDetector:
         
         detections = []
         
-        # Capturar estado atual
-        current_snapshot = SystemSnapshot(
-            timestamp=time.time(),
-            processes=self._capture_processes(),
-            network_connections=self._capture_network_connections(),
-            environment_variables=dict(os.environ),
-            registry_keys=self._capture_registry_keys(),
-            file_system_state=self._capture_file_system_state(),
-            performance_metrics=self._capture_performance_metrics()
-        )
+        # Capturar estado atual e comparar com o ciclo anterior
+        current_snapshot = self._capture_snapshot()
+        if self.previous_snapshot is not None:
+            self.last_snapshot_diff = diff_snapshots(
+                self._snapshot_records(self.previous_snapshot), current_snapshot.records
+            )
+            changed = {name: len(d.added) + len(d.removed) + len(d.changed)
+                       for name, d in self.last_snapshot_diff.items() if not d.unchanged}
+            self.logger.debug(f"Alterações desde o último snapshot: {changed}")
+        self.previous_snapshot = current_snapshot
+        self.record_store.retain([
+            self.system_baseline.records if self.system_baseline else None, current_snapshot.records
+        ])
         
         # Análise de processos
         process_detections = self._analyze_processes(current_snapshot.processes)
@@ -419,35 +563,39 @@ class EnvironmentContaminationDetector:
     def _analyze_processes(self, processes: List[Dict[str, Any]]) -> List[ContaminationDetection]:
         """Analisa processos em busca de contaminação"""
         detections = []
+        matcher = self._ensure_signature_matcher()
+        conflicting: Dict[str, Tuple[ContaminationSignature, List[Dict[str, Any]]]] = {}
         
         for proc in processes:
-            proc_name = proc.get('name', '').lower()
+            proc_name = (proc.get('name') or '').lower()
             proc_exe = (proc.get('exe') or '').lower()
             
-            # Verificar contra assinaturas
-            for signature in self.contamination_signatures:
-                if signature.type == ContaminationType.MALICIOUS_PROCESS:
-                    for pattern in signature.patterns:
-                        if self._match_pattern(pattern.lower(), proc_name) or self._match_pattern(pattern.lower(), proc_exe):
-                            # Verificar indicadores adicionais
-                            if self._check_process_indicators(proc, signature.indicators):
-                                detection = ContaminationDetection(
-                                    detection_id=f"proc_{proc.get('pid', 0)}_{signature.name}",
-                                    type=signature.type,
-                                    severity=signature.severity,
-                                    description=f"Processo suspeito detectado: {proc_name} - {signature.description}",
-                                    evidence={
-                                        'process_name': proc_name,
-                                        'process_exe': proc_exe,
-                                        'pid': proc.get('pid'),
-                                        'cpu_percent': proc.get('cpu_percent'),
-                                        'memory_percent': proc.get('memory_percent'),
-                                        'signature_matched': signature.name
-                                    },
-                                    detection_method=DetectionMethod.PROCESS_ANALYSIS,
-                                    remediation_steps=signature.remediation
-                                )
-                                detections.append(detection)
+            # Software conflitante: avaliado no conjunto de processos, após o laço
+            if proc_name not in self.whitelist:
+                for signature in matcher.match(ContaminationType.CONFLICTING_SOFTWARE, proc_name, proc_exe):
+                    conflicting.setdefault(signature.name, (signature, []))[1].append(proc)
+            
+            # Verificar contra assinaturas (já com exclusões aplicadas)
+            for signature in matcher.match(ContaminationType.MALICIOUS_PROCESS, proc_name, proc_exe):
+                # Verificar indicadores adicionais
+                if self._check_process_indicators(proc, signature.indicators):
+                    detection = ContaminationDetection(
+                        detection_id=f"proc_{proc.get('pid', 0)}_{signature.name}",
+                        type=signature.type,
+                        severity=signature.severity,
+                        description=f"Processo suspeito detectado: {proc_name} - {signature.description}",
+                        evidence={
+                            'process_name': proc_name,
+                            'process_exe': proc_exe,
+                            'pid': proc.get('pid'),
+                            'cpu_percent': proc.get('cpu_percent'),
+                            'memory_percent': proc.get('memory_percent'),
+                            'signature_matched': signature.name
+                        },
+                        detection_method=DetectionMethod.PROCESS_ANALYSIS,
+                        remediation_steps=signature.remediation
+                    )
+                    detections.append(detection)
             
             # Verificar processos com alto uso de recursos
             if proc.get('cpu_percent', 0) > 80 and proc.get('memory_percent', 0) > 50:
@@ -466,8 +614,46 @@ class EnvironmentContaminationDetector:
                 )
                 detections.append(detection)
         
+        for signature, matched in conflicting.values():
+            detection = self._conflicting_software_detection(signature, matched)
+            if detection:
+                detections.append(detection)
+        
         return detections
     
+    def _conflicting_software_detection(self, signature: ContaminationSignature,
+                                        processes: List[Dict[str, Any]]) -> Optional[ContaminationDetection]:
+        """Gera a detecção de software conflitante se o número de programas distintos passa do limite"""
+        # Indicadores que a lista de processos não permite verificar (ex.: file_access_blocks)
+        # impedem a detecção em vez de serem ignorados
+        if any(indicator != 'conflict_count' for indicator in signature.indicators):
+            return None
+        
+        names = sorted({(proc.get('name') or '').lower() for proc in processes})
+        texts = names + [(proc.get('exe') or '').lower() for proc in processes]
+        # Cada padrão corresponde a um programa (ex.: "avast*" cobre avastsvc.exe e avastui.exe)
+        programs = [pattern for pattern in signature.patterns
+                    if any(fnmatch.fnmatchcase(text, pattern.lower()) for text in texts if text)]
+        
+        threshold = signature.indicators.get('conflict_count', '>0')
+        if threshold.startswith('>') and len(programs) <= int(threshold[1:]):
+            return None
+        
+        return ContaminationDetection(
+            detection_id=f"conflict_{signature.name}",
+            type=signature.type,
+            severity=signature.severity,
+            description=f"Software conflitante detectado: {', '.join(names)} - {signature.description}",
+            evidence={
+                'process_names': names,
+                'pids': [proc.get('pid') for proc in processes],
+                'programs_matched': programs,
+                'signature_matched': signature.name
+            },
+            detection_method=DetectionMethod.PROCESS_ANALYSIS,
+            remediation_steps=signature.remediation
+        )
+    
     def _analyze_network(self, connections: List[Dict[str, Any]]) -> List[ContaminationDetection]:
         """Analisa conexões de rede"""
         detections = []
@@ -701,14 +887,13 @@ class EnvironmentContaminationDetector:
     def _compare_with_baseline(self, current: SystemSnapshot, baseline: SystemSnapshot) -> List[ContaminationDetection]:
         """Compara snapshot atual com baseline"""
         detections = []
-        
-        # Comparar processos
-        baseline_processes = {proc.get('name', ''): proc for proc in baseline.processes}
-        current_processes = {proc.get('name', ''): proc for proc in current.processes}
+        diff = diff_snapshots(self._snapshot_records(baseline), self._snapshot_records(current))
         
         # Novos processos
-        new_processes = set(current_processes.keys()) - set(baseline_processes.keys())
-        for proc_name in new_processes:
+        new_processes = set(diff['processes'].added)
+        current_processes = {proc.get('name') or '': proc for proc in current.processes
+                             if (proc.get('name') or '') in new_processes}
+        for proc_name in diff['processes'].added:
             if proc_name and not self._is_whitelisted(proc_name):
                 detection = ContaminationDetection(
                     detection_id=f"new_process_{proc_name}",
@@ -724,12 +909,10 @@ class EnvironmentContaminationDetector:
                 )
                 detections.append(detection)
         
-        # Comparar variáveis de ambiente
-        baseline_env = set(baseline.environment_variables.items())
-        current_env = set(current.environment_variables.items())
-        
-        new_env_vars = current_env - baseline_env
-        for var_name, var_value in new_env_vars:
+        # Variáveis de ambiente novas ou alteradas
+        env_diff = diff['environment_variables']
+        for var_name in env_diff.added + env_diff.changed:
+            var_value = current.environment_variables[var_name]
             if not self._is_whitelisted(var_name):
                 detection = ContaminationDetection(
                     detection_id=f"new_env_var_{var_name}",
@@ -763,33 +946,6 @@ class EnvironmentContaminationDetector:
         
         return True
     
-    def _match_pattern(self, pattern: str, text: str) -> bool:
-        """Verifica se texto corresponde ao padrão"""
-        import fnmatch
-        return fnmatch.fnmatch(text, pattern)
-    
-    def _calculate_file_hash(self, file_path: str) -> Optional[str]:
-        """Calcula hash de um arquivo"""
-        try:
-            with open(file_path, 'rb') as f:
-                return hashlib.sha256(f.read()).hexdigest()
-        except Exception:
-            return None
-    
-    def _count_files(self, directory: str) -> int:
-        """Conta arquivos em um diretório"""
-        try:
-            return sum(1 for _ in Path(directory).rglob('*') if _.is_file())
-        except Exception:
-            return 0
-    
-    def _get_directory_size(self, directory: str) -> int:
-        """Obtém tamanho total de um diretório"""
-        try:
-            return sum(f.stat().st_size for f in Path(directory).rglob('*') if f.is_file())
-        except Exception:
-            return 0
-    
     def _filter_detections(self, detections: List[ContaminationDetection]) -> List[ContaminationDetection]:
         """Filtra detecções duplicadas e aplica whitelist"""
         filtered = []
@@ -37,6 +37,7 @@ except ImportError:
     winreg = None
 
 from .detection_base import DetectionStrategy, DetectedApplication, DetectionMethod, ApplicationStatus
+from .version_probe import get_version_probe_service
 
 
 @dataclass
@@ -841,32 +842,19 @@ class EssentialRuntimeDetector:
     
     def _get_executable_version(self, executable_path: str, config: Dict[str, Any]) -> Optional[str]:
         """Get version from executable file."""
-        try:
-            version_command = config.get("version_command")
-            if not version_command:
-                return None
-            
-            # Replace first element with full path
-            command = [executable_path] + version_command[1:]
-            
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=10,
-                creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
-            )
-            
-            if result.returncode == 0:
-                output = result.stdout + result.stderr
-                version_regex = config.get("version_regex")
-                if version_regex:
-                    match = re.search(version_regex, output)
-                    if match:
-                        return match.group(1)
-                        
-        except Exception:
-            pass
+        version_command = config.get("version_command")
+        if not version_command:
+            return None
+        
+        # Replace first element with full path
+        result = get_version_probe_service().probe(executable_path, version_command[1:], timeout=10)
+        
+        if result.ok:
+            version_regex = config.get("version_regex")
+            if version_regex:
+                match = re.search(version_regex, result.output)
+                if match:
+                    return match.group(1)
         
         return None
     
@@ -0,0 +1,254 @@
+"""Índice incremental de arquivos executáveis no sistema de arquivos.
+
+Este módulo substitui varreduras repetidas com ``Path.rglob`` por uma única
+caminhada baseada em ``os.scandir`` por diretório raiz, que encontra todos os
+nomes de arquivo procurados ao mesmo tempo. O resultado é persistido por
+diretório junto com o ``mtime_ns`` do diretório, de modo que execuções
+posteriores só relistam os diretórios que mudaram.
+"""
+
+import json
+import logging
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Extensões de arquivo mantidas no índice
+DEFAULT_INDEXED_EXTENSIONS = (".exe", ".com", ".bat", ".cmd")
+
+# Subárvores que nunca contêm as aplicações procuradas
+DEFAULT_PRUNED_DIRECTORIES = frozenset({
+    "$recycle.bin",
+    "system volume information",
+    "windowsapps",
+    "packages",
+    "temp",
+    "tmp",
+    "cache",
+    "caches",
+    "code cache",
+    "gpucache",
+    "crashpad",
+    "crashdumps",
+    "logs",
+    "node_modules",
+    "__pycache__",
+    ".git",
+    ".svn",
+    ".hg",
+})
+
+# Profundidade máxima a partir de cada raiz
+DEFAULT_MAX_DEPTH = 8
+
+_FILE_ATTRIBUTE_REPARSE_POINT = getattr(stat, "FILE_ATTRIBUTE_REPARSE_POINT", 0x400)
+
+
+class FilesystemIndex:
+    """Índice nome de arquivo -> caminhos com invalidação por mtime de diretório."""
+
+    def __init__(self, cache_file: Optional[Path] = None,
+                 indexed_extensions: Iterable[str] = DEFAULT_INDEXED_EXTENSIONS,
+                 pruned_directories: Iterable[str] = DEFAULT_PRUNED_DIRECTORIES,
+                 max_depth: int = DEFAULT_MAX_DEPTH,
+                 max_workers: int = 4):
+        """Inicializa o índice.
+
+        Args:
+            cache_file: Arquivo JSON de persistência (padrão: cache/filesystem_index.json)
+            indexed_extensions: Extensões de arquivo registradas no índice
+            pruned_directories: Nomes de diretório (minúsculos) que não são percorridos
+            max_depth: Profundidade máxima da caminhada a partir de cada raiz
+            max_workers: Número de raízes percorridas em paralelo
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_file = cache_file or Path.cwd() / "cache" / "filesystem_index.json"
+        self.indexed_extensions = tuple(ext.lower() for ext in indexed_extensions)
+        self.pruned_directories = frozenset(name.lower() for name in pruned_directories)
+        self.max_depth = max_depth
+        self.max_workers = max(1, max_workers)
+
+        # raiz -> diretório -> [mtime_ns, subdiretórios, arquivos indexados]
+        self._roots: Dict[str, Dict[str, list]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        self.metrics = {"directories_listed": 0, "directories_reused": 0}
+
+    def find(self, roots: Iterable[Path], basenames: Iterable[str]) -> Dict[Path, Dict[str, List[Path]]]:
+        """Procura vários nomes de arquivo em várias raízes.
+
+        As raízes são percorridas em paralelo, uma única vez cada.
+
+        Args:
+            roots: Diretórios raiz
+            basenames: Nomes de arquivo procurados (comparação sem distinção de maiúsculas)
+
+        Returns:
+            Dicionário raiz -> {nome em minúsculas: [caminhos encontrados]}
+        """
+        wanted = {name.lower() for name in basenames}
+        unsupported = {name for name in wanted if not name.endswith(self.indexed_extensions)}
+        if unsupported:
+            self.logger.debug(f"Nomes fora das extensões indexadas ignorados: {sorted(unsupported)}")
+            wanted -= unsupported
+
+        existing_roots = [Path(root) for root in roots if Path(root).is_dir()]
+        if not wanted or not existing_roots:
+            return {root: {} for root in existing_roots}
+
+        self._ensure_loaded()
+
+        if len(existing_roots) == 1:
+            results = {existing_roots[0]: self._scan_root(existing_roots[0], wanted)}
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(existing_roots)),
+                                    thread_name_prefix="fs-index") as executor:
+                futures = {root: executor.submit(self._scan_root, root, wanted)
+                           for root in existing_roots}
+                results = {root: future.result() for root, future in futures.items()}
+
+        self.save()
+        return results
+
+    def invalidate(self, root: Optional[Path] = None):
+        """Descarta o índice de uma raiz (ou de todas)."""
+        self._ensure_loaded()
+        with self._lock:
+            if root is None:
+                self._roots.clear()
+            else:
+                self._roots.pop(self._root_key(Path(root)), None)
+            self._dirty = True
+
+    def save(self):
+        """Persiste o índice se houver alterações."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": 1, "extensions": list(self.indexed_extensions), "roots": self._roots}
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = self.cache_file.with_suffix(".tmp")
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(temp_file, self.cache_file)
+                self._dirty = False
+            except Exception as e:
+                self.logger.warning(f"Erro ao salvar índice do sistema de arquivos: {e}")
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self.cache_file.exists():
+                return
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # Índice gerado com outras extensões não é confiável
+                if data.get("version") == 1 and tuple(data.get("extensions", ())) == self.indexed_extensions:
+                    self._roots = data.get("roots", {})
+            except Exception as e:
+                self.logger.warning(f"Erro ao carregar índice do sistema de arquivos: {e}")
+
+    @staticmethod
+    def _root_key(root: Path) -> str:
+        return os.path.normcase(os.path.abspath(str(root)))
+
+    def _scan_root(self, root: Path, wanted: Set[str]) -> Dict[str, List[Path]]:
+        """Percorre uma raiz reaproveitando diretórios inalterados."""
+        key = self._root_key(root)
+        with self._lock:
+            previous = self._roots.get(key, {})
+        current: Dict[str, list] = {}
+        matches: Dict[str, List[Path]] = {}
+        listed = reused = 0
+
+        stack: List[Tuple[str, int]] = [(str(root), 0)]
+        while stack:
+            directory, depth = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            record = previous.get(directory)
+            if record is not None and record[0] == mtime_ns:
+                subdirs, files = record[1], record[2]
+                reused += 1
+            else:
+                subdirs, files = self._list_directory(directory)
+                listed += 1
+            current[directory] = [mtime_ns, subdirs, files]
+
+            for name in files:
+                lower = name.lower()
+                if lower in wanted:
+                    matches.setdefault(lower, []).append(Path(directory) / name)
+
+            if depth < self.max_depth:
+                # Ordem reversa para que a pilha visite na ordem de listagem
+                for name in reversed(subdirs):
+                    stack.append((os.path.join(directory, name), depth + 1))
+
+        with self._lock:
+            if current != previous:
+                self._roots[key] = current
+                self._dirty = True
+            self.metrics["directories_listed"] += listed
+            self.metrics["directories_reused"] += reused
+
+        return matches
+
+    def _list_directory(self, directory: str) -> Tuple[List[str], List[str]]:
+        """Lista subdiretórios relevantes e arquivos indexados de um diretório."""
+        subdirs: List[str] = []
+        files: List[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() in self.pruned_directories or self._is_link(entry):
+                                continue
+                            subdirs.append(entry.name)
+                        elif entry.name.lower().endswith(self.indexed_extensions) and entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            self.logger.debug(f"Não foi possível listar {directory}: {e}")
+        return subdirs, files
+
+    @staticmethod
+    def _is_link(entry: os.DirEntry) -> bool:
+        """Detecta links simbólicos e junções (evita ciclos como 'Application Data')."""
+        if entry.is_symlink():
+            return True
+        is_junction = getattr(entry, "is_junction", None)
+        if is_junction is not None and is_junction():
+            return True
+        try:
+            attributes = getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+        except OSError:
+            return False
+        return bool(attributes & _FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+# Instância global do índice
+_index_instance: Optional[FilesystemIndex] = None
+
+
+def get_filesystem_index() -> FilesystemIndex:
+    """Retorna a instância global do índice do sistema de arquivos."""
+    global _index_instance
+    if _index_instance is None:
+        _index_instance = FilesystemIndex()
+    return _index_instance
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Agendador de instalação orientado a dependências
+Executa cada componente por uma sequência de estágios (rede, disco, CPU)
+assim que as suas próprias dependências terminam, sem barreiras por nível.
+Estágios que não dependem das dependências (ex.: download) são adiantados,
+de modo que artefatos do nível N+1 são baixados enquanto o nível N instala.
+"""
+
+import logging
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Função de estágio: (componente, saída do estágio anterior) -> (sucesso, saída)
+StageFunction = Callable[[str, Any], Tuple[bool, Any]]
+
+
+@dataclass
+class SchedulerStage:
+    """Estágio do pipeline de instalação com limite próprio de concorrência"""
+    name: str
+    function: StageFunction
+    max_workers: int = 1
+    wait_for_dependencies: bool = True
+
+
+@dataclass
+class ComponentSchedule:
+    """Tempos de um componente no agendamento (segundos desde o início do lote)"""
+    stage_times: Dict[str, float] = field(default_factory=dict)
+    queue_waits: Dict[str, float] = field(default_factory=dict)
+    dependency_wait: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    blocked_by: Optional[str] = None
+
+    @property
+    def queue_wait(self) -> float:
+        """Tempo total aguardando vaga nos estágios"""
+        return sum(self.queue_waits.values())
+
+
+@dataclass
+class ScheduleReport:
+    """Resultado da execução do agendador"""
+    completed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    schedules: Dict[str, ComponentSchedule] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_time: float = 0.0
+    total_time: float = 0.0
+    stopped: bool = False
+
+
+class DependencyScheduler:
+    """
+    Agendador em fila de prontos sobre o DAG de dependências.
+
+    Cada estágio tem o seu próprio pool de threads, de modo que downloads,
+    escrita em disco e verificação não disputam a mesma vaga. Um componente
+    entra num estágio com ``wait_for_dependencies`` apenas depois que todas
+    as suas dependências passaram por todos os estágios; dependentes de um
+    componente que falhou são pulados.
+    """
+
+    def __init__(self, stages: List[SchedulerStage]):
+        if not stages:
+            raise ValueError("O agendador precisa de pelo menos um estágio")
+        self.stages = stages
+
+    def run(self, graph: Dict[str, List[str]], order: Optional[List[str]] = None,
+            should_stop: Optional[Callable[[str, Any], bool]] = None) -> ScheduleReport:
+        """
+        Executa o pipeline para todos os componentes do grafo
+
+        Args:
+            graph: Mapa componente -> dependências (fora do grafo são ignoradas)
+            order: Prioridade de submissão (padrão: ordem do grafo)
+            should_stop: Chamado com (componente, saída) a cada falha; se
+                retornar True, nada novo é iniciado e o restante é pulado
+
+        Returns:
+            ScheduleReport: Componentes concluídos, falhos e pulados, com tempos
+        """
+        components = list(order) if order else list(graph)
+        for component in graph:
+            if component not in components:
+                components.append(component)
+
+        dependencies = {c: [d for d in graph.get(c, []) if d in graph and d != c] for c in components}
+        dependents: Dict[str, List[str]] = {c: [] for c in components}
+        for component, deps in dependencies.items():
+            for dep in deps:
+                dependents[dep].append(component)
+
+        report = ScheduleReport()
+        report.schedules = {c: ComponentSchedule() for c in components}
+        remaining_deps = {c: len(dependencies[c]) for c in components}
+        next_stage = {c: 0 for c in components}
+        values: Dict[str, Any] = {c: None for c in components}
+        ready_at: Dict[str, float] = {}
+        parked: set = set()
+        finished: set = set()
+        pending: Dict[Future, str] = {}
+        events: "queue.Queue[Tuple[str, int, Future]]" = queue.Queue()
+        stopping = False
+
+        batch_start = time.perf_counter()
+
+        def now() -> float:
+            return time.perf_counter() - batch_start
+
+        executors = {
+            stage.name: ThreadPoolExecutor(max_workers=max(1, stage.max_workers),
+                                           thread_name_prefix=f"install-{stage.name}")
+            for stage in self.stages
+        }
+
+        def run_stage(stage: SchedulerStage, component: str, value: Any, submitted_at: float):
+            started_at = now()
+            try:
+                ok, output = stage.function(component, value)
+            except Exception as e:
+                logger.error(f"Erro no estágio {stage.name} de {component}: {e}")
+                ok, output = False, e
+            return ok, output, started_at - submitted_at, started_at, now()
+
+        def advance(component: str) -> None:
+            """Submete o próximo estágio do componente, se possível"""
+            if stopping or component in finished:
+                return
+            index = next_stage[component]
+            stage = self.stages[index]
+            if stage.wait_for_dependencies and remaining_deps[component] > 0:
+                ready_at.setdefault(component, now())
+                parked.add(component)
+                return
+            parked.discard(component)
+
+            schedule = report.schedules[component]
+            if stage.wait_for_dependencies and component in ready_at:
+                schedule.dependency_wait += now() - ready_at.pop(component)
+
+            future = executors[stage.name].submit(run_stage, stage, component, values[component], now())
+            pending[future] = component
+            future.add_done_callback(lambda f, c=component, i=index: events.put((c, i, f)))
+
+        def skip_dependents(component: str) -> None:
+            stack = list(dependents[component])
+            while stack:
+                dependent = stack.pop()
+                if dependent in finished:
+                    continue
+                finished.add(dependent)
+                parked.discard(dependent)
+                report.skipped.append(dependent)
+                stack.extend(dependents[dependent])
+
+        def stop_all() -> None:
+            for future in list(pending):
+                future.cancel()
+
+        try:
+            for component in components:
+                advance(component)
+
+            while pending:
+                component, index, future = events.get()
+                pending.pop(future, None)
+                if future.cancelled():
+                    continue
+
+                ok, output, queue_wait, started_at, finished_at = future.result()
+                stage = self.stages[index]
+                schedule = report.schedules[component]
+                schedule.queue_waits[stage.name] = queue_wait
+                schedule.stage_times[stage.name] = finished_at - started_at
+                if schedule.started_at is None:
+                    schedule.started_at = started_at
+                values[component] = output
+
+                if component in finished:
+                    # Pulado enquanto o estágio já estava em andamento
+                    continue
+
+                if not ok:
+                    schedule.finished_at = finished_at
+                    finished.add(component)
+                    report.failed.append(component)
+                    report.outputs[component] = output
+                    skip_dependents(component)
+                    if should_stop and should_stop(component, output):
+                        logger.warning(f"Falha crítica em {component}: interrompendo agendamento")
+                        stopping = True
+                        report.stopped = True
+                        stop_all()
+                    continue
+
+                next_stage[component] = index + 1
+                if next_stage[component] < len(self.stages):
+                    advance(component)
+                    continue
+
+                schedule.finished_at = finished_at
+                finished.add(component)
+                report.completed.append(component)
+                report.outputs[component] = output
+                for dependent in dependents[component]:
+                    remaining_deps[dependent] -= 1
+                    if dependent in parked and remaining_deps[dependent] == 0:
+                        # A última dependência a terminar é a que o segurou
+                        report.schedules[dependent].blocked_by = component
+                        advance(dependent)
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+
+        for component in components:
+            if component not in finished:
+                report.skipped.append(component)
+
+        report.total_time = now()
+        report.critical_path, report.critical_path_time = self._critical_path(report)
+        return report
+
+    @staticmethod
+    def _critical_path(report: ScheduleReport) -> Tuple[List[str], float]:
+        """
+        Cadeia de componentes que determinou o fim do lote: parte do último a
+        terminar e segue, para trás, a dependência que o manteve esperando.
+        """
+        finished = [(s.finished_at, c) for c, s in report.schedules.items() if s.finished_at is not None]
+        if not finished:
+            return [], 0.0
+        end_time, component = max(finished)
+        path = []
+        while component is not None and component not in path:
+            path.append(component)
+            component = report.schedules[component].blocked_by
+        path.reverse()
+        return path, end_time
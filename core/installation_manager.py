@@ -14,12 +14,11 @@ import json
 import threading
 import time
 from pathlib import Path
-from typing import Dict, Optional, Tuple, List, Any, Set
+from typing import Dict, Optional, Tuple, List, Any, Set, Union
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 try:
     import networkx as nx
@@ -34,6 +33,8 @@ from utils.permission_checker import is_admin, check_write_permission
 from core.error_handler import EnvDevError, ErrorSeverity, ErrorCategory
 from core.download_manager import DownloadManager
 from core.preparation_manager import PreparationManager
+from core.install_scheduler import DependencyScheduler, SchedulerStage
+from core.conflict_index import ConflictIndex
 
 logger = logging.getLogger(__name__)
 
@@ -134,6 +135,21 @@ class BatchInstallationResult:
     detected_conflicts: List[ConflictInfo] = field(default_factory=list)
     recovery_attempts: Dict[str, int] = field(default_factory=dict)
     parallel_installations: int = 0
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_time: float = 0.0
+    queue_wait_times: Dict[str, float] = field(default_factory=dict)
+
+@dataclass
+class StagedInstallation:
+    """Estado de um componente entre os estágios de download, instalação e verificação"""
+    component: str
+    start_time: datetime
+    component_data: Dict
+    file_path: Optional[str] = None
+    rollback_info: Optional[RollbackInfo] = None
+
+# Saída de um estágio: estado para o próximo estágio ou resultado final
+StageOutput = Union[StagedInstallation, InstallationResult]
 
 class InstallationStrategy(ABC):
     """Estratégia base para instalação"""
@@ -341,6 +357,10 @@ class InstallationManager:
         self.installation_states: Dict[str, InstallationState] = {}
         self.rollback_registry: Dict[str, RollbackInfo] = {}
         
+        # Índice incremental de conflitos entre componentes
+        self.conflict_index = ConflictIndex()
+        self._conflict_index_lock = threading.Lock()
+        
         # Diretório para armazenar informações de rollback
         self.rollback_dir = os.path.join(self.base_path, "rollback")
         os.makedirs(self.rollback_dir, exist_ok=True)
@@ -356,113 +376,14 @@ class InstallationManager:
             InstallationResult: Resultado da instalação
         """
         start_time = datetime.now()
-        self.logger.info(f"Iniciando instalação do componente: {component}")
-        
-        # Cria estado da instalação
-        state = InstallationState(
-            component=component,
-            status=InstallationStatus.PREPARING
-        )
-        self.installation_states[component] = state
         
         try:
-            # 1. Prepara ambiente
-            state.status = InstallationStatus.PREPARING
-            state.current_step = "Preparando ambiente"
-            prep_result = self.preparation_manager.prepare_environment([component])
-            
-            if not prep_result.status.value == "completed":
-                return self._handle_installation_failure(
-                    component, "Falha na preparação do ambiente", 
-                    prep_result.errors, start_time
-                )
-            
-            # 2. Carrega configuração do componente
-            component_data = self._load_component_config(component)
-            if not component_data:
-                return self._handle_installation_failure(
-                    component, f"Configuração do componente {component} não encontrada", 
-                    [], start_time
-                )
-            
-            # 3. Cria informações de rollback
-            rollback_info = self._create_rollback_info(component)
-            state.rollback_info = rollback_info
-            
-            # 4. Download do componente
-            state.status = InstallationStatus.DOWNLOADING
-            state.current_step = "Baixando componente"
-            file_path = self._download_component(component_data)
-            
-            if not file_path:
-                return self._handle_installation_failure(
-                    component, "Falha no download do componente", 
-                    [], start_time
-                )
-            
-            # 5. Executa instalação
-            state.status = InstallationStatus.INSTALLING
-            state.current_step = "Instalando componente"
-            
-            strategy = self._get_strategy(component_data)
-            if not strategy:
-                return self._handle_installation_failure(
-                    component, "Método de instalação não suportado", 
-                    [component_data.get('install_method', 'unknown')], start_time
-                )
-            
-            # Instala com monitoramento para rollback
-            install_result = self._install_with_rollback_tracking(
-                strategy, file_path, component_data, rollback_info
-            )
-            
-            if not install_result.success:
-                # Executa rollback automático
-                self._perform_rollback(rollback_info)
-                return self._handle_installation_failure(
-                    component, install_result.message, 
-                    [install_result.details], start_time
-                )
-            
-            # 6. Verificação pós-instalação
-            state.status = InstallationStatus.VERIFYING
-            state.current_step = "Verificando instalação"
-            
-            verification_result = self.verify_installation(component)
-            if not verification_result.success:
-                # Executa rollback automático
-                self._perform_rollback(rollback_info)
-                return self._handle_installation_failure(
-                    component, "Falha na verificação pós-instalação", 
-                    [verification_result.details], start_time
-                )
-            
-            # 7. Finaliza instalação
-            state.status = InstallationStatus.COMPLETED
-            state.end_time = datetime.now()
-            
-            # Salva informações de rollback para uso futuro
-            self._save_rollback_info(rollback_info)
-            
-            installation_time = (state.end_time - start_time).total_seconds()
-            
-            self.logger.info(f"Instalação de {component} concluída com sucesso em {installation_time:.2f}s")
-            
-            return InstallationResult(
-                success=True,
-                status=InstallationStatus.COMPLETED,
-                message=f"Componente {component} instalado com sucesso",
-                details={
-                    'component': component,
-                    'installation_time': installation_time,
-                    'verification': verification_result.details
-                },
-                installed_path=verification_result.installed_path,
-                version=verification_result.version,
-                rollback_info=rollback_info,
-                installation_time=installation_time,
-                verification_result=verification_result.details
-            )
+            ok, staged = self._stage_download(component, start_time)
+            if ok:
+                ok, staged = self._stage_install(staged)
+            if ok:
+                ok, staged = self._stage_verify(staged)
+            return staged
             
         except Exception as e:
             # Executa rollback em caso de erro crítico
@@ -474,16 +395,153 @@ class InstallationManager:
                 [str(e)], start_time
             )
     
+    def _stage_download(self, component: str, start_time: datetime) -> Tuple[bool, StageOutput]:
+        """Estágio de rede: prepara ambiente, carrega configuração e baixa o componente"""
+        self.logger.info(f"Iniciando instalação do componente: {component}")
+        
+        # Cria estado da instalação
+        state = InstallationState(
+            component=component,
+            status=InstallationStatus.PREPARING
+        )
+        self.installation_states[component] = state
+        
+        # 1. Prepara ambiente
+        state.current_step = "Preparando ambiente"
+        prep_result = self.preparation_manager.prepare_environment([component])
+        
+        if not prep_result.status.value == "completed":
+            return False, self._handle_installation_failure(
+                component, "Falha na preparação do ambiente", 
+                prep_result.errors, start_time
+            )
+        
+        # 2. Carrega configuração do componente
+        component_data = self._load_component_config(component)
+        if not component_data:
+            return False, self._handle_installation_failure(
+                component, f"Configuração do componente {component} não encontrada", 
+                [], start_time
+            )
+        
+        # 3. Download do componente
+        state.status = InstallationStatus.DOWNLOADING
+        state.current_step = "Baixando componente"
+        file_path = self._download_component(component_data)
+        
+        if not file_path:
+            return False, self._handle_installation_failure(
+                component, "Falha no download do componente", 
+                [], start_time
+            )
+        
+        return True, StagedInstallation(
+            component=component,
+            start_time=start_time,
+            component_data=component_data,
+            file_path=file_path
+        )
+    
+    def _stage_install(self, staged: StagedInstallation) -> Tuple[bool, StageOutput]:
+        """Estágio de disco: executa a estratégia de instalação com tracking para rollback"""
+        component = staged.component
+        state = self.installation_states[component]
+        
+        # 4. Cria informações de rollback
+        rollback_info = self._create_rollback_info(component)
+        state.rollback_info = rollback_info
+        staged.rollback_info = rollback_info
+        
+        # 5. Executa instalação
+        state.status = InstallationStatus.INSTALLING
+        state.current_step = "Instalando componente"
+        
+        strategy = self._get_strategy(staged.component_data)
+        if not strategy:
+            return False, self._handle_installation_failure(
+                component, "Método de instalação não suportado", 
+                [staged.component_data.get('install_method', 'unknown')], staged.start_time
+            )
+        
+        # Instala com monitoramento para rollback
+        install_result = self._install_with_rollback_tracking(
+            strategy, staged.file_path, staged.component_data, rollback_info
+        )
+        
+        if not install_result.success:
+            # Executa rollback automático
+            self._perform_rollback(rollback_info)
+            return False, self._handle_installation_failure(
+                component, install_result.message, 
+                [install_result.details], staged.start_time
+            )
+        
+        return True, staged
+    
+    def _stage_verify(self, staged: StagedInstallation) -> Tuple[bool, StageOutput]:
+        """Estágio de CPU: verificação pós-instalação e finalização"""
+        component = staged.component
+        state = self.installation_states[component]
+        rollback_info = staged.rollback_info
+        
+        # 6. Verificação pós-instalação
+        state.status = InstallationStatus.VERIFYING
+        state.current_step = "Verificando instalação"
+        
+        verification_result = self.verify_installation(component)
+        if not verification_result.success:
+            # Executa rollback automático
+            self._perform_rollback(rollback_info)
+            return False, self._handle_installation_failure(
+                component, "Falha na verificação pós-instalação", 
+                [verification_result.details], staged.start_time
+            )
+        
+        # 7. Finaliza instalação
+        state.status = InstallationStatus.COMPLETED
+        state.end_time = datetime.now()
+        
+        # Salva informações de rollback para uso futuro
+        self._save_rollback_info(rollback_info)
+        
+        installation_time = (state.end_time - staged.start_time).total_seconds()
+        
+        self.logger.info(f"Instalação de {component} concluída com sucesso em {installation_time:.2f}s")
+        
+        return True, InstallationResult(
+            success=True,
+            status=InstallationStatus.COMPLETED,
+            message=f"Componente {component} instalado com sucesso",
+            details={
+                'component': component,
+                'installation_time': installation_time,
+                'verification': verification_result.details
+            },
+            installed_path=verification_result.installed_path,
+            version=verification_result.version,
+            rollback_info=rollback_info,
+            installation_time=installation_time,
+            verification_result=verification_result.details
+        )
+    
     def install_multiple(self, components: List[str], max_parallel: int = 3, 
-                        enable_recovery: bool = True) -> BatchInstallationResult:
+                        enable_recovery: bool = True,
+                        max_parallel_downloads: Optional[int] = None,
+                        max_parallel_verifications: Optional[int] = None) -> BatchInstallationResult:
         """
         Instala múltiplos componentes com resolução automática de dependências,
         instalação paralela inteligente e recovery automático
         
+        Cada componente é instalado assim que as suas próprias dependências
+        terminam (sem barreira por nível), e os downloads são adiantados
+        enquanto componentes anteriores ainda estão instalando.
+        
         Args:
             components: Lista de componentes para instalar
-            max_parallel: Número máximo de instalações paralelas
+            max_parallel: Número máximo de instalações paralelas (estágio de disco)
             enable_recovery: Habilita recovery automático de falhas
+            max_parallel_downloads: Downloads simultâneos (padrão: max_parallel)
+            max_parallel_verifications: Verificações simultâneas (padrão: max_parallel)
             
         Returns:
             BatchInstallationResult: Resultado da instalação em lote
@@ -522,37 +580,55 @@ class InstallationManager:
             
             self.logger.info(f"Grupos de instalação paralela criados: {len(parallel_groups)}")
             
-            # 4. Instala componentes por grupos com paralelização
-            for group_idx, group in enumerate(parallel_groups):
-                self.logger.info(f"Processando grupo {group_idx + 1}/{len(parallel_groups)}: {group.components}")
-                
-                if group.can_install_parallel and len(group.components) > 1:
-                    # Instalação paralela
-                    group_result = self._install_group_parallel(
-                        group, max_parallel, enable_recovery, result
-                    )
-                else:
-                    # Instalação sequencial
-                    group_result = self._install_group_sequential(
-                        group, enable_recovery, result
+            # 4. Instala componentes pelo agendador de dependências
+            dependency_graph = self._build_dependency_graph(components)
+            scheduler = self._create_installation_scheduler(
+                max_parallel,
+                max_parallel_downloads or max_parallel,
+                max_parallel_verifications or max_parallel,
+                enable_recovery, result,
+                serial_locks=self._create_serial_locks(parallel_groups)
+            )
+            report = scheduler.run(
+                dependency_graph,
+                order=result.dependency_order,
+                should_stop=lambda component, output: (
+                    isinstance(output, InstallationResult) and self._is_critical_failure(output)
+                )
+            )
+            
+            for component in report.completed:
+                result.completed_components.append(component)
+                result.installation_results[component] = report.outputs[component]
+            for component in report.failed:
+                output = report.outputs[component]
+                if not isinstance(output, InstallationResult):
+                    output = InstallationResult(
+                        success=False,
+                        status=InstallationStatus.FAILED,
+                        message=f"Erro na instalação: {output}",
+                        details={'error': str(output)}
                     )
+                result.failed_components.append(component)
+                result.installation_results[component] = output
+                self.logger.error(f"Falha na instalação de {component}: {output.message}")
+            result.skipped_components.extend(report.skipped)
+            
+            result.critical_path = report.critical_path
+            result.critical_path_time = report.critical_path_time
+            result.queue_wait_times = {
+                component: schedule.queue_wait for component, schedule in report.schedules.items()
+            }
+            
+            if report.stopped:
+                self.logger.warning("Parando instalação devido a falhas críticas")
                 
-                # Verifica se deve continuar
-                if not group_result and self._has_critical_failures(result):
-                    self.logger.warning("Parando instalação devido a falhas críticas")
-                    
-                    # Marca componentes restantes como pulados
-                    remaining_groups = parallel_groups[group_idx + 1:]
-                    for remaining_group in remaining_groups:
-                        result.skipped_components.extend(remaining_group.components)
-                    
-                    # Executa rollback se necessário
-                    if enable_recovery:
-                        result.rollback_performed = True
-                        result.rollback_results = self._rollback_batch_installation(
-                            result.completed_components
-                        )
-                    break
+                # Executa rollback se necessário
+                if enable_recovery:
+                    result.rollback_performed = True
+                    result.rollback_results = self._rollback_batch_installation(
+                        result.completed_components
+                    )
             
             # 5. Calcula resultado final
             end_time = datetime.now()
@@ -567,7 +643,9 @@ class InstallationManager:
                 f"{len(result.completed_components)} sucessos, "
                 f"{len(result.failed_components)} falhas, "
                 f"{len(result.skipped_components)} pulados, "
-                f"{result.parallel_installations} instalações paralelas"
+                f"{result.parallel_installations} instalações paralelas, "
+                f"caminho crítico {' -> '.join(result.critical_path)} "
+                f"({result.critical_path_time:.2f}s)"
             )
             
             return result
@@ -1110,109 +1188,69 @@ class InstallationManager:
         """
         Detecta conflitos entre componentes
         
+        Usa o índice de conflitos: apenas pares que se declaram em conflito ou
+        compartilham recursos/software base são examinados.
+        
         Args:
             components: Lista de componentes para verificar
             
         Returns:
             List[ConflictInfo]: Lista de conflitos detectados
         """
-        conflicts = []
-        
         try:
-            # Carrega configurações de todos os componentes
-            component_configs = {}
-            for component in components:
-                config = self._load_component_config(component)
-                if config:
-                    component_configs[component] = config
-            
-            # Verifica conflitos entre pares de componentes
-            for i, comp1 in enumerate(components):
-                for comp2 in components[i+1:]:
-                    conflict = self._check_component_pair_conflict(
-                        comp1, comp2, component_configs
-                    )
-                    if conflict:
-                        conflicts.append(conflict)
+            with self._conflict_index_lock:
+                # Reindexa apenas componentes cuja configuração mudou
+                for component in components:
+                    self.conflict_index.update(component, self._load_component_config(component))
+                pair_conflicts = self.conflict_index.find_conflicts(components)
             
-            return conflicts
+            return [
+                self._conflict_info_from_pair(pair.component1, pair.component2,
+                                              pair.conflict_type, pair.resources)
+                for pair in pair_conflicts
+            ]
             
         except Exception as e:
             self.logger.error(f"Erro na detecção de conflitos: {e}")
             return []
     
-    def _check_component_pair_conflict(self, comp1: str, comp2: str, 
-                                     configs: Dict[str, Dict]) -> Optional[ConflictInfo]:
-        """Verifica conflito entre dois componentes específicos"""
-        try:
-            config1 = configs.get(comp1, {})
-            config2 = configs.get(comp2, {})
-            
-            # Verifica conflitos explícitos
-            conflicts1 = config1.get('conflicts', [])
-            conflicts2 = config2.get('conflicts', [])
-            
-            if comp2 in conflicts1 or comp1 in conflicts2:
-                return ConflictInfo(
-                    component1=comp1,
-                    component2=comp2,
-                    conflict_type="explicit",
-                    description=f"Conflito explícito entre {comp1} e {comp2}",
-                    severity="critical",
-                    resolution_suggestion="Escolha apenas um dos componentes"
-                )
-            
-            # Verifica conflitos de arquivo/diretório
-            paths1 = set(config1.get('install_paths', []))
-            paths2 = set(config2.get('install_paths', []))
-            
-            if paths1.intersection(paths2):
-                common_paths = paths1.intersection(paths2)
-                return ConflictInfo(
-                    component1=comp1,
-                    component2=comp2,
-                    conflict_type="path",
-                    description=f"Conflito de caminhos: {list(common_paths)}",
-                    severity="warning",
-                    resolution_suggestion="Verifique se os componentes podem coexistir"
-                )
-            
-            # Verifica conflitos de versão
-            if self._check_version_conflict(config1, config2):
-                return ConflictInfo(
-                    component1=comp1,
-                    component2=comp2,
-                    conflict_type="version",
-                    description=f"Conflito de versões entre {comp1} e {comp2}",
-                    severity="warning",
-                    resolution_suggestion="Verifique compatibilidade de versões"
-                )
-            
-            return None
-            
-        except Exception as e:
-            self.logger.error(f"Erro ao verificar conflito entre {comp1} e {comp2}: {e}")
-            return None
-    
-    def _check_version_conflict(self, config1: Dict, config2: Dict) -> bool:
-        """Verifica conflitos de versão entre dois componentes"""
-        try:
-            # Verifica se ambos modificam o mesmo software base
-            base1 = config1.get('base_software')
-            base2 = config2.get('base_software')
-            
-            if base1 and base2 and base1 == base2:
-                version1 = config1.get('version', '')
-                version2 = config2.get('version', '')
-                
-                # Se versões são diferentes, pode haver conflito
-                if version1 and version2 and version1 != version2:
-                    return True
-            
-            return False
-            
-        except Exception:
-            return False
+    def _conflict_info_from_pair(self, comp1: str, comp2: str, conflict_type: str,
+                                 resources: List[str]) -> ConflictInfo:
+        """Cria ConflictInfo para um conflito encontrado pelo índice"""
+        if conflict_type == "explicit":
+            return ConflictInfo(
+                component1=comp1,
+                component2=comp2,
+                conflict_type="explicit",
+                description=f"Conflito explícito entre {comp1} e {comp2}",
+                severity="critical",
+                resolution_suggestion="Escolha apenas um dos componentes"
+            )
+        
+        if conflict_type == "version":
+            return ConflictInfo(
+                component1=comp1,
+                component2=comp2,
+                conflict_type="version",
+                description=f"Conflito de versões entre {comp1} e {comp2}",
+                severity="warning",
+                resolution_suggestion="Verifique compatibilidade de versões"
+            )
+        
+        descriptions = {
+            "path": "Conflito de caminhos",
+            "port": "Conflito de portas",
+            "env_var": "Conflito de variáveis de ambiente",
+            "path_entry": "Conflito de entradas no PATH",
+        }
+        return ConflictInfo(
+            component1=comp1,
+            component2=comp2,
+            conflict_type=conflict_type,
+            description=f"{descriptions.get(conflict_type, 'Conflito de recursos')}: {resources}",
+            severity="warning",
+            resolution_suggestion="Verifique se os componentes podem coexistir"
+        )
     
     def _create_parallel_installation_groups(self, components: List[str]) -> List[ParallelInstallationGroup]:
         """
@@ -1251,14 +1289,13 @@ class InstallationManager:
             
         except Exception as e:
             self.logger.error(f"Erro ao criar grupos paralelos: {e}")
-            # Fallback: cria grupos sequenciais
+            # Fallback: um único grupo sequencial, na ordem recebida
             return [
                 ParallelInstallationGroup(
-                    components=[comp],
-                    level=i,
+                    components=list(components),
+                    level=0,
                     can_install_parallel=False
                 )
-                for i, comp in enumerate(components)
             ]
     
     def _build_dependency_graph(self, components: List[str]) -> Dict[str, List[str]]:
@@ -1325,91 +1362,69 @@ class InstallationManager:
             self.logger.error(f"Erro ao verificar paralelização: {e}")
             return False
     
-    def _install_group_parallel(self, group: ParallelInstallationGroup, 
-                              max_parallel: int, enable_recovery: bool,
-                              result: BatchInstallationResult) -> bool:
-        """Instala grupo de componentes em paralelo"""
-        try:
-            self.logger.info(f"Instalação paralela de {len(group.components)} componentes")
-            
-            # Limita paralelismo
-            max_workers = min(max_parallel, len(group.components))
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submete tarefas de instalação
-                future_to_component = {
-                    executor.submit(self._install_component_with_recovery, comp, enable_recovery, result): comp
-                    for comp in group.components
-                }
-                
-                # Processa resultados conforme completam
-                group_success = True
-                for future in as_completed(future_to_component):
-                    component = future_to_component[future]
-                    
-                    try:
-                        install_result = future.result()
-                        result.installation_results[component] = install_result
-                        
-                        if install_result.success:
-                            result.completed_components.append(component)
-                            self.logger.info(f"Instalação paralela de {component} bem-sucedida")
-                        else:
-                            result.failed_components.append(component)
-                            group_success = False
-                            self.logger.error(f"Falha na instalação paralela de {component}: {install_result.message}")
-                            
-                    except Exception as e:
-                        self.logger.error(f"Erro na instalação paralela de {component}: {e}")
-                        result.failed_components.append(component)
-                        group_success = False
-                        
-                        # Cria resultado de erro
-                        result.installation_results[component] = InstallationResult(
-                            success=False,
-                            status=InstallationStatus.FAILED,
-                            message=f"Erro na instalação paralela: {e}",
-                            details={'error': str(e)}
-                        )
-            
-            return group_success
-            
-        except Exception as e:
-            self.logger.error(f"Erro crítico na instalação paralela: {e}")
-            return False
+    def _create_serial_locks(self, groups: List[ParallelInstallationGroup]) -> Dict[str, threading.Lock]:
+        """
+        Cria um lock por nível de dependência que não pode instalar em paralelo
+        
+        Só os componentes desse nível passam a instalar e verificar um por vez;
+        os demais níveis continuam com o paralelismo configurado.
+        """
+        serial_locks = {}
+        for group in groups:
+            if not group.can_install_parallel and len(group.components) > 1:
+                lock = threading.Lock()
+                serial_locks.update(dict.fromkeys(group.components, lock))
+        return serial_locks
     
-    def _install_group_sequential(self, group: ParallelInstallationGroup,
-                                enable_recovery: bool, result: BatchInstallationResult) -> bool:
-        """Instala grupo de componentes sequencialmente"""
-        try:
-            self.logger.info(f"Instalação sequencial de {len(group.components)} componentes")
-            
-            group_success = True
-            for component in group.components:
-                install_result = self._install_component_with_recovery(component, enable_recovery, result)
-                result.installation_results[component] = install_result
-                
-                if install_result.success:
-                    result.completed_components.append(component)
-                    self.logger.info(f"Instalação sequencial de {component} bem-sucedida")
-                else:
-                    result.failed_components.append(component)
-                    group_success = False
-                    self.logger.error(f"Falha na instalação sequencial de {component}: {install_result.message}")
-                    
-                    # Para instalação sequencial se há falha crítica
-                    if self._is_critical_failure(install_result):
-                        break
-            
-            return group_success
-            
-        except Exception as e:
-            self.logger.error(f"Erro na instalação sequencial: {e}")
-            return False
+    def _create_installation_scheduler(self, max_installs: int, max_downloads: int,
+                                       max_verifications: int, enable_recovery: bool,
+                                       result: BatchInstallationResult,
+                                       serial_locks: Optional[Dict[str, threading.Lock]] = None) -> DependencyScheduler:
+        """Cria o agendador com limites separados para rede, disco e CPU"""
+        serial_locks = serial_locks or {}
+        
+        def download(component: str, _: Any) -> Tuple[bool, StageOutput]:
+            return self._stage_download(component, datetime.now())
+        
+        def install(_: str, staged: StagedInstallation) -> Tuple[bool, StageOutput]:
+            return self._stage_install(staged)
+        
+        def verify(_: str, staged: StagedInstallation) -> Tuple[bool, StageOutput]:
+            return self._stage_verify(staged)
+        
+        def reinstall_and_verify(component: str, staged: StagedInstallation) -> Tuple[bool, StageOutput]:
+            # Falha na verificação já desfez a instalação: refaz os dois passos
+            ok, output = install(component, staged)
+            return verify(component, output) if ok else (ok, output)
+        
+        def stage(function, retry_function):
+            def run(component: str, value: Any) -> Tuple[bool, StageOutput]:
+                return self._run_batch_stage(function, retry_function, component, value,
+                                             enable_recovery, result)
+            return run
+        
+        def serialized(function):
+            # O lock do nível vale por tentativa, não durante o backoff entre elas
+            def run(component: str, value: Any) -> Tuple[bool, StageOutput]:
+                lock = serial_locks.get(component)
+                if lock is None:
+                    return function(component, value)
+                with lock:
+                    return function(component, value)
+            return run
+        
+        return DependencyScheduler([
+            SchedulerStage(name="download", function=stage(download, download),
+                           max_workers=max_downloads, wait_for_dependencies=False),
+            SchedulerStage(name="install", function=stage(serialized(install), serialized(install)),
+                           max_workers=max_installs),
+            SchedulerStage(name="verify", function=stage(serialized(verify), serialized(reinstall_and_verify)),
+                           max_workers=max_verifications),
+        ])
     
-    def _install_component_with_recovery(self, component: str, enable_recovery: bool,
-                                       result: BatchInstallationResult) -> InstallationResult:
-        """Instala componente com tentativas de recovery"""
+    def _run_batch_stage(self, function, retry_function, component: str, value: Any,
+                         enable_recovery: bool, result: BatchInstallationResult) -> Tuple[bool, StageOutput]:
+        """Executa um estágio da instalação em lote com tentativas de recovery"""
         max_attempts = 3 if enable_recovery else 1
         
         for attempt in range(max_attempts):
@@ -1420,18 +1435,27 @@ class InstallationManager:
                 # Aguarda antes de tentar novamente
                 time.sleep(2 ** attempt)  # Backoff exponencial
             
-            install_result = self.install_component(component)
+            try:
+                ok, output = (retry_function if attempt > 0 else function)(component, value)
+            except Exception as e:
+                # Executa rollback em caso de erro crítico
+                if component in self.rollback_registry:
+                    self._perform_rollback(self.rollback_registry[component])
+                start_time = value.start_time if isinstance(value, StagedInstallation) else datetime.now()
+                ok, output = False, self._handle_installation_failure(
+                    component, f"Erro crítico na instalação: {e}", [str(e)], start_time
+                )
             
-            if install_result.success:
-                return install_result
+            if ok:
+                return ok, output
             
             # Verifica se deve tentar recovery
-            if not enable_recovery or not self._should_retry_installation(install_result):
+            if not enable_recovery or not self._should_retry_installation(output):
                 break
             
             self.logger.warning(f"Tentativa {attempt + 1} falhou para {component}, tentando recovery...")
         
-        return install_result
+        return ok, output
     
     def _should_retry_installation(self, result: InstallationResult) -> bool:
         """Verifica se deve tentar recovery da instalação"""
@@ -1452,13 +1476,6 @@ class InstallationManager:
         
         return any(error in error_details.lower() for error in recoverable_errors)
     
-    def _has_critical_failures(self, result: BatchInstallationResult) -> bool:
-        """Verifica se há falhas críticas que devem parar a instalação"""
-        for component, install_result in result.installation_results.items():
-            if not install_result.success and self._is_critical_failure(install_result):
-                return True
-        return False
-    
     def _is_critical_failure(self, result: InstallationResult) -> bool:
         """Verifica se uma falha é crítica"""
         error_details = str(result.details)
@@ -277,8 +277,8 @@ def _install_archive(component_name, component_data, download_path, rollback_mgr
     logger.info(f"Extraindo {component_name} para {extract_path}...")
     send_status_update({'type': 'stage', 'component': component_name, 'stage': 'Extracting'})
 
-    if not extractor.is_7zip_available():
-        err = dependency_error("7-Zip não encontrado. Não é possível extrair o arquivo.", dependency="7zip", severity=ErrorSeverity.ERROR)
+    if not extractor.is_archive_supported(download_path):
+        err = dependency_error(f"Formato não suportado para extração: {os.path.basename(download_path)} (arquivos .7z requerem py7zr).", dependency="py7zr", severity=ErrorSeverity.ERROR)
         err.log()
         return False
 
@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de manifestos de integridade
+Criação e verificação paralelas de manifestos em formato JSON-lines,
+com modo rápido baseado em stat e checkpoints para retomar verificações
+interrompidas em árvores muito grandes.
+"""
+
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+
+from utils.hash_utils import hashing_service
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato JSON-lines do manifesto
+MANIFEST_FORMAT_VERSION = 2
+
+# Sufixo do arquivo de checkpoint de verificação
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+# Número de resultados entre gravações do checkpoint em disco
+DEFAULT_CHECKPOINT_INTERVAL = 500
+
+# Tolerância (segundos) ao comparar datas de modificação
+MODIFIED_TOLERANCE_SECONDS = 1
+
+
+class IntegrityManifestEngine:
+    """
+    Cria e verifica manifestos de integridade em paralelo.
+
+    O manifesto é gravado em JSON-lines: uma linha de cabeçalho seguida de
+    uma linha por arquivo, escrita à medida que os hashes ficam prontos.
+    Hashes são calculados num pool de threads com janela limitada, de modo
+    que a memória usada não cresce com o tamanho da árvore.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        Args:
+            max_workers: Threads de hash (padrão: min(8, CPUs))
+            checkpoint_interval: Resultados entre flushes do checkpoint
+        """
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.checkpoint_interval = max(1, checkpoint_interval)
+
+    # ------------------------------------------------------------------
+    # Criação
+    # ------------------------------------------------------------------
+
+    def create_manifest(self, directory: str, output_file: Optional[str] = None,
+                        algorithm: str = "sha256") -> Tuple[str, int]:
+        """
+        Cria manifesto JSON-lines para um diretório
+
+        Args:
+            directory: Diretório para criar manifesto
+            output_file: Arquivo de saída (padrão: <diretório>/integrity_manifest.jsonl)
+            algorithm: Algoritmo de hash
+
+        Returns:
+            Tuple[str, int]: Caminho do manifesto e número de arquivos registrados
+        """
+        directory_path = Path(directory)
+        if not directory_path.is_dir():
+            raise ValueError(f"Diretório não encontrado: {directory}")
+
+        output_path = Path(output_file) if output_file else directory_path / "integrity_manifest.jsonl"
+        excluded = self._excluded_paths(output_path)
+        temp_path = output_path.with_name(output_path.name + ".tmp")
+        excluded.add(os.path.normcase(str(temp_path.absolute())))
+
+        header = {
+            "type": "header",
+            "format_version": MANIFEST_FORMAT_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "directory": str(directory_path.absolute()),
+            "algorithm": algorithm,
+        }
+
+        def hash_entry(item):
+            relative_path, full_path, stat_result = item
+            try:
+                file_hash = hashing_service.hash_file(full_path, algorithm, use_cache=False)[algorithm]
+            except Exception as e:
+                logger.warning(f"Erro ao processar {full_path}: {e}")
+                return None
+            return {
+                "path": relative_path,
+                "hash": file_hash,
+                "size": stat_result.st_size,
+                "mtime_ns": stat_result.st_mtime_ns,
+                "modified": datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+            }
+
+        count = 0
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for entry in self._ordered_map(hash_entry, self._walk(directory_path, excluded)):
+                if entry is not None:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    count += 1
+        os.replace(temp_path, output_path)
+
+        return str(output_path), count
+
+    # ------------------------------------------------------------------
+    # Verificação
+    # ------------------------------------------------------------------
+
+    def verify_manifest(self, manifest_file: str, quick: bool = False, resume: bool = True,
+                        on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Verifica integridade usando manifesto (JSON-lines ou JSON legado)
+
+        Args:
+            manifest_file: Arquivo de manifesto
+            quick: Recalcula hash apenas de arquivos cujo tamanho/mtime mudou
+            resume: Retoma a partir do checkpoint de uma verificação interrompida
+            on_result: Callback chamado com cada resultado à medida que é produzido
+
+        Returns:
+            Dict: Resultado da verificação (mesma estrutura do IntegrityValidator)
+        """
+        manifest_path = Path(manifest_file)
+        if not manifest_path.exists():
+            raise ValueError(f"Manifesto não encontrado: {manifest_file}")
+
+        header = self._read_header(manifest_path)
+        base_directory = Path(header["directory"])
+        algorithm = header.get("algorithm", "sha256")
+        checkpoint_path = manifest_path.with_name(manifest_path.name + CHECKPOINT_SUFFIX)
+        identity = self._checkpoint_identity(manifest_path, quick)
+
+        results = {
+            "manifest_file": str(manifest_path),
+            "base_directory": str(base_directory),
+            "verified_at": datetime.now().isoformat(),
+            "total_files": 0,
+            "results": [],
+            "summary": {
+                "valid": 0,
+                "invalid": 0,
+                "missing": 0,
+                "modified": 0,
+                "new_files": 0,
+                "corrupted": 0
+            },
+            "quick_mode": quick,
+            "rehashed_files": 0,
+            "resumed_files": 0
+        }
+
+        def record(result: Dict[str, Any]):
+            results["results"].append(result)
+            results["summary"][result["status"]] += 1
+            if result["details"].get("time_modified") and result["status"] == "valid":
+                results["summary"]["modified"] += 1
+            if result["details"].get("rehashed"):
+                results["rehashed_files"] += 1
+            if on_result:
+                on_result(result)
+
+        # Resultados já verificados numa execução interrompida
+        done = self._load_checkpoint(checkpoint_path, identity) if resume else []
+        for result in done:
+            record(result)
+        results["resumed_files"] = len(done)
+
+        manifest_paths: Set[str] = set()
+
+        def entries():
+            for index, entry in enumerate(self._read_entries(manifest_path)):
+                manifest_paths.add(entry["path"])
+                if index >= len(done):
+                    yield entry
+
+        def verify_entry(entry):
+            return self._verify_entry(base_directory, entry, algorithm, quick)
+
+        with open(checkpoint_path, 'w' if not done else 'a', encoding='utf-8') as checkpoint:
+            if not done:
+                checkpoint.write(json.dumps(identity, ensure_ascii=False) + "\n")
+            pending = 0
+            for result in self._ordered_map(verify_entry, entries()):
+                record(result)
+                checkpoint.write(json.dumps(result, ensure_ascii=False) + "\n")
+                pending += 1
+                if pending >= self.checkpoint_interval:
+                    checkpoint.flush()
+                    os.fsync(checkpoint.fileno())
+                    pending = 0
+
+        results["total_files"] = len(manifest_paths)
+
+        # Verifica arquivos novos (não no manifesto)
+        excluded = self._excluded_paths(manifest_path)
+        new_files = 0
+        for relative_path, _, _ in self._walk(base_directory, excluded):
+            if relative_path not in manifest_paths:
+                result = {
+                    "file_path": relative_path,
+                    "status": "new",
+                    "details": {"note": "Arquivo não estava no manifesto original"}
+                }
+                results["results"].append(result)
+                if on_result:
+                    on_result(result)
+                new_files += 1
+        results["summary"]["new_files"] = new_files
+
+        # Verificação concluída: o checkpoint não é mais necessário
+        try:
+            checkpoint_path.unlink()
+        except OSError:
+            pass
+
+        total_expected = results["total_files"]
+        valid_files = results["summary"]["valid"]
+        results["statistics"] = {
+            "integrity_rate": (valid_files / total_expected * 100) if total_expected > 0 else 0,
+            "files_with_issues": total_expected - valid_files,
+            "new_files_found": new_files
+        }
+        return results
+
+    # ------------------------------------------------------------------
+    # Auxiliares
+    # ------------------------------------------------------------------
+
+    def _ordered_map(self, function: Callable, items) -> Iterator[Any]:
+        """Aplica function em paralelo preservando a ordem, com janela limitada"""
+        window = self.max_workers * 4
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="integrity-manifest") as executor:
+            futures = deque()
+            for item in items:
+                futures.append(executor.submit(function, item))
+                if len(futures) >= window:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+
+    @staticmethod
+    def _excluded_paths(manifest_path: Path) -> Set[str]:
+        """Arquivos do próprio manifesto que não entram na comparação"""
+        manifest_abs = manifest_path.absolute()
+        return {
+            os.path.normcase(str(manifest_abs)),
+            os.path.normcase(str(manifest_abs) + CHECKPOINT_SUFFIX),
+        }
+
+    @staticmethod
+    def _walk(root: Path, excluded: Set[str]) -> Iterator[Tuple[str, str, os.stat_result]]:
+        """Percorre a árvore com os.scandir, produzindo (relativo, completo, stat)"""
+        root_str = str(root.absolute())
+        stack = [root_str]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    items = sorted(entries, key=lambda entry: entry.name)
+            except OSError as e:
+                logger.warning(f"Erro ao listar {directory}: {e}")
+                continue
+
+            subdirs = []
+            for entry in items:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        if os.path.normcase(entry.path) in excluded:
+                            continue
+                        relative_path = os.path.relpath(entry.path, root_str)
+                        yield relative_path, entry.path, entry.stat()
+                except OSError as e:
+                    logger.warning(f"Erro ao processar {entry.path}: {e}")
+            stack.extend(reversed(subdirs))
+
+    @staticmethod
+    def _read_header(manifest_path: Path) -> Dict[str, Any]:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            first_line = f.readline()
+        try:
+            header = json.loads(first_line)
+            if isinstance(header, dict) and header.get("type") == "header":
+                return header
+        except json.JSONDecodeError:
+            pass
+        # Manifesto JSON legado (um único objeto com "files")
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return {key: value for key, value in manifest.items() if key != "files"}
+
+    @staticmethod
+    def _read_entries(manifest_path: Path) -> Iterator[Dict[str, Any]]:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            first_line = f.readline()
+            try:
+                header = json.loads(first_line)
+            except json.JSONDecodeError:
+                header = None
+            if isinstance(header, dict) and header.get("type") == "header":
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+                return
+
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        for relative_path, file_info in manifest["files"].items():
+            yield dict(file_info, path=relative_path)
+
+    @staticmethod
+    def _checkpoint_identity(manifest_path: Path, quick: bool) -> Dict[str, Any]:
+        """Identifica o manifesto para que checkpoints antigos não sejam reutilizados"""
+        stat_result = manifest_path.stat()
+        return {
+            "type": "checkpoint",
+            "manifest_size": stat_result.st_size,
+            "manifest_mtime_ns": stat_result.st_mtime_ns,
+            "quick": quick,
+        }
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: Path, identity: Dict[str, Any]) -> list:
+        if not checkpoint_path.exists():
+            return []
+        done = []
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                if json.loads(f.readline() or "null") != identity:
+                    return []
+                for line in f:
+                    # Última linha pode estar truncada pela interrupção
+                    if not line.endswith("\n"):
+                        break
+                    done.append(json.loads(line))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Checkpoint inválido ignorado ({checkpoint_path}): {e}")
+            return []
+
+        if done:
+            logger.info(f"Retomando verificação a partir de {len(done)} arquivos já verificados")
+            # Reescreve sem a eventual linha truncada antes de acrescentar novos resultados
+            with open(checkpoint_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(identity, ensure_ascii=False) + "\n")
+                for result in done:
+                    f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        return done
+
+    @staticmethod
+    def _verify_entry(base_directory: Path, entry: Dict[str, Any], algorithm: str,
+                      quick: bool) -> Dict[str, Any]:
+        """Verifica um arquivo do manifesto"""
+        relative_path = entry["path"]
+        expected_hash = entry["hash"]
+        file_path = base_directory / relative_path
+        result = {
+            "file_path": relative_path,
+            "status": "valid",
+            "expected_hash": expected_hash,
+            "calculated_hash": None,
+            "details": {}
+        }
+
+        try:
+            stat_result = file_path.stat()
+        except FileNotFoundError:
+            result["status"] = "missing"
+            result["details"]["error"] = "Arquivo não encontrado"
+            return result
+        except OSError as e:
+            result["status"] = "corrupted"
+            result["details"]["error"] = str(e)
+            return result
+
+        if "mtime_ns" in entry:
+            mtime_changed = abs(stat_result.st_mtime_ns - entry["mtime_ns"]) > MODIFIED_TOLERANCE_SECONDS * 1e9
+        else:
+            expected_modified = datetime.fromisoformat(entry["modified"])
+            current_modified = datetime.fromtimestamp(stat_result.st_mtime)
+            mtime_changed = abs((current_modified - expected_modified).total_seconds()) > MODIFIED_TOLERANCE_SECONDS
+        if mtime_changed:
+            result["details"]["time_modified"] = True
+
+        # Modo rápido: stat idêntico ao registrado dispensa recalcular o hash
+        if (quick and entry.get("mtime_ns") == stat_result.st_mtime_ns
+                and entry.get("size") == stat_result.st_size):
+            result["calculated_hash"] = expected_hash
+            result["details"]["message"] = "Stat inalterado (modo rápido)"
+            return result
+
+        try:
+            calculated_hash = hashing_service.hash_file(file_path, algorithm, use_cache=False)[algorithm]
+        except Exception as e:
+            result["status"] = "corrupted"
+            result["details"]["error"] = str(e)
+            return result
+
+        result["calculated_hash"] = calculated_hash
+        result["details"]["rehashed"] = True
+        if calculated_hash.lower() == expected_hash.lower():
+            result["details"]["message"] = "Integridade verificada com sucesso"
+        else:
+            result["status"] = "invalid"
+            result["details"]["error"] = "Hash não confere"
+            result["details"]["hash_mismatch"] = {
+                "expected": expected_hash,
+                "calculated": calculated_hash
+            }
+        return result
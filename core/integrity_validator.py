@@ -7,7 +7,6 @@ sanitização de logs e criptografia de configurações
 
 import os
 import logging
-import hashlib
 import ssl
 import socket
 import json
@@ -21,6 +20,9 @@ from datetime import datetime, timedelta
 from urllib.parse import urlparse
 import tempfile
 
+from utils.hash_utils import hashing_service
+from .integrity_manifest import IntegrityManifestEngine
+
 try:
     from cryptography.fernet import Fernet
     from cryptography.hazmat.primitives import hashes, serialization
@@ -696,24 +698,11 @@ class IntegrityValidator:
     # Métodos auxiliares privados
     def _calculate_file_hash(self, file_path: Path, algorithm: str = "sha256") -> str:
         """Calcula hash de um arquivo"""
-        hash_algorithms = {
-            'md5': hashlib.md5,
-            'sha1': hashlib.sha1,
-            'sha256': hashlib.sha256,
-            'sha512': hashlib.sha512
-        }
-        
-        if algorithm.lower() not in hash_algorithms:
+        if algorithm.lower() not in ('md5', 'sha1', 'sha256', 'sha512'):
             raise ValueError(f"Algoritmo {algorithm} não suportado")
         
-        hash_func = hash_algorithms[algorithm.lower()]()
-        
         try:
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    hash_func.update(chunk)
-            
-            return hash_func.hexdigest()
+            return hashing_service.hash_file(file_path, algorithm.lower())[algorithm.lower()]
             
         except Exception as e:
             logger.error(f"Erro ao calcular hash de {file_path}: {e}")
@@ -927,154 +916,52 @@ class IntegrityValidator:
         
         return None
     
-    def create_integrity_manifest(self, directory: str, output_file: Optional[str] = None) -> str:
+    def create_integrity_manifest(self, directory: str, output_file: Optional[str] = None,
+                                  max_workers: Optional[int] = None) -> str:
         """
         Cria manifesto de integridade para um diretório
         
+        Os hashes são calculados em paralelo e o manifesto é gravado em
+        JSON-lines à medida que os arquivos são processados.
+        
         Args:
             directory: Diretório para criar manifesto
             output_file: Arquivo de saída (opcional)
+            max_workers: Número de threads de hash (opcional)
             
         Returns:
             str: Caminho do arquivo de manifesto criado
         """
         logger.info(f"Criando manifesto de integridade para: {directory}")
         
-        directory_path = Path(directory)
-        if not directory_path.exists():
-            raise ValueError(f"Diretório não encontrado: {directory}")
-        
-        manifest = {
-            "created_at": datetime.now().isoformat(),
-            "directory": str(directory_path.absolute()),
-            "algorithm": "sha256",
-            "files": {}
-        }
-        
-        # Processa todos os arquivos no diretório
-        for file_path in directory_path.rglob("*"):
-            if file_path.is_file():
-                try:
-                    relative_path = file_path.relative_to(directory_path)
-                    file_hash = self._calculate_file_hash(file_path, "sha256")
-                    file_stat = file_path.stat()
-                    
-                    manifest["files"][str(relative_path)] = {
-                        "hash": file_hash,
-                        "size": file_stat.st_size,
-                        "modified": datetime.fromtimestamp(file_stat.st_mtime).isoformat()
-                    }
-                    
-                except Exception as e:
-                    logger.warning(f"Erro ao processar {file_path}: {e}")
-        
-        # Salva manifesto
-        if not output_file:
-            output_file = directory_path / "integrity_manifest.json"
-        else:
-            output_file = Path(output_file)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        engine = IntegrityManifestEngine(max_workers=max_workers)
+        manifest_path, file_count = engine.create_manifest(directory, output_file)
         
-        logger.info(f"Manifesto criado: {output_file} ({len(manifest['files'])} arquivos)")
-        return str(output_file)
+        logger.info(f"Manifesto criado: {manifest_path} ({file_count} arquivos)")
+        return manifest_path
     
-    def verify_integrity_manifest(self, manifest_file: str) -> Dict[str, Any]:
+    def verify_integrity_manifest(self, manifest_file: str, quick: bool = False,
+                                  resume: bool = True,
+                                  max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Verifica integridade usando manifesto
         
         Args:
-            manifest_file: Arquivo de manifesto
+            manifest_file: Arquivo de manifesto (JSON-lines ou JSON legado)
+            quick: Recalcula hash apenas de arquivos cujo tamanho/mtime mudou
+            resume: Retoma uma verificação interrompida a partir do checkpoint
+            max_workers: Número de threads de hash (opcional)
             
         Returns:
             Dict: Resultado da verificação
         """
         logger.info(f"Verificando integridade usando manifesto: {manifest_file}")
         
-        manifest_path = Path(manifest_file)
-        if not manifest_path.exists():
-            raise ValueError(f"Manifesto não encontrado: {manifest_file}")
-        
-        # Carrega manifesto
-        with open(manifest_path, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
-        
-        base_directory = Path(manifest["directory"])
-        algorithm = manifest.get("algorithm", "sha256")
-        
-        results = {
-            "manifest_file": str(manifest_path),
-            "base_directory": str(base_directory),
-            "verified_at": datetime.now().isoformat(),
-            "total_files": len(manifest["files"]),
-            "results": [],
-            "summary": {
-                "valid": 0,
-                "invalid": 0,
-                "missing": 0,
-                "modified": 0,
-                "new_files": 0
-            }
-        }
-        
-        # Verifica arquivos do manifesto
-        for relative_path, file_info in manifest["files"].items():
-            file_path = base_directory / relative_path
-            expected_hash = file_info["hash"]
-            
-            result = self.validate_file_integrity(str(file_path), expected_hash, algorithm)
-            
-            # Verifica se arquivo foi modificado
-            if file_path.exists():
-                current_stat = file_path.stat()
-                expected_modified = datetime.fromisoformat(file_info["modified"])
-                current_modified = datetime.fromtimestamp(current_stat.st_mtime)
-                
-                if abs((current_modified - expected_modified).total_seconds()) > 1:
-                    result.details["time_modified"] = True
-                    if result.status == IntegrityStatus.VALID:
-                        results["summary"]["modified"] += 1
-            
-            results["results"].append({
-                "file_path": str(relative_path),
-                "status": result.status.value,
-                "expected_hash": result.expected_hash,
-                "calculated_hash": result.calculated_hash,
-                "details": result.details
-            })
-            
-            results["summary"][result.status.value] += 1
-        
-        # Verifica arquivos novos (não no manifesto)
-        current_files = set()
-        for file_path in base_directory.rglob("*"):
-            if file_path.is_file() and file_path != manifest_path:
-                relative_path = file_path.relative_to(base_directory)
-                current_files.add(str(relative_path))
-        
-        manifest_files = set(manifest["files"].keys())
-        new_files = current_files - manifest_files
-        
-        for new_file in new_files:
-            results["results"].append({
-                "file_path": new_file,
-                "status": "new",
-                "details": {"note": "Arquivo não estava no manifesto original"}
-            })
-            results["summary"]["new_files"] += 1
-        
-        # Calcula estatísticas finais
-        total_expected = results["total_files"]
-        valid_files = results["summary"]["valid"]
-        
-        results["statistics"] = {
-            "integrity_rate": (valid_files / total_expected * 100) if total_expected > 0 else 0,
-            "files_with_issues": total_expected - valid_files,
-            "new_files_found": len(new_files)
-        }
+        engine = IntegrityManifestEngine(max_workers=max_workers)
+        results = engine.verify_manifest(manifest_file, quick=quick, resume=resume)
         
-        logger.info(f"Verificação concluída: {valid_files}/{total_expected} arquivos íntegros")
+        logger.info(f"Verificação concluída: {results['summary']['valid']}/{results['total_files']} "
+                    f"arquivos íntegros ({results['rehashed_files']} rehash)")
         return results
     
     def get_integrity_statistics(self) -> Dict[str, Any]:
@@ -18,7 +18,6 @@ import os
 import sys
 import logging
 import shutil
-import subprocess
 import platform
 import json
 from typing import Dict, List, Optional, Tuple, Any, Set
@@ -28,6 +27,11 @@ from enum import Enum
 import time
 from datetime import datetime
 
+try:
+    from .version_probe import get_version_probe_service, extract_version
+except ImportError:
+    from version_probe import get_version_probe_service, extract_version
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -412,25 +416,14 @@ class IntelligentDependencyManager:
             ['version']
         ]
         
+        probe_service = get_version_probe_service()
         for cmd_args in version_commands:
-            try:
-                result = subprocess.run(
-                    [executable_path] + cmd_args,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if result.returncode == 0 and result.stdout:
-                    # Extrair versão do output
-                    import re
-                    version_pattern = r'(\d+\.\d+(?:\.\d+)?(?:\.\d+)?)'
-                    match = re.search(version_pattern, result.stdout)
-                    if match:
-                        return match.group(1)
-            
-            except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-                continue
+            result = probe_service.probe(executable_path, cmd_args, timeout=10)
+            if result.ok and result.stdout:
+                # Extrair versão do output
+                version = extract_version(result.stdout, r'(\d+\.\d+(?:\.\d+)?(?:\.\d+)?)')
+                if version:
+                    return version
         
         return None
     
@@ -11,7 +11,9 @@ import queue
 import time
 import json
 import uuid
-from typing import Dict, List, Optional, Callable, Any, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Callable, Any, Union, Deque, Set
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from datetime import datetime, timedelta
@@ -34,6 +36,7 @@ except ImportError:
 
 # Import logging system
 from env_dev.utils.log_manager import setup_logging
+from env_dev.core.progress_bus import ProgressBus, ProgressEvent, get_progress_bus
 
 class NotificationSeverity(Enum):
     """Enhanced notification severity levels"""
@@ -110,6 +113,29 @@ class OperationRecord:
     result_data: Optional[Dict[str, Any]] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+# Maximum notifications stored and fanned out per consumer wake-up
+MAX_BATCH_SIZE = 100
+
+# Queue sentinel that stops the consumer thread
+_STOP = object()
+
+@dataclass
+class NotificationSink:
+    """Subscriber that receives notifications on its own worker thread"""
+    callback: Callable[[StructuredNotification], None]
+    name: str
+    severities: Optional[Set[NotificationSeverity]] = None
+    operation_id: Optional[str] = None
+    executor: Optional[ThreadPoolExecutor] = None
+    
+    def accepts(self, notification: StructuredNotification) -> bool:
+        """Check the sink filters"""
+        if self.severities is not None and notification.severity not in self.severities:
+            return False
+        if self.operation_id is not None and notification.operation_id != self.operation_id:
+            return False
+        return True
+
 class NotificationManager:
     """
     Advanced notification manager providing structured feedback system
@@ -153,17 +179,31 @@ class NotificationManager:
             except Exception as e:
                 self.logger.warning(f"Failed to initialize GUI notification center: {e}")
         
-        # Internal storage
+        # Internal storage; notifications indexes history by id and the
+        # per-severity/per-operation deques keep history order, so evicting
+        # the oldest notification is O(1) everywhere
         self.notifications: Dict[str, StructuredNotification] = {}
         self.operations: Dict[str, OperationRecord] = {}
-        self.notification_history: List[StructuredNotification] = []
-        self.operation_history: List[OperationRecord] = []
+        self.notification_history: Deque[StructuredNotification] = deque()
+        self.operation_history: Deque[OperationRecord] = deque(maxlen=max_history_size)
+        self._notifications_by_severity: Dict[NotificationSeverity, Deque[StructuredNotification]] = {}
+        self._notifications_by_operation: Dict[str, Deque[StructuredNotification]] = {}
+        self._history_lock = threading.RLock()
         
         # Threading and queuing
         self.notification_queue = queue.Queue()
         self.processing_thread = None
         self.is_running = True
         
+        # Fan-out: every sink runs on its own single worker, so a slow GUI
+        # does not delay the file log and each sink sees notifications in order
+        self._sinks: Dict[int, NotificationSink] = {}
+        self._sinks_lock = threading.Lock()
+        self._next_sink_token = 0
+        self.subscribe(self._record_operation_notification, name="operations")
+        self.subscribe(self._log_notification, name="file_log")
+        self.subscribe(self._show_gui_notification, name="gui")
+        
         # Statistics
         self.stats = {
             'total_notifications': 0,
@@ -182,6 +222,7 @@ class NotificationManager:
     def start_processing(self):
         """Start the notification processing thread"""
         if self.processing_thread is None or not self.processing_thread.is_alive():
+            self.is_running = True
             self.processing_thread = threading.Thread(
                 target=self._process_notifications,
                 daemon=True
@@ -192,60 +233,205 @@ class NotificationManager:
         """Stop the notification processing thread"""
         self.is_running = False
         if self.processing_thread and self.processing_thread.is_alive():
+            # Notifications queued before the sentinel are still delivered
+            self.notification_queue.put(_STOP)
             self.processing_thread.join(timeout=5.0)
+        
+        with self._sinks_lock:
+            executors = [sink.executor for sink in self._sinks.values() if sink.executor]
+            for sink in self._sinks.values():
+                sink.executor = None
+        for executor in executors:
+            executor.shutdown(wait=True)
     
     def _process_notifications(self):
         """Process notifications from the queue"""
-        while self.is_running:
+        while True:
+            # Block until there is work instead of polling
+            batch = [self.notification_queue.get()]
             try:
-                # Process all pending notifications
-                while not self.notification_queue.empty():
-                    notification = self.notification_queue.get_nowait()
-                    self._handle_notification(notification)
-                
-                # Sleep briefly to avoid busy waiting
-                time.sleep(0.1)
-                
+                while len(batch) < MAX_BATCH_SIZE:
+                    batch.append(self.notification_queue.get_nowait())
             except queue.Empty:
-                continue
+                pass
+            
+            stop = any(item is _STOP for item in batch)
+            notifications = [item for item in batch if item is not _STOP]
+            try:
+                if notifications:
+                    self._handle_notifications(notifications)
             except Exception as e:
                 self.logger.error(f"Error processing notifications: {e}")
-    
-    def _handle_notification(self, notification: StructuredNotification):
-        """Handle a single notification"""
-        try:
-            # Store notification
-            self.notifications[notification.id] = notification
-            self.notification_history.append(notification)
-            
-            # Maintain history size limit
-            if len(self.notification_history) > self.max_history_size:
-                old_notification = self.notification_history.pop(0)
-                if old_notification.id in self.notifications:
-                    del self.notifications[old_notification.id]
+            finally:
+                for _ in batch:
+                    self.notification_queue.task_done()
             
-            # Update statistics
-            self._update_stats(notification)
-            
-            # Log to file
-            if self.enable_file_logging:
-                self._log_notification(notification)
-            
-            # Show GUI notification
-            if self.enable_gui_notifications and self.gui_notification_center:
-                self._show_gui_notification(notification)
+            if stop:
+                return
+    
+    def _handle_notifications(self, notifications: List[StructuredNotification]):
+        """Store a batch of notifications and fan it out to the sinks"""
+        with self._history_lock:
+            for notification in notifications:
+                self._store_notification(notification)
+                self._update_stats(notification)
+        
+        self._dispatch(notifications)
+    
+    def _store_notification(self, notification: StructuredNotification):
+        """Add a notification to the history and its indexes"""
+        self.notifications[notification.id] = notification
+        self.notification_history.append(notification)
+        self._notifications_by_severity.setdefault(notification.severity, deque()).append(notification)
+        if notification.operation_id:
+            self._notifications_by_operation.setdefault(notification.operation_id, deque()).append(notification)
+        
+        # Maintain history size limit; the evicted notification is also the
+        # oldest entry of its severity and operation deques
+        while len(self.notification_history) > self.max_history_size:
+            old_notification = self.notification_history.popleft()
+            self.notifications.pop(old_notification.id, None)
+            self._evict_from_index(self._notifications_by_severity, old_notification.severity, old_notification)
+            if old_notification.operation_id:
+                self._evict_from_index(self._notifications_by_operation, old_notification.operation_id, old_notification)
+    
+    @staticmethod
+    def _evict_from_index(index: Dict[Any, Deque[StructuredNotification]], key: Any,
+                          notification: StructuredNotification):
+        """Drop the oldest notification from a secondary index"""
+        bucket = index.get(key)
+        if bucket and bucket[0] is notification:
+            bucket.popleft()
+        elif bucket:
+            bucket.remove(notification)
+        if not bucket:
+            index.pop(key, None)
+    
+    def _rebuild_indexes(self, notifications: List[StructuredNotification]):
+        """Rebuild history and indexes from a list of notifications"""
+        self.notifications = {}
+        self.notification_history = deque()
+        self._notifications_by_severity = {}
+        self._notifications_by_operation = {}
+        for notification in notifications:
+            self._store_notification(notification)
+    
+    def subscribe(self,
+                  callback: Callable[[StructuredNotification], None],
+                  severities: Optional[List[NotificationSeverity]] = None,
+                  operation_id: Optional[str] = None,
+                  name: Optional[str] = None) -> int:
+        """
+        Register a notification sink
+        
+        The callback runs on a worker thread owned by the sink, receiving
+        notifications in order; errors are logged and do not affect other sinks.
+        
+        Args:
+            callback: Function called with each StructuredNotification
+            severities: Only deliver these severities (default: all)
+            operation_id: Only deliver notifications of this operation
+            name: Sink name used for the worker thread and error messages
             
-            # Update operation record if applicable
-            if notification.operation_id and notification.operation_id in self.operations:
-                operation = self.operations[notification.operation_id]
-                operation.notifications.append(notification.id)
-                
-                # Update progress if provided
-                if notification.progress is not None:
-                    operation.progress = notification.progress
+        Returns:
+            Token for unsubscribe
+        """
+        with self._sinks_lock:
+            token = self._next_sink_token
+            self._next_sink_token += 1
+            self._sinks[token] = NotificationSink(
+                callback=callback,
+                name=name or getattr(callback, '__name__', f"sink-{token}"),
+                severities=set(severities) if severities else None,
+                operation_id=operation_id
+            )
+            return token
+    
+    def unsubscribe(self, token: int):
+        """Remove a sink registered with subscribe"""
+        with self._sinks_lock:
+            sink = self._sinks.pop(token, None)
+        if sink and sink.executor:
+            sink.executor.shutdown(wait=False)
+    
+    def _dispatch(self, notifications: List[StructuredNotification]):
+        """Hand a batch to every interested sink without waiting for them"""
+        with self._sinks_lock:
+            deliveries = []
+            for sink in self._sinks.values():
+                accepted = [n for n in notifications if sink.accepts(n)]
+                if not accepted:
+                    continue
+                if sink.executor is None:
+                    sink.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"notify-{sink.name}")
+                deliveries.append((sink, accepted))
         
-        except Exception as e:
-            self.logger.error(f"Error handling notification {notification.id}: {e}")
+        for sink, accepted in deliveries:
+            try:
+                sink.executor.submit(self._deliver, sink, accepted)
+            except RuntimeError:
+                # Sink removed or manager stopping
+                continue
+    
+    def _deliver(self, sink: NotificationSink, notifications: List[StructuredNotification]):
+        """Run a sink callback for each notification of a batch"""
+        for notification in notifications:
+            try:
+                sink.callback(notification)
+            except Exception as e:
+                self.logger.error(f"Error in notification sink {sink.name} for {notification.id}: {e}")
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until queued notifications are stored and delivered to every sink
+        
+        Args:
+            timeout: Maximum seconds to wait for the queue and the sinks (default: no limit)
+        
+        Returns:
+            True if everything was delivered in time
+        """
+        if self.processing_thread is None or not self.processing_thread.is_alive():
+            return self.notification_queue.unfinished_tasks == 0
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        # Queue.join() has no timeout; wait on its condition instead
+        with self.notification_queue.all_tasks_done:
+            while self.notification_queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.notification_queue.all_tasks_done.wait(remaining)
+        
+        with self._sinks_lock:
+            executors = [sink.executor for sink in self._sinks.values() if sink.executor]
+        
+        markers = []
+        for executor in executors:
+            try:
+                markers.append(executor.submit(lambda: None))
+            except RuntimeError:
+                continue
+        for marker in markers:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                marker.result(timeout=remaining)
+            except Exception:
+                return False
+        return True
+    
+    def _record_operation_notification(self, notification: StructuredNotification):
+        """Attach a notification to its operation record"""
+        operation = self.operations.get(notification.operation_id) if notification.operation_id else None
+        if operation is None:
+            return
+        
+        operation.notifications.append(notification.id)
+        
+        # Update progress if provided
+        if notification.progress is not None:
+            operation.progress = notification.progress
     
     def _update_stats(self, notification: StructuredNotification):
         """Update notification statistics"""
@@ -263,6 +449,8 @@ class NotificationManager:
     
     def _log_notification(self, notification: StructuredNotification):
         """Log notification to file"""
+        if not self.enable_file_logging:
+            return
         try:
             # Map severity to logging level
             severity_mapping = {
@@ -311,7 +499,7 @@ class NotificationManager:
     def _show_gui_notification(self, notification: StructuredNotification):
         """Show GUI notification if available"""
         try:
-            if not self.gui_notification_center:
+            if not (self.enable_gui_notifications and self.gui_notification_center):
                 return
             
             # Map severity to GUI notification level
@@ -509,6 +697,29 @@ class NotificationManager:
             progress=operation.progress
         )
     
+    def attach_progress_bus(self, bus: Optional[ProgressBus] = None) -> int:
+        """
+        Follow byte progress published on a progress bus
+        
+        Events whose operation_id matches a started operation update its
+        progress; the bus already limits how often that happens.
+        
+        Args:
+            bus: Progress bus to follow (default: global bus)
+            
+        Returns:
+            Subscription token for bus.unsubscribe
+        """
+        bus = bus or get_progress_bus()
+        return bus.subscribe(self._on_progress_event)
+    
+    def _on_progress_event(self, event: ProgressEvent):
+        """Update a tracked operation from a progress bus event"""
+        operation = self.operations.get(event.operation_id)
+        if operation is None or event.finished:
+            return
+        self.update_operation_progress(event.operation_id, operation.current_step, progress=event.percentage)
+    
     def complete_operation(self,
                           operation_id: str,
                           success: bool = True,
@@ -563,10 +774,8 @@ class NotificationManager:
                 persistent=True
             )
         
-        # Move to history
+        # Move to history (bounded by the deque's maxlen)
         self.operation_history.append(operation)
-        if len(self.operation_history) > self.max_history_size:
-            self.operation_history.pop(0)
         
         # Remove from active operations
         del self.operations[operation_id]
@@ -630,7 +839,16 @@ class NotificationManager:
                          tags: Optional[List[str]] = None,
                          since: Optional[datetime] = None) -> List[StructuredNotification]:
         """Get notifications with filtering"""
-        notifications = self.notification_history.copy()
+        with self._history_lock:
+            # Start from the smallest secondary index that applies
+            candidates = self.notification_history
+            if operation_id:
+                candidates = self._notifications_by_operation.get(operation_id, ())
+            if severity:
+                by_severity = self._notifications_by_severity.get(severity, ())
+                if not operation_id or len(by_severity) < len(candidates):
+                    candidates = by_severity
+            notifications = list(candidates)
         
         if severity:
             notifications = [n for n in notifications if n.severity == severity]
@@ -658,7 +876,7 @@ class NotificationManager:
                       since: Optional[datetime] = None) -> List[OperationRecord]:
         """Get operations with filtering"""
         # Combine active and historical operations
-        all_operations = list(self.operations.values()) + self.operation_history
+        all_operations = list(self.operations.values()) + list(self.operation_history)
         
         if category:
             all_operations = [op for op in all_operations if op.category == category]
@@ -749,28 +967,28 @@ class NotificationManager:
                      older_than: Optional[datetime] = None,
                      categories: Optional[List[OperationCategory]] = None):
         """Clear notification and operation history"""
-        if older_than:
-            self.notification_history = [
-                n for n in self.notification_history 
-                if n.timestamp >= older_than
-            ]
-            self.operation_history = [
-                op for op in self.operation_history 
-                if op.start_time >= older_than
-            ]
-        elif categories:
-            self.notification_history = [
-                n for n in self.notification_history 
-                if n.category not in categories
-            ]
-            self.operation_history = [
-                op for op in self.operation_history 
-                if op.category not in categories
-            ]
-        else:
-            self.notification_history.clear()
-            self.operation_history.clear()
-            self.notifications.clear()  # Also clear the notifications dict
+        with self._history_lock:
+            if older_than:
+                self._rebuild_indexes([
+                    n for n in self.notification_history 
+                    if n.timestamp >= older_than
+                ])
+                self.operation_history = deque((
+                    op for op in self.operation_history 
+                    if op.start_time >= older_than
+                ), maxlen=self.max_history_size)
+            elif categories:
+                self._rebuild_indexes([
+                    n for n in self.notification_history 
+                    if n.category not in categories
+                ])
+                self.operation_history = deque((
+                    op for op in self.operation_history 
+                    if op.category not in categories
+                ), maxlen=self.max_history_size)
+            else:
+                self._rebuild_indexes([])
+                self.operation_history.clear()
         
         # Reset statistics
         self.stats = {
@@ -12,13 +12,15 @@ Requirements addressed:
 import logging
 import json
 import csv
+import os
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set, Callable, Tuple, Union
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
 import sqlite3
 import zipfile
 import io
@@ -32,6 +34,51 @@ except ImportError:
     from security_manager import SecurityManager, SecurityLevel
 
 
+# Pending writes are committed in one transaction once this many accumulate...
+WRITE_BATCH_SIZE = 50
+# ...or at most this many seconds after the first one
+WRITE_BATCH_INTERVAL = 1.0
+
+# Rows fetched per round trip when hydrating records
+FETCH_BATCH_SIZE = 500
+
+# Rows pulled from the export cursor per fetch
+EXPORT_FETCH_SIZE = 1000
+
+# Export progress callbacks fire at most once per this many records
+EXPORT_PROGRESS_INTERVAL = 1000
+
+# Schema version stored in PRAGMA user_version
+SCHEMA_VERSION = 2
+
+# Hour key used by the rollup table (same format as SQLite strftime below)
+ROLLUP_HOUR_FORMAT = "%Y-%m-%d %H:00:00"
+
+# Columns written for each record, in statement order
+RECORD_COLUMNS = (
+    "operation_id", "operation_type", "status", "component_name", "title", "description",
+    "start_time", "end_time", "duration_seconds", "progress_percentage", "current_step",
+    "total_steps", "current_step_number", "details", "warnings", "errors", "result",
+    "metadata", "user_id", "session_id", "system_info"
+)
+
+# Record fields search_operations can match on
+SEARCHABLE_COLUMNS = {
+    "operation_id", "operation_type", "status", "component_name", "title",
+    "description", "current_step", "user_id", "session_id"
+}
+
+
+def _db_time(value: datetime) -> str:
+    """Format a datetime the way sqlite3's default adapter stores it"""
+    return value.isoformat(" ")
+
+
+def _unicode_lower(value):
+    """SQLite lower() only folds ASCII; used for case-insensitive search"""
+    return value.lower() if isinstance(value, str) else value
+
+
 class OperationStatus(Enum):
     """Status of operations"""
     PENDING = "pending"
@@ -128,6 +175,148 @@ class ReportExportResult:
     export_time: datetime = field(default_factory=datetime.now)
 
 
+class ExportCancelledError(Exception):
+    """Raised inside an export when its job has been cancelled"""
+
+
+class ReportExportJob:
+    """
+    Handle of a report export
+    
+    Exports started with start_report_export run on a background worker;
+    use progress_percentage / records_written to follow them, cancel() to
+    stop them and result() to wait for the ReportExportResult. The output
+    file only appears once the export has finished successfully.
+    """
+    
+    def __init__(self, export_format: ReportFormat, output_path: str,
+                 progress_callback: Optional[Callable[["ReportExportJob"], None]] = None):
+        self.export_format = export_format
+        self.output_path = output_path
+        self.records_total = 0
+        self.records_written = 0
+        self._progress_callback = progress_callback
+        self._cancel_event = threading.Event()
+        self._future: Future = Future()
+    
+    @property
+    def progress_percentage(self) -> float:
+        if self.records_total:
+            return min(self.records_written / self.records_total * 100, 100.0)
+        return 100.0 if self.done() else 0.0
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+    
+    def cancel(self):
+        """Ask the export to stop; result() then reports it as cancelled"""
+        self._cancel_event.set()
+    
+    def done(self) -> bool:
+        return self._future.done()
+    
+    def result(self, timeout: Optional[float] = None) -> ReportExportResult:
+        """Wait for the export to finish and return its result"""
+        return self._future.result(timeout)
+    
+    def _check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise ExportCancelledError(f"Export to {self.output_path} cancelled")
+    
+    def _advance(self, count: int):
+        """Count exported records, notifying the callback every EXPORT_PROGRESS_INTERVAL"""
+        previous = self.records_written
+        self.records_written += count
+        if previous // EXPORT_PROGRESS_INTERVAL != self.records_written // EXPORT_PROGRESS_INTERVAL:
+            self._notify_progress()
+    
+    def _notify_progress(self):
+        if self._progress_callback:
+            try:
+                self._progress_callback(self)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Export progress callback failed: {e}")
+
+
+class _ExportRows:
+    """
+    Records selected for an export, read from a database snapshot
+    
+    Iterating runs the query again on the snapshot connection and yields one
+    export dict per row, fetching EXPORT_FETCH_SIZE rows at a time, so
+    several passes (ZIP entries) see the same data without holding it in
+    memory.
+    """
+    
+    def __init__(self, connection: sqlite3.Connection, where_sql: str, params: List[Any],
+                 job: ReportExportJob):
+        self.connection = connection
+        self.where_sql = where_sql
+        self.params = params
+        self.job = job
+        self.total = connection.execute(
+            f"SELECT COUNT(*) FROM operation_records{where_sql}", params
+        ).fetchone()[0]
+    
+    def __iter__(self):
+        return self.iterate()
+    
+    def iterate(self, track_progress: bool = True):
+        """Yield export dicts; only the tracked pass advances the job progress"""
+        cursor = self.connection.execute(
+            f"SELECT * FROM operation_records{self.where_sql} ORDER BY start_time, operation_id",
+            self.params
+        )
+        try:
+            while True:
+                self.job._check_cancelled()
+                rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _row_to_export_dict(row)
+                if track_progress:
+                    self.job._advance(len(rows))
+        finally:
+            cursor.close()
+    
+    def status_counts(self) -> Dict[str, int]:
+        """Number of selected records per status"""
+        return dict(self.connection.execute(
+            f"SELECT status, COUNT(*) FROM operation_records{self.where_sql} GROUP BY status ORDER BY status",
+            self.params
+        ).fetchall())
+
+
+def _row_to_export_dict(row) -> Dict[str, Any]:
+    """Convert a database row to the exported record dict"""
+    end_time = row['end_time']
+    return {
+        "operation_id": row['operation_id'],
+        "operation_type": row['operation_type'],
+        "status": row['status'],
+        "component_name": row['component_name'],
+        "title": row['title'] or '',
+        "description": row['description'] or '',
+        "start_time": datetime.fromisoformat(row['start_time']).isoformat(),
+        "end_time": datetime.fromisoformat(end_time).isoformat() if end_time else None,
+        "duration_seconds": row['duration_seconds'],
+        "progress_percentage": row['progress_percentage'] or 0.0,
+        "current_step": row['current_step'] or '',
+        "total_steps": row['total_steps'] or 1,
+        "current_step_number": row['current_step_number'] or 0,
+        "details": json.loads(row['details']) if row['details'] else [],
+        "warnings": json.loads(row['warnings']) if row['warnings'] else [],
+        "errors": json.loads(row['errors']) if row['errors'] else [],
+        "result": json.loads(row['result']) if row['result'] else None,
+        "metadata": json.loads(row['metadata']) if row['metadata'] else {},
+        "user_id": row['user_id'],
+        "session_id": row['session_id'],
+        "system_info": json.loads(row['system_info']) if row['system_info'] else {}
+    }
+
+
 @dataclass
 class HistoryTrackingResult:
     """Result of history tracking operations"""
@@ -160,7 +349,8 @@ class OperationHistoryReportingSystem:
         Args:
             security_manager: Security manager for auditing
             database_path: Path to SQLite database file
-            max_history_records: Maximum number of records to keep in memory
+            max_history_records: Maximum number of recently tracked records kept
+                in memory; queries are answered by the database
         """
         self.logger = logging.getLogger(__name__)
         
@@ -173,11 +363,22 @@ class OperationHistoryReportingSystem:
         self.enable_real_time_tracking = True
         self.auto_cleanup_days = 90  # Keep records for 90 days
         
-        # Storage
-        self.operation_records: Dict[str, OperationRecord] = {}
-        self.timeline_events: List[TimelineEvent] = []
+        # Storage: the database holds the history; operation_records keeps the
+        # most recently tracked records (also returned by queries, so callers
+        # see the same objects they tracked)
+        self.operation_records: "OrderedDict[str, OperationRecord]" = OrderedDict()
+        self.timeline_events: deque = deque(maxlen=max_history_records)
         self.active_operations: Dict[str, OperationRecord] = {}
         
+        # Database connection and write batching
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending_writes: Dict[str, OperationRecord] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        
+        # Background report exports
+        self._export_executor: Optional[ThreadPoolExecutor] = None
+        self._export_jobs: Set[ReportExportJob] = set()
+        
         # Analytics cache
         self.cached_summaries: Dict[str, OperationSummary] = {}
         self.cache_expiry: Dict[str, datetime] = {}
@@ -188,9 +389,6 @@ class OperationHistoryReportingSystem:
         # Initialize database
         self._initialize_database()
         
-        # Load recent records
-        self._load_recent_records()
-        
         self.logger.info("Operation History and Reporting System initialized")
     
     def build_detailed_operation_history_tracking_and_display(self) -> HistoryTrackingResult:
@@ -212,8 +410,8 @@ class OperationHistoryReportingSystem:
             # Setup automatic cleanup
             cleanup_scheduled = self._schedule_automatic_cleanup()
             
-            # Load existing records
-            records_loaded = self._load_all_records_from_database()
+            # Count existing records (they stay in the database)
+            records_loaded = self._count_database_records()
             
             # Setup display components
             display_ready = self._setup_history_display_components()
@@ -258,6 +456,9 @@ class OperationHistoryReportingSystem:
         """
         Create report export functionality for troubleshooting
         
+        Records are streamed from the database into the output file; use
+        start_report_export to run the export in the background.
+        
         Args:
             export_format: Format for export (JSON, CSV, HTML, PDF, XML, ZIP)
             filters: Optional filters for data selection
@@ -265,71 +466,52 @@ class OperationHistoryReportingSystem:
             
         Returns:
             ReportExportResult: Result of export operation
-        """
-        try:
-            result = ReportExportResult(success=False, format=export_format)
             
-            # Apply filters to get relevant records
-            filtered_records = self._apply_export_filters(filters or {})
-            result.records_exported = len(filtered_records)
-            
-            # Generate output path if not provided
-            if not output_path:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_path = f"reports/operation_history_{timestamp}.{export_format.value}"
-            
-            # Ensure output directory exists
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        Raises:
+            ValueError: If the export format is not supported
+        """
+        job = self._create_export_job(export_format, output_path)
+        return self._run_export(job, filters or {})
+    
+    def start_report_export(self,
+                            export_format: ReportFormat,
+                            filters: Optional[Dict[str, Any]] = None,
+                            output_path: Optional[str] = None,
+                            progress_callback: Optional[Callable[[ReportExportJob], None]] = None) -> ReportExportJob:
+        """
+        Start a report export on the background export worker
+        
+        Args:
+            export_format: Format for export (JSON, CSV, HTML, PDF, XML, ZIP)
+            filters: Optional filters for data selection
+            output_path: Optional custom output path
+            progress_callback: Called with the job every EXPORT_PROGRESS_INTERVAL
+                records and once more when the export ends
             
-            # Export based on format
-            if export_format == ReportFormat.JSON:
-                success = self._export_to_json(filtered_records, output_path)
-            elif export_format == ReportFormat.CSV:
-                success = self._export_to_csv(filtered_records, output_path)
-            elif export_format == ReportFormat.HTML:
-                success = self._export_to_html(filtered_records, output_path)
-            elif export_format == ReportFormat.PDF:
-                success = self._export_to_pdf(filtered_records, output_path)
-            elif export_format == ReportFormat.XML:
-                success = self._export_to_xml(filtered_records, output_path)
-            elif export_format == ReportFormat.ZIP:
-                success = self._export_to_zip(filtered_records, output_path)
-            else:
-                raise ValueError(f"Unsupported export format: {export_format}")
+        Returns:
+            ReportExportJob: Handle to follow, cancel or wait for the export
             
-            if success:
-                result.success = True
-                result.file_path = output_path
-                result.file_size = Path(output_path).stat().st_size if Path(output_path).exists() else 0
-                
-                self.logger.info(f"Successfully exported {result.records_exported} records to {output_path}")
-                
-                # Audit export operation
-                self.security_manager.audit_critical_operation(
-                    operation="operation_history_export",
-                    component="operation_history_reporting",
-                    details={
-                        "format": export_format.value,
-                        "records_exported": result.records_exported,
-                        "file_size": result.file_size,
-                        "output_path": output_path
-                    },
-                    success=True,
-                    security_level=SecurityLevel.MEDIUM
-                )
+        Raises:
+            ValueError: If the export format is not supported
+        """
+        job = self._create_export_job(export_format, output_path, progress_callback)
+        
+        with self._lock:
+            if self._export_executor is None:
+                self._export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-export")
+            self._export_jobs.add(job)
+            future = self._export_executor.submit(self._run_export, job, dict(filters or {}))
+        
+        def finished(done: Future):
+            with self._lock:
+                self._export_jobs.discard(job)
+            if done.exception() is not None:
+                job._future.set_exception(done.exception())
             else:
-                result.error_message = f"Failed to export to {export_format.value} format"
-                self.logger.error(f"Export failed for format {export_format.value}")
-            
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Error creating report export: {e}")
-            return ReportExportResult(
-                success=False,
-                format=export_format,
-                error_message=str(e)
-            )
+                job._future.set_result(done.result())
+        
+        future.add_done_callback(finished)
+        return job
     
     def implement_operation_timeline_visualization(self, 
                                                  time_range: Optional[Tuple[datetime, datetime]] = None,
@@ -353,17 +535,23 @@ class OperationHistoryReportingSystem:
                 start_time = end_time - timedelta(days=7)  # Last 7 days
                 time_range = (start_time, end_time)
             
-            # Get filtered records
-            filtered_records = self._get_records_in_time_range(time_range, component_filter)
+            # Stream timeline events (oldest first), keeping a preview
+            preview_events: List[TimelineEvent] = []
+            event_count = 0
             
-            # Generate timeline events
-            timeline_events = self._generate_timeline_events(filtered_records, granularity)
+            def counted_events():
+                nonlocal event_count
+                for event in self._iter_timeline_events(time_range, component_filter):
+                    event_count += 1
+                    if len(preview_events) < 100:  # Limit to 100 events for performance
+                        preview_events.append(event)
+                    yield event
             
             # Create timeline buckets
-            timeline_buckets = self._create_timeline_buckets(timeline_events, time_range, granularity)
+            timeline_buckets = self._create_timeline_buckets(counted_events(), time_range, granularity)
             
             # Calculate statistics
-            timeline_stats = self._calculate_timeline_statistics(filtered_records, time_range)
+            timeline_stats = self._calculate_timeline_statistics(time_range, component_filter)
             
             # Generate visualization data
             visualization_data = {
@@ -372,7 +560,7 @@ class OperationHistoryReportingSystem:
                     "end_time": time_range[1].isoformat(),
                     "granularity": granularity.value,
                     "buckets": timeline_buckets,
-                    "total_events": len(timeline_events)
+                    "total_events": event_count
                 },
                 "statistics": timeline_stats,
                 "events": [
@@ -386,7 +574,7 @@ class OperationHistoryReportingSystem:
                         "progress": event.progress,
                         "metadata": event.metadata
                     }
-                    for event in timeline_events[:100]  # Limit to 100 events for performance
+                    for event in preview_events
                 ],
                 "filters": {
                     "time_range": [time_range[0].isoformat(), time_range[1].isoformat()],
@@ -396,7 +584,7 @@ class OperationHistoryReportingSystem:
                 "generated_at": datetime.now().isoformat()
             }
             
-            self.logger.info(f"Generated timeline visualization: {len(timeline_events)} events, {len(timeline_buckets)} buckets")
+            self.logger.info(f"Generated timeline visualization: {event_count} events, {len(timeline_buckets)} buckets")
             
             return visualization_data
             
@@ -426,6 +614,7 @@ class OperationHistoryReportingSystem:
                 
                 # Store in memory
                 self.operation_records[record.operation_id] = record
+                self.operation_records.move_to_end(record.operation_id)
                 
                 # Update active operations
                 if record.status in [OperationStatus.PENDING, OperationStatus.RUNNING]:
@@ -438,7 +627,7 @@ class OperationHistoryReportingSystem:
                 timeline_event = self._create_timeline_event(record)
                 self.timeline_events.append(timeline_event)
                 
-                # Persist to database
+                # Persist to database (batched)
                 self._save_record_to_database(record)
                 
                 # Cleanup old records if needed
@@ -454,34 +643,37 @@ class OperationHistoryReportingSystem:
     def get_operation_history(self, 
                             limit: int = 100,
                             offset: int = 0,
-                            filters: Optional[Dict[str, Any]] = None) -> List[OperationRecord]:
+                            filters: Optional[Dict[str, Any]] = None,
+                            after: Optional[Tuple[datetime, str]] = None) -> List[OperationRecord]:
         """
         Get operation history with pagination and filtering
         
+        Records are ordered newest first by (start_time, operation_id). For
+        deep pages pass the last record's (start_time, operation_id) as
+        `after` instead of an offset; the database then seeks straight to it.
+        
         Args:
             limit: Maximum number of records to return
             offset: Number of records to skip
             filters: Optional filters
+            after: Optional keyset cursor (start_time, operation_id) of the last record seen
             
         Returns:
             List[OperationRecord]: List of operation records
         """
         try:
-            with self._lock:
-                # Apply filters
-                filtered_records = list(self.operation_records.values())
-                
-                if filters:
-                    filtered_records = self._apply_history_filters(filtered_records, filters)
-                
-                # Sort by start time (newest first)
-                filtered_records.sort(key=lambda r: r.start_time, reverse=True)
-                
-                # Apply pagination
-                start_idx = offset
-                end_idx = offset + limit
-                
-                return filtered_records[start_idx:end_idx]
+            where, params = self._build_filter_clause(filters or {})
+            if after:
+                where.append("(start_time, operation_id) < (?, ?)")
+                params.extend([_db_time(after[0]), after[1]])
+            
+            sql = "SELECT operation_id FROM operation_records"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY start_time DESC, operation_id DESC LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+            
+            return self._fetch_records(self._select_ids(sql, params))
                 
         except Exception as e:
             self.logger.error(f"Error getting operation history: {e}")
@@ -501,6 +693,9 @@ class OperationHistoryReportingSystem:
             OperationSummary: Summary statistics
         """
         try:
+            # Writes pending in the batch must be visible
+            self._flush_pending_writes()
+            
             # Check cache first
             cache_key = f"{time_period}_{component_filter or 'all'}"
             if cache_key in self.cached_summaries:
@@ -521,15 +716,9 @@ class OperationHistoryReportingSystem:
             else:
                 start_time = end_time - timedelta(days=1)  # Default to 24h
             
-            # Filter records
-            filtered_records = [
-                record for record in self.operation_records.values()
-                if start_time <= record.start_time <= end_time
-                and (not component_filter or record.component_name == component_filter)
-            ]
-            
-            # Calculate summary
-            summary = self._calculate_operation_summary(filtered_records, time_period)
+            # Aggregate from the hourly rollups
+            groups = self._aggregate_time_window(start_time, end_time, component_filter)
+            summary = self._calculate_operation_summary(groups, time_period)
             
             # Cache result
             self.cached_summaries[cache_key] = summary
@@ -561,27 +750,22 @@ class OperationHistoryReportingSystem:
             search_fields = search_fields or ["title", "description", "component_name", "current_step"]
             query_lower = query.lower()
             
-            matching_records = []
+            # Search in specified fields, then in details, warnings, and errors
+            conditions = [
+                f"instr(history_lower({column}), ?) > 0"
+                for column in search_fields if column in SEARCHABLE_COLUMNS
+            ]
+            conditions.extend(
+                f"EXISTS (SELECT 1 FROM json_each(operation_records.{column}) "
+                f"WHERE instr(history_lower(json_each.value), ?) > 0)"
+                for column in ("details", "warnings", "errors")
+            )
             
-            with self._lock:
-                for record in self.operation_records.values():
-                    # Search in specified fields
-                    for field in search_fields:
-                        field_value = getattr(record, field, "")
-                        if field_value and query_lower in str(field_value).lower():
-                            matching_records.append(record)
-                            break
-                    
-                    # Search in details, warnings, and errors
-                    all_messages = record.details + record.warnings + record.errors
-                    if any(query_lower in msg.lower() for msg in all_messages):
-                        if record not in matching_records:
-                            matching_records.append(record)
+            sql = ("SELECT operation_id FROM operation_records WHERE " + " OR ".join(conditions) +
+                   " ORDER BY start_time DESC, operation_id DESC")
             
             # Sort by relevance (start time for now)
-            matching_records.sort(key=lambda r: r.start_time, reverse=True)
-            
-            return matching_records
+            return self._fetch_records(self._select_ids(sql, [query_lower] * len(conditions)))
             
         except Exception as e:
             self.logger.error(f"Error searching operations: {e}")
@@ -596,7 +780,10 @@ class OperationHistoryReportingSystem:
         """
         try:
             with self._lock:
-                total_records = len(self.operation_records)
+                self._flush_pending_writes()
+                connection = self._get_connection()
+                
+                total_records = self._count_database_records()
                 active_operations = len(self.active_operations)
                 database_size = self._get_database_size()
                 
@@ -604,26 +791,24 @@ class OperationHistoryReportingSystem:
                 recent_summary = self.get_operation_summary("24h")
                 
                 # Top components by activity
-                component_activity = defaultdict(int)
-                for record in self.operation_records.values():
-                    if record.component_name:
-                        component_activity[record.component_name] += 1
-                
-                top_components = sorted(
-                    component_activity.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:10]
+                top_components = connection.execute("""
+                    SELECT component_name, SUM(operations) AS operations
+                    FROM operation_hourly_rollups
+                    WHERE component_name != ''
+                    GROUP BY component_name
+                    HAVING operations > 0
+                    ORDER BY operations DESC, component_name
+                    LIMIT 10
+                """).fetchall()
                 
                 # Error analysis
-                error_records = [
-                    record for record in self.operation_records.values()
-                    if record.status == OperationStatus.FAILED
-                ]
-                
+                total_errors = 0
                 common_errors = defaultdict(int)
-                for record in error_records:
-                    for error in record.errors:
+                for row in connection.execute(
+                        "SELECT errors FROM operation_records WHERE status = ?",
+                        (OperationStatus.FAILED.value,)):
+                    total_errors += 1
+                    for error in json.loads(row['errors']) if row['errors'] else []:
                         # Extract error type (simplified)
                         error_type = error.split(':')[0] if ':' in error else error[:50]
                         common_errors[error_type] += 1
@@ -647,11 +832,11 @@ class OperationHistoryReportingSystem:
                         "summary": asdict(recent_summary)
                     },
                     "top_components": [
-                        {"component": comp, "operations": count}
-                        for comp, count in top_components
+                        {"component": row['component_name'], "operations": row['operations']}
+                        for row in top_components
                     ],
                     "error_analysis": {
-                        "total_errors": len(error_records),
+                        "total_errors": total_errors,
                         "common_errors": [
                             {"error_type": error, "count": count}
                             for error, count in top_errors
@@ -683,6 +868,8 @@ class OperationHistoryReportingSystem:
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
             
             with self._lock:
+                self._flush_pending_writes()
+                
                 # Remove from memory
                 old_record_ids = [
                     record_id for record_id, record in self.operation_records.items()
@@ -691,21 +878,21 @@ class OperationHistoryReportingSystem:
                 
                 for record_id in old_record_ids:
                     del self.operation_records[record_id]
+                    self.active_operations.pop(record_id, None)
                 
                 # Remove from database
-                db_cleaned = self._cleanup_database_records(cutoff_date)
+                total_cleaned = self._cleanup_database_records(cutoff_date)
                 
                 # Clean timeline events
-                self.timeline_events = [
-                    event for event in self.timeline_events
-                    if event.timestamp >= cutoff_date
-                ]
+                self.timeline_events = deque(
+                    (event for event in self.timeline_events if event.timestamp >= cutoff_date),
+                    maxlen=self.max_history_records
+                )
                 
                 # Clear cache
                 self.cached_summaries.clear()
                 self.cache_expiry.clear()
                 
-                total_cleaned = len(old_record_ids)
                 self.logger.info(f"Cleaned up {total_cleaned} old records (older than {days_to_keep} days)")
                 
                 return total_cleaned
@@ -718,6 +905,14 @@ class OperationHistoryReportingSystem:
         """Shutdown the history and reporting system"""
         self.logger.info("Shutting down Operation History and Reporting System")
         
+        # Stop running exports
+        with self._lock:
+            for job in self._export_jobs:
+                job.cancel()
+            executor, self._export_executor = self._export_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        
         # Save any pending data
         self._save_all_pending_data()
         
@@ -733,20 +928,33 @@ class OperationHistoryReportingSystem:
         try:
             Path(self.database_path).parent.mkdir(parents=True, exist_ok=True)
             
-            with sqlite3.connect(self.database_path) as conn:
-                conn.execute("PRAGMA foreign_keys = ON")
-                conn.execute("PRAGMA journal_mode = WAL")
+            self._get_connection()
+            self._create_database_schema()
                 
             self.logger.info(f"Database initialized at {self.database_path}")
             
         except Exception as e:
             self.logger.error(f"Error initializing database: {e}")
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return the persistent connection, opening it on first use"""
+        with self._lock:
+            if self._connection is None:
+                connection = sqlite3.connect(self.database_path, check_same_thread=False)
+                connection.row_factory = sqlite3.Row
+                connection.execute("PRAGMA foreign_keys = ON")
+                connection.execute("PRAGMA journal_mode = WAL")
+                connection.execute("PRAGMA synchronous = NORMAL")
+                connection.create_function("history_lower", 1, _unicode_lower, deterministic=True)
+                self._connection = connection
+            return self._connection
+    
     def _create_database_schema(self) -> bool:
         """Create database schema"""
         try:
-            with sqlite3.connect(self.database_path) as conn:
-                conn.execute("""
+            with self._lock:
+                conn = self._get_connection()
+                conn.executescript("""
                     CREATE TABLE IF NOT EXISTS operation_records (
                         operation_id TEXT PRIMARY KEY,
                         operation_type TEXT NOT NULL,
@@ -770,25 +978,104 @@ class OperationHistoryReportingSystem:
                         session_id TEXT,
                         system_info TEXT,  -- JSON
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                conn.execute("""
+                    );
+                    
+                    -- Keyset pagination order; covers id-only history queries
                     CREATE INDEX IF NOT EXISTS idx_operation_start_time 
-                    ON operation_records(start_time)
-                """)
-                
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_operation_status 
-                    ON operation_records(status)
-                """)
-                
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_operation_component 
-                    ON operation_records(component_name)
+                    ON operation_records(start_time, operation_id);
+                    
+                    -- Filtered history queries seek on the filter, then page by time
+                    DROP INDEX IF EXISTS idx_operation_status;
+                    CREATE INDEX IF NOT EXISTS idx_operation_status_start_time 
+                    ON operation_records(status, start_time, operation_id);
+                    
+                    DROP INDEX IF EXISTS idx_operation_component;
+                    CREATE INDEX IF NOT EXISTS idx_operation_component_start_time 
+                    ON operation_records(component_name, start_time, operation_id);
+                    
+                    CREATE INDEX IF NOT EXISTS idx_operation_type_start_time 
+                    ON operation_records(operation_type, start_time, operation_id);
+                    
+                    -- Per-hour counts maintained by the triggers below
+                    CREATE TABLE IF NOT EXISTS operation_hourly_rollups (
+                        hour TEXT NOT NULL,
+                        component_name TEXT NOT NULL,  -- '' when the record has none
+                        operation_type TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        operations INTEGER NOT NULL DEFAULT 0,
+                        duration_count INTEGER NOT NULL DEFAULT 0,
+                        duration_total REAL NOT NULL DEFAULT 0,
+                        PRIMARY KEY (hour, component_name, operation_type, status)
+                    ) WITHOUT ROWID;
+                    
+                    CREATE TRIGGER IF NOT EXISTS trg_operation_rollup_insert
+                    AFTER INSERT ON operation_records
+                    BEGIN
+                        INSERT INTO operation_hourly_rollups
+                            (hour, component_name, operation_type, status, operations, duration_count, duration_total)
+                        VALUES (strftime('%Y-%m-%d %H:00:00', NEW.start_time), COALESCE(NEW.component_name, ''),
+                                NEW.operation_type, NEW.status, 1,
+                                NEW.duration_seconds IS NOT NULL, COALESCE(NEW.duration_seconds, 0))
+                        ON CONFLICT (hour, component_name, operation_type, status) DO UPDATE SET
+                            operations = operations + excluded.operations,
+                            duration_count = duration_count + excluded.duration_count,
+                            duration_total = duration_total + excluded.duration_total;
+                    END;
+                    
+                    CREATE TRIGGER IF NOT EXISTS trg_operation_rollup_update
+                    AFTER UPDATE ON operation_records
+                    WHEN OLD.start_time IS NOT NEW.start_time
+                      OR OLD.component_name IS NOT NEW.component_name
+                      OR OLD.operation_type IS NOT NEW.operation_type
+                      OR OLD.status IS NOT NEW.status
+                      OR OLD.duration_seconds IS NOT NEW.duration_seconds
+                    BEGIN
+                        UPDATE operation_hourly_rollups SET
+                            operations = operations - 1,
+                            duration_count = duration_count - (OLD.duration_seconds IS NOT NULL),
+                            duration_total = duration_total - COALESCE(OLD.duration_seconds, 0)
+                        WHERE hour = strftime('%Y-%m-%d %H:00:00', OLD.start_time)
+                          AND component_name = COALESCE(OLD.component_name, '')
+                          AND operation_type = OLD.operation_type AND status = OLD.status;
+                        INSERT INTO operation_hourly_rollups
+                            (hour, component_name, operation_type, status, operations, duration_count, duration_total)
+                        VALUES (strftime('%Y-%m-%d %H:00:00', NEW.start_time), COALESCE(NEW.component_name, ''),
+                                NEW.operation_type, NEW.status, 1,
+                                NEW.duration_seconds IS NOT NULL, COALESCE(NEW.duration_seconds, 0))
+                        ON CONFLICT (hour, component_name, operation_type, status) DO UPDATE SET
+                            operations = operations + excluded.operations,
+                            duration_count = duration_count + excluded.duration_count,
+                            duration_total = duration_total + excluded.duration_total;
+                        DELETE FROM operation_hourly_rollups WHERE operations <= 0;
+                    END;
+                    
+                    CREATE TRIGGER IF NOT EXISTS trg_operation_rollup_delete
+                    AFTER DELETE ON operation_records
+                    BEGIN
+                        UPDATE operation_hourly_rollups SET
+                            operations = operations - 1,
+                            duration_count = duration_count - (OLD.duration_seconds IS NOT NULL),
+                            duration_total = duration_total - COALESCE(OLD.duration_seconds, 0)
+                        WHERE hour = strftime('%Y-%m-%d %H:00:00', OLD.start_time)
+                          AND component_name = COALESCE(OLD.component_name, '')
+                          AND operation_type = OLD.operation_type AND status = OLD.status;
+                        DELETE FROM operation_hourly_rollups WHERE operations <= 0;
+                    END;
                 """)
                 
-                conn.commit()
+                # Databases created before the rollups existed need a backfill
+                if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                    with conn:
+                        conn.execute("DELETE FROM operation_hourly_rollups")
+                        conn.execute("""
+                            INSERT INTO operation_hourly_rollups
+                                (hour, component_name, operation_type, status, operations, duration_count, duration_total)
+                            SELECT strftime('%Y-%m-%d %H:00:00', start_time), COALESCE(component_name, ''),
+                                   operation_type, status, COUNT(*), COUNT(duration_seconds), TOTAL(duration_seconds)
+                            FROM operation_records
+                            GROUP BY 1, 2, 3, 4
+                        """)
+                        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             
             return True
             
@@ -816,37 +1103,20 @@ class OperationHistoryReportingSystem:
             self.logger.error(f"Error scheduling automatic cleanup: {e}")
             return False
     
-    def _load_all_records_from_database(self) -> int:
-        """Load all records from database"""
+    def _count_database_records(self) -> int:
+        """Count records stored in the database (from the rollups)"""
         try:
-            with sqlite3.connect(self.database_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute("""
-                    SELECT * FROM operation_records 
-                    ORDER BY start_time DESC 
-                    LIMIT ?
-                """, (self.max_history_records,))
-                
-                records_loaded = 0
-                for row in cursor:
-                    record = self._row_to_operation_record(row)
-                    self.operation_records[record.operation_id] = record
-                    records_loaded += 1
-                
-                return records_loaded
+            with self._lock:
+                self._flush_pending_writes()
+                row = self._get_connection().execute(
+                    "SELECT COALESCE(SUM(operations), 0) FROM operation_hourly_rollups"
+                ).fetchone()
+                return int(row[0])
                 
         except Exception as e:
-            self.logger.error(f"Error loading records from database: {e}")
+            self.logger.error(f"Error counting records in database: {e}")
             return 0
     
-    def _load_recent_records(self):
-        """Load recent records from database"""
-        try:
-            recent_count = self._load_all_records_from_database()
-            self.logger.info(f"Loaded {recent_count} recent records from database")
-        except Exception as e:
-            self.logger.error(f"Error loading recent records: {e}")
-    
     def _setup_history_display_components(self) -> bool:
         """Setup history display components"""
         try:
@@ -866,107 +1136,166 @@ class OperationHistoryReportingSystem:
             self.logger.error(f"Error getting database size: {e}")
             return 0
     
-    def _apply_export_filters(self, filters: Dict[str, Any]) -> List[OperationRecord]:
-        """Apply filters to records for export"""
+    def _create_export_job(self, export_format: ReportFormat, output_path: Optional[str],
+                           progress_callback: Optional[Callable[[ReportExportJob], None]] = None) -> ReportExportJob:
+        """Validate the export format and create the job for it"""
+        if not isinstance(export_format, ReportFormat):
+            raise ValueError(f"Unsupported export format: {export_format}")
+        
+        # Generate output path if not provided
+        if not output_path:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = f"reports/operation_history_{timestamp}.{export_format.value}"
+        
+        return ReportExportJob(export_format, output_path, progress_callback)
+    
+    def _run_export(self, job: ReportExportJob, filters: Dict[str, Any]) -> ReportExportResult:
+        """Stream the filtered records into job.output_path"""
+        export_format = job.export_format
+        output_path = job.output_path
+        temp_path = f"{output_path}.part"
+        
+        exporters = {
+            ReportFormat.JSON: self._export_to_json,
+            ReportFormat.CSV: self._export_to_csv,
+            ReportFormat.HTML: self._export_to_html,
+            ReportFormat.PDF: self._export_to_pdf,
+            ReportFormat.XML: self._export_to_xml,
+            ReportFormat.ZIP: self._export_to_zip
+        }
+        
+        result = ReportExportResult(success=False, format=export_format)
+        connection = None
         try:
-            filtered_records = list(self.operation_records.values())
-            
-            # Apply time range filter
-            if 'start_time' in filters and 'end_time' in filters:
-                start_time = filters['start_time']
-                end_time = filters['end_time']
-                if isinstance(start_time, str):
-                    start_time = datetime.fromisoformat(start_time)
-                if isinstance(end_time, str):
-                    end_time = datetime.fromisoformat(end_time)
-                
-                filtered_records = [
-                    record for record in filtered_records
-                    if start_time <= record.start_time <= end_time
-                ]
+            # Ensure output directory exists
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
             
-            # Apply status filter
-            if 'status' in filters:
-                status_filter = filters['status']
-                if isinstance(status_filter, str):
-                    status_filter = [status_filter]
-                filtered_records = [
-                    record for record in filtered_records
-                    if record.status.value in status_filter
-                ]
+            # Read from a snapshot so the export does not block tracking
+            connection = self._open_export_connection()
+            rows = self._select_export_rows(connection, filters, job)
+            job.records_total = rows.total
             
-            # Apply component filter
-            if 'component' in filters:
-                component_filter = filters['component']
-                filtered_records = [
-                    record for record in filtered_records
-                    if record.component_name == component_filter
-                ]
+            # Export to a temporary file, published only on success
+            success = exporters[export_format](rows, temp_path)
             
-            # Apply operation type filter
-            if 'operation_type' in filters:
-                type_filter = filters['operation_type']
-                if isinstance(type_filter, str):
-                    type_filter = [type_filter]
-                filtered_records = [
-                    record for record in filtered_records
-                    if record.operation_type.value in type_filter
-                ]
+            if success:
+                os.replace(temp_path, output_path)
+                result.success = True
+                result.records_exported = job.records_written
+                result.file_path = output_path
+                result.file_size = Path(output_path).stat().st_size
+                
+                self.logger.info(f"Successfully exported {result.records_exported} records to {output_path}")
+                
+                # Audit export operation
+                self.security_manager.audit_critical_operation(
+                    operation="operation_history_export",
+                    component="operation_history_reporting",
+                    details={
+                        "format": export_format.value,
+                        "records_exported": result.records_exported,
+                        "file_size": result.file_size,
+                        "output_path": output_path
+                    },
+                    success=True,
+                    security_level=SecurityLevel.MEDIUM
+                )
+            else:
+                result.error_message = f"Failed to export to {export_format.value} format"
+                self.logger.error(f"Export failed for format {export_format.value}")
             
-            return filtered_records
+        except ExportCancelledError as e:
+            self.logger.info(str(e))
+            result.error_message = str(e)
+            
+        except Exception as e:
+            self.logger.error(f"Error creating report export: {e}")
+            result.error_message = str(e)
+            
+        finally:
+            if connection is not None:
+                connection.close()
+            if not result.success and os.path.exists(temp_path):
+                os.remove(temp_path)
+            result.records_exported = job.records_written
+            job._notify_progress()
+        
+        return result
+    
+    def _open_export_connection(self) -> sqlite3.Connection:
+        """Open a read-only connection holding a snapshot of the database"""
+        self._flush_pending_writes()
+        
+        connection = sqlite3.connect(self.database_path, isolation_level=None, check_same_thread=False)
+        try:
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA query_only = ON")
+            # In WAL mode the read transaction keeps its snapshot while tracking goes on
+            connection.execute("BEGIN")
+            return connection
+        except Exception:
+            connection.close()
+            raise
+    
+    def _apply_export_filters(self, filters: Dict[str, Any]) -> List[OperationRecord]:
+        """Apply filters to records for export"""
+        try:
+            where, params = self._build_filter_clause(filters)
+            sql = "SELECT operation_id FROM operation_records"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY start_time, operation_id"
+            
+            return self._fetch_records(self._select_ids(sql, params))
             
         except Exception as e:
             self.logger.error(f"Error applying export filters: {e}")
-            return list(self.operation_records.values())
+            return []
+    
+    def _select_export_rows(self, connection: sqlite3.Connection, filters: Dict[str, Any],
+                            job: ReportExportJob) -> _ExportRows:
+        """Apply filters for a streamed export on the snapshot connection"""
+        where, params = self._build_filter_clause(filters)
+        where_sql = " WHERE " + " AND ".join(where) if where else ""
+        return _ExportRows(connection, where_sql, params, job)
     
-    def _export_to_json(self, records: List[OperationRecord], output_path: str) -> bool:
+    def _export_to_json(self, rows: _ExportRows, output_path: str) -> bool:
         """Export records to JSON format"""
         try:
-            export_data = {
-                "export_info": {
-                    "format": "json",
-                    "exported_at": datetime.now().isoformat(),
-                    "total_records": len(records),
-                    "system": "Environment Dev - Operation History"
-                },
-                "records": [
-                    {
-                        "operation_id": record.operation_id,
-                        "operation_type": record.operation_type.value,
-                        "status": record.status.value,
-                        "component_name": record.component_name,
-                        "title": record.title,
-                        "description": record.description,
-                        "start_time": record.start_time.isoformat(),
-                        "end_time": record.end_time.isoformat() if record.end_time else None,
-                        "duration_seconds": record.duration_seconds,
-                        "progress_percentage": record.progress_percentage,
-                        "current_step": record.current_step,
-                        "total_steps": record.total_steps,
-                        "current_step_number": record.current_step_number,
-                        "details": record.details,
-                        "warnings": record.warnings,
-                        "errors": record.errors,
-                        "result": record.result,
-                        "metadata": record.metadata,
-                        "user_id": record.user_id,
-                        "session_id": record.session_id,
-                        "system_info": record.system_info
-                    }
-                    for record in records
-                ]
+            export_info = {
+                "format": "json",
+                "exported_at": datetime.now().isoformat(),
+                "total_records": rows.total,
+                "system": "Environment Dev - Operation History"
             }
             
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+                f.write('{\n  "export_info": ')
+                f.write(json.dumps(export_info, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+                f.write(',\n  "records": ')
+                self._write_json_records(rows, f, indent_level=1)
+                f.write('\n}')
             
             return True
             
+        except ExportCancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"Error exporting to JSON: {e}")
             return False
     
-    def _export_to_csv(self, records: List[OperationRecord], output_path: str) -> bool:
+    def _write_json_records(self, records, stream, indent_level: int = 0):
+        """Write records as an indented JSON array, one record at a time"""
+        prefix = '  ' * indent_level
+        separator = '[\n'
+        for record in records:
+            stream.write(separator + prefix + '  ')
+            stream.write(json.dumps(record, indent=2, ensure_ascii=False, default=str)
+                         .replace('\n', '\n' + prefix + '  '))
+            separator = ',\n'
+        stream.write('[]' if separator == '[\n' else '\n' + prefix + ']')
+    
+    def _export_to_csv(self, rows: _ExportRows, output_path: str) -> bool:
         """Export records to CSV format"""
         try:
             with open(output_path, 'w', newline='', encoding='utf-8') as f:
@@ -980,33 +1309,38 @@ class OperationHistoryReportingSystem:
                 ])
                 
                 # Write records
-                for record in records:
-                    writer.writerow([
-                        record.operation_id,
-                        record.operation_type.value,
-                        record.status.value,
-                        record.component_name or '',
-                        record.title,
-                        record.start_time.isoformat(),
-                        record.end_time.isoformat() if record.end_time else '',
-                        record.duration_seconds or '',
-                        record.progress_percentage,
-                        record.current_step,
-                        len(record.details),
-                        len(record.warnings),
-                        len(record.errors)
-                    ])
+                writer.writerows(
+                    [
+                        record['operation_id'],
+                        record['operation_type'],
+                        record['status'],
+                        record['component_name'] or '',
+                        record['title'],
+                        record['start_time'],
+                        record['end_time'] or '',
+                        record['duration_seconds'] or '',
+                        record['progress_percentage'],
+                        record['current_step'],
+                        len(record['details']),
+                        len(record['warnings']),
+                        len(record['errors'])
+                    ]
+                    for record in rows
+                )
             
             return True
             
+        except ExportCancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"Error exporting to CSV: {e}")
             return False
     
-    def _export_to_html(self, records: List[OperationRecord], output_path: str) -> bool:
+    def _export_to_html(self, rows: _ExportRows, output_path: str) -> bool:
         """Export records to HTML format"""
         try:
-            html_content = f"""
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(f"""
             <!DOCTYPE html>
             <html>
             <head>
@@ -1025,7 +1359,7 @@ class OperationHistoryReportingSystem:
             <body>
                 <h1>Operation History Report</h1>
                 <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                <p>Total Records: {len(records)}</p>
+                <p>Total Records: {rows.total}</p>
                 
                 <table>
                     <thead>
@@ -1041,42 +1375,42 @@ class OperationHistoryReportingSystem:
                         </tr>
                     </thead>
                     <tbody>
-            """
-            
-            for record in records:
-                duration_str = f"{record.duration_seconds:.1f}s" if record.duration_seconds else "N/A"
-                status_class = f"status-{record.status.value}"
+            """)
                 
-                html_content += f"""
+                for record in rows:
+                    duration_str = f"{record['duration_seconds']:.1f}s" if record['duration_seconds'] else "N/A"
+                    status_class = f"status-{record['status']}"
+                    start_time = record['start_time'][:19].replace('T', ' ')
+                    
+                    f.write(f"""
                         <tr>
-                            <td>{record.operation_id}</td>
-                            <td>{record.operation_type.value}</td>
-                            <td class="{status_class}">{record.status.value}</td>
-                            <td>{record.component_name or 'N/A'}</td>
-                            <td>{record.title}</td>
-                            <td>{record.start_time.strftime('%Y-%m-%d %H:%M:%S')}</td>
+                            <td>{record['operation_id']}</td>
+                            <td>{record['operation_type']}</td>
+                            <td class="{status_class}">{record['status']}</td>
+                            <td>{record['component_name'] or 'N/A'}</td>
+                            <td>{record['title']}</td>
+                            <td>{start_time}</td>
                             <td>{duration_str}</td>
-                            <td>{record.progress_percentage:.1f}%</td>
+                            <td>{record['progress_percentage']:.1f}%</td>
                         </tr>
-                """
-            
-            html_content += """
+                """)
+                
+                f.write("""
                     </tbody>
                 </table>
             </body>
             </html>
-            """
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            """)
             
             return True
             
+        except ExportCancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"Error exporting to HTML: {e}")
             return False
     
-    def _export_to_pdf(self, records: List[OperationRecord], output_path: str) -> bool:
+    def _export_to_pdf(self, rows: _ExportRows, output_path: str) -> bool:
         """Export records to PDF format"""
         try:
             # This would require a PDF library like reportlab
@@ -1085,81 +1419,87 @@ class OperationHistoryReportingSystem:
                 f.write("PDF Export - Operation History Report\n")
                 f.write("=" * 50 + "\n\n")
                 f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Total Records: {len(records)}\n\n")
+                f.write(f"Total Records: {rows.total}\n\n")
                 
-                for record in records:
-                    f.write(f"Operation: {record.operation_id}\n")
-                    f.write(f"Type: {record.operation_type.value}\n")
-                    f.write(f"Status: {record.status.value}\n")
-                    f.write(f"Component: {record.component_name or 'N/A'}\n")
-                    f.write(f"Title: {record.title}\n")
-                    f.write(f"Start: {record.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                for record in rows:
+                    f.write(f"Operation: {record['operation_id']}\n")
+                    f.write(f"Type: {record['operation_type']}\n")
+                    f.write(f"Status: {record['status']}\n")
+                    f.write(f"Component: {record['component_name'] or 'N/A'}\n")
+                    f.write(f"Title: {record['title']}\n")
+                    f.write(f"Start: {record['start_time'][:19].replace('T', ' ')}\n")
                     f.write("-" * 30 + "\n\n")
             
             return True
             
+        except ExportCancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"Error exporting to PDF: {e}")
             return False
     
-    def _export_to_xml(self, records: List[OperationRecord], output_path: str) -> bool:
+    def _export_to_xml(self, rows: _ExportRows, output_path: str) -> bool:
         """Export records to XML format"""
         try:
-            xml_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-            xml_content += '<operation_history>\n'
-            xml_content += f'  <export_info>\n'
-            xml_content += f'    <format>xml</format>\n'
-            xml_content += f'    <exported_at>{datetime.now().isoformat()}</exported_at>\n'
-            xml_content += f'    <total_records>{len(records)}</total_records>\n'
-            xml_content += f'  </export_info>\n'
-            xml_content += f'  <records>\n'
-            
-            for record in records:
-                xml_content += f'    <record>\n'
-                xml_content += f'      <operation_id>{record.operation_id}</operation_id>\n'
-                xml_content += f'      <operation_type>{record.operation_type.value}</operation_type>\n'
-                xml_content += f'      <status>{record.status.value}</status>\n'
-                xml_content += f'      <component_name>{record.component_name or ""}</component_name>\n'
-                xml_content += f'      <title><![CDATA[{record.title}]]></title>\n'
-                xml_content += f'      <start_time>{record.start_time.isoformat()}</start_time>\n'
-                if record.end_time:
-                    xml_content += f'      <end_time>{record.end_time.isoformat()}</end_time>\n'
-                if record.duration_seconds:
-                    xml_content += f'      <duration_seconds>{record.duration_seconds}</duration_seconds>\n'
-                xml_content += f'      <progress_percentage>{record.progress_percentage}</progress_percentage>\n'
-                xml_content += f'    </record>\n'
-            
-            xml_content += f'  </records>\n'
-            xml_content += '</operation_history>\n'
-            
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(xml_content)
+                f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+                f.write('<operation_history>\n')
+                f.write(f'  <export_info>\n')
+                f.write(f'    <format>xml</format>\n')
+                f.write(f'    <exported_at>{datetime.now().isoformat()}</exported_at>\n')
+                f.write(f'    <total_records>{rows.total}</total_records>\n')
+                f.write(f'  </export_info>\n')
+                f.write(f'  <records>\n')
+                
+                for record in rows:
+                    xml_content = f'    <record>\n'
+                    xml_content += f'      <operation_id>{record["operation_id"]}</operation_id>\n'
+                    xml_content += f'      <operation_type>{record["operation_type"]}</operation_type>\n'
+                    xml_content += f'      <status>{record["status"]}</status>\n'
+                    xml_content += f'      <component_name>{record["component_name"] or ""}</component_name>\n'
+                    xml_content += f'      <title><![CDATA[{record["title"]}]]></title>\n'
+                    xml_content += f'      <start_time>{record["start_time"]}</start_time>\n'
+                    if record["end_time"]:
+                        xml_content += f'      <end_time>{record["end_time"]}</end_time>\n'
+                    if record["duration_seconds"]:
+                        xml_content += f'      <duration_seconds>{record["duration_seconds"]}</duration_seconds>\n'
+                    xml_content += f'      <progress_percentage>{record["progress_percentage"]}</progress_percentage>\n'
+                    xml_content += f'    </record>\n'
+                    f.write(xml_content)
+                
+                f.write(f'  </records>\n')
+                f.write('</operation_history>\n')
             
             return True
             
+        except ExportCancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"Error exporting to XML: {e}")
             return False
     
-    def _export_to_zip(self, records: List[OperationRecord], output_path: str) -> bool:
+    def _export_to_zip(self, rows: _ExportRows, output_path: str) -> bool:
         """Export records to ZIP format with multiple files"""
         try:
             with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add JSON export
-                json_data = io.StringIO()
-                json.dump([asdict(record) for record in records], json_data, indent=2, default=str)
-                zipf.writestr("operation_history.json", json_data.getvalue())
+                # Add JSON export (entries are written as streams of unknown size;
+                # force_zip64 lets them grow past 2 GiB)
+                with zipf.open("operation_history.json", 'w', force_zip64=True) as entry, \
+                        io.TextIOWrapper(entry, encoding='utf-8') as json_data:
+                    self._write_json_records(rows, json_data)
                 
                 # Add CSV export
-                csv_data = io.StringIO()
-                writer = csv.writer(csv_data)
-                writer.writerow(['Operation ID', 'Type', 'Status', 'Component', 'Title', 'Start Time'])
-                for record in records:
-                    writer.writerow([
-                        record.operation_id, record.operation_type.value, record.status.value,
-                        record.component_name or '', record.title, record.start_time.isoformat()
-                    ])
-                zipf.writestr("operation_history.csv", csv_data.getvalue())
+                with zipf.open("operation_history.csv", 'w', force_zip64=True) as entry, \
+                        io.TextIOWrapper(entry, encoding='utf-8', newline='') as csv_data:
+                    writer = csv.writer(csv_data)
+                    writer.writerow(['Operation ID', 'Type', 'Status', 'Component', 'Title', 'Start Time'])
+                    writer.writerows(
+                        [
+                            record['operation_id'], record['operation_type'], record['status'],
+                            record['component_name'] or '', record['title'], record['start_time']
+                        ]
+                        for record in rows.iterate(track_progress=False)
+                    )
                 
                 # Add summary report
                 summary_data = f"""
@@ -1167,82 +1507,82 @@ Operation History Export Summary
 ================================
 
 Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Total Records: {len(records)}
+Total Records: {rows.total}
 
 Status Distribution:
 """
-                status_counts = defaultdict(int)
-                for record in records:
-                    status_counts[record.status.value] += 1
-                
-                for status, count in status_counts.items():
+                for status, count in rows.status_counts().items():
                     summary_data += f"  {status}: {count}\n"
                 
                 zipf.writestr("summary.txt", summary_data)
             
             return True
             
+        except ExportCancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"Error exporting to ZIP: {e}")
             return False
     
-    def _get_records_in_time_range(self, time_range: Tuple[datetime, datetime], 
-                                  component_filter: Optional[str] = None) -> List[OperationRecord]:
-        """Get records within time range"""
+    def _iter_timeline_events(self, time_range: Tuple[datetime, datetime],
+                              component_filter: Optional[str] = None):
+        """Yield start/finish events of the records in a time range, oldest first"""
         start_time, end_time = time_range
+        condition = "start_time >= ? AND start_time <= ?"
+        params = [_db_time(start_time), _db_time(end_time)]
+        if component_filter:
+            condition += " AND component_name = ?"
+            params.append(component_filter)
         
-        filtered_records = [
-            record for record in self.operation_records.values()
-            if start_time <= record.start_time <= end_time
-            and (not component_filter or record.component_name == component_filter)
-        ]
+        columns = ("operation_id, operation_type, status, component_name, title, description, "
+                   "duration_seconds, progress_percentage")
+        sql = f"""
+            SELECT start_time AS ts, 0 AS is_end, {columns}
+            FROM operation_records WHERE {condition}
+            UNION ALL
+            SELECT end_time AS ts, 1 AS is_end, {columns}
+            FROM operation_records WHERE end_time IS NOT NULL AND {condition}
+            ORDER BY ts, operation_id, is_end
+        """
         
-        return filtered_records
-    
-    def _generate_timeline_events(self, records: List[OperationRecord], 
-                                granularity: TimelineGranularity) -> List[TimelineEvent]:
-        """Generate timeline events from records"""
-        events = []
+        with self._lock:
+            self._flush_pending_writes()
+            rows = self._get_connection().execute(sql, params + params).fetchall()
         
-        for record in records:
-            # Start event
-            events.append(TimelineEvent(
-                timestamp=record.start_time,
-                operation_id=record.operation_id,
-                event_type="start",
-                title=f"Started: {record.title}",
-                description=record.description,
-                component=record.component_name,
-                progress=0.0,
-                metadata={"operation_type": record.operation_type.value}
-            ))
-            
-            # End event (if completed)
-            if record.end_time:
-                events.append(TimelineEvent(
-                    timestamp=record.end_time,
-                    operation_id=record.operation_id,
-                    event_type="complete" if record.status == OperationStatus.COMPLETED else "error",
-                    title=f"Finished: {record.title}",
-                    description=f"Status: {record.status.value}",
-                    component=record.component_name,
-                    progress=record.progress_percentage,
+        for row in rows:
+            if not row['is_end']:
+                # Start event
+                yield TimelineEvent(
+                    timestamp=datetime.fromisoformat(row['ts']),
+                    operation_id=row['operation_id'],
+                    event_type="start",
+                    title=f"Started: {row['title'] or ''}",
+                    description=row['description'] or '',
+                    component=row['component_name'],
+                    progress=0.0,
+                    metadata={"operation_type": row['operation_type']}
+                )
+            else:
+                # End event (if completed)
+                yield TimelineEvent(
+                    timestamp=datetime.fromisoformat(row['ts']),
+                    operation_id=row['operation_id'],
+                    event_type="complete" if row['status'] == OperationStatus.COMPLETED.value else "error",
+                    title=f"Finished: {row['title'] or ''}",
+                    description=f"Status: {row['status']}",
+                    component=row['component_name'],
+                    progress=row['progress_percentage'] or 0.0,
                     metadata={
-                        "operation_type": record.operation_type.value,
-                        "duration": record.duration_seconds,
-                        "status": record.status.value
+                        "operation_type": row['operation_type'],
+                        "duration": row['duration_seconds'],
+                        "status": row['status']
                     }
-                ))
-        
-        # Sort by timestamp
-        events.sort(key=lambda e: e.timestamp)
-        
-        return events
+                )
     
-    def _create_timeline_buckets(self, events: List[TimelineEvent], 
+    def _create_timeline_buckets(self, events, 
                                time_range: Tuple[datetime, datetime],
                                granularity: TimelineGranularity) -> List[Dict[str, Any]]:
-        """Create timeline buckets for visualization"""
+        """Create timeline buckets for visualization in one pass over time-ordered events"""
         start_time, end_time = time_range
         buckets = []
         
@@ -1262,81 +1602,72 @@ Status Distribution:
         current_time = start_time
         while current_time < end_time:
             bucket_end = min(current_time + delta, end_time)
-            
-            # Count events in this bucket
-            bucket_events = [
-                event for event in events
-                if current_time <= event.timestamp < bucket_end
-            ]
-            
-            # Categorize events
-            event_counts = defaultdict(int)
-            for event in bucket_events:
-                event_counts[event.event_type] += 1
-            
             buckets.append({
                 "start_time": current_time.isoformat(),
                 "end_time": bucket_end.isoformat(),
-                "total_events": len(bucket_events),
-                "event_counts": dict(event_counts),
-                "events": [
-                    {
-                        "timestamp": event.timestamp.isoformat(),
-                        "operation_id": event.operation_id,
-                        "event_type": event.event_type,
-                        "title": event.title,
-                        "component": event.component
-                    }
-                    for event in bucket_events[:5]  # Limit to 5 events per bucket
-                ]
+                "total_events": 0,
+                "event_counts": {},
+                "events": []
             })
-            
             current_time = bucket_end
         
+        # Bucket index is arithmetic on the offset from the range start
+        for event in events:
+            if not start_time <= event.timestamp < end_time:
+                continue
+            
+            bucket = buckets[(event.timestamp - start_time) // delta]
+            bucket["total_events"] += 1
+            bucket["event_counts"][event.event_type] = bucket["event_counts"].get(event.event_type, 0) + 1
+            
+            if len(bucket["events"]) < 5:  # Limit to 5 events per bucket
+                bucket["events"].append({
+                    "timestamp": event.timestamp.isoformat(),
+                    "operation_id": event.operation_id,
+                    "event_type": event.event_type,
+                    "title": event.title,
+                    "component": event.component
+                })
+        
         return buckets
     
-    def _calculate_timeline_statistics(self, records: List[OperationRecord], 
-                                     time_range: Tuple[datetime, datetime]) -> Dict[str, Any]:
+    def _calculate_timeline_statistics(self, time_range: Tuple[datetime, datetime],
+                                     component_filter: Optional[str] = None) -> Dict[str, Any]:
         """Calculate statistics for timeline"""
-        if not records:
+        summary = self._calculate_operation_summary(
+            self._aggregate_time_window(time_range[0], time_range[1], component_filter), ""
+        )
+        if not summary.total_operations:
             return {}
         
-        # Basic counts
-        total_operations = len(records)
-        completed_operations = len([r for r in records if r.status == OperationStatus.COMPLETED])
-        failed_operations = len([r for r in records if r.status == OperationStatus.FAILED])
-        
         # Duration statistics
-        completed_records = [r for r in records if r.duration_seconds is not None]
-        if completed_records:
-            durations = [r.duration_seconds for r in completed_records]
-            avg_duration = sum(durations) / len(durations)
-            min_duration = min(durations)
-            max_duration = max(durations)
-        else:
-            avg_duration = min_duration = max_duration = 0
+        condition = "start_time >= ? AND start_time <= ?"
+        params = [_db_time(time_range[0]), _db_time(time_range[1])]
+        if component_filter:
+            condition += " AND component_name = ?"
+            params.append(component_filter)
         
-        # Operations by type
-        operations_by_type = defaultdict(int)
-        for record in records:
-            operations_by_type[record.operation_type.value] += 1
+        with self._lock:
+            min_duration, max_duration = self._get_connection().execute(
+                f"SELECT MIN(duration_seconds), MAX(duration_seconds) FROM operation_records WHERE {condition}",
+                params
+            ).fetchone()
         
-        # Operations by component
-        operations_by_component = defaultdict(int)
-        for record in records:
-            if record.component_name:
-                operations_by_component[record.component_name] += 1
+        if min_duration is None:
+            avg_duration = min_duration = max_duration = 0
+        else:
+            avg_duration = summary.average_duration
         
         return {
-            "total_operations": total_operations,
-            "completed_operations": completed_operations,
-            "failed_operations": failed_operations,
-            "success_rate": (completed_operations / total_operations * 100) if total_operations > 0 else 0,
+            "total_operations": summary.total_operations,
+            "completed_operations": summary.completed_operations,
+            "failed_operations": summary.failed_operations,
+            "success_rate": summary.success_rate,
             "average_duration": avg_duration,
             "min_duration": min_duration,
             "max_duration": max_duration,
-            "operations_by_type": dict(operations_by_type),
-            "operations_by_component": dict(operations_by_component),
+            "operations_by_type": summary.operations_by_type,
+            "operations_by_component": summary.operations_by_component,
             "time_range": {
                 "start": time_range[0].isoformat(),
                 "end": time_range[1].isoformat(),
@@ -1412,84 +1743,124 @@ Status Distribution:
         )
     
     def _save_record_to_database(self, record: OperationRecord):
-        """Save operation record to database"""
-        try:
-            with sqlite3.connect(self.database_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO operation_records (
-                        operation_id, operation_type, status, component_name, title, description,
-                        start_time, end_time, duration_seconds, progress_percentage, current_step,
-                        total_steps, current_step_number, details, warnings, errors, result,
-                        metadata, user_id, session_id, system_info
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    record.operation_id, record.operation_type.value, record.status.value,
-                    record.component_name, record.title, record.description,
-                    record.start_time, record.end_time, record.duration_seconds,
-                    record.progress_percentage, record.current_step, record.total_steps,
-                    record.current_step_number, json.dumps(record.details),
-                    json.dumps(record.warnings), json.dumps(record.errors),
-                    json.dumps(record.result), json.dumps(record.metadata),
-                    record.user_id, record.session_id, json.dumps(record.system_info)
-                ))
-                conn.commit()
-                
-        except Exception as e:
-            self.logger.error(f"Error saving record to database: {e}")
+        """Queue an operation record for the next batched database write"""
+        with self._lock:
+            # Later updates of the same operation replace the queued one
+            self._pending_writes[record.operation_id] = record
+            
+            if len(self._pending_writes) >= WRITE_BATCH_SIZE:
+                self._flush_pending_writes()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(WRITE_BATCH_INTERVAL, self._flush_pending_writes)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
     
-    def _cleanup_old_records(self):
-        """Cleanup old records from memory"""
-        try:
-            # Remove oldest records if we exceed the limit
-            if len(self.operation_records) > self.max_history_records:
-                # Sort by start time and keep the newest records
-                sorted_records = sorted(
-                    self.operation_records.items(),
-                    key=lambda x: x[1].start_time,
-                    reverse=True
-                )
+    def _flush_pending_writes(self):
+        """Write all queued records in a single transaction"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            
+            if not self._pending_writes:
+                return
+            
+            rows = []
+            for record in list(self._pending_writes.values()):
+                try:
+                    rows.append(self._record_to_row(record))
+                except Exception as e:
+                    # Would fail again on every retry
+                    del self._pending_writes[record.operation_id]
+                    self.logger.error(f"Error saving record {record.operation_id} to database: {e}")
+            
+            updates = ", ".join(f"{column} = excluded.{column}" for column in RECORD_COLUMNS[1:])
+            try:
+                with self._get_connection() as conn:
+                    conn.executemany(f"""
+                        INSERT INTO operation_records ({", ".join(RECORD_COLUMNS)})
+                        VALUES ({", ".join("?" * len(RECORD_COLUMNS))})
+                        ON CONFLICT(operation_id) DO UPDATE SET {updates}
+                    """, rows)
                 
-                # Keep only the newest records
-                records_to_keep = dict(sorted_records[:self.max_history_records])
-                self.operation_records = records_to_keep
+                # Only committed records leave the queue
+                self._pending_writes.clear()
                 
-                self.logger.info(f"Cleaned up old records, keeping {len(records_to_keep)} newest records")
+                # Summaries include the new rows from now on
+                self.cached_summaries.clear()
+                self.cache_expiry.clear()
                 
-        except Exception as e:
-            self.logger.error(f"Error cleaning up old records: {e}")
+            except Exception as e:
+                # Records stay queued and are retried by the next save, query or shutdown
+                self.logger.error(f"Error saving {len(rows)} records to database, will retry: {e}")
+    
+    def _record_to_row(self, record: OperationRecord) -> Tuple[Any, ...]:
+        """Convert an OperationRecord to statement parameters (RECORD_COLUMNS order)"""
+        return (
+            record.operation_id, record.operation_type.value, record.status.value,
+            record.component_name, record.title, record.description,
+            _db_time(record.start_time), _db_time(record.end_time) if record.end_time else None,
+            record.duration_seconds, record.progress_percentage, record.current_step,
+            record.total_steps, record.current_step_number, json.dumps(record.details),
+            json.dumps(record.warnings), json.dumps(record.errors),
+            json.dumps(record.result), json.dumps(record.metadata),
+            record.user_id, record.session_id, json.dumps(record.system_info)
+        )
+    
+    def _select_ids(self, sql: str, params: List[Any]) -> List[str]:
+        """Run an id-only query (answered from the covering indexes)"""
+        with self._lock:
+            self._flush_pending_writes()
+            return [row[0] for row in self._get_connection().execute(sql, params)]
+    
+    def _fetch_records(self, operation_ids: List[str]) -> List[OperationRecord]:
+        """Load records by id, keeping order and reusing records still in memory"""
+        records = {
+            operation_id: self.operation_records[operation_id]
+            for operation_id in operation_ids if operation_id in self.operation_records
+        }
+        missing = [operation_id for operation_id in operation_ids if operation_id not in records]
+        
+        with self._lock:
+            connection = self._get_connection()
+            for i in range(0, len(missing), FETCH_BATCH_SIZE):
+                batch = missing[i:i + FETCH_BATCH_SIZE]
+                rows = connection.execute(
+                    f"SELECT * FROM operation_records WHERE operation_id IN ({', '.join('?' * len(batch))})",
+                    batch
+                )
+                for row in rows:
+                    records[row['operation_id']] = self._row_to_operation_record(row)
+        
+        return [records[operation_id] for operation_id in operation_ids if operation_id in records]
     
-    def _apply_history_filters(self, records: List[OperationRecord], 
-                             filters: Dict[str, Any]) -> List[OperationRecord]:
-        """Apply filters to history records"""
-        filtered_records = records
+    def _build_filter_clause(self, filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Translate history/export filters into SQL conditions and parameters"""
+        where = []
+        params = []
         
         # Status filter
         if 'status' in filters:
             status_filter = filters['status']
             if isinstance(status_filter, str):
                 status_filter = [status_filter]
-            filtered_records = [
-                record for record in filtered_records
-                if record.status.value in status_filter
-            ]
+            status_filter = list(status_filter)
+            where.append(f"status IN ({', '.join('?' * len(status_filter))})")
+            params.extend(status_filter)
         
         # Component filter
         if 'component' in filters:
-            component_filter = filters['component']
-            filtered_records = [
-                record for record in filtered_records
-                if record.component_name == component_filter
-            ]
+            where.append("component_name IS ?")
+            params.append(filters['component'])
         
         # Operation type filter
         if 'operation_type' in filters:
             type_filter = filters['operation_type']
             if isinstance(type_filter, str):
                 type_filter = [type_filter]
-            filtered_records = [
-                record for record in filtered_records
-                if record.operation_type.value in type_filter
-            ]
+            type_filter = list(type_filter)
+            where.append(f"operation_type IN ({', '.join('?' * len(type_filter))})")
+            params.extend(type_filter)
         
         # Time range filter
         if 'start_time' in filters and 'end_time' in filters:
@@ -1500,57 +1871,103 @@ Status Distribution:
             if isinstance(end_time, str):
                 end_time = datetime.fromisoformat(end_time)
             
-            filtered_records = [
-                record for record in filtered_records
-                if start_time <= record.start_time <= end_time
-            ]
+            where.append("start_time >= ? AND start_time <= ?")
+            params.extend([_db_time(start_time), _db_time(end_time)])
         
-        return filtered_records
+        return where, params
     
-    def _calculate_operation_summary(self, records: List[OperationRecord], 
-                                   time_period: str) -> OperationSummary:
-        """Calculate operation summary from records"""
-        if not records:
-            return OperationSummary(time_period=time_period)
+    def _aggregate_time_window(self, start_time: datetime, end_time: datetime,
+                               component_filter: Optional[str] = None) -> List[Tuple[str, str, str, int, int, float]]:
+        """
+        Count operations started in [start_time, end_time] per component, type and status
         
-        total_operations = len(records)
-        completed_operations = len([r for r in records if r.status == OperationStatus.COMPLETED])
-        failed_operations = len([r for r in records if r.status == OperationStatus.FAILED])
-        cancelled_operations = len([r for r in records if r.status == OperationStatus.CANCELLED])
+        Whole hours come from the rollup table; only the partial hours at the
+        edges of the window are counted from operation_records.
         
-        # Calculate average duration
-        completed_records = [r for r in records if r.duration_seconds is not None]
-        average_duration = (
-            sum(r.duration_seconds for r in completed_records) / len(completed_records)
-            if completed_records else 0.0
-        )
+        Returns:
+            List of (component_name, operation_type, status, operations,
+            duration_count, duration_total); component_name is '' when unset
+        """
+        first_hour = start_time.replace(minute=0, second=0, microsecond=0)
+        if first_hour < start_time:
+            first_hour += timedelta(hours=1)
+        last_hour = end_time.replace(minute=0, second=0, microsecond=0)
         
-        # Calculate success rate
-        success_rate = (completed_operations / total_operations * 100) if total_operations > 0 else 0.0
+        group_columns = "COALESCE(component_name, ''), operation_type, status"
+        raw_select = (f"SELECT {group_columns}, COUNT(*), COUNT(duration_seconds), TOTAL(duration_seconds) "
+                      f"FROM operation_records WHERE ")
+        component_condition = " AND component_name = ?" if component_filter else ""
+        component_params = [component_filter] if component_filter else []
         
-        # Group by type
-        operations_by_type = defaultdict(int)
-        for record in records:
-            operations_by_type[record.operation_type.value] += 1
+        queries = []
+        if first_hour >= last_hour:
+            queries.append((raw_select + "start_time >= ? AND start_time <= ?" + component_condition +
+                            f" GROUP BY {group_columns}",
+                            [_db_time(start_time), _db_time(end_time)] + component_params))
+        else:
+            queries.append((raw_select + "((start_time >= ? AND start_time < ?) OR (start_time >= ? AND start_time <= ?))" +
+                            component_condition + f" GROUP BY {group_columns}",
+                            [_db_time(start_time), _db_time(first_hour),
+                             _db_time(last_hour), _db_time(end_time)] + component_params))
+            queries.append(("SELECT component_name, operation_type, status, SUM(operations), "
+                            "SUM(duration_count), TOTAL(duration_total) FROM operation_hourly_rollups "
+                            "WHERE hour >= ? AND hour < ?" + component_condition +
+                            " GROUP BY component_name, operation_type, status",
+                            [first_hour.strftime(ROLLUP_HOUR_FORMAT), last_hour.strftime(ROLLUP_HOUR_FORMAT)] +
+                            component_params))
         
-        # Group by component
+        with self._lock:
+            self._flush_pending_writes()
+            connection = self._get_connection()
+            return [tuple(row) for sql, params in queries for row in connection.execute(sql, params)]
+    
+    def _cleanup_old_records(self):
+        """Drop the least recently tracked records from memory"""
+        try:
+            # Active operations stay reachable through active_operations
+            evicted = 0
+            while len(self.operation_records) > self.max_history_records:
+                self.operation_records.popitem(last=False)
+                evicted += 1
+            
+            if evicted:
+                self.logger.debug(f"Evicted {evicted} records from memory, keeping {len(self.operation_records)}")
+                
+        except Exception as e:
+            self.logger.error(f"Error cleaning up old records: {e}")
+    
+    def _calculate_operation_summary(self, groups: List[Tuple[str, str, str, int, int, float]], 
+                                   time_period: str) -> OperationSummary:
+        """Calculate operation summary from aggregated (component, type, status) groups"""
+        operations_by_type = defaultdict(int)
         operations_by_component = defaultdict(int)
-        for record in records:
-            if record.component_name:
-                operations_by_component[record.component_name] += 1
-        
-        # Group by status
         operations_by_status = defaultdict(int)
-        for record in records:
-            operations_by_status[record.status.value] += 1
+        duration_count = 0
+        duration_total = 0.0
+        
+        for component_name, operation_type, status, operations, durations, total in groups:
+            if not operations:
+                continue
+            operations_by_type[operation_type] += operations
+            if component_name:
+                operations_by_component[component_name] += operations
+            operations_by_status[status] += operations
+            duration_count += durations
+            duration_total += total
+        
+        total_operations = sum(operations_by_status.values())
+        if not total_operations:
+            return OperationSummary(time_period=time_period)
+        
+        completed_operations = operations_by_status.get(OperationStatus.COMPLETED.value, 0)
         
         return OperationSummary(
             total_operations=total_operations,
             completed_operations=completed_operations,
-            failed_operations=failed_operations,
-            cancelled_operations=cancelled_operations,
-            average_duration=average_duration,
-            success_rate=success_rate,
+            failed_operations=operations_by_status.get(OperationStatus.FAILED.value, 0),
+            cancelled_operations=operations_by_status.get(OperationStatus.CANCELLED.value, 0),
+            average_duration=duration_total / duration_count if duration_count else 0.0,
+            success_rate=completed_operations / total_operations * 100,
             operations_by_type=dict(operations_by_type),
             operations_by_component=dict(operations_by_component),
             operations_by_status=dict(operations_by_status),
@@ -1586,14 +2003,12 @@ Status Distribution:
     def _cleanup_database_records(self, cutoff_date: datetime) -> int:
         """Cleanup old records from database"""
         try:
-            with sqlite3.connect(self.database_path) as conn:
+            with self._lock, self._get_connection() as conn:
                 cursor = conn.execute(
                     "DELETE FROM operation_records WHERE start_time < ?",
-                    (cutoff_date,)
+                    (_db_time(cutoff_date),)
                 )
-                deleted_count = cursor.rowcount
-                conn.commit()
-                return deleted_count
+                return cursor.rowcount
                 
         except Exception as e:
             self.logger.error(f"Error cleaning up database records: {e}")
@@ -1602,16 +2017,17 @@ Status Distribution:
     def _save_all_pending_data(self):
         """Save any pending data to database"""
         try:
-            # This would save any unsaved data
-            pass
+            self._flush_pending_writes()
         except Exception as e:
             self.logger.error(f"Error saving pending data: {e}")
     
     def _close_database_connection(self):
         """Close database connection"""
         try:
-            # This would close any open database connections
-            pass
+            with self._lock:
+                if self._connection is not None:
+                    self._connection.close()
+                    self._connection = None
         except Exception as e:
             self.logger.error(f"Error closing database connection: {e}")
 
@@ -6,7 +6,6 @@ Verifica a integridade de componentes após a instalação usando checksums e va
 """
 
 import logging
-import hashlib
 import os
 import json
 import subprocess
@@ -18,6 +17,8 @@ from pathlib import Path
 import winreg
 import psutil
 
+from utils.hash_utils import hashing_service
+
 class IntegrityStatus(Enum):
     """Status de integridade"""
     VALID = "valid"
@@ -577,13 +578,7 @@ class PostInstallationIntegrityChecker:
     
     def _calculate_file_hash(self, file_path: str, algorithm: str = 'sha256') -> str:
         """Calcula hash de um arquivo"""
-        hash_obj = hashlib.new(algorithm)
-        
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_obj.update(chunk)
-        
-        return hash_obj.hexdigest()
+        return hashing_service.hash_file(file_path, algorithm)[algorithm.lower()]
     
     def _analyze_integrity_results(self, component_name: str, 
                                  results: List[IntegrityResult]) -> ComponentIntegrityReport:
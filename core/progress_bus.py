@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Barramento de eventos de progresso
+Agrega as atualizações de bytes de cada operação (download, instalação) e
+publica no máximo um evento por intervalo configurado, com velocidade
+suavizada (EWMA) e ETA calculados uma única vez por tick. Os assinantes
+(GUI, notificações, histórico) recebem apenas os eventos publicados.
+"""
+
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Intervalo mínimo entre eventos de uma mesma operação (segundos)
+DEFAULT_PUBLISH_INTERVAL = 0.25
+
+# Constante de tempo da média móvel exponencial da velocidade (segundos)
+DEFAULT_SPEED_SMOOTHING = 3.0
+
+# Eventos mantidos por operação em ProgressHistory
+DEFAULT_HISTORY_SIZE = 120
+
+# Status de operação
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+
+@dataclass
+class ProgressEvent:
+    """Progresso publicado de uma operação"""
+    operation_id: str
+    bytes_done: int
+    total_bytes: int
+    speed: float  # bytes/segundo (EWMA)
+    eta: Optional[float]  # segundos, None se desconhecido
+    elapsed: float
+    status: str = STATUS_RUNNING
+    message: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def percentage(self) -> float:
+        if self.total_bytes > 0:
+            return min(self.bytes_done / self.total_bytes * 100, 100.0)
+        return 100.0 if self.status == STATUS_COMPLETED else 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status != STATUS_RUNNING
+
+
+class _OperationState:
+    """Contadores de uma operação entre dois ticks"""
+    __slots__ = ('start', 'total_bytes', 'bytes_done', 'last_publish', 'last_bytes', 'speed', 'metadata')
+
+    def __init__(self, now: float, total_bytes: int, metadata: Dict[str, Any]):
+        self.start = now
+        self.total_bytes = total_bytes
+        self.bytes_done = 0
+        self.last_publish = now
+        self.last_bytes = 0
+        self.speed = 0.0
+        self.metadata = metadata
+
+
+class ProgressBus:
+    """
+    Barramento de progresso com limitação de taxa por operação.
+
+    ``report`` é chamado no laço de leitura e custa um ``time.monotonic()``
+    e uma comparação quando não há tick; só quando o intervalo da operação
+    expira o evento é montado e entregue aos assinantes.
+    """
+
+    def __init__(self, publish_interval: float = DEFAULT_PUBLISH_INTERVAL,
+                 speed_smoothing: float = DEFAULT_SPEED_SMOOTHING,
+                 clock: Callable[[], float] = time.monotonic):
+        self.publish_interval = publish_interval
+        self.speed_smoothing = speed_smoothing
+        self._clock = clock
+        self._operations: Dict[str, _OperationState] = {}
+        self._subscribers: Dict[int, tuple] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+        self.stats = {"reported": 0, "published": 0}
+
+    def subscribe(self, callback: Callable[[ProgressEvent], None],
+                  operation_id: Optional[str] = None) -> int:
+        """
+        Registra um assinante
+
+        Args:
+            callback: Recebe cada ProgressEvent publicado
+            operation_id: Restringe a uma operação (None = todas)
+
+        Returns:
+            int: Token para ``unsubscribe``
+        """
+        with self._lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = (operation_id, callback)
+            return self._next_token
+
+    def unsubscribe(self, token: int) -> None:
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def begin(self, operation_id: str, total_bytes: int = 0, **metadata) -> ProgressEvent:
+        """Inicia (ou reinicia) uma operação e publica o evento inicial"""
+        now = self._clock()
+        with self._lock:
+            state = _OperationState(now, total_bytes, metadata)
+            self._operations[operation_id] = state
+            event = self._build_event(operation_id, state, now, STATUS_RUNNING, "")
+        self._publish(event)
+        return event
+
+    def report(self, operation_id: str, bytes_done: int, total_bytes: Optional[int] = None,
+               message: str = "") -> Optional[ProgressEvent]:
+        """
+        Atualiza os bytes acumulados de uma operação
+
+        Returns:
+            ProgressEvent se um tick foi publicado, senão None
+        """
+        now = self._clock()
+        with self._lock:
+            self.stats["reported"] += 1
+            state = self._operations.get(operation_id)
+            if state is None:
+                state = _OperationState(now, total_bytes or 0, {})
+                self._operations[operation_id] = state
+            state.bytes_done = bytes_done
+            if total_bytes:
+                state.total_bytes = total_bytes
+            if now - state.last_publish < self.publish_interval:
+                return None
+            self._update_speed(state, now)
+            event = self._build_event(operation_id, state, now, STATUS_RUNNING, message)
+        self._publish(event)
+        return event
+
+    def finish(self, operation_id: str, status: str = STATUS_COMPLETED, message: str = "",
+               bytes_done: Optional[int] = None) -> Optional[ProgressEvent]:
+        """Publica o evento final (sem limitação de taxa) e esquece a operação"""
+        now = self._clock()
+        with self._lock:
+            state = self._operations.pop(operation_id, None)
+            if state is None:
+                return None
+            if bytes_done is not None:
+                state.bytes_done = bytes_done
+            elapsed = now - state.start
+            # Velocidade final é a média da operação inteira
+            state.speed = state.bytes_done / elapsed if elapsed > 0 else state.speed
+            event = self._build_event(operation_id, state, now, status, message)
+        self._publish(event)
+        return event
+
+    def active_operations(self) -> List[str]:
+        with self._lock:
+            return list(self._operations)
+
+    def _update_speed(self, state: _OperationState, now: float) -> None:
+        interval = now - state.last_publish
+        if interval <= 0:
+            return
+        instantaneous = (state.bytes_done - state.last_bytes) / interval
+        if state.last_bytes == 0 and state.speed == 0.0:
+            state.speed = instantaneous
+        else:
+            # Peso proporcional ao tempo decorrido, independente da taxa de ticks
+            alpha = 1.0 - math.exp(-interval / self.speed_smoothing)
+            state.speed += alpha * (instantaneous - state.speed)
+        state.last_publish = now
+        state.last_bytes = state.bytes_done
+
+    def _build_event(self, operation_id: str, state: _OperationState, now: float,
+                     status: str, message: str) -> ProgressEvent:
+        eta = None
+        if status == STATUS_RUNNING and state.total_bytes > 0 and state.speed > 0:
+            eta = max(state.total_bytes - state.bytes_done, 0) / state.speed
+        elif status != STATUS_RUNNING:
+            eta = 0.0
+        return ProgressEvent(
+            operation_id=operation_id,
+            bytes_done=state.bytes_done,
+            total_bytes=state.total_bytes,
+            speed=state.speed,
+            eta=eta,
+            elapsed=now - state.start,
+            status=status,
+            message=message,
+            metadata=state.metadata
+        )
+
+    def _publish(self, event: ProgressEvent) -> None:
+        with self._lock:
+            self.stats["published"] += 1
+            subscribers = list(self._subscribers.values())
+        for operation_id, callback in subscribers:
+            if operation_id is not None and operation_id != event.operation_id:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                # Assinantes com erro não podem interromper o download
+                logger.debug(f"Erro em assinante de progresso: {e}")
+
+
+class ProgressHistory:
+    """Assinante que guarda os últimos eventos publicados de cada operação"""
+
+    def __init__(self, max_events: int = DEFAULT_HISTORY_SIZE):
+        self.max_events = max_events
+        self._events: Dict[str, Deque[ProgressEvent]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ProgressEvent) -> None:
+        with self._lock:
+            events = self._events.get(event.operation_id)
+            if events is None:
+                events = self._events[event.operation_id] = deque(maxlen=self.max_events)
+            events.append(event)
+
+    def events(self, operation_id: str) -> List[ProgressEvent]:
+        with self._lock:
+            return list(self._events.get(operation_id, ()))
+
+    def latest(self, operation_id: str) -> Optional[ProgressEvent]:
+        with self._lock:
+            events = self._events.get(operation_id)
+            return events[-1] if events else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+
+def new_operation_id(kind: str = "download") -> str:
+    """
+    Gera um operation_id único por operação
+
+    Dois downloads simultâneos da mesma URL recebem ids diferentes e não
+    misturam seus bytes no barramento.
+    """
+    return f"{kind}:{uuid.uuid4().hex}"
+
+
+# Instância global
+_progress_bus: Optional[ProgressBus] = None
+_progress_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Obtém a instância global do barramento de progresso"""
+    global _progress_bus
+    if _progress_bus is None:
+        with _progress_bus_lock:
+            if _progress_bus is None:
+                _progress_bus = ProgressBus()
+    return _progress_bus
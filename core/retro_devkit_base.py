@@ -7,7 +7,6 @@ import json
 import subprocess
 import shutil
 import urllib.request
-import zipfile
 import platform
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
@@ -15,6 +14,8 @@ import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
+from utils.extractor import extraction_engine
+
 @dataclass
 class DevkitInfo:
     """Informações básicas de um devkit"""
@@ -132,32 +133,16 @@ class RetroDevkitManager(ABC):
             
     def extract_archive(self, archive_path: Path, destination: Path) -> bool:
         """Extrai arquivo compactado"""
-        try:
-            self.logger.info(f"Extraindo {archive_path} para {destination}")
-            
-            if archive_path.suffix.lower() == '.zip':
-                with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                    zip_ref.extractall(destination)
-            elif archive_path.suffix.lower() in ['.7z']:
-                # Para arquivos 7z, usar 7zip se disponível
-                result = subprocess.run(
-                    ['7z', 'x', str(archive_path), f'-o{destination}'],
-                    capture_output=True, text=True
-                )
-                if result.returncode != 0:
-                    self.logger.error(f"Erro ao extrair 7z: {result.stderr}")
-                    return False
-            else:
-                self.logger.error(f"Formato de arquivo não suportado: {archive_path.suffix}")
-                return False
-                
-            self.logger.info(f"Extração concluída: {destination}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Erro na extração de {archive_path}: {e}")
+        self.logger.info(f"Extraindo {archive_path} para {destination}")
+        
+        result = extraction_engine.extract(archive_path, destination)
+        if not result.success:
+            self.logger.error(f"Erro na extração de {archive_path}: {result.error_message}")
             return False
             
+        self.logger.info(f"Extração concluída: {destination}")
+        return True
+            
     def run_command(self, command: List[str], cwd: Optional[Path] = None) -> Tuple[bool, str]:
         """Executa comando e retorna resultado"""
         try:
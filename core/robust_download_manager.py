@@ -22,6 +22,13 @@ from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed, Future
 
 from core.error_handler import EnvDevError
+from core.progress_bus import ProgressBus, STATUS_COMPLETED, STATUS_FAILED, get_progress_bus, new_operation_id
+from core.segmented_download import (
+    SegmentedDownloader, SegmentedDownloadConfig, RangeNotSupportedError, STATE_SUFFIX
+)
+from utils.hash_utils import hashing_service
+from utils.http_client import HttpClient, get_http_client
+from utils.mirror_health import MirrorHealthService, get_mirror_health_service
 
 
 class DownloadError(EnvDevError):
@@ -89,6 +96,7 @@ class DownloadRequest:
     expected_sha256: str
     description: Optional[str] = None
     mirrors: Optional[List[str]] = None
+    operation_id: Optional[str] = None  # Progress bus id, e.g. a NotificationManager operation
 
 
 @dataclass
@@ -172,7 +180,9 @@ class RobustDownloadManager:
     for all download operations in the Environment Dev system.
     """
     
-    def __init__(self, security_manager=None, temp_dir: Optional[Path] = None, max_retries: int = 3, bandwidth_config: Optional[BandwidthConfig] = None):
+    def __init__(self, security_manager=None, temp_dir: Optional[Path] = None, max_retries: int = 3, bandwidth_config: Optional[BandwidthConfig] = None,
+                 segmented_config: Optional[SegmentedDownloadConfig] = None, progress_bus: Optional[ProgressBus] = None,
+                 http_client: Optional[HttpClient] = None, mirror_health_service: Optional[MirrorHealthService] = None):
         """
         Initialize the Robust Download Manager.
         
@@ -181,6 +191,10 @@ class RobustDownloadManager:
             temp_dir: Directory for temporary files during download
             max_retries: Maximum number of retry attempts (default: 3)
             bandwidth_config: Configuration for bandwidth management
+            segmented_config: Configuration for segmented Range downloads
+            progress_bus: Bus that rate-limits progress updates (default: global bus)
+            http_client: Pooled HTTP client used for downloads (default: shared client)
+            mirror_health_service: Persisted mirror latency/throughput scores (default: shared service)
         """
         self.security_manager = security_manager
         self.temp_dir = temp_dir or Path.cwd() / "temp_downloads"
@@ -199,6 +213,7 @@ class RobustDownloadManager:
         self.mirror_health: Dict[str, MirrorInfo] = {}
         self.health_check_interval = 300  # 5 minutes
         self.mirror_timeout = 10  # seconds
+        self.mirror_health_service = mirror_health_service or get_mirror_health_service()
         self._lock = threading.Lock()
         
         # Parallel download configuration
@@ -207,12 +222,20 @@ class RobustDownloadManager:
         self.progress_callbacks: List[Callable[[DownloadProgress], None]] = []
         self.bandwidth_monitor = BandwidthMonitor()
         self._progress_lock = threading.Lock()
+        self.progress_bus = progress_bus or get_progress_bus()
+        
+        # Segmented download configuration
+        self.segmented_config = segmented_config or SegmentedDownloadConfig()
+        self.http_client = http_client or get_http_client()
+        self._opener = None
+        self._streamed_hashes: Dict[str, str] = {}
     
     def download_with_mandatory_hash_verification(
         self, 
         url: str, 
         expected_sha256: str,
-        destination_path: Optional[Path] = None
+        destination_path: Optional[Path] = None,
+        operation_id: Optional[str] = None
     ) -> DownloadResult:
         """
         Download a file with mandatory SHA256 hash verification.
@@ -221,6 +244,7 @@ class RobustDownloadManager:
             url: URL to download from (must be HTTPS)
             expected_sha256: Expected SHA256 hash for verification
             destination_path: Where to save the file (optional)
+            operation_id: Progress bus operation id (optional, a new unique id by default)
             
         Returns:
             DownloadResult with download status and details
@@ -244,10 +268,13 @@ class RobustDownloadManager:
         
         try:
             # Download file to temporary location
-            file_size = self._download_file_securely(url, temp_path)
+            file_size = self._download_file_securely(url, temp_path, operation_id or new_operation_id())
             
-            # Calculate SHA256 hash
-            calculated_hash = self._calculate_sha256(temp_path)
+            # SHA256 is computed while downloading; hash the file only as a fallback
+            with self._lock:
+                calculated_hash = self._streamed_hashes.pop(str(temp_path), None)
+            if calculated_hash is None:
+                calculated_hash = self._calculate_sha256(temp_path)
             
             # Verify hash
             if not self._verify_hash(calculated_hash, expected_sha256):
@@ -283,8 +310,9 @@ class RobustDownloadManager:
             return result
             
         except Exception as e:
-            # Clean up temp file on error
-            temp_path.unlink(missing_ok=True)
+            # Clean up temp file on error, unless a partial download can be resumed
+            if not Path(str(temp_path) + STATE_SUFFIX).exists():
+                temp_path.unlink(missing_ok=True)
             
             # Create failed result
             result = DownloadResult(
@@ -325,7 +353,8 @@ class RobustDownloadManager:
                 result = self.download_with_mandatory_hash_verification(
                     url=request.url,
                     expected_sha256=request.expected_sha256,
-                    destination_path=request.destination_path
+                    destination_path=request.destination_path,
+                    operation_id=request.operation_id
                 )
                 results.append(result)
             except (DownloadError, HashVerificationError, SecureConnectionError) as e:
@@ -411,13 +440,19 @@ class RobustDownloadManager:
         
         return filename
     
-    def _download_file_securely(self, url: str, destination: Path) -> int:
+    def _download_file_securely(self, url: str, destination: Path, operation_id: str) -> int:
         """
         Download file securely using HTTPS with SSL verification.
         
+        Large files on servers that accept Range requests are downloaded in
+        parallel segments and resume from a previous partial attempt. Other
+        files are streamed in one request. In both cases the SHA256 digest is
+        computed while downloading.
+        
         Args:
             url: HTTPS URL to download from
             destination: Path to save the file
+            operation_id: Progress bus operation id, unique per download
             
         Returns:
             Size of downloaded file in bytes
@@ -426,39 +461,107 @@ class RobustDownloadManager:
             SecureConnectionError: If secure connection fails
             DownloadError: If download fails
         """
+        self.progress_bus.begin(operation_id, url=url, destination=str(destination))
+        
+        def report_progress(downloaded_size: int, total_size: int) -> None:
+            self._update_download_progress(url, downloaded_size, total_size, operation_id)
+        
         try:
-            # Create secure HTTPS handler
-            https_handler = urllib.request.HTTPSHandler(context=self.ssl_context)
-            opener = urllib.request.build_opener(https_handler)
-            
-            # Set user agent to identify our application
-            opener.addheaders = [('User-Agent', 'EnvironmentDev-RobustDownloadManager/1.0')]
-            
-            # Open connection and download
-            with opener.open(url) as response:
-                # Verify we got a successful response
-                if response.getcode() != 200:
-                    raise DownloadError(f"HTTP {response.getcode()}: {response.reason}")
-                
-                # Download file in chunks
-                total_size = 0
-                with open(destination, 'wb') as f:
-                    while True:
-                        chunk = response.read(8192)  # 8KB chunks
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        total_size += len(chunk)
-                
-                return total_size
-                
+            file_size = self._download_file_with_fallback(url, destination, report_progress)
         except urllib.error.URLError as e:
+            self.progress_bus.finish(operation_id, STATUS_FAILED, str(e.reason))
             if isinstance(e.reason, ssl.SSLError):
                 raise SecureConnectionError(f"SSL verification failed: {e.reason}")
             else:
                 raise SecureConnectionError(f"Connection failed: {e.reason}")
         except Exception as e:
+            self.progress_bus.finish(operation_id, STATUS_FAILED, str(e))
             raise DownloadError(f"Download failed: {str(e)}")
+        
+        self.progress_bus.finish(operation_id, STATUS_COMPLETED, bytes_done=file_size)
+        return file_size
+    
+    def _download_file_with_fallback(self, url: str, destination: Path,
+                                     report_progress: Callable[[int, int], None]) -> int:
+        """
+        Download in parallel segments when the server supports it, otherwise
+        as a single stream.
+        
+        Returns:
+            Size of downloaded file in bytes
+        """
+        opener = self._get_opener()
+        
+        if self.segmented_config.max_segments > 1:
+            downloader = SegmentedDownloader(opener, self.segmented_config)
+            info = downloader.probe(url)
+            if info and info['total_size'] >= self.segmented_config.min_segmented_size:
+                try:
+                    file_size, digest = downloader.download(url, destination, info, report_progress)
+                    with self._lock:
+                        self._streamed_hashes[str(destination)] = digest
+                    return file_size
+                except RangeNotSupportedError:
+                    # Server advertised ranges but did not honour them
+                    Path(str(destination) + STATE_SUFFIX).unlink(missing_ok=True)
+        
+        return self._download_single_stream(opener, url, destination, report_progress)
+    
+    def _download_single_stream(self, opener, url: str, destination: Path,
+                                progress_callback: Callable[[int, int], None]) -> int:
+        """
+        Download file as a single stream, hashing it on the fly.
+        
+        Args:
+            opener: URL opener to use
+            url: URL to download from
+            destination: Path to save the file
+            progress_callback: Called with (downloaded_bytes, total_bytes)
+            
+        Returns:
+            Size of downloaded file in bytes
+        """
+        with opener.open(url) as response:
+            # Verify we got a successful response
+            if response.getcode() != 200:
+                raise DownloadError(f"HTTP {response.getcode()}: {response.reason}")
+            
+            try:
+                expected_size = int(response.headers.get('Content-Length'))
+            except (TypeError, ValueError):
+                expected_size = 0
+            
+            digest = hashlib.sha256()
+            total_size = 0
+            with open(destination, 'wb') as f:
+                while True:
+                    chunk = response.read(self.segmented_config.chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    digest.update(chunk)
+                    total_size += len(chunk)
+                    progress_callback(total_size, expected_size)
+        
+        with self._lock:
+            self._streamed_hashes[str(destination)] = digest.hexdigest()
+        return total_size
+    
+    def _get_opener(self):
+        """
+        Return the URL opener, built once per manager.
+        
+        Requests go through the shared HTTP client, so segments and
+        consecutive downloads from the same host reuse keep-alive connections
+        (the client verifies certificates and requires TLS 1.2+).
+        """
+        if self._opener is None:
+            opener = urllib.request.build_opener(self.http_client.urllib_handler())
+            
+            # Set user agent to identify our application
+            opener.addheaders = [('User-Agent', 'EnvironmentDev-RobustDownloadManager/1.0')]
+            self._opener = opener
+        return self._opener
     
     def _calculate_sha256(self, file_path: Path) -> str:
         """
@@ -470,14 +573,7 @@ class RobustDownloadManager:
         Returns:
             SHA256 hash as hexadecimal string
         """
-        sha256_hash = hashlib.sha256()
-        
-        with open(file_path, 'rb') as f:
-            # Read file in chunks to handle large files efficiently
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
-        
-        return sha256_hash.hexdigest()
+        return hashing_service.hash_file(file_path, 'sha256')['sha256']
     
     def _verify_hash(self, calculated: str, expected: str) -> bool:
         """
@@ -503,7 +599,7 @@ class RobustDownloadManager:
     def cleanup_temp_files(self) -> None:
         """Clean up temporary download files."""
         if self.temp_dir.exists():
-            for temp_file in self.temp_dir.glob("*.tmp"):
+            for temp_file in list(self.temp_dir.glob("*.tmp")) + list(self.temp_dir.glob("*.tmp" + STATE_SUFFIX)):
                 try:
                     temp_file.unlink()
                 except Exception:
@@ -525,13 +621,17 @@ class RobustDownloadManager:
                 if mirror not in self.mirror_health:
                     self.mirror_health[mirror] = MirrorInfo(url=mirror)
             
-            # Update health checks if needed
+            # Update stale health checks concurrently
             current_time = time.time()
-            for mirror in mirrors:
-                mirror_info = self.mirror_health[mirror]
-                if (mirror_info.last_health_check is None or 
-                    current_time - mirror_info.last_health_check > self.health_check_interval):
-                    self._check_mirror_health(mirror)
+            stale_mirrors = [
+                mirror for mirror in mirrors
+                if (self.mirror_health[mirror].last_health_check is None or
+                    current_time - self.mirror_health[mirror].last_health_check > self.health_check_interval)
+            ]
+            if stale_mirrors:
+                with ThreadPoolExecutor(max_workers=min(len(stale_mirrors), 8)) as executor:
+                    list(executor.map(self._check_mirror_health, stale_mirrors))
+                self.mirror_health_service.save()
             
             # Select best mirror based on health and performance
             selected_mirror = self._select_best_mirror(mirrors)
@@ -587,7 +687,8 @@ class RobustDownloadManager:
         expected_sha256: str,
         destination_path: Optional[Path] = None,
         mirrors: Optional[List[str]] = None,
-        max_retries: Optional[int] = None
+        max_retries: Optional[int] = None,
+        operation_id: Optional[str] = None
     ) -> DownloadResult:
         """
         Download with intelligent mirror fallback and configurable retry system.
@@ -598,17 +699,19 @@ class RobustDownloadManager:
             destination_path: Where to save the file (optional)
             mirrors: List of mirror URLs (optional)
             max_retries: Maximum retry attempts (optional, uses instance default)
+            operation_id: Progress bus operation id shared by every attempt (optional)
             
         Returns:
             DownloadResult with download status and details
         """
         if max_retries is None:
             max_retries = self.max_retries
+        operation_id = operation_id or new_operation_id()
         
-        # Prepare URL list (primary + mirrors)
+        # Prepare URL list (primary + mirrors), fastest expected first
         all_urls = [url]
         if mirrors:
-            all_urls.extend(mirrors)
+            all_urls = self.mirror_health_service.rank(dict.fromkeys(all_urls + list(mirrors)))
         
         # Generate destination path if not provided
         if destination_path is None:
@@ -635,8 +738,12 @@ class RobustDownloadManager:
                     
                     # Attempt download
                     result = self.download_with_mandatory_hash_verification(
-                        current_url, expected_sha256, destination_path
+                        current_url, expected_sha256, destination_path, operation_id=operation_id
+                    )
+                    self.mirror_health_service.record_success(
+                        current_url, bytes_count=result.file_size, seconds=result.download_time
                     )
+                    self.mirror_health_service.save()
                     
                     # Update mirror health on success
                     if current_url in self.mirror_health:
@@ -652,6 +759,7 @@ class RobustDownloadManager:
                     
                 except (DownloadError, HashVerificationError, SecureConnectionError) as e:
                     last_error = e
+                    self.mirror_health_service.record_failure(current_url)
                     
                     # Update mirror health on failure
                     if current_url in self.mirror_health:
@@ -666,6 +774,7 @@ class RobustDownloadManager:
                         break
         
         # All URLs and retries exhausted
+        self.mirror_health_service.save()
         start_time = time.time()
         result = DownloadResult(
             url=url,
@@ -709,12 +818,15 @@ class RobustDownloadManager:
                     mirror_info.status = MirrorStatus.SLOW
                 else:
                     mirror_info.status = MirrorStatus.UNREACHABLE
+            
+            self.mirror_health_service.record_success(mirror_url, ttfb=response_time)
                     
         except Exception:
             # Mirror is unreachable
             mirror_info = self.mirror_health[mirror_url]
             mirror_info.status = MirrorStatus.UNREACHABLE
             mirror_info.last_health_check = time.time()
+            self.mirror_health_service.record_failure(mirror_url)
     
     def _select_best_mirror(self, mirrors: List[str]) -> Optional[str]:
         """
@@ -736,15 +848,16 @@ class RobustDownloadManager:
         if not healthy_mirrors:
             return mirrors[0] if mirrors else None  # Fallback to first mirror
         
-        # Sort by success rate and response time
+        # Sort by expected transfer time (persisted TTFB/throughput EWMA),
+        # then by success rate and response time of this session
         def mirror_score(mirror_tuple):
             mirror_url, mirror_info = mirror_tuple
             success_rate = (mirror_info.success_count / 
                           max(1, mirror_info.success_count + mirror_info.failure_count))
             response_penalty = mirror_info.response_time * 0.1  # Small penalty for slow mirrors
-            return success_rate - response_penalty
+            return (self.mirror_health_service.expected_time(mirror_url), -(success_rate - response_penalty))
         
-        healthy_mirrors.sort(key=mirror_score, reverse=True)
+        healthy_mirrors.sort(key=mirror_score)
         return healthy_mirrors[0][0]
     
     def get_mirror_health_report(self) -> Dict[str, Dict[str, any]]:
@@ -945,7 +1058,8 @@ class RobustDownloadManager:
             result = self.download_with_mandatory_hash_verification(
                 url=request.url,
                 expected_sha256=request.expected_sha256,
-                destination_path=request.destination_path
+                destination_path=request.destination_path,
+                operation_id=request.operation_id
             )
             
             # Update progress to completed
@@ -983,35 +1097,35 @@ class RobustDownloadManager:
             
             return result
     
-    def _update_download_progress(self, url: str, downloaded_size: int, total_size: int, start_time: float) -> None:
+    def _update_download_progress(self, url: str, downloaded_size: int, total_size: int,
+                                  operation_id: str) -> None:
         """
         Update download progress for a specific URL.
         
+        Byte counts go to the progress bus on every chunk; the active
+        download entry and the registered callbacks are only updated when
+        the bus publishes a tick, with its smoothed speed and ETA.
+        
         Args:
             url: URL being downloaded
             downloaded_size: Number of bytes downloaded
             total_size: Total file size in bytes
-            start_time: Download start time
+            operation_id: Progress bus operation id of this download
         """
+        event = self.progress_bus.report(operation_id, downloaded_size, total_size)
+        if event is None:
+            return
+        
         with self._progress_lock:
             if url in self.active_downloads:
                 progress = self.active_downloads[url]
-                progress.downloaded_size = downloaded_size
-                
-                # Calculate progress percentage
-                if total_size > 0:
-                    progress.progress_percentage = (downloaded_size / total_size) * 100
-                
-                # Calculate download speed
-                elapsed_time = time.time() - start_time
-                if elapsed_time > 0:
-                    speed_bps = downloaded_size / elapsed_time
-                    progress.download_speed_mbps = speed_bps / (1024 * 1024)
-                    
-                    # Estimate time remaining
-                    if progress.download_speed_mbps > 0 and total_size > 0:
-                        remaining_bytes = total_size - downloaded_size
-                        progress.estimated_time_remaining = remaining_bytes / speed_bps
+                progress.downloaded_size = event.bytes_done
+                if event.total_bytes > 0:
+                    progress.total_size = event.total_bytes
+                    progress.progress_percentage = event.percentage
+                progress.download_speed_mbps = event.speed / (1024 * 1024)
+                if event.eta is not None:
+                    progress.estimated_time_remaining = event.eta
                 
                 self._notify_progress_callbacks(progress)
     
@@ -2,7 +2,6 @@
 Implementa download seguro com verificação de integridade e limpeza automática"""
 
 import os
-import hashlib
 import shutil
 import time
 import urllib.request
@@ -10,13 +9,12 @@ import urllib.error
 from pathlib import Path
 from typing import Optional, Dict, Callable
 import logging
-import py7zr
-import zipfile
-import tarfile
 
 from config.retro_devkit_constants import (
     DOWNLOAD_MAX_RETRIES, DOWNLOAD_TIMEOUT, TEMP_DOWNLOAD_PATH
 )
+from utils.extractor import extraction_engine
+from utils.hash_utils import hashing_service
 
 class RobustDownloader:
     """Downloader com retry, verificação de checksum e rollback automático"""
@@ -132,12 +130,7 @@ class RobustDownloader:
         try:
             self.logger.info("🔍 Verificando integridade do arquivo...")
             
-            sha256_hash = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(chunk)
-                    
-            actual_checksum = sha256_hash.hexdigest()
+            actual_checksum = hashing_service.hash_file(file_path, 'sha256')['sha256']
             
             if actual_checksum.lower() == expected_checksum.lower():
                 self.logger.info("✅ Checksum verificado com sucesso")
@@ -155,34 +148,17 @@ class RobustDownloader:
             return False
             
     def _extract_archive(self, archive_path: Path, extract_path: Path) -> bool:
-        """Extrai arquivo usando biblioteca Python apropriada"""
-        try:
-            self.logger.info(f"📦 Extraindo {archive_path.name}...")
-            
-            # Criar diretório de destino
-            extract_path.mkdir(parents=True, exist_ok=True)
-            
-            # Determinar tipo de arquivo e extrair
-            if archive_path.suffix.lower() == '.7z':
-                with py7zr.SevenZipFile(archive_path, 'r') as archive:
-                    archive.extractall(path=extract_path)
-            elif archive_path.suffix.lower() == '.zip':
-                with zipfile.ZipFile(archive_path, 'r') as archive:
-                    archive.extractall(path=extract_path)
-            elif archive_path.suffix.lower() in ['.tar', '.tar.gz', '.tgz']:
-                with tarfile.open(archive_path, 'r:*') as archive:
-                    archive.extractall(path=extract_path)
-            else:
-                self.logger.error(f"❌ Formato de arquivo não suportado: {archive_path.suffix}")
-                return False
-                
-            self.logger.info("✅ Extração concluída")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"❌ Erro na extração: {e}")
+        """Extrai arquivo usando o motor de extração compartilhado"""
+        self.logger.info(f"📦 Extraindo {archive_path.name}...")
+        
+        result = extraction_engine.extract(archive_path, extract_path)
+        if not result.success:
+            self.logger.error(f"❌ Erro na extração: {result.error_message}")
             return False
             
+        self.logger.info("✅ Extração concluída")
+        return True
+            
     def _verify_extraction(self, extract_path: Path) -> bool:
         """Verifica se a extração foi bem-sucedida"""
         try:
@@ -42,7 +42,8 @@ try:
 except ImportError:
     STATUS_MANAGER_AVAILABLE = False
 
-# Configuração de logging
+# Configuração de logging (logs/ não é versionado)
+os.makedirs('logs', exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
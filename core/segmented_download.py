@@ -0,0 +1,362 @@
+"""
+Segmented, resumable HTTP downloads over Range requests.
+
+A file is split into byte-range segments that are fetched in parallel into a
+preallocated partial file. Progress is persisted to a small JSON state file so
+an interrupted download continues where it stopped. The SHA256 digest is
+computed incrementally as the contiguous prefix of the file completes, so no
+second full read is needed after the transfer.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+STATE_SUFFIX = ".state"
+STATE_VERSION = 1
+
+
+class RangeNotSupportedError(Exception):
+    """Raised when the server does not honour Range requests."""
+
+
+@dataclass(eq=False)
+class Segment:
+    """A byte range [start, end) of the target file."""
+    start: int
+    end: int
+    downloaded: int = 0
+
+    @property
+    def position(self) -> int:
+        return self.start + self.downloaded
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.end - self.position)
+
+
+@dataclass
+class SegmentedDownloadConfig:
+    """Tuning parameters for segmented downloads."""
+    min_segmented_size: int = 8 * 1024 * 1024
+    min_segment_size: int = 2 * 1024 * 1024
+    initial_segments: int = 2
+    max_segments: int = 8
+    chunk_size: int = 256 * 1024
+    request_timeout: float = 30.0
+    sample_interval: float = 0.5
+    min_throughput_gain: float = 0.1
+    state_save_interval: float = 1.0
+
+
+class _HashFrontier:
+    """Feeds the digest with the contiguous completed prefix of the file."""
+
+    def __init__(self, path: Path, segments: List[Segment], segments_lock: threading.Lock):
+        self.path = path
+        self.segments = segments
+        self.segments_lock = segments_lock
+        self.offset = 0
+        self.digest = hashlib.sha256()
+        self._lock = threading.Lock()
+
+    def on_chunk(self, position: int, data: bytes) -> None:
+        """Called after data has been written at position."""
+        with self._lock:
+            if position == self.offset:
+                self.digest.update(data)
+                self.offset += len(data)
+            self._catch_up()
+
+    def finish(self) -> str:
+        with self._lock:
+            self._catch_up()
+            return self.digest.hexdigest()
+
+    def _catch_up(self) -> None:
+        """Hash bytes other segments already wrote right after the frontier."""
+        while True:
+            available = self._available_from(self.offset)
+            if available <= 0:
+                return
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                while available > 0:
+                    data = f.read(min(available, 1024 * 1024))
+                    if not data:
+                        return
+                    self.digest.update(data)
+                    self.offset += len(data)
+                    available -= len(data)
+
+    def _available_from(self, offset: int) -> int:
+        with self.segments_lock:
+            return self._available_from_locked(offset)
+
+    def _available_from_locked(self, offset: int) -> int:
+        for segment in self.segments:
+            if segment.start <= offset < segment.end:
+                return segment.position - offset
+        return 0
+
+
+class SegmentedDownloader:
+    """
+    Downloads one URL with parallel Range requests and crash-safe resume.
+
+    The number of connections adapts to throughput: the download starts with
+    ``initial_segments`` connections and opens another one (by splitting the
+    largest remaining segment) after each sample interval in which aggregate
+    throughput grew by at least ``min_throughput_gain``. Workers that finish
+    early steal half of the largest remaining segment.
+    """
+
+    def __init__(self, opener, config: Optional[SegmentedDownloadConfig] = None,
+                 user_agent: str = 'EnvironmentDev-RobustDownloadManager/1.0'):
+        self.opener = opener
+        self.config = config or SegmentedDownloadConfig()
+        self.user_agent = user_agent
+
+    def probe(self, url: str) -> Optional[Dict[str, object]]:
+        """
+        Return size and validators if the server supports ranges, else None.
+        """
+        request = urllib.request.Request(url, method='HEAD', headers={'User-Agent': self.user_agent})
+        try:
+            with self.opener.open(request, timeout=self.config.request_timeout) as response:
+                headers = response.headers
+                if str(headers.get('Accept-Ranges', '')).lower() != 'bytes':
+                    return None
+                total_size = int(headers.get('Content-Length'))
+                return {
+                    'total_size': total_size,
+                    'etag': headers.get('ETag'),
+                    'last_modified': headers.get('Last-Modified'),
+                }
+        except Exception:
+            return None
+
+    def download(self, url: str, destination: Path, info: Dict[str, object],
+                 progress_callback: Optional[Callable[[int, int], None]] = None) -> Tuple[int, str]:
+        """
+        Download url into destination using Range requests.
+
+        Args:
+            url: URL to download
+            destination: Partial file path (kept on failure for resume)
+            info: Result of probe()
+            progress_callback: Called with (downloaded_bytes, total_bytes)
+
+        Returns:
+            Tuple of (file size, sha256 hex digest)
+
+        Raises:
+            RangeNotSupportedError: If the server ignores Range headers
+            urllib.error.URLError / OSError: On network or disk failures
+        """
+        total_size = int(info['total_size'])
+        state_path = Path(str(destination) + STATE_SUFFIX)
+        segments = self._load_state(state_path, url, info, destination)
+        if segments is None:
+            segments = self._plan_segments(total_size)
+            with open(destination, 'wb') as f:
+                f.truncate(total_size)
+
+        lock = threading.Lock()
+        frontier = _HashFrontier(destination, segments, lock)
+        errors: List[BaseException] = []
+        stop = threading.Event()
+        workers: List[threading.Thread] = []
+        claimed: set = set()
+
+        def downloaded_total() -> int:
+            with lock:
+                return sum(segment.downloaded for segment in segments)
+
+        def save_state() -> None:
+            with lock:
+                snapshot = [[s.start, s.end, s.downloaded] for s in segments]
+            self._save_state(state_path, url, info, snapshot)
+
+        def take_work() -> Optional[Segment]:
+            """Next segment for a worker: an unclaimed one or half of the largest."""
+            with lock:
+                for segment in segments:
+                    if segment.remaining > 0 and segment not in claimed:
+                        claimed.add(segment)
+                        return segment
+                largest = max(segments, key=lambda s: s.remaining)
+                if largest.remaining < 2 * self.config.min_segment_size:
+                    return None
+                middle = largest.position + largest.remaining // 2
+                stolen = Segment(middle, largest.end)
+                largest.end = middle
+                segments.append(stolen)
+                segments.sort(key=lambda s: s.start)
+                claimed.add(stolen)
+                return stolen
+
+        def worker() -> None:
+            segment = take_work()
+            try:
+                while segment is not None and not stop.is_set():
+                    self._fetch_segment(url, destination, segment, lock, frontier, stop)
+                    with lock:
+                        claimed.discard(segment)
+                    segment = take_work()
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        def start_worker() -> None:
+            thread = threading.Thread(target=worker, name="segmented-download", daemon=True)
+            workers.append(thread)
+            thread.start()
+
+        for _ in range(min(self.config.initial_segments, len(segments) or 1)):
+            start_worker()
+
+        last_sample_bytes = downloaded_total()
+        last_sample_time = time.perf_counter()
+        last_throughput = 0.0
+        last_save = last_sample_time
+        grow = True
+
+        while any(thread.is_alive() for thread in workers):
+            time.sleep(self.config.sample_interval)
+            now = time.perf_counter()
+            current = downloaded_total()
+            throughput = (current - last_sample_bytes) / max(now - last_sample_time, 1e-6)
+            last_sample_bytes, last_sample_time = current, now
+
+            if progress_callback:
+                progress_callback(current, total_size)
+
+            if now - last_save >= self.config.state_save_interval:
+                save_state()
+                last_save = now
+
+            alive = sum(1 for thread in workers if thread.is_alive())
+            if grow and not stop.is_set() and alive < self.config.max_segments:
+                if throughput >= last_throughput * (1 + self.config.min_throughput_gain):
+                    start_worker()
+                else:
+                    # Another connection did not pay off: keep the current count
+                    grow = False
+            last_throughput = max(last_throughput, throughput)
+
+        for thread in workers:
+            thread.join()
+
+        if errors:
+            save_state()
+            raise errors[0]
+
+        if any(segment.remaining for segment in segments):
+            save_state()
+            raise urllib.error.URLError("Segmented download ended with missing ranges")
+
+        digest = frontier.finish()
+        try:
+            state_path.unlink()
+        except OSError:
+            pass
+        if progress_callback:
+            progress_callback(total_size, total_size)
+        return total_size, digest
+
+    def _fetch_segment(self, url: str, destination: Path, segment: Segment, lock: threading.Lock,
+                       frontier: _HashFrontier, stop: threading.Event) -> None:
+        """Fetch the remaining bytes of a segment (its end may shrink concurrently)."""
+        with lock:
+            start, end = segment.position, segment.end
+        if start >= end:
+            return
+
+        request = urllib.request.Request(url, headers={
+            'User-Agent': self.user_agent,
+            'Range': f'bytes={start}-{end - 1}',
+        })
+        with self.opener.open(request, timeout=self.config.request_timeout) as response:
+            if response.getcode() != 206:
+                raise RangeNotSupportedError(f"Expected HTTP 206 for range request, got {response.getcode()}")
+            content_range = str(response.headers.get('Content-Range', ''))
+            if not content_range.startswith(f'bytes {start}-'):
+                raise RangeNotSupportedError(f"Unexpected Content-Range: {content_range}")
+
+            with open(destination, 'r+b') as f:
+                f.seek(start)
+                position = start
+                while not stop.is_set():
+                    with lock:
+                        limit = segment.end
+                    if position >= limit:
+                        break
+                    data = response.read(min(self.config.chunk_size, limit - position))
+                    if not data:
+                        break
+                    f.write(data)
+                    f.flush()
+                    with lock:
+                        segment.downloaded += len(data)
+                    frontier.on_chunk(position, data)
+                    position += len(data)
+
+        with lock:
+            if segment.remaining > 0 and not stop.is_set():
+                raise urllib.error.URLError(f"Connection closed early at byte {segment.position}")
+
+    def _plan_segments(self, total_size: int) -> List[Segment]:
+        count = max(1, min(self.config.initial_segments, total_size // self.config.min_segment_size))
+        size = total_size // count
+        segments = [Segment(i * size, (i + 1) * size) for i in range(count)]
+        segments[-1].end = total_size
+        return segments
+
+    @staticmethod
+    def _save_state(state_path: Path, url: str, info: Dict[str, object], segments: List[list]) -> None:
+        state = {
+            'version': STATE_VERSION,
+            'url': url,
+            'total_size': info['total_size'],
+            'etag': info.get('etag'),
+            'last_modified': info.get('last_modified'),
+            'segments': segments,
+        }
+        temp_path = state_path.with_name(state_path.name + '.new')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    @staticmethod
+    def _load_state(state_path: Path, url: str, info: Dict[str, object],
+                    destination: Path) -> Optional[List[Segment]]:
+        """Segments of a previous attempt, if it matches the same remote file."""
+        if not state_path.exists() or not destination.exists():
+            return None
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        same_file = (
+            state.get('version') == STATE_VERSION
+            and state.get('url') == url
+            and state.get('total_size') == info['total_size']
+            and state.get('etag') == info.get('etag')
+            and state.get('last_modified') == info.get('last_modified')
+            and destination.stat().st_size == info['total_size']
+        )
+        if not same_file:
+            return None
+        return [Segment(start, end, downloaded) for start, end, downloaded in state['segments']]
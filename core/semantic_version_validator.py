@@ -3,11 +3,16 @@ Semantic Version Validator for advanced compatibility checking.
 Implements sophisticated semantic versioning validation and scoring.
 """
 
-import re
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from .version_parser import VersionKey, parse_version, CONSTRAINT_CACHE_SIZE
+except ImportError:
+    from version_parser import VersionKey, parse_version, CONSTRAINT_CACHE_SIZE
+
 
 class VersionConstraintType(Enum):
     """Types of version constraints supported."""
@@ -33,33 +38,17 @@ class SemanticVersion:
     
     @classmethod
     def parse(cls, version_str: str) -> 'SemanticVersion':
-        """Parse a version string into SemanticVersion."""
-        # Remove 'v' prefix if present
-        version_str = version_str.lstrip('v')
-        
-        # Regex for semantic version parsing
-        pattern = r'^(\d+)\.(\d+)\.(\d+)(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?$'
-        match = re.match(pattern, version_str)
-        
-        if not match:
-            # Fallback for simpler version formats
-            simple_pattern = r'^(\d+)(?:\.(\d+))?(?:\.(\d+))?'
-            simple_match = re.match(simple_pattern, version_str)
-            if simple_match:
-                major = int(simple_match.group(1))
-                minor = int(simple_match.group(2) or 0)
-                patch = int(simple_match.group(3) or 0)
-                return cls(major, minor, patch)
-            else:
-                raise ValueError(f"Invalid version format: {version_str}")
-        
-        major = int(match.group(1))
-        minor = int(match.group(2))
-        patch = int(match.group(3))
-        prerelease = match.group(4)
-        build = match.group(5)
-        
-        return cls(major, minor, patch, prerelease, build)
+        """Parse a version string into SemanticVersion (cached by the shared version parser)."""
+        # 'v' prefix and trailing non-semver parts are tolerated
+        key = parse_version(version_str, lenient=True)
+        if key is None:
+            raise ValueError(f"Invalid version format: {version_str}")
+        return cls.from_key(key)
+    
+    @classmethod
+    def from_key(cls, key: VersionKey) -> 'SemanticVersion':
+        """Create a SemanticVersion from a parsed VersionKey."""
+        return cls(key.major, key.minor, key.patch, key.prerelease, key.build)
     
     def __str__(self) -> str:
         version = f"{self.major}.{self.minor}.{self.patch}"
@@ -109,62 +98,66 @@ class VersionConstraint:
     @classmethod
     def parse(cls, constraint_str: str) -> 'VersionConstraint':
         """Parse a constraint string into VersionConstraint."""
-        constraint_str = constraint_str.strip()
-        
-        # Exact match
-        if constraint_str.startswith('=='):
-            version = SemanticVersion.parse(constraint_str[2:])
-            return cls(VersionConstraintType.EXACT, version)
-        
-        # Greater than or equal
-        elif constraint_str.startswith('>='):
-            version = SemanticVersion.parse(constraint_str[2:])
-            return cls(VersionConstraintType.GREATER_EQUAL, version)
-        
-        # Less than or equal
-        elif constraint_str.startswith('<='):
-            version = SemanticVersion.parse(constraint_str[2:])
-            return cls(VersionConstraintType.LESS_EQUAL, version)
-        
-        # Greater than
-        elif constraint_str.startswith('>'):
-            version = SemanticVersion.parse(constraint_str[1:])
-            return cls(VersionConstraintType.GREATER_THAN, version)
-        
-        # Less than
-        elif constraint_str.startswith('<'):
-            version = SemanticVersion.parse(constraint_str[1:])
-            return cls(VersionConstraintType.LESS_THAN, version)
-        
-        # Caret constraint (^1.0.0)
-        elif constraint_str.startswith('^'):
-            version = SemanticVersion.parse(constraint_str[1:])
-            return cls(VersionConstraintType.CARET, version)
-        
-        # Tilde constraint (~1.0.0)
-        elif constraint_str.startswith('~'):
-            version = SemanticVersion.parse(constraint_str[1:])
-            return cls(VersionConstraintType.COMPATIBLE, version)
-        
-        # Range constraint (1.0.0 - 2.0.0)
-        elif ' - ' in constraint_str:
-            parts = constraint_str.split(' - ')
-            if len(parts) == 2:
-                lower = SemanticVersion.parse(parts[0])
-                upper = SemanticVersion.parse(parts[1])
-                return cls(VersionConstraintType.RANGE, lower, upper)
-        
-        # Wildcard constraint (1.0.*)
-        elif '*' in constraint_str:
-            # Convert wildcard to range
-            base_version = constraint_str.replace('*', '0')
-            version = SemanticVersion.parse(base_version)
-            return cls(VersionConstraintType.WILDCARD, version)
-        
-        # Default to exact match
-        else:
-            version = SemanticVersion.parse(constraint_str)
-            return cls(VersionConstraintType.EXACT, version)
+        constraint_type, version, upper_bound = _parse_constraint(constraint_str.strip())
+        return cls(constraint_type, SemanticVersion.from_key(version),
+                   SemanticVersion.from_key(upper_bound) if upper_bound else None)
+
+
+def _parse_version_key(version_str: str) -> VersionKey:
+    key = parse_version(version_str, lenient=True)
+    if key is None:
+        raise ValueError(f"Invalid version format: {version_str}")
+    return key
+
+
+@lru_cache(maxsize=CONSTRAINT_CACHE_SIZE)
+def _parse_constraint(constraint_str: str) -> Tuple[VersionConstraintType, VersionKey, Optional[VersionKey]]:
+    """Parse a constraint string once; returns (type, version, upper bound)."""
+    # Exact match
+    if constraint_str.startswith('=='):
+        return VersionConstraintType.EXACT, _parse_version_key(constraint_str[2:]), None
+    
+    # Greater than or equal
+    elif constraint_str.startswith('>='):
+        return VersionConstraintType.GREATER_EQUAL, _parse_version_key(constraint_str[2:]), None
+    
+    # Less than or equal
+    elif constraint_str.startswith('<='):
+        return VersionConstraintType.LESS_EQUAL, _parse_version_key(constraint_str[2:]), None
+    
+    # Greater than
+    elif constraint_str.startswith('>'):
+        return VersionConstraintType.GREATER_THAN, _parse_version_key(constraint_str[1:]), None
+    
+    # Less than
+    elif constraint_str.startswith('<'):
+        return VersionConstraintType.LESS_THAN, _parse_version_key(constraint_str[1:]), None
+    
+    # Caret constraint (^1.0.0)
+    elif constraint_str.startswith('^'):
+        return VersionConstraintType.CARET, _parse_version_key(constraint_str[1:]), None
+    
+    # Tilde constraint (~1.0.0)
+    elif constraint_str.startswith('~'):
+        return VersionConstraintType.COMPATIBLE, _parse_version_key(constraint_str[1:]), None
+    
+    # Range constraint (1.0.0 - 2.0.0)
+    elif ' - ' in constraint_str:
+        parts = constraint_str.split(' - ')
+        if len(parts) == 2:
+            return (VersionConstraintType.RANGE, _parse_version_key(parts[0]),
+                    _parse_version_key(parts[1]))
+        raise ValueError(f"Invalid range constraint: {constraint_str}")
+    
+    # Wildcard constraint (1.0.*)
+    elif '*' in constraint_str:
+        # Convert wildcard to range
+        base_version = constraint_str.replace('*', '0')
+        return VersionConstraintType.WILDCARD, _parse_version_key(base_version), None
+    
+    # Default to exact match
+    else:
+        return VersionConstraintType.EXACT, _parse_version_key(constraint_str), None
 
 
 @dataclass
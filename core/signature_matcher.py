@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Matcher compilado de assinaturas de contaminação
+Compila os padrões glob das assinaturas uma única vez: padrões literais vão
+para um dicionário de nomes exatos e os demais viram uma regex combinada por
+tipo de assinatura. Assim cada texto (nome ou executável de um processo) é
+verificado com uma consulta ao dicionário e uma única busca de regex,
+independentemente do número de assinaturas.
+"""
+
+import fnmatch
+import re
+import threading
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+
+# Caracteres que tornam um padrão glob não literal
+_GLOB_CHARS = frozenset('*?[')
+
+# Limite do cache de resultados por texto (por tipo de assinatura)
+MATCH_CACHE_SIZE = 4096
+
+
+def _is_literal(pattern: str) -> bool:
+    return not any(char in _GLOB_CHARS for char in pattern)
+
+
+def _string_patterns(patterns: Optional[Iterable[Any]]) -> Tuple[str, ...]:
+    return tuple(p for p in patterns or () if isinstance(p, str))
+
+
+def signature_fingerprint(signatures: Iterable[Any]) -> Tuple:
+    """
+    Chave de conteúdo de um conjunto de assinaturas
+
+    Muda quando uma assinatura é trocada, incluída, removida ou tem seu tipo,
+    padrões ou exclusões alterados; usada para saber se o matcher precisa ser
+    recompilado.
+    """
+    return tuple(
+        (id(signature), signature.type, _string_patterns(signature.patterns),
+         _string_patterns(getattr(signature, 'exclusions', None)))
+        for signature in signatures
+    )
+
+
+def _compile_globs(patterns: Iterable[str]) -> Optional[Pattern]:
+    translated = [fnmatch.translate(pattern) for pattern in patterns]
+    if not translated:
+        return None
+    return re.compile('|'.join(f'(?:{regex})' for regex in translated))
+
+
+class _CompiledPatterns:
+    """Padrões de um conjunto de assinaturas: nomes exatos + regex combinada"""
+
+    __slots__ = ('literals', 'combined', 'individual')
+
+    def __init__(self, patterns_by_signature: Sequence[Tuple[int, Sequence[str]]]):
+        self.literals: Dict[str, Set[int]] = {}
+        globs: Dict[int, List[str]] = {}
+        for index, patterns in patterns_by_signature:
+            for pattern in patterns:
+                if _is_literal(pattern):
+                    self.literals.setdefault(pattern, set()).add(index)
+                else:
+                    globs.setdefault(index, []).append(pattern)
+
+        # Regex combinada de todos os globs (filtro rápido) e uma por assinatura,
+        # usada apenas quando a combinada encontra algo
+        self.combined = _compile_globs(p for patterns in globs.values() for p in patterns)
+        self.individual: List[Tuple[int, Pattern]] = [
+            (index, _compile_globs(patterns)) for index, patterns in globs.items()
+        ]
+
+    def match(self, text: str) -> Set[int]:
+        hits = set(self.literals.get(text, ()))
+        if self.combined is not None and self.combined.match(text):
+            hits.update(index for index, regex in self.individual if regex.match(text))
+        return hits
+
+
+class _TypeMatcher:
+    """Assinaturas de um mesmo tipo, com padrões e exclusões compilados"""
+
+    def __init__(self, signatures: List[Any]):
+        self.signatures = signatures
+        self.patterns = _CompiledPatterns([
+            (index, [p.lower() for p in _string_patterns(signature.patterns)])
+            for index, signature in enumerate(signatures)
+        ])
+        self.exclusions = _CompiledPatterns([
+            (index, [p.lower() for p in _string_patterns(getattr(signature, 'exclusions', None))])
+            for index, signature in enumerate(signatures)
+        ])
+        self._cache: Dict[str, Tuple[FrozenSet[int], FrozenSet[int]]] = {}
+
+    def evaluate(self, text: str) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+        """Assinaturas que casam com o texto e assinaturas que o excluem"""
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
+        result = (frozenset(self.patterns.match(text)), frozenset(self.exclusions.match(text)))
+        if len(self._cache) >= MATCH_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[text] = result
+        return result
+
+
+class SignatureMatcher:
+    """
+    Conjunto de assinaturas compilado, agrupado por tipo.
+
+    Os padrões seguem a semântica de ``fnmatch`` sobre texto em minúsculas.
+    Uma assinatura com ``exclusions`` não casa com um item se qualquer um dos
+    textos do item casar com uma exclusão (ex.: ``coinbase*`` exclui o
+    processo ``coinbase.exe`` da assinatura ``*coin*``).
+    """
+
+    def __init__(self, signatures: Iterable[Any]):
+        signatures = list(signatures)
+        self.fingerprint = signature_fingerprint(signatures)
+        grouped: Dict[Hashable, List[Any]] = {}
+        for signature in signatures:
+            grouped.setdefault(signature.type, []).append(signature)
+        self._matchers = {sig_type: _TypeMatcher(sigs) for sig_type, sigs in grouped.items()}
+        self._lock = threading.Lock()
+
+    def match(self, signature_type: Hashable, *texts: Optional[str]) -> List[Any]:
+        """
+        Assinaturas do tipo que casam com algum dos textos
+
+        Args:
+            signature_type: Tipo das assinaturas a verificar
+            texts: Textos do item (ex.: nome e executável do processo)
+
+        Returns:
+            List: Assinaturas encontradas, na ordem de cadastro
+        """
+        matcher = self._matchers.get(signature_type)
+        if matcher is None:
+            return []
+
+        hits: Set[int] = set()
+        excluded: Set[int] = set()
+        with self._lock:
+            for text in texts:
+                if not text:
+                    continue
+                matched, excluding = matcher.evaluate(text.lower())
+                hits.update(matched)
+                excluded.update(excluding)
+
+        return [matcher.signatures[index] for index in sorted(hits - excluded)]
+
+    def __contains__(self, signature_type: Hashable) -> bool:
+        return signature_type in self._matchers
@@ -0,0 +1,477 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshot backups for atomic transactions
+Content-addressed backup store used by AtomicTransaction. File content is
+stored once per SHA-256 digest (shared across transactions) and brought into
+the store with the cheapest method available: reflink (FICLONE), hardlink or
+a full copy. Directory backups are manifests, and restoring only touches the
+files that actually changed since the snapshot.
+"""
+
+import json
+import logging
+import os
+import shutil
+import stat
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from utils.hash_utils import hashing_service
+
+logger = logging.getLogger(__name__)
+
+# ioctl FICLONE (linux/fs.h): clones dst from src sharing extents (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Backup methods, cheapest first
+METHOD_REFLINK = "reflink"
+METHOD_HARDLINK = "hardlink"
+METHOD_COPY = "copy"
+DEFAULT_METHODS = (METHOD_REFLINK, METHOD_HARDLINK, METHOD_COPY)
+
+MANIFEST_SUFFIX = ".snapshot.json"
+
+
+def reflink_file(source: str, destination: str) -> bool:
+    """
+    Clone a file with FICLONE (copy-on-write at filesystem level)
+
+    Returns:
+        bool: True if the clone was created, False if unsupported
+    """
+    if fcntl is None:
+        return False
+    try:
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(source, destination)
+        return True
+    except OSError:
+        try:
+            os.remove(destination)
+        except OSError:
+            pass
+        return False
+
+
+@dataclass
+class RestoreStats:
+    """Outcome of restoring a snapshot"""
+    restored: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+    @property
+    def success(self) -> bool:
+        return self.failed == 0
+
+
+class SnapshotBackupStore:
+    """
+    Content-addressed backup store.
+
+    Besides the objects, the index remembers the digest of every file seen
+    by (device, inode, size, mtime), so backing up an unchanged tree again
+    costs one stat per file instead of re-hashing it.
+
+    Hardlinks are only used when the caller promises copy-on-modify, i.e.
+    that the live file is replaced (write to a temporary file + ``os.replace``)
+    instead of rewritten in place; otherwise an in-place write would also
+    change the backup. Objects are validated against the size and mtime
+    recorded when they were stored, so a hardlinked object that was later
+    edited in place is detected and never reused.
+    """
+
+    def __init__(self, root: str, methods: Iterable[str] = DEFAULT_METHODS):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_file = os.path.join(self.objects_dir, "index.json")
+        self.methods = tuple(methods)
+        self._index: Optional[Dict[str, Dict]] = None
+        self._lock = threading.RLock()
+        self._reflink_supported: Optional[bool] = None
+        self.stats = {METHOD_REFLINK: 0, METHOD_HARDLINK: 0, METHOD_COPY: 0, "deduplicated": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def snapshot(self, source: str, backup_path: str, copy_on_modify: bool = False) -> str:
+        """
+        Back up a file or directory
+
+        Args:
+            source: File or directory to back up
+            backup_path: Where to place the backup. Files are materialized at
+                this path (linked from the store); directories get a manifest
+                at ``backup_path + MANIFEST_SUFFIX``
+            copy_on_modify: Allow hardlinks (the caller replaces files instead
+                of writing in place)
+
+        Returns:
+            str: Path of the backup (file or manifest)
+        """
+        if os.path.isdir(source):
+            return self._snapshot_directory(source, backup_path, copy_on_modify)
+
+        st = os.stat(source)
+        with self._lock:
+            digest = self._known_digests({source: st}).get(source)
+        if digest is None:
+            digest = hashing_service.hash_file(source, 'sha256', use_cache=False)['sha256']
+        with self._lock:
+            obj = self._store_object(source, st, digest, copy_on_modify)
+            self._save_index()
+        # The backup is another name for the immutable object
+        self._link_or_copy(obj, backup_path)
+        return backup_path
+
+    def restore(self, backup_path: str, target: str) -> RestoreStats:
+        """
+        Restore a snapshot over target, rewriting only what changed
+
+        Args:
+            backup_path: Path returned by snapshot
+            target: File or directory to restore
+        """
+        if backup_path.endswith(MANIFEST_SUFFIX):
+            return self._restore_directory(backup_path, target)
+
+        result = RestoreStats()
+        backup_st = os.stat(backup_path)
+        if self._same_file_state(target, backup_st.st_size, backup_st.st_mtime_ns):
+            result.unchanged += 1
+            return result
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        self._restore_file(backup_path, target)
+        result.restored += 1
+        return result
+
+    def collect_garbage(self, manifest_dirs: Iterable[str]) -> int:
+        """
+        Remove objects no longer referenced by any backup
+
+        Args:
+            manifest_dirs: Directories holding backups (transaction directories)
+
+        Returns:
+            int: Number of objects removed
+        """
+        referenced = set()
+        for directory in manifest_dirs:
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.endswith(MANIFEST_SUFFIX):
+                    try:
+                        manifest = self._load_manifest(os.path.join(directory, name))
+                        referenced.update(entry[0] for entry in manifest['files'].values())
+                    except (OSError, ValueError, KeyError):
+                        continue
+
+        removed = 0
+        with self._lock:
+            index = self._load_index()['objects']
+            for digest in list(index):
+                obj = self._object_path(digest)
+                try:
+                    # File backups are hardlinks of the object (nlink > 1)
+                    if digest in referenced or os.stat(obj).st_nlink > 1:
+                        continue
+                    os.remove(obj)
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+                del index[digest]
+                removed += 1
+            if removed:
+                identities = self._load_index()['identities']
+                for identity in [i for i, digest in identities.items() if digest not in index]:
+                    del identities[identity]
+                self._save_index()
+        return removed
+
+    # ------------------------------------------------------------------
+    # Directories
+    # ------------------------------------------------------------------
+
+    def _snapshot_directory(self, source: str, backup_path: str, copy_on_modify: bool) -> str:
+        source = os.path.abspath(source)
+        prefix_length = len(os.path.join(source, ''))
+        files: Dict[str, os.stat_result] = {}
+        directories: List[str] = []
+        for current, dirnames, filenames in os.walk(source):
+            if current != source:
+                directories.append(current[prefix_length:])
+            for name in filenames:
+                path = os.path.join(current, name)
+                st = os.lstat(path)
+                if stat.S_ISREG(st.st_mode):
+                    files[path] = st
+
+        # Only files not seen before (by inode, size and mtime) are hashed
+        with self._lock:
+            digests = self._known_digests(files)
+        unknown = [path for path in files if path not in digests]
+        if unknown:
+            hashed = hashing_service.hash_files(unknown, 'sha256', use_cache=False)
+            digests.update((path, result['sha256']) for path, result in hashed.items())
+
+        entries = {}
+        with self._lock:
+            for path, st in files.items():
+                digest = digests.get(path)
+                if digest is None:
+                    raise OSError(f"Could not hash {path}")
+                self._store_object(path, st, digest, copy_on_modify)
+                entries[path[prefix_length:]] = [digest, st.st_size, st.st_mtime_ns, st.st_mode]
+            self._save_index()
+
+        manifest_path = backup_path + MANIFEST_SUFFIX
+        temp_path = manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'version': 1, 'source': source, 'directories': sorted(directories),
+                                'files': entries}))
+        os.replace(temp_path, manifest_path)
+        return manifest_path
+
+    def _restore_directory(self, manifest_path: str, target: str) -> RestoreStats:
+        manifest = self._load_manifest(manifest_path)
+        entries: Dict[str, list] = manifest['files']
+        directories = set(manifest['directories'])
+        result = RestoreStats()
+
+        if os.path.isfile(target):
+            os.remove(target)
+        os.makedirs(target, exist_ok=True)
+
+        # Remove what did not exist at snapshot time (deepest first)
+        for current, dirnames, filenames in os.walk(target, topdown=False):
+            rel_dir = os.path.relpath(current, target)
+            for name in filenames:
+                rel = os.path.normpath(os.path.join(rel_dir, name))
+                if rel not in entries:
+                    os.remove(os.path.join(current, name))
+                    result.removed += 1
+            if rel_dir != '.' and rel_dir not in directories:
+                shutil.rmtree(current, ignore_errors=True)
+                result.removed += 1
+
+        for rel_dir in sorted(directories):
+            os.makedirs(os.path.join(target, rel_dir), exist_ok=True)
+
+        for rel, (digest, size, mtime_ns, mode) in entries.items():
+            path = os.path.join(target, rel)
+            if self._same_file_state(path, size, mtime_ns):
+                result.unchanged += 1
+                continue
+            obj = self._object_path(digest)
+            if not self._object_valid(digest, size):
+                logger.error(f"Backup object for {path} is missing or was modified")
+                result.failed += 1
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            self._restore_file(obj, path, mtime_ns, mode)
+            result.restored += 1
+
+        return result
+
+    # ------------------------------------------------------------------
+    # Object store
+    # ------------------------------------------------------------------
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    @staticmethod
+    def _identity(st: os.stat_result) -> str:
+        return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+    def _known_digests(self, files: Dict[str, os.stat_result]) -> Dict[str, str]:
+        identities = self._load_index()['identities']
+        known = {}
+        for path, st in files.items():
+            digest = identities.get(self._identity(st))
+            if digest is not None:
+                known[path] = digest
+        return known
+
+    def _store_object(self, source: str, st: os.stat_result, digest: str, copy_on_modify: bool) -> str:
+        obj = self._object_path(digest)
+        self._load_index()['identities'][self._identity(st)] = digest
+        if self._object_valid(digest, st.st_size):
+            self.stats["deduplicated"] += 1
+            return obj
+
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        temp = f"{obj}.{uuid.uuid4().hex[:8]}.tmp"
+        for method in self.methods:
+            if method == METHOD_HARDLINK and not copy_on_modify:
+                continue
+            if self._bring_in(method, source, temp):
+                os.replace(temp, obj)
+                self.stats[method] += 1
+                break
+        else:
+            raise OSError(f"Could not back up {source}")
+
+        obj_st = os.stat(obj)
+        self._load_index()['objects'][digest] = [obj_st.st_size, obj_st.st_mtime_ns]
+        return obj
+
+    def _bring_in(self, method: str, source: str, destination: str) -> bool:
+        try:
+            if method == METHOD_REFLINK:
+                if self._reflink_supported is False:
+                    return False
+                self._reflink_supported = reflink_file(source, destination)
+                return self._reflink_supported
+            if method == METHOD_HARDLINK:
+                os.link(source, destination)
+                return True
+            shutil.copy2(source, destination)
+            return True
+        except OSError as e:
+            logger.debug(f"Backup method {method} failed for {source}: {e}")
+            return False
+
+    def _object_valid(self, digest: str, size: int) -> bool:
+        recorded = self._load_index()['objects'].get(digest)
+        if recorded is None or recorded[0] != size:
+            return False
+        try:
+            st = os.stat(self._object_path(digest))
+        except OSError:
+            return False
+        return [st.st_size, st.st_mtime_ns] == recorded
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Index: objects (digest -> [size, mtime_ns]) and identities (stat identity -> digest)"""
+        if self._index is None:
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+            self._index.setdefault('objects', {})
+            self._index.setdefault('identities', {})
+        return self._index
+
+    def _save_index(self) -> None:
+        os.makedirs(self.objects_dir, exist_ok=True)
+        temp = self.index_file + ".tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self._load_index()))
+        os.replace(temp, self.index_file)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load_manifest(manifest_path: str) -> Dict:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _same_file_state(path: str, size: int, mtime_ns: int) -> bool:
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return False
+        return stat.S_ISREG(st.st_mode) and st.st_size == size and st.st_mtime_ns == mtime_ns
+
+    def _link_or_copy(self, source: str, destination: str) -> None:
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+    def _restore_file(self, source: str, target: str, mtime_ns: Optional[int] = None,
+                      mode: Optional[int] = None) -> None:
+        """Replace target with a private clone of source (never a hardlink)"""
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        temp = f"{target}.{uuid.uuid4().hex[:8]}.restore"
+        if not (self._reflink_supported is not False and reflink_file(source, temp)):
+            shutil.copy2(source, temp)
+        if mode is not None:
+            os.chmod(temp, stat.S_IMODE(mode))
+        if mtime_ns is not None:
+            os.utime(temp, ns=(mtime_ns, mtime_ns))
+        os.replace(temp, target)
+
+
+def replace_file_contents(path: str, content: str, encoding: str = 'utf-8') -> None:
+    """
+    Write a text file by replacing it (temporary file + os.replace)
+
+    Never writes into the existing inode, which keeps hardlinked backups of
+    the previous version intact (copy-on-modify).
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    temp = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(temp, 'w', encoding=encoding) as f:
+            f.write(content)
+        if os.path.exists(path):
+            shutil.copymode(path, temp)
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+def merge_directory(staging: str, target: str) -> Tuple[int, int]:
+    """
+    Move the contents of staging into target, replacing files by rename
+
+    Existing files are replaced with os.replace, so hardlinked backups of
+    them are not modified. staging is removed afterwards.
+
+    Returns:
+        Tuple[int, int]: (files moved, directories created)
+    """
+    moved = created = 0
+    for current, dirnames, filenames in os.walk(staging):
+        rel_dir = os.path.relpath(current, staging)
+        destination_dir = target if rel_dir == '.' else os.path.join(target, rel_dir)
+        if os.path.isfile(destination_dir):
+            os.remove(destination_dir)
+        if not os.path.isdir(destination_dir):
+            os.makedirs(destination_dir)
+            created += 1
+        for name in filenames:
+            destination = os.path.join(destination_dir, name)
+            if os.path.isdir(destination):
+                shutil.rmtree(destination)
+            os.replace(os.path.join(current, name), destination)
+            moved += 1
+    shutil.rmtree(staging, ignore_errors=True)
+    return moved, created
+
+
+# Global stores (one per backup root)
+_stores: Dict[str, SnapshotBackupStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(root: str) -> SnapshotBackupStore:
+    """Get the shared store for a backup root (deduplicates across transactions)"""
+    key = os.path.normcase(os.path.abspath(root))
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SnapshotBackupStore(key)
+        return _stores[key]
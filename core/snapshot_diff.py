@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshots incrementais do ambiente
+Representa cada snapshot como registros compactos, ordenados por chave e
+endereçados por conteúdo (digest), de forma que comparar dois snapshots é
+uma junção ordenada de digests. Inclui também um índice de diretórios que
+reaproveita o mtime de cada diretório para não relistar subárvores
+inalteradas entre ciclos de monitoramento.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Tamanho do digest dos registros (bytes)
+RECORD_DIGEST_SIZE = 16
+
+# Seção -> tupla ordenada de (chave, digest)
+SectionRecords = Tuple[Tuple[str, str], ...]
+
+
+def record_digest(record: Any) -> str:
+    """Digest estável do conteúdo de um registro (JSON canônico)"""
+    payload = json.dumps(record, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=RECORD_DIGEST_SIZE).hexdigest()
+
+
+class RecordStore:
+    """
+    Armazenamento endereçado por conteúdo: digest -> registro.
+
+    Registros idênticos em snapshots diferentes são guardados uma única vez;
+    ``retain`` descarta os que não são mais referenciados.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def put(self, record: Any) -> str:
+        digest = record_digest(record)
+        with self._lock:
+            self._records.setdefault(digest, record)
+        return digest
+
+    def get(self, digest: str) -> Any:
+        return self._records.get(digest)
+
+    def retain(self, snapshots: Iterable['SnapshotRecords']) -> int:
+        """
+        Mantém apenas os registros referenciados pelos snapshots informados
+
+        Returns:
+            int: Número de registros removidos
+        """
+        referenced = set()
+        for snapshot in snapshots:
+            if snapshot is None:
+                continue
+            for records in snapshot.sections.values():
+                referenced.update(digest for _, digest in records)
+        with self._lock:
+            stale = [digest for digest in self._records if digest not in referenced]
+            for digest in stale:
+                del self._records[digest]
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+@dataclass
+class SnapshotRecords:
+    """Snapshot compacto: por seção, registros (chave, digest) ordenados por chave"""
+    timestamp: float
+    sections: Dict[str, SectionRecords] = field(default_factory=dict)
+    section_digests: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, timestamp: float, sections: Mapping[str, Mapping[str, Any]],
+              store: RecordStore) -> 'SnapshotRecords':
+        """
+        Cria o snapshot a partir de seções chave -> registro
+
+        Args:
+            timestamp: Momento da captura
+            sections: Ex.: {"processes": {"python.exe": {...}}, ...}
+            store: Armazenamento onde os registros são guardados
+        """
+        snapshot = cls(timestamp=timestamp)
+        for name, records in sections.items():
+            entries = tuple(sorted((str(key), store.put(record)) for key, record in records.items()))
+            snapshot.sections[name] = entries
+            snapshot.section_digests[name] = record_digest(entries)
+        return snapshot
+
+    def keys(self, section: str) -> List[str]:
+        return [key for key, _ in self.sections.get(section, ())]
+
+
+@dataclass
+class SectionDiff:
+    """Diferença de uma seção entre dois snapshots"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def diff_sections(old: SectionRecords, new: SectionRecords) -> SectionDiff:
+    """Compara duas seções ordenadas numa única passada (junção por chave)"""
+    diff = SectionDiff()
+    i = j = 0
+    while i < len(old) and j < len(new):
+        old_key, old_digest = old[i]
+        new_key, new_digest = new[j]
+        if old_key == new_key:
+            if old_digest != new_digest:
+                diff.changed.append(new_key)
+            i += 1
+            j += 1
+        elif old_key < new_key:
+            diff.removed.append(old_key)
+            i += 1
+        else:
+            diff.added.append(new_key)
+            j += 1
+    diff.removed.extend(key for key, _ in old[i:])
+    diff.added.extend(key for key, _ in new[j:])
+    return diff
+
+
+def diff_snapshots(old: SnapshotRecords, new: SnapshotRecords) -> Dict[str, SectionDiff]:
+    """
+    Compara dois snapshots seção a seção
+
+    Seções com o mesmo digest agregado são consideradas iguais sem percorrer
+    os registros.
+    """
+    diffs = {}
+    for name in sorted(set(old.sections) | set(new.sections)):
+        if name in old.sections and old.section_digests.get(name) == new.section_digests.get(name):
+            diffs[name] = SectionDiff()
+            continue
+        diffs[name] = diff_sections(old.sections.get(name, ()), new.sections.get(name, ()))
+    return diffs
+
+
+@dataclass
+class _DirectoryEntry:
+    """Conteúdo direto de um diretório na última listagem"""
+    mtime_ns: int
+    file_count: int
+    total_size: int
+    subdirs: Tuple[str, ...]
+
+
+class DirectoryTreeIndex:
+    """
+    Índice incremental de árvores de diretórios.
+
+    Um diretório só é relistado quando o seu mtime muda (criação, remoção ou
+    renomeação de entradas); caso contrário, a contagem e o tamanho dos seus
+    arquivos vêm do índice e apenas os subdiretórios são visitados com um
+    ``stat``. O custo de um novo ciclo é proporcional ao número de
+    diretórios mais as entradas dos diretórios alterados. Alterações de
+    conteúdo que não mudam o mtime do diretório (reescrita no lugar) só são
+    refletidas quando o diretório é relistado.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _DirectoryEntry] = {}
+        self._lock = threading.Lock()
+        self.stats = {"listed": 0, "reused": 0}
+
+    def scan(self, root: str) -> Dict[str, Any]:
+        """
+        Totais de uma árvore de diretórios
+
+        Returns:
+            Dict: file_count, total_size e last_modified (mtime da raiz)
+        """
+        root_stat = os.stat(root)
+        file_count = 0
+        total_size = 0
+        visited = set()
+        pending = [root]
+
+        with self._lock:
+            while pending:
+                directory = pending.pop()
+                entry = self._directory_entry(directory)
+                if entry is None:
+                    continue
+                visited.add(directory)
+                file_count += entry.file_count
+                total_size += entry.total_size
+                pending.extend(entry.subdirs)
+
+            # Esquece diretórios desta árvore que deixaram de existir
+            prefix = os.path.join(root, '')
+            for directory in [d for d in self._entries if d.startswith(prefix) and d not in visited]:
+                del self._entries[directory]
+
+        return {
+            'file_count': file_count,
+            'total_size': total_size,
+            'last_modified': root_stat.st_mtime
+        }
+
+    def _directory_entry(self, directory: str) -> Optional[_DirectoryEntry]:
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._entries.pop(directory, None)
+            return None
+
+        cached = self._entries.get(directory)
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            self.stats["reused"] += 1
+            return cached
+
+        file_count = 0
+        total_size = 0
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for item in entries:
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            subdirs.append(item.path)
+                        elif item.is_file(follow_symlinks=False):
+                            file_count += 1
+                            total_size += item.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            self._entries.pop(directory, None)
+            return None
+
+        entry = _DirectoryEntry(mtime_ns, file_count, total_size, tuple(subdirs))
+        self._entries[directory] = entry
+        self.stats["listed"] += 1
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
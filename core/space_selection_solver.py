@@ -0,0 +1,610 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Space Selection Solver - Dependency-closed knapsack for component selection
+Chooses the set of components with the highest total value that fits in the
+available space, where selecting a component also selects its prerequisites.
+"""
+
+import bisect
+import heapq
+import math
+import operator
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+try:
+    from .snapshot_diff import record_digest
+except ImportError:
+    from snapshot_diff import record_digest
+
+# Capacity resolution of the DP; sizes are rounded up to buckets of
+# ceil(capacity / MAX_CAPACITY_BUCKETS) MB, so solutions always fit.
+MAX_CAPACITY_BUCKETS = 4096
+
+# Subsets enumerated per dependency group before the group is considered too
+# entangled for the DP and branch-and-bound takes over
+MAX_GROUP_SUBSETS = 512
+
+# Width of the quick DP that provides the lower bound for the reductions
+COARSE_BUCKETS = 256
+
+# Largest DP table (options x buckets) built after the reductions; above it
+# buckets are widened
+DP_CELL_BUDGET = 1500000
+
+# Nodes explored by branch-and-bound before the best solution so far is returned
+BRANCH_AND_BOUND_NODE_LIMIT = 5000
+
+# Cached results per SpaceSelectionSolver
+SOLUTION_CACHE_SIZE = 128
+
+
+@dataclass(frozen=True)
+class SelectionItem:
+    """Candidate component for the solver."""
+    name: str
+    size_mb: float
+    value: float
+    dependencies: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class SolverResult:
+    """Outcome of a space selection."""
+    selected: Tuple[str, ...]  # dependencies before dependents
+    total_size_mb: float
+    total_value: float
+    method: str  # "all", "dp" or "branch_and_bound"
+    optimal: bool  # False when the DP was coarsened or branch-and-bound hit its node limit
+    cyclic: Tuple[str, ...] = ()  # items unreachable because of circular dependencies
+
+
+class _Option(NamedTuple):
+    """Dependency-closed subset of one group."""
+    weight: int
+    value: float
+    members: Tuple[str, ...]
+
+
+def capacity_bucket_size(capacity_mb: float, max_buckets: int = MAX_CAPACITY_BUCKETS) -> int:
+    """Bucket size (MB) that keeps the DP table at most max_buckets wide."""
+    return max(1, math.ceil(max(capacity_mb, 0) / max_buckets))
+
+
+def catalog_digest(items: Iterable[SelectionItem]) -> str:
+    """Stable digest of a candidate catalog."""
+    return record_digest([[item.name, item.size_mb, item.value, list(item.dependencies)] for item in items])
+
+
+def dependency_closure(name: str, dependencies: Mapping[str, Sequence[str]]) -> List[str]:
+    """
+    Transitive prerequisites of a component, dependencies first and the
+    component itself last. Names missing from the mapping are ignored.
+    """
+    if name not in dependencies:
+        return []
+    closure = []
+    visited = {name}
+    stack = [(name, iter(dependencies[name]))]
+    while stack:
+        current, pending = stack[-1]
+        for dependency in pending:
+            if dependency in dependencies and dependency not in visited:
+                visited.add(dependency)
+                stack.append((dependency, iter(dependencies[dependency])))
+                break
+        else:
+            stack.pop()
+            closure.append(current)
+    return closure
+
+
+def _size_in_buckets(size_mb: float, bucket_mb: int) -> int:
+    return math.ceil(size_mb / bucket_mb) if size_mb > 0 else 0
+
+
+def _topological_order(index: Dict[str, SelectionItem]) -> Tuple[List[str], Tuple[str, ...]]:
+    """Dependencies before dependents, otherwise in input order; cyclic items are left out."""
+    position = {name: i for i, name in enumerate(index)}
+    dependents: Dict[str, List[str]] = {name: [] for name in index}
+    missing = {}
+    for name, item in index.items():
+        known = {dependency for dependency in item.dependencies if dependency in index}
+        missing[name] = len(known)
+        for dependency in known:
+            dependents[dependency].append(name)
+
+    ready = [position[name] for name, count in missing.items() if count == 0]
+    heapq.heapify(ready)
+    names = list(index)
+    order = []
+    while ready:
+        name = names[heapq.heappop(ready)]
+        order.append(name)
+        for dependent in dependents[name]:
+            missing[dependent] -= 1
+            if missing[dependent] == 0:
+                heapq.heappush(ready, position[dependent])
+
+    ordered = set(order)
+    return order, tuple(name for name in index if name not in ordered)
+
+
+def _dependency_groups(order: List[str], index: Dict[str, SelectionItem]) -> List[List[str]]:
+    """Connected components of the dependency graph, members in topological order."""
+    parent = {name: name for name in order}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for name in order:
+        for dependency in index[name].dependencies:
+            if dependency in parent:
+                root, other = find(name), find(dependency)
+                if root != other:
+                    parent[other] = root
+
+    groups: Dict[str, List[str]] = OrderedDict()
+    for name in order:
+        groups.setdefault(find(name), []).append(name)
+    return list(groups.values())
+
+
+def _enumerate_closed_subsets(group: List[str], index: Dict[str, SelectionItem], bucket_mb: int,
+                              capacity: int, limit: int) -> Optional[List[_Option]]:
+    """
+    All dependency-closed subsets of a group that fit and have value, or None
+    when the group has more than ``limit`` of them.
+    """
+    position = {name: i for i, name in enumerate(group)}
+    dependencies = [tuple(position[d] for d in index[name].dependencies if d in position) for name in group]
+    weights = [_size_in_buckets(index[name].size_mb, bucket_mb) for name in group]
+    values = [index[name].value for name in group]
+    count = len(group)
+
+    options = []
+    leaves = 0
+    chosen = bytearray(count)
+    stack = [(0, 0, 0.0)]
+    while stack:
+        frame = stack.pop()
+        if frame[0] is None:
+            chosen[frame[1]] = 0
+            continue
+        i, weight, value = frame
+        if i == count:
+            leaves += 1
+            if leaves > limit:
+                return None
+            if value > 0:
+                options.append(_Option(weight, value, tuple(group[j] for j in range(count) if chosen[j])))
+            continue
+        stack.append((i + 1, weight, value))
+        if weight + weights[i] <= capacity and all(chosen[d] for d in dependencies[i]):
+            chosen[i] = 1
+            stack.append((None, i))
+            stack.append((i + 1, weight + weights[i], value + values[i]))
+    return options
+
+
+def _closure_groups(group: List[str], index: Dict[str, SelectionItem], bucket_mb: int,
+                    capacity: int) -> List[List[_Option]]:
+    """
+    Split an entangled group into one pseudo-group per valuable member: the
+    member with its prerequisites, valued by the member alone. Shared
+    prerequisites are counted in every closure, so any combination of these
+    options still fits; they seed branch-and-bound with a good solution.
+    """
+    dependencies = {name: index[name].dependencies for name in group}
+    groups = []
+    for name in group:
+        if index[name].value <= 0:
+            continue
+        members = tuple(dependency_closure(name, dependencies))
+        weight = sum(_size_in_buckets(index[member].size_mb, bucket_mb) for member in members)
+        if weight <= capacity:
+            groups.append([_Option(weight, index[name].value, members)])
+    return groups
+
+
+def _hull_increments(options: List[_Option]) -> List[Tuple[int, float]]:
+    """
+    Upper convex hull of a group's (weight, value) points, starting from the
+    empty choice, as increments with decreasing value per bucket.
+    """
+    hull = [(0, 0.0)]
+    for option in sorted(options, key=lambda o: (o.weight, -o.value)):
+        if option.value <= hull[-1][1]:
+            continue
+        if option.weight == hull[-1][0] and len(hull) > 1:
+            hull.pop()
+        while len(hull) >= 2:
+            (w1, v1), (w2, v2) = hull[-2], hull[-1]
+            # Drop the middle point when it lies on or below the segment
+            if (v2 - v1) * (option.weight - w1) <= (option.value - v1) * (w2 - w1):
+                hull.pop()
+            else:
+                break
+        hull.append((option.weight, option.value))
+    return [(w2 - w1, v2 - v1) for (w1, v1), (w2, v2) in zip(hull, hull[1:])]
+
+
+def _reduce_groups(group_options: List[List[_Option]], capacity: int,
+                   lower_bound: float) -> Tuple[List[_Option], List[List[_Option]], int]:
+    """
+    Fix options in or out of every solution at least as good as the best
+    known one (``lower_bound`` or a greedy solution, whichever is higher).
+
+    The upper bound is the LP relaxation of the multiple-choice knapsack
+    (hull increments of every group taken by decreasing value per bucket),
+    evaluated in O(log n) with prefix sums. An option whose best possible
+    total stays below the greedy value is dropped; a group with a single
+    option that no good solution can do without is fixed in. Only the
+    options left in between reach the DP.
+
+    Returns:
+        Tuple: (fixed options, remaining group options, remaining capacity)
+    """
+    increments = []
+    for g, options in enumerate(group_options):
+        for weight, value in _hull_increments(options):
+            increments.append((value / weight if weight else math.inf, weight, value, g))
+    increments.sort(key=lambda increment: increment[0], reverse=True)
+    prefix_weight = [0]
+    prefix_value = [0.0]
+    for _, weight, value, _ in increments:
+        prefix_weight.append(prefix_weight[-1] + weight)
+        prefix_value.append(prefix_value[-1] + value)
+
+    def critical(cap):
+        return bisect.bisect_right(prefix_weight, cap) - 1
+
+    def relaxation(cap):
+        k = critical(cap)
+        if k == len(increments):
+            return prefix_value[k]
+        return prefix_value[k] + (cap - prefix_weight[k]) * increments[k][0]
+
+    # Greedy lower bound: options by value per bucket, upgrading a group's
+    # choice when a more valuable option of the same group still fits
+    chosen: Dict[int, _Option] = {}
+    free = capacity
+    ranked = sorted(((option.value / option.weight if option.weight else math.inf, g, option)
+                     for g, options in enumerate(group_options) for option in options),
+                    key=lambda entry: entry[0], reverse=True)
+    for _, g, option in ranked:
+        current = chosen.get(g)
+        extra = option.weight - (current.weight if current else 0)
+        if (current is None or option.value > current.value) and extra <= free:
+            chosen[g] = option
+            free -= extra
+    threshold = max(lower_bound, sum(option.value for option in chosen.values())) - 1e-9
+
+    limit = critical(capacity)
+    position = {g: p for p, (_, _, _, g) in enumerate(increments)}
+    fixed = []
+    remaining = []
+    for g, options in enumerate(group_options):
+        kept = [o for o in options
+                if o.weight <= capacity and o.value + relaxation(capacity - o.weight) >= threshold]
+        if len(kept) == 1 and len(options) == 1:
+            option = kept[0]
+            if position[g] < limit:
+                without = relaxation(capacity + option.weight) - option.value
+            else:
+                without = relaxation(capacity)
+            if without < threshold:
+                fixed.append(option)
+                continue
+        if kept:
+            remaining.append(kept)
+    return fixed, remaining, capacity - sum(option.weight for option in fixed)
+
+
+def _knapsack_table(group_options: List[List[_Option]], capacity: int,
+                    record: bool = True) -> Tuple[List[float], List[List[Tuple[_Option, bytes]]]]:
+    """
+    Multiple-choice knapsack over bucketed sizes: at most one option per group.
+
+    ``best[c]`` is the best value using at most c buckets. Each option is
+    applied with whole-row list operations instead of a loop with per-cell
+    bookkeeping; with ``record`` a byte mask per option marks where it won,
+    so the solution can be rebuilt backwards without keeping every row.
+    """
+    best = [0.0] * (capacity + 1)
+    decisions = []
+    for options in group_options:
+        previous = best
+        best = previous[:]
+        applied = []
+        for option in options:
+            weight = option.weight
+            if weight > capacity:
+                continue
+            value = option.value
+            candidate = [v + value for v in previous[:capacity + 1 - weight]]
+            current = best[weight:]
+            if record:
+                applied.append((option, bytes(map(operator.gt, candidate, current))))
+            best[weight:] = [c if c > o else o for c, o in zip(candidate, current)]
+        decisions.append(applied)
+    return best, decisions
+
+
+def _coarse_lower_bound(group_options: List[List[_Option]], capacity: int) -> float:
+    """Value of a feasible solution found by a DP over COARSE_BUCKETS wide buckets."""
+    factor = math.ceil(capacity / COARSE_BUCKETS)
+    if factor <= 1 or not group_options:
+        return 0.0
+    coarse = [[_Option(math.ceil(o.weight / factor), o.value, o.members) for o in options]
+              for options in group_options]
+    best, _ = _knapsack_table(coarse, capacity // factor, record=False)
+    return best[-1]
+
+
+def _solve_grouped(group_options: List[List[_Option]], capacity: int) -> Tuple[Set[str], bool]:
+    """
+    Multiple-choice knapsack: reduce with a greedy bound, tighten the bound
+    with a coarse DP and reduce again, then run the full DP on what is left.
+    If the remaining table would exceed DP_CELL_BUDGET cells, buckets are
+    widened to stay within it.
+
+    Returns:
+        Tuple: (selected names, whether the DP ran at full resolution)
+    """
+    fixed, group_options, capacity = _reduce_groups(group_options, capacity, 0.0)
+    if len(group_options) > 1:
+        more, group_options, capacity = _reduce_groups(
+            group_options, capacity, _coarse_lower_bound(group_options, capacity))
+        fixed.extend(more)
+    capacity = min(capacity, sum(max(o.weight for o in options) for options in group_options))
+
+    factor = math.ceil((capacity + 1) * sum(map(len, group_options)) / DP_CELL_BUDGET)
+    if factor > 1:
+        group_options = [[_Option(math.ceil(o.weight / factor), o.value, o.members) for o in options]
+                         for options in group_options]
+        capacity //= factor
+    _, decisions = _knapsack_table(group_options, capacity)
+
+    selected: Set[str] = set()
+    for option in fixed:
+        selected.update(option.members)
+    remaining = capacity
+    for applied in reversed(decisions):
+        for option, improved in reversed(applied):
+            if remaining >= option.weight and improved[remaining - option.weight]:
+                selected.update(option.members)
+                remaining -= option.weight
+                break
+    return selected, factor <= 1
+
+
+def _fill_remaining(chosen: Set[str], order: List[str], index: Dict[str, SelectionItem],
+                    capacity_mb: float) -> Set[str]:
+    """Add items, with their missing prerequisites, that fit in the space rounding left unused."""
+    chosen = set(chosen)
+    free = capacity_mb - sum(index[name].size_mb for name in chosen)
+    dependencies = {name: index[name].dependencies for name in order}
+    candidates = [name for name in order if index[name].value > 0 and name not in chosen]
+    candidates.sort(key=lambda name: _ratio(index[name]), reverse=True)
+    for name in candidates:
+        if name in chosen:
+            continue
+        missing = [member for member in dependency_closure(name, dependencies) if member not in chosen]
+        extra = sum(index[member].size_mb for member in missing)
+        if extra <= free:
+            chosen.update(missing)
+            free -= extra
+    return chosen
+
+
+def _ratio(item: SelectionItem) -> float:
+    if item.size_mb > 0:
+        return item.value / item.size_mb
+    return math.inf if item.value > 0 else 0.0
+
+
+def _branch_and_bound(order: List[str], index: Dict[str, SelectionItem], capacity_mb: float,
+                      incumbent: Set[str], node_limit: int) -> Tuple[Set[str], bool]:
+    """
+    Depth-first branch-and-bound over valuable items by decreasing value
+    per MB. Including an item also includes its missing prerequisites;
+    excluding it rules out everything that depends on it. Subtrees are
+    pruned with the fractional knapsack over undecided items, which ignores
+    dependencies and is therefore an upper bound.
+
+    Returns:
+        Tuple: (selected names, whether the search completed)
+    """
+    dependencies = {name: index[name].dependencies for name in order}
+    variables = sorted((name for name in order if index[name].value > 0),
+                       key=lambda name: _ratio(index[name]), reverse=True)
+    count = len(variables)
+    sizes = {name: max(index[name].size_mb, 0) for name in order}
+    values = {name: index[name].value for name in order}
+
+    status: Dict[str, int] = {}  # 1 = included, 2 = excluded
+    best_value = sum(values[name] for name in incumbent) + 1e-9
+    best = None
+    nodes = 0
+    stack = [('node', 0, 0.0, 0.0)]
+    while stack:
+        frame = stack.pop()
+        kind = frame[0]
+        if kind == 'undo':
+            for name in frame[1]:
+                del status[name]
+            continue
+        if kind == 'exclude':
+            _, i, used, value = frame
+            status[variables[i]] = 2
+            stack.append(('undo', (variables[i],)))
+            stack.append(('node', i + 1, used, value))
+            continue
+
+        nodes += 1
+        if nodes > node_limit:
+            break
+        _, i, used, value = frame
+        if value > best_value:
+            best_value = value + 1e-9
+            best = [name for name, state in status.items() if state == 1]
+        while i < count and variables[i] in status:
+            i += 1
+        if i == count:
+            continue
+
+        free = capacity_mb - used
+        bound = value
+        for name in variables[i:]:
+            if name in status:
+                continue
+            if sizes[name] <= free:
+                bound += values[name]
+                free -= sizes[name]
+            else:
+                bound += values[name] * free / sizes[name]
+                break
+        if bound <= best_value:
+            continue
+
+        stack.append(('exclude', i, used, value))
+        missing = [m for m in dependency_closure(variables[i], dependencies) if status.get(m) != 1]
+        extra = sum(sizes[m] for m in missing)
+        if used + extra <= capacity_mb and not any(status.get(m) == 2 for m in missing):
+            for m in missing:
+                status[m] = 1
+            stack.append(('undo', missing))
+            stack.append(('node', i + 1, used + extra, value + sum(values[m] for m in missing)))
+
+    complete = nodes <= node_limit
+    return (set(best) if best is not None else set(incumbent)), complete
+
+
+def _build_result(chosen: Set[str], order: List[str], index: Dict[str, SelectionItem], method: str,
+                  optimal: bool, cyclic: Tuple[str, ...]) -> SolverResult:
+    # Drop value-less items that no selected item depends on
+    kept = set()
+    needed = set()
+    for name in reversed(order):
+        if name in chosen and (index[name].value > 0 or name in needed):
+            kept.add(name)
+            needed.update(index[name].dependencies)
+    selected = tuple(name for name in order if name in kept)
+    return SolverResult(
+        selected=selected,
+        total_size_mb=sum(index[name].size_mb for name in selected),
+        total_value=sum(index[name].value for name in selected),
+        method=method,
+        optimal=optimal,
+        cyclic=cyclic
+    )
+
+
+def solve_space_selection(items: Iterable[SelectionItem], capacity_mb: float,
+                          bucket_mb: Optional[int] = None,
+                          max_buckets: int = MAX_CAPACITY_BUCKETS,
+                          max_group_subsets: int = MAX_GROUP_SUBSETS,
+                          node_limit: int = BRANCH_AND_BOUND_NODE_LIMIT) -> SolverResult:
+    """
+    Select the dependency-closed set of items with the highest total value
+    whose size fits in capacity_mb.
+
+    Items are split into groups connected by dependencies. When every group
+    has few dependency-closed subsets, the problem is a multiple-choice
+    knapsack solved exactly by DP over size buckets. Groups too entangled to
+    enumerate are replaced by one option per component (the component plus
+    its prerequisites) and the DP result seeds a branch-and-bound search
+    over the whole catalog. Space left unused by bucket rounding is filled
+    greedily afterwards.
+
+    Dependencies not present in ``items`` are treated as already satisfied.
+    Items with zero value are only selected as prerequisites of others.
+    """
+    index: Dict[str, SelectionItem] = {}
+    for item in items:
+        index.setdefault(item.name, item)
+    order, cyclic = _topological_order(index)
+    capacity_mb = max(capacity_mb, 0)
+
+    # Everything worth selecting fits: nothing to optimize
+    dependencies = {name: index[name].dependencies for name in order}
+    wanted = set()
+    for name in order:
+        if index[name].value > 0 and name not in wanted:
+            wanted.update(dependency_closure(name, dependencies))
+    if sum(index[name].size_mb for name in wanted) <= capacity_mb:
+        return _build_result(wanted, order, index, "all", True, cyclic)
+
+    if bucket_mb is None:
+        bucket_mb = capacity_bucket_size(capacity_mb, max_buckets)
+    capacity = int(capacity_mb // bucket_mb)
+
+    group_options = []
+    entangled = False
+    for group in _dependency_groups(order, index):
+        options = _enumerate_closed_subsets(group, index, bucket_mb, capacity, max_group_subsets)
+        if options is None:
+            entangled = True
+            group_options.extend(_closure_groups(group, index, bucket_mb, capacity))
+        else:
+            group_options.append(options)
+
+    chosen, full_resolution = _solve_grouped(group_options, capacity)
+    chosen = _fill_remaining(chosen, order, index, capacity * bucket_mb)
+    if not entangled:
+        return _build_result(chosen, order, index, "dp", full_resolution, cyclic)
+
+    chosen, complete = _branch_and_bound(order, index, capacity * bucket_mb, chosen, node_limit)
+    return _build_result(chosen, order, index, "branch_and_bound", complete, cyclic)
+
+
+class SpaceSelectionSolver:
+    """
+    Space selection with an LRU cache of results keyed by
+    (catalog digest, free space bucket, criteria key).
+
+    Free space is quantized to the DP bucket size before solving, so every
+    capacity that falls in the same bucket shares a cached result.
+    """
+
+    def __init__(self, cache_size: int = SOLUTION_CACHE_SIZE, max_buckets: int = MAX_CAPACITY_BUCKETS):
+        self.cache_size = cache_size
+        self.max_buckets = max_buckets
+        self._cache: 'OrderedDict[Hashable, SolverResult]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def solve(self, items: Iterable[SelectionItem], capacity_mb: float,
+              criteria_key: Hashable = ()) -> SolverResult:
+        items = tuple(items)
+        bucket_mb = capacity_bucket_size(capacity_mb, self.max_buckets)
+        space_bucket = int(max(capacity_mb, 0) // bucket_mb)
+        key = (catalog_digest(items), bucket_mb, space_bucket, criteria_key)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return cached
+
+        result = solve_space_selection(items, space_bucket * bucket_mb, bucket_mb=bucket_mb,
+                                       max_buckets=self.max_buckets)
+
+        with self._lock:
+            self.stats["misses"] += 1
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
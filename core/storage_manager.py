@@ -19,6 +19,11 @@ from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
+try:
+    from .space_selection_solver import SelectionItem, SpaceSelectionSolver, dependency_closure
+except ImportError:
+    from space_selection_solver import SelectionItem, SpaceSelectionSolver, dependency_closure
+
 # Import winreg safely for Windows
 try:
     import winreg
@@ -660,12 +665,18 @@ class StorageManager:
             )
 
 
+# Solver value given to eligible components with a zero score, so they still
+# fill spare space
+MIN_SELECTION_VALUE = 0.01
+
+
 class SelectiveInstallationManager:
     """Manager for selective component installation based on available space and priorities."""
     
     def __init__(self, storage_manager: StorageManager):
         self.storage_manager = storage_manager
         self.logger = logging.getLogger("selective_installation_manager")
+        self.selection_solver = SpaceSelectionSolver()
         
         # Component priority mappings
         self.component_priorities = {
@@ -777,15 +788,17 @@ class SelectiveInstallationManager:
     def select_components_by_space(self, components: List[Dict[str, Any]], 
                                  available_space_mb: int,
                                  criteria: SelectionCriteria) -> ComponentSelection:
-        """Select components that fit within available space using intelligent algorithms."""
+        """Select the highest-scoring set of components, with their dependencies, that fits within available space."""
         try:
             # Calculate component scores
             scores = self.calculate_component_scores(components, criteria)
             
-            # Sort components by score (highest first)
-            sorted_components = sorted(components, 
-                                     key=lambda c: scores.get(c.get('name', ''), 0), 
-                                     reverse=True)
+            catalog = {}
+            for component in components:
+                catalog.setdefault(component.get('name', 'unknown'), component)
+            names = sorted(catalog, key=lambda n: scores.get(n, 0), reverse=True)
+            sizes = {name: catalog[name].get('size_mb', 0) for name in names}
+            dependencies = {name: tuple(catalog[name].get('dependencies') or ()) for name in names}
             
             selected = []
             deselected = []
@@ -797,54 +810,84 @@ class SelectiveInstallationManager:
             max_size = criteria.max_total_size_mb or available_space_mb
             effective_limit = min(max_size, available_space_mb)
             
-            # First pass: Select required components
-            for component in sorted_components:
-                name = component.get('name', 'unknown')
-                size_mb = component.get('size_mb', 0)
-                
-                if name in criteria.required_components:
-                    if total_size + size_mb <= effective_limit:
-                        selected.append(name)
-                        total_size += size_mb
-                        selection_reasons[name] = "Required component"
-                    else:
-                        deselected.append(name)
-                        selection_reasons[name] = f"Required but insufficient space ({size_mb}MB needed)"
-                        recommendations.append(f"Consider freeing space to install required component: {name}")
-            
-            # Second pass: Select components by priority and score
-            for component in sorted_components:
-                name = component.get('name', 'unknown')
-                size_mb = component.get('size_mb', 0)
-                score = scores.get(name, 0)
-                priority = self.get_component_priority(name, criteria.steamdeck_optimized)
-                
-                # Skip if already processed or excluded
-                if name in selected or name in deselected or name in criteria.excluded_components:
+            # First pass: Select required components together with their dependencies
+            for name in names:
+                if name not in criteria.required_components:
                     continue
-                
-                # Check priority threshold
-                priority_values = {
-                    ComponentPriority.CRITICAL: 5,
-                    ComponentPriority.HIGH: 4,
-                    ComponentPriority.MEDIUM: 3,
-                    ComponentPriority.LOW: 2,
-                    ComponentPriority.OPTIONAL: 1
-                }
-                
-                if priority_values.get(priority, 0) < priority_values.get(criteria.priority_threshold, 0):
+                missing = [m for m in dependency_closure(name, dependencies) if m not in selected]
+                needed = sum(sizes[m] for m in missing)
+                if total_size + needed <= effective_limit:
+                    for member in missing:
+                        if member in deselected:
+                            deselected.remove(member)
+                        selected.append(member)
+                        selection_reasons[member] = ("Required component" if member in criteria.required_components
+                                                     else f"Dependency of {name}")
+                    total_size += needed
+                else:
                     deselected.append(name)
-                    selection_reasons[name] = f"Below priority threshold ({priority.value})"
+                    selection_reasons[name] = f"Required but insufficient space ({needed}MB needed)"
+                    recommendations.append(f"Consider freeing space to install required component: {name}")
+            
+            # Second pass: Choose the best-scoring dependency-closed set for the remaining space
+            priority_values = {
+                ComponentPriority.CRITICAL: 5,
+                ComponentPriority.HIGH: 4,
+                ComponentPriority.MEDIUM: 3,
+                ComponentPriority.LOW: 2,
+                ComponentPriority.OPTIONAL: 1
+            }
+            unavailable = (set(criteria.excluded_components) | set(deselected)) - set(selected)
+            candidates = [n for n in names if n not in selected and n not in unavailable]
+            items = []
+            below_threshold = {}
+            blocked = {}
+            for name in candidates:
+                priority = self.get_component_priority(name, criteria.steamdeck_optimized)
+                eligible = priority_values.get(priority, 0) >= priority_values.get(criteria.priority_threshold, 0)
+                if not eligible:
+                    below_threshold[name] = priority
+                blocker = next((m for m in dependency_closure(name, dependencies) if m in unavailable), None)
+                if blocker is not None:
+                    blocked[name] = blocker
                     continue
-                
-                # Check if component fits
-                if total_size + size_mb <= effective_limit:
-                    selected.append(name)
-                    total_size += size_mb
-                    selection_reasons[name] = f"Selected (priority: {priority.value}, score: {score:.1f})"
+                # Below-threshold components have no value of their own and are only pulled in as dependencies
+                value = max(scores.get(name, 0), MIN_SELECTION_VALUE) if eligible else 0.0
+                items.append(SelectionItem(name, sizes[name], value,
+                                           tuple(d for d in dependencies[name] if d in catalog and d not in selected)))
+            
+            criteria_key = (criteria.max_total_size_mb, tuple(sorted(criteria.required_components)),
+                            tuple(sorted(criteria.excluded_components)), criteria.priority_threshold.value,
+                            criteria.prefer_essential_only, criteria.steamdeck_optimized)
+            result = self.selection_solver.solve(items, effective_limit - total_size, criteria_key)
+            
+            dependents = {}
+            for name in result.selected:
+                for dependency in dependencies[name]:
+                    dependents.setdefault(dependency, name)
+            for name in result.selected:
+                selected.append(name)
+                total_size += sizes[name]
+                if name in below_threshold:
+                    selection_reasons[name] = f"Dependency of {dependents.get(name, 'selected component')}"
                 else:
-                    deselected.append(name)
-                    selection_reasons[name] = f"Insufficient space ({size_mb}MB needed, {effective_limit - total_size}MB available)"
+                    priority = self.get_component_priority(name, criteria.steamdeck_optimized)
+                    selection_reasons[name] = f"Selected (priority: {priority.value}, score: {scores.get(name, 0):.1f})"
+            
+            chosen = set(result.selected)
+            for name in candidates:
+                if name in chosen:
+                    continue
+                deselected.append(name)
+                if name in below_threshold:
+                    selection_reasons[name] = f"Below priority threshold ({below_threshold[name].value})"
+                elif name in blocked:
+                    selection_reasons[name] = f"Depends on unavailable component ({blocked[name]})"
+                elif name in result.cyclic:
+                    selection_reasons[name] = "Circular dependency"
+                else:
+                    needed = sum(sizes[m] for m in dependency_closure(name, dependencies) if m not in chosen)
+                    selection_reasons[name] = f"Insufficient space ({needed}MB needed, {effective_limit - total_size}MB available)"
             
             # Generate recommendations
             if deselected:
@@ -865,7 +908,8 @@ class SelectiveInstallationManager:
                 recommendations=recommendations
             )
             
-            self.logger.info(f"Component selection completed: {len(selected)} selected, {len(deselected)} deselected")
+            self.logger.info(f"Component selection completed: {len(selected)} selected, {len(deselected)} deselected "
+                             f"({result.method}{'' if result.optimal else ', best found'})")
             return selection
             
         except Exception as e:
@@ -29,6 +29,12 @@ from intelligent_dependency_manager import (
     get_intelligent_dependency_manager
 )
 
+# Catálogo compilado compartilhado (evita reanalisar os mesmos YAML)
+try:
+    from config.loader import get_component_catalog
+except ImportError:
+    get_component_catalog = None
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -126,6 +132,8 @@ class UniversalDependencyOptimizer:
     def _load_components_from_file(self, file_path: str) -> Dict[str, Any]:
         """Carrega componentes de um arquivo YAML"""
         try:
+            if get_component_catalog is not None:
+                return get_component_catalog().load_file(file_path) or {}
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = yaml.safe_load(f) or {}
                 return data
@@ -4,12 +4,16 @@ Este módulo fornece uma classe centralizada para gerenciamento de versões,
 suportando diferentes formatos e operações de comparação.
 """
 
-import re
 import logging
 from typing import Optional, Tuple, Union, List
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from .version_parser import VersionKey, parse_version, compare_keys, compile_constraint
+except ImportError:
+    from version_parser import VersionKey, parse_version, compare_keys, compile_constraint
+
 
 class VersionFormat(Enum):
     """Formatos de versão suportados."""
@@ -32,10 +36,13 @@ class ParsedVersion:
     build: Optional[str] = None
     original: str = ""
     format_type: VersionFormat = VersionFormat.SEMANTIC
+    revision: int = 0  # Quarto componente numérico ("10.0.19041.1")
     
     def __str__(self) -> str:
         """Retorna representação string da versão."""
         version = f"{self.major}.{self.minor}.{self.patch}"
+        if self.revision:
+            version += f".{self.revision}"
         if self.prerelease:
             version += f"-{self.prerelease}"
         if self.build:
@@ -58,29 +65,13 @@ class VersionManager:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        
-        # Padrões regex para diferentes formatos
-        self.patterns = {
-            VersionFormat.SEMANTIC_FULL: re.compile(
-                r'^(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)'
-                r'(?:-(?P<prerelease>[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?'
-                r'(?:\+(?P<build>[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?$'
-            ),
-            VersionFormat.WINDOWS_STYLE: re.compile(
-                r'^(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)'
-                r'(?:\.(?P<extra>\w+))?(?:\.(?P<build>\d+))?$'
-            ),
-            VersionFormat.SIMPLE: re.compile(
-                r'^(?P<major>\d+)\.(?P<minor>\d+)$'
-            ),
-            VersionFormat.SINGLE: re.compile(
-                r'^(?P<major>\d+)$'
-            )
-        }
     
     def parse_version(self, version_str: str) -> Optional[ParsedVersion]:
         """Parse uma string de versão em um objeto ParsedVersion.
         
+        A interpretação é feita pelo parser unificado (core.version_parser),
+        que mantém cache: a mesma string não é reinterpretada.
+        
         Args:
             version_str: String da versão a ser parseada
             
@@ -90,54 +81,33 @@ class VersionManager:
         if not version_str or not isinstance(version_str, str):
             self.logger.warning(f"Versão inválida: {version_str}")
             return None
-            
-        # Remove espaços e caracteres especiais
-        clean_version = version_str.strip()
         
-        # Tenta cada padrão em ordem de complexidade
-        for format_type, pattern in self.patterns.items():
-            match = pattern.match(clean_version)
-            if match:
-                try:
-                    groups = match.groupdict()
-                    
-                    # Extrai componentes básicos
-                    major = int(groups.get('major', 0))
-                    minor = int(groups.get('minor', 0))
-                    patch = int(groups.get('patch', 0))
-                    
-                    # Trata prerelease e build
-                    prerelease = groups.get('prerelease')
-                    build = groups.get('build')
-                    
-                    # Para formato Windows, trata campos especiais
-                    if format_type == VersionFormat.WINDOWS_STYLE:
-                        extra = groups.get('extra')
-                        if extra and extra != 'windows':
-                            prerelease = extra
-                        build_num = groups.get('build')
-                        if build_num:
-                            build = build_num
-                    
-                    parsed = ParsedVersion(
-                        major=major,
-                        minor=minor,
-                        patch=patch,
-                        prerelease=prerelease,
-                        build=build,
-                        original=version_str,
-                        format_type=format_type
-                    )
-                    
-                    self.logger.debug(f"Versão parseada: {version_str} -> {parsed}")
-                    return parsed
-                    
-                except (ValueError, TypeError) as e:
-                    self.logger.warning(f"Erro ao parsear versão {version_str}: {e}")
-                    continue
+        key = parse_version(version_str)
+        if key is None:
+            self.logger.warning(f"Não foi possível parsear a versão: {version_str}")
+            return None
         
-        self.logger.warning(f"Não foi possível parsear a versão: {version_str}")
-        return None
+        return ParsedVersion(
+            major=key.major,
+            minor=key.minor,
+            patch=key.patch,
+            prerelease=key.prerelease,
+            build=key.build,
+            original=version_str,
+            format_type=VersionFormat(key.format),
+            revision=key.revision
+        )
+    
+    def _version_key(self, version: Union[str, ParsedVersion]) -> VersionKey:
+        """Obtém a chave de comparação de uma versão"""
+        if isinstance(version, ParsedVersion):
+            return VersionKey(version.major, version.minor, version.patch,
+                              version.prerelease, version.build, revision=version.revision)
+        
+        key = parse_version(version) if version and isinstance(version, str) else None
+        if key is None:
+            raise ValueError(f"Não foi possível parsear versão: {version}")
+        return key
     
     def compare_versions(self, version1: Union[str, ParsedVersion], 
                         version2: Union[str, ParsedVersion]) -> int:
@@ -152,40 +122,8 @@ class VersionManager:
              0 se version1 == version2
              1 se version1 > version2
         """
-        # Parse das versões se necessário
-        if isinstance(version1, str):
-            v1 = self.parse_version(version1)
-            if not v1:
-                raise ValueError(f"Não foi possível parsear versão: {version1}")
-        else:
-            v1 = version1
-            
-        if isinstance(version2, str):
-            v2 = self.parse_version(version2)
-            if not v2:
-                raise ValueError(f"Não foi possível parsear versão: {version2}")
-        else:
-            v2 = version2
-        
-        # Compara componentes principais
-        if v1.major != v2.major:
-            return 1 if v1.major > v2.major else -1
-        if v1.minor != v2.minor:
-            return 1 if v1.minor > v2.minor else -1
-        if v1.patch != v2.patch:
-            return 1 if v1.patch > v2.patch else -1
-        
-        # Trata prerelease (versões prerelease são menores que release)
-        if v1.prerelease and not v2.prerelease:
-            return -1
-        if not v1.prerelease and v2.prerelease:
-            return 1
-        if v1.prerelease and v2.prerelease:
-            if v1.prerelease != v2.prerelease:
-                return 1 if v1.prerelease > v2.prerelease else -1
-        
         # Build metadata não afeta precedência
-        return 0
+        return compare_keys(self._version_key(version1), self._version_key(version2))
     
     def is_compatible(self, current_version: Union[str, ParsedVersion],
                      required_version: str) -> bool:
@@ -198,37 +136,10 @@ class VersionManager:
         Returns:
             True se compatível, False caso contrário
         """
-        # Parse do operador e versão requerida
-        operator_pattern = re.compile(r'^(>=|<=|==|!=|>|<)\s*(.+)$')
-        match = operator_pattern.match(required_version.strip())
-        
-        if not match:
-            # Se não há operador, assume igualdade
-            operator = "=="
-            required_ver = required_version.strip()
-        else:
-            operator = match.group(1)
-            required_ver = match.group(2)
-        
         try:
-            comparison = self.compare_versions(current_version, required_ver)
-            
-            if operator == ">=":
-                return comparison >= 0
-            elif operator == "<=":
-                return comparison <= 0
-            elif operator == "==":
-                return comparison == 0
-            elif operator == "!=":
-                return comparison != 0
-            elif operator == ">":
-                return comparison > 0
-            elif operator == "<":
-                return comparison < 0
-            else:
-                self.logger.warning(f"Operador desconhecido: {operator}")
-                return False
-                
+            # Sem operador, assume igualdade; prereleases são sempre considerados
+            constraint = compile_constraint(required_version.strip())
+            return constraint.contains(self._version_key(current_version), prereleases=True)
         except Exception as e:
             self.logger.error(f"Erro ao verificar compatibilidade: {e}")
             return False
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+Parser de versões unificado
+Interpreta strings de versão uma única vez (cache LRU) em chaves compactas,
+imutáveis e hasheáveis, e compila especificadores de restrição em objetos
+reutilizáveis. É usado pelo VersionManager, pelo SemanticVersionValidator e
+pela CompatibilityMatrix, de modo que a mesma string nunca é reinterpretada.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+import packaging.specifiers as pkg_specifiers
+import packaging.version as pkg_version
+
+# Tamanhos dos caches LRU
+VERSION_CACHE_SIZE = 8192
+CONSTRAINT_CACHE_SIZE = 2048
+
+# Formatos (mesmos valores de VersionFormat em core.version_manager)
+FORMAT_SEMANTIC_FULL = "semantic_full"
+FORMAT_WINDOWS_STYLE = "windows_style"
+FORMAT_SIMPLE = "simple"
+FORMAT_SINGLE = "single"
+FORMAT_PREFIX = "prefix"
+
+_IDENTIFIERS = r'[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*'
+
+# Formatos estritos, em ordem de complexidade
+_STRICT_PATTERNS = (
+    (FORMAT_SEMANTIC_FULL, re.compile(
+        r'^(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)'
+        r'(?:-(?P<prerelease>' + _IDENTIFIERS + r'))?'
+        r'(?:\+(?P<build>' + _IDENTIFIERS + r'))?$'
+    )),
+    (FORMAT_WINDOWS_STYLE, re.compile(
+        r'^(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)'
+        r'(?:\.(?P<extra>\w+))?(?:\.(?P<build>\d+))?$'
+    )),
+    (FORMAT_SIMPLE, re.compile(r'^(?P<major>\d+)\.(?P<minor>\d+)$')),
+    (FORMAT_SINGLE, re.compile(r'^(?P<major>\d+)$')),
+)
+
+# Formato tolerante: prefixo numérico (ex.: "1.2.3.4" -> 1.2.3)
+_PREFIX_PATTERN = re.compile(r'^(?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?')
+
+_CLAUSE_PATTERN = re.compile(r'^(~=|==|!=|>=|<=|>|<|\^|~|=)?\s*(.+)$')
+_WILDCARD_PATTERN = re.compile(r'^(\d+)(?:\.(\d+))?\.\*$')
+
+
+class VersionKey:
+    """
+    Versão interpretada: compacta, imutável e hasheável.
+
+    A ordem segue SemVer simplificado: major, minor, patch e revision
+    numéricos, versão final acima de prerelease, prereleases comparados como
+    texto e build ignorado na precedência. ``revision`` é o quarto componente
+    numérico das versões de arquivo do Windows ("10.0.19041.1"); como no
+    packaging, "1.2.3.4" > "1.2.3" e "1.2.3.0" == "1.2.3".
+    """
+
+    __slots__ = ('major', 'minor', 'patch', 'prerelease', 'build', 'format', 'precision', 'revision', '_order')
+
+    def __init__(self, major: int, minor: int = 0, patch: int = 0,
+                 prerelease: Optional[str] = None, build: Optional[str] = None,
+                 format: str = FORMAT_SEMANTIC_FULL, precision: int = 3, revision: int = 0):
+        set_attr = object.__setattr__
+        set_attr(self, 'major', major)
+        set_attr(self, 'minor', minor)
+        set_attr(self, 'patch', patch)
+        set_attr(self, 'prerelease', prerelease)
+        set_attr(self, 'build', build)
+        set_attr(self, 'format', format)
+        set_attr(self, 'precision', precision)
+        set_attr(self, 'revision', revision)
+        set_attr(self, '_order', (major, minor, patch, revision, prerelease is None, prerelease or ""))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("VersionKey é imutável")
+
+    @property
+    def release(self) -> Tuple[int, int, int]:
+        return self.major, self.minor, self.patch
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, VersionKey):
+            return NotImplemented
+        return self._order == other._order
+
+    def __lt__(self, other: 'VersionKey') -> bool:
+        return self._order < other._order
+
+    def __le__(self, other: 'VersionKey') -> bool:
+        return self._order <= other._order
+
+    def __gt__(self, other: 'VersionKey') -> bool:
+        return self._order > other._order
+
+    def __ge__(self, other: 'VersionKey') -> bool:
+        return self._order >= other._order
+
+    def __hash__(self) -> int:
+        return hash(self._order)
+
+    def __str__(self) -> str:
+        version = f"{self.major}.{self.minor}.{self.patch}"
+        if self.revision:
+            version += f".{self.revision}"
+        if self.prerelease:
+            version += f"-{self.prerelease}"
+        if self.build:
+            version += f"+{self.build}"
+        return version
+
+    def __repr__(self) -> str:
+        return f"VersionKey('{self}')"
+
+
+@lru_cache(maxsize=VERSION_CACHE_SIZE)
+def parse_version(version_str: str, lenient: bool = False) -> Optional[VersionKey]:
+    """
+    Interpreta uma string de versão (resultado em cache: a mesma string
+    retorna sempre o mesmo objeto)
+
+    Args:
+        version_str: Versão, ex.: "1.2.3-beta+5", "2.47.1.windows.1", "3.8"
+        lenient: Remove prefixo "v" e aceita prefixo numérico ("1.2.3.4" -> 1.2.3)
+
+    Returns:
+        VersionKey ou None se a string não é uma versão reconhecida
+    """
+    if lenient:
+        text = version_str.lstrip('v')
+        match = _STRICT_PATTERNS[0][1].match(text)
+        if match:
+            return _key_from_match(match, FORMAT_SEMANTIC_FULL)
+        match = _PREFIX_PATTERN.match(text)
+        if not match:
+            return None
+        precision = 1 + (match.group('minor') is not None) + (match.group('patch') is not None)
+        return VersionKey(int(match.group('major')), int(match.group('minor') or 0),
+                          int(match.group('patch') or 0), format=FORMAT_PREFIX, precision=precision)
+
+    text = version_str.strip()
+    for format_type, pattern in _STRICT_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            return _key_from_match(match, format_type)
+    return None
+
+
+def _key_from_match(match, format_type: str) -> Optional[VersionKey]:
+    groups = match.groupdict()
+    prerelease = groups.get('prerelease')
+    build = groups.get('build')
+    revision = 0
+    precision = {FORMAT_SIMPLE: 2, FORMAT_SINGLE: 1}.get(format_type, 3)
+    if format_type == FORMAT_WINDOWS_STYLE:
+        extra = groups.get('extra')
+        if extra and extra.isdigit():
+            # "10.0.19041.1": quarto componente numérico da versão, não prerelease
+            if build is not None:
+                return None  # "1.2.3.4.5" não é uma versão reconhecida
+            revision, precision = int(extra), 4
+        elif extra and extra != 'windows':
+            # "2.47.1.windows.1": o sufixo "windows" não é prerelease
+            prerelease = extra
+    return VersionKey(
+        int(groups['major']), int(groups.get('minor') or 0), int(groups.get('patch') or 0),
+        prerelease, build, format_type, precision, revision
+    )
+
+
+def compare_keys(first: VersionKey, second: VersionKey) -> int:
+    """Retorna -1, 0 ou 1 conforme first <, == ou > second"""
+    return (first._order > second._order) - (first._order < second._order)
+
+
+class VersionConstraintSet:
+    """
+    Restrição compilada: cláusulas separadas por vírgula, todas obrigatórias.
+
+    Operadores: ==, =, !=, >=, <=, >, <, ~= (PEP 440), ^ e ~ (npm), curingas
+    ("1.2.*" ou "==1.2.*") e versão sem operador (igualdade).
+    """
+
+    __slots__ = ('specifier', 'clauses', 'mentions_prerelease')
+
+    def __init__(self, specifier: str):
+        self.specifier = specifier
+        self.clauses = tuple(self._compile_clause(clause.strip())
+                             for clause in specifier.split(',') if clause.strip())
+        if not self.clauses:
+            raise ValueError(f"Restrição vazia: {specifier!r}")
+        self.mentions_prerelease = any(
+            bound is not None and bound.prerelease is not None for _, bound, _ in self.clauses
+        )
+
+    def contains(self, version: Union[str, VersionKey], prereleases: Optional[bool] = None) -> bool:
+        """
+        Verifica se a versão atende a todas as cláusulas
+
+        Args:
+            version: Versão (string ou VersionKey)
+            prereleases: Aceita prereleases; None segue o PEP 440 (apenas se
+                alguma cláusula cita um prerelease)
+        """
+        key = parse_version(version) if isinstance(version, str) else version
+        if key is None:
+            return False
+        if key.prerelease is not None:
+            allowed = self.mentions_prerelease if prereleases is None else prereleases
+            if not allowed:
+                return False
+        return all(self._check(op, bound, extra, key) for op, bound, extra in self.clauses)
+
+    __contains__ = contains
+
+    @staticmethod
+    def _compile_clause(clause: str) -> Tuple[str, Optional[VersionKey], Optional[Tuple[int, ...]]]:
+        match = _CLAUSE_PATTERN.match(clause)
+        if not match:
+            raise ValueError(f"Cláusula de versão inválida: {clause!r}")
+        op, text = match.group(1) or '==', match.group(2).strip()
+        if op == '=':
+            op = '=='
+
+        wildcard = _WILDCARD_PATTERN.match(text)
+        if wildcard:
+            if op not in ('==', '!='):
+                raise ValueError(f"Curinga só é permitido com == ou !=: {clause!r}")
+            prefix = tuple(int(part) for part in wildcard.groups() if part is not None)
+            return ('==*' if op == '==' else '!=*'), None, prefix
+
+        bound = parse_version(text)
+        if bound is None:
+            raise ValueError(f"Versão inválida na restrição: {clause!r}")
+
+        if op == '~=':
+            if bound.precision < 2:
+                raise ValueError(f"~= exige ao menos dois componentes: {clause!r}")
+            return op, bound, bound.release[:bound.precision - 1]
+        if op == '^':
+            # ^1.2.3 := >=1.2.3 <2.0.0; ^0.2.3 := <0.3.0; ^0.0.3 := <0.0.4
+            if bound.major:
+                return op, bound, (bound.major,)
+            if bound.minor:
+                return op, bound, (0, bound.minor)
+            return op, bound, bound.release
+        if op == '~':
+            # ~1.2.3 := >=1.2.3 <1.3.0
+            return op, bound, bound.release[:2] if bound.precision >= 2 else bound.release[:1]
+        return op, bound, None
+
+    @staticmethod
+    def _check(op: str, bound: Optional[VersionKey], extra, key: VersionKey) -> bool:
+        if op == '==':
+            return key == bound
+        if op == '!=':
+            return key != bound
+        if op == '>=':
+            return key >= bound
+        if op == '<=':
+            return key <= bound
+        if op == '>':
+            return key > bound
+        if op == '<':
+            return key < bound
+        if op == '==*':
+            return key.release[:len(extra)] == extra
+        if op == '!=*':
+            return key.release[:len(extra)] != extra
+        # ~=, ^ e ~: limite inferior mais prefixo fixo
+        return key >= bound and key.release[:len(extra)] == extra
+
+    def __repr__(self) -> str:
+        return f"VersionConstraintSet({self.specifier!r})"
+
+
+@lru_cache(maxsize=CONSTRAINT_CACHE_SIZE)
+def compile_constraint(specifier: str) -> VersionConstraintSet:
+    """
+    Compila uma restrição de versão (resultado em cache)
+
+    Raises:
+        ValueError: Se a restrição não é suportada
+    """
+    return VersionConstraintSet(specifier)
+
+
+@lru_cache(maxsize=CONSTRAINT_CACHE_SIZE)
+def _compile_pep440(specifier: str) -> pkg_specifiers.SpecifierSet:
+    return pkg_specifiers.SpecifierSet(specifier)
+
+
+@lru_cache(maxsize=VERSION_CACHE_SIZE)
+def _parse_pep440(version: str) -> pkg_version.Version:
+    return pkg_version.Version(version)
+
+
+def version_matches(specifier: str, version: str) -> bool:
+    """
+    Verifica se version atende a specifier
+
+    Usa a restrição compilada; versões ou especificadores fora da gramática
+    acima (ex.: "1.0rc1", "v2", épocas do PEP 440) caem para o packaging,
+    também com cache.
+    """
+    try:
+        key = parse_version(version)
+        if key is not None:
+            return compile_constraint(specifier).contains(key)
+    except ValueError:
+        pass
+    try:
+        return _parse_pep440(version) in _compile_pep440(specifier)
+    except Exception:
+        return False
+
+
+def cache_info() -> dict:
+    """Estatísticas dos caches LRU"""
+    return {
+        'versions': parse_version.cache_info()._asdict(),
+        'constraints': compile_constraint.cache_info()._asdict(),
+    }
+
+
+def clear_caches() -> None:
+    """Limpa todos os caches de versões e restrições"""
+    parse_version.cache_clear()
+    compile_constraint.cache_clear()
+    _compile_pep440.cache_clear()
+    _parse_pep440.cache_clear()
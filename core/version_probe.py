@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Version Probe Service
+Shared, memoized execution of version commands (``tool --version`` and friends).
+
+Probes are cached per (resolved executable path, mtime, args), identical probes
+that are already running are shared instead of spawned again, and probes run
+concurrently as asyncio subprocesses on a dedicated event loop thread so they
+can be used from synchronous and threaded callers alike.
+
+Running ``--version`` on a GUI application may launch it, so executables that
+are not known command line tools should be versioned with read_file_version,
+which reads the PE version resource without executing anything.
+"""
+
+import asyncio
+import logging
+import os
+import platform
+import re
+import shutil
+import struct
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+DEFAULT_PROBE_TIMEOUT = 10.0
+DEFAULT_MAX_CONCURRENT_PROBES = 8
+
+VERSION_PATTERN = re.compile(r'(\d+\.\d+(?:\.\d+)*)')
+
+# VS_FIXEDFILEINFO.dwSignature (0xFEEF04BD, little endian)
+VS_FIXEDFILEINFO_SIGNATURE = b'\xbd\x04\xef\xfe'
+
+# Upper bound on the resource section read when looking for the version block
+MAX_RESOURCE_SECTION_BYTES = 16 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Result of running one version command."""
+    executable: str
+    args: Tuple[str, ...]
+    returncode: Optional[int]
+    stdout: str = ""
+    stderr: str = ""
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.returncode == 0
+
+    @property
+    def output(self) -> str:
+        return self.stdout + self.stderr
+
+
+@dataclass
+class ProbeLatency:
+    """Latency statistics for one executable."""
+    executable: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    timeouts: int = 0
+    failures: int = 0
+
+    @property
+    def average_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+def extract_version(text: str, pattern: Optional[str] = None) -> Optional[str]:
+    """Extract the first version number from command output."""
+    match = re.search(pattern, text) if pattern else VERSION_PATTERN.search(text)
+    return match.group(1) if match else None
+
+
+def read_file_version(path: str) -> Optional[str]:
+    """Read the file version from a PE executable's version resource.
+
+    Nothing is executed, so this is safe for GUI applications. Results are
+    cached per (path, size, mtime). Returns None for non-PE files or files
+    without a version resource.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return _read_file_version(os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=1024)
+def _read_file_version(path: str, size: int, mtime_ns: int) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            dos_header = f.read(64)
+            if len(dos_header) < 64 or dos_header[:2] != b'MZ':
+                return None
+            pe_offset = struct.unpack_from('<I', dos_header, 0x3C)[0]
+
+            f.seek(pe_offset)
+            file_header = f.read(24)
+            if len(file_header) < 24 or file_header[:4] != b'PE\0\0':
+                return None
+            section_count, = struct.unpack_from('<H', file_header, 6)
+            optional_header_size, = struct.unpack_from('<H', file_header, 20)
+
+            f.seek(pe_offset + 24 + optional_header_size)
+            sections = f.read(40 * section_count)
+            for index in range(len(sections) // 40):
+                name, _, _, raw_size, raw_offset = struct.unpack_from('<8sIIII', sections, index * 40)
+                if name.rstrip(b'\0') != b'.rsrc':
+                    continue
+                f.seek(raw_offset)
+                resources = f.read(min(raw_size, MAX_RESOURCE_SECTION_BYTES))
+                position = resources.find(VS_FIXEDFILEINFO_SIGNATURE)
+                if position < 0 or position + 16 > len(resources):
+                    return None
+                version_ms, version_ls = struct.unpack_from('<II', resources, position + 8)
+                return (f"{version_ms >> 16}.{version_ms & 0xFFFF}."
+                        f"{version_ls >> 16}.{version_ls & 0xFFFF}")
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+class VersionProbeService:
+    """Memoized, deduplicated and concurrent version command runner."""
+
+    def __init__(self, default_timeout: float = DEFAULT_PROBE_TIMEOUT,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENT_PROBES):
+        self.logger = logging.getLogger("version_probe")
+        self.default_timeout = default_timeout
+        self.max_concurrency = max(1, max_concurrency)
+
+        self._lock = threading.Lock()
+        self._cache: Dict[tuple, ProbeResult] = {}
+        self._in_flight: Dict[tuple, Future] = {}
+        self._latency: Dict[str, ProbeLatency] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def probe(self, executable: str, args: Sequence[str] = ("--version",),
+              timeout: Optional[float] = None) -> ProbeResult:
+        """Run (or reuse) a version command and wait for its result."""
+        return self.submit(executable, args, timeout).result()
+
+    def probe_many(self, requests: Iterable[Tuple[str, Sequence[str]]],
+                   timeout: Optional[float] = None) -> List[ProbeResult]:
+        """Run several version commands concurrently, preserving input order."""
+        futures = [self.submit(executable, args, timeout) for executable, args in requests]
+        return [future.result() for future in futures]
+
+    def submit(self, executable: str, args: Sequence[str] = ("--version",),
+               timeout: Optional[float] = None) -> Future:
+        """Schedule a probe and return a Future resolving to its ProbeResult."""
+        args = tuple(args)
+        resolved = self._resolve(executable)
+        if resolved is None:
+            future: Future = Future()
+            future.set_result(ProbeResult(executable, args, None, error="executable not found"))
+            return future
+
+        try:
+            mtime_ns = os.stat(resolved).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        key = (os.path.normcase(resolved), mtime_ns, args)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                future = Future()
+                future.set_result(replace(cached, cached=True))
+                return future
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                return in_flight
+
+            loop = self._ensure_loop()
+            future = asyncio.run_coroutine_threadsafe(
+                self._run(resolved, args, timeout or self.default_timeout), loop
+            )
+            self._in_flight[key] = future
+
+        future.add_done_callback(lambda done, key=key: self._on_done(key, done))
+        return future
+
+    def get_latency_stats(self) -> List[Dict[str, float]]:
+        """Latency statistics per executable, slowest average first."""
+        with self._lock:
+            stats = [
+                {
+                    "executable": latency.executable,
+                    "count": latency.count,
+                    "average_seconds": round(latency.average_seconds, 4),
+                    "max_seconds": round(latency.max_seconds, 4),
+                    "total_seconds": round(latency.total_seconds, 4),
+                    "timeouts": latency.timeouts,
+                    "failures": latency.failures,
+                }
+                for latency in self._latency.values()
+            ]
+        return sorted(stats, key=lambda item: item["average_seconds"], reverse=True)
+
+    def clear_cache(self) -> None:
+        """Forget cached probe results (in-flight probes are not affected)."""
+        with self._lock:
+            self._cache.clear()
+
+    def shutdown(self) -> None:
+        """Stop the background event loop."""
+        with self._lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = self._semaphore = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _resolve(executable: str) -> Optional[str]:
+        if os.path.dirname(executable):
+            return os.path.abspath(executable) if os.path.isfile(executable) else None
+        return shutil.which(executable)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the event loop thread on first use (caller holds the lock)."""
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                ready.set()
+                loop.run_forever()
+                loop.close()
+
+            thread = threading.Thread(target=run_loop, name="VersionProbeLoop", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._loop_thread = loop, thread
+        return self._loop
+
+    async def _run(self, resolved: str, args: Tuple[str, ...], timeout: float) -> ProbeResult:
+        kwargs = {}
+        if platform.system() == "Windows":
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    resolved, *args,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    **kwargs
+                )
+            except Exception as e:
+                return ProbeResult(resolved, args, None, duration_seconds=time.perf_counter() - start,
+                                   error=str(e))
+
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return ProbeResult(resolved, args, None, duration_seconds=time.perf_counter() - start,
+                                   error=f"timed out after {timeout:.1f}s")
+
+            return ProbeResult(
+                resolved, args, process.returncode,
+                stdout=stdout.decode(errors="replace"),
+                stderr=stderr.decode(errors="replace"),
+                duration_seconds=time.perf_counter() - start
+            )
+
+    def _on_done(self, key: tuple, future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            result = ProbeResult(key[0], key[2], None, error=str(e))
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+            # Timeouts are not memoized: the next run may be less loaded
+            if result.error is None or not result.error.startswith("timed out"):
+                self._cache[key] = result
+
+            latency = self._latency.setdefault(result.executable, ProbeLatency(result.executable))
+            latency.count += 1
+            latency.total_seconds += result.duration_seconds
+            latency.max_seconds = max(latency.max_seconds, result.duration_seconds)
+            if result.error and result.error.startswith("timed out"):
+                latency.timeouts += 1
+            elif not result.ok:
+                latency.failures += 1
+
+        if result.duration_seconds > 2.0:
+            self.logger.debug(f"Slow version probe: {result.executable} {' '.join(result.args)} "
+                              f"took {result.duration_seconds:.2f}s")
+
+
+# Global probe service instance
+_probe_service: Optional[VersionProbeService] = None
+_probe_service_lock = threading.Lock()
+
+
+def get_version_probe_service() -> VersionProbeService:
+    """Get the global version probe service."""
+    global _probe_service
+    with _probe_service_lock:
+        if _probe_service is None:
+            _probe_service = VersionProbeService()
+        return _probe_service
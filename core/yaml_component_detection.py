@@ -12,6 +12,7 @@ from pathlib import Path
 from dataclasses import dataclass
 
 from .detection_base import DetectionStrategy, DetectedApplication, DetectionMethod, ApplicationStatus
+from .version_probe import get_version_probe_service
 from config.loader import load_all_components
 from utils import env_checker
 
@@ -19,6 +20,8 @@ from utils import env_checker
 class YAMLComponentDetectionStrategy(DetectionStrategy):
     """Estratégia de detecção baseada nos componentes YAML com verify_actions."""
     
+    per_app_probes = True
+    
     def __init__(self):
         self.logger = logging.getLogger("yaml_component_detection")
         self.components = {}
@@ -250,21 +253,12 @@ class YAMLComponentDetectionStrategy(DetectionStrategy):
         # 1. Se há um comando de versão definido
         version_command = component_data.get('version_command')
         if version_command and executable_path:
-            try:
-                import subprocess
-                result = subprocess.run(
-                    [executable_path] + version_command,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if result.returncode == 0:
-                    # Extrair versão do output
-                    version = self._parse_version_output(result.stdout)
-                    if version:
-                        return version
-            except Exception:
-                pass
+            result = get_version_probe_service().probe(executable_path, version_command, timeout=10)
+            if result.ok:
+                # Extrair versão do output
+                version = self._parse_version_output(result.stdout)
+                if version:
+                    return version
         
         # 2. Tentar obter versão do arquivo executável (Windows)
         if executable_path and os.path.exists(executable_path):
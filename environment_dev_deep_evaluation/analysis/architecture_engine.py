@@ -13,6 +13,7 @@ from datetime import datetime
 from pathlib import Path
 
 from .base import AnalysisBase
+from .source_index import SourceFileRecord, SourceIndex, analyze_source, get_source_index
 from .interfaces import (
     ArchitectureAnalysisInterface,
     ArchitectureAnalysis,
@@ -309,15 +310,13 @@ class ArchitectureAnalysisEngine(AnalysisBase, ArchitectureAnalysisInterface):
             # Analyze workspace structure
             workspace_path = Path(self._workspace_root)
             
-            # Find all Python files in the project
-            python_files = list(workspace_path.rglob("*.py"))
-            architecture["metadata"]["total_files_analyzed"] = len(python_files)
+            # Parse the project's Python files through the shared source index
+            index = self._get_source_index()
+            records = index.refresh()
+            architecture["metadata"]["total_files_analyzed"] = len(records)
             
-            for file_path in python_files:
-                try:
-                    self._analyze_file_architecture(file_path, architecture)
-                except Exception as e:
-                    self._logger.warning(f"Failed to analyze file {file_path}: {e}")
+            for record in records:
+                self._record_file_architecture(record, architecture)
             
             # Analyze directory structure
             self._analyze_directory_structure(workspace_path, architecture)
@@ -335,6 +334,10 @@ class ArchitectureAnalysisEngine(AnalysisBase, ArchitectureAnalysisInterface):
                 context={"workspace_root": self._workspace_root}
             ) from e
     
+    def _get_source_index(self) -> SourceIndex:
+        """Return the source index shared with the other analysis engines."""
+        return get_source_index(getattr(self, '_workspace_root', '.'))
+    
     def _analyze_file_architecture(self, file_path: Path, architecture: Dict[str, Any]) -> None:
         """Analyze a single file's contribution to the architecture."""
         try:
@@ -347,54 +350,37 @@ class ArchitectureAnalysisEngine(AnalysisBase, ArchitectureAnalysisInterface):
             else:
                 relative_path = file_path.name
             
-            # Extract classes and interfaces
-            classes = re.findall(self._analysis_patterns["component_patterns"]["class_definition"], content)
-            interfaces = re.findall(self._analysis_patterns["component_patterns"]["interface_definition"], content)
-            functions = re.findall(self._analysis_patterns["component_patterns"]["function_definition"], content)
-            imports = re.findall(self._analysis_patterns["component_patterns"]["import_statement"], content)
-            
-            # Store component information
-            if classes or interfaces or functions:
-                architecture["components"][relative_path] = {
-                    "classes": classes,
-                    "interfaces": interfaces,
-                    "functions": functions,
-                    "imports": imports,
-                    "file_size": len(content),
-                    "line_count": len(content.splitlines())
-                }
-            
-            # Analyze dependencies
-            if imports:
-                architecture["dependencies"][relative_path] = imports
+            self._record_file_architecture(analyze_source(str(file_path), relative_path, content), architecture)
             
         except Exception as e:
             self._logger.warning(f"Error analyzing file {file_path}: {e}")
     
+    def _record_file_architecture(self, record: SourceFileRecord, architecture: Dict[str, Any]) -> None:
+        """Add an indexed file's classes, interfaces and imports to the architecture."""
+        if record.error:
+            self._logger.warning(f"Failed to analyze file {record.path}: {record.error}")
+            return
+        
+        # Store component information
+        if record.classes or record.interfaces or record.functions:
+            architecture["components"][record.relative_path] = {
+                "classes": list(record.classes),
+                "interfaces": list(record.interfaces),
+                "functions": list(record.functions),
+                "imports": list(record.imports),
+                "file_size": record.file_size,
+                "line_count": record.line_count
+            }
+        
+        # Analyze dependencies
+        if record.imports:
+            architecture["dependencies"][record.relative_path] = list(record.imports)
+    
     def _analyze_directory_structure(self, workspace_path: Path, architecture: Dict[str, Any]) -> None:
         """Analyze the directory structure to understand architectural organization."""
         try:
-            # Find all directories
-            directories = [d for d in workspace_path.rglob("*") if d.is_dir()]
-            
-            architecture["directory_structure"] = {}
-            
-            for directory in directories:
-                relative_path = str(directory.relative_to(workspace_path))
-                
-                # Skip hidden and cache directories
-                if any(part.startswith('.') or part == '__pycache__' for part in directory.parts):
-                    continue
-                
-                # Count Python files in directory
-                python_files = list(directory.glob("*.py"))
-                
-                if python_files:
-                    architecture["directory_structure"][relative_path] = {
-                        "python_files": len(python_files),
-                        "subdirectories": len([d for d in directory.iterdir() if d.is_dir()]),
-                        "files": [f.name for f in python_files]
-                    }
+            # Collected by the same walk that indexed the source files
+            architecture["directory_structure"] = get_source_index(workspace_path).directory_structure()
             
         except Exception as e:
             self._logger.warning(f"Error analyzing directory structure: {e}")
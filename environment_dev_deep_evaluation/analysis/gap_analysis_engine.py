@@ -6,12 +6,20 @@ criticality prioritization, and comprehensive documentation generation.
 """
 
 import os
-import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from .base import AnalysisBase
+from .source_index import (
+    GAP_DETECTION_RULES,
+    SourceFileRecord,
+    SourceIndex,
+    analyze_source,
+    find_gap_matches,
+    freeze_rules,
+    get_source_index
+)
 from .interfaces import (
     GapAnalysisInterface,
     GapAnalysisReport,
@@ -280,36 +288,7 @@ class GapAnalysisEngine(AnalysisBase, GapAnalysisInterface):
     
     def _initialize_gap_detection_rules(self) -> Dict[str, Any]:
         """Initialize rules for gap detection."""
-        return {
-            "missing_implementation_patterns": [
-                r"TODO:\s*(.+)",
-                r"FIXME:\s*(.+)",
-                r"NotImplementedError",
-                r"pass\s*#\s*TODO",
-                r"raise\s+NotImplementedError"
-            ],
-            "security_gap_patterns": [
-                r"#\s*SECURITY:\s*(.+)",
-                r"#\s*UNSAFE:\s*(.+)",
-                r"#\s*VULNERABILITY:\s*(.+)",
-                r"password\s*=\s*[\"'].*[\"']",  # Hardcoded passwords
-                r"api_key\s*=\s*[\"'].*[\"']"   # Hardcoded API keys
-            ],
-            "stability_gap_patterns": [
-                r"#\s*HACK:\s*(.+)",
-                r"#\s*TEMPORARY:\s*(.+)",
-                r"#\s*WORKAROUND:\s*(.+)",
-                r"except:\s*pass",  # Bare except clauses
-                r"except\s+Exception:\s*pass"  # Overly broad exception handling
-            ],
-            "functionality_gap_patterns": [
-                r"#\s*INCOMPLETE:\s*(.+)",
-                r"#\s*PARTIAL:\s*(.+)",
-                r"#\s*STUB:\s*(.+)",
-                r"def\s+\w+\([^)]*\):\s*pass",  # Empty function definitions
-                r"class\s+\w+[^:]*:\s*pass"     # Empty class definitions
-            ]
-        }
+        return {gap_type: list(patterns) for gap_type, patterns in GAP_DETECTION_RULES.items()}
     
     def _initialize_criticality_weights(self) -> Dict[CriticalityLevel, float]:
         """Initialize weights for criticality prioritization."""
@@ -425,27 +404,22 @@ This report identifies {total_gaps_identified} gaps in the current system archit
             self._logger.error(f"Error identifying gaps: {e}")
             return all_gaps
     
+    def _get_source_index(self) -> SourceIndex:
+        """Return the source index shared with the other analysis engines."""
+        return get_source_index(getattr(self, '_workspace_root', '.'), self._gap_detection_rules)
+    
     def _scan_codebase_for_gaps(self) -> List[CriticalGap]:
         """Scan codebase for implementation gaps."""
         gaps = []
-        gap_counter = 1
         
         try:
-            # Find all Python files
-            workspace_path = Path(self._workspace_root)
-            python_files = list(workspace_path.rglob("*.py"))
-            
-            for file_path in python_files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Check for various gap patterns
-                    file_gaps = self._detect_gaps_in_file(file_path, content)
-                    gaps.extend(file_gaps)
-                    
-                except Exception as e:
-                    self._logger.warning(f"Error scanning file {file_path}: {e}")
+            # Files are parsed once and only re-parsed when they change
+            for record in self._get_source_index().refresh():
+                if record.error:
+                    self._logger.warning(f"Error scanning file {record.path}: {record.error}")
+                    continue
+                
+                gaps.extend(self._gaps_from_matches(record.relative_path, record.gap_matches))
             
             return gaps
             
@@ -460,27 +434,8 @@ This report identifies {total_gaps_identified} gaps in the current system archit
         try:
             relative_path = str(file_path.relative_to(Path(self._workspace_root))) if hasattr(self, '_workspace_root') else file_path.name
             
-            # Check for different types of gaps
-            for gap_type, patterns in self._gap_detection_rules.items():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE)
-                    
-                    for match in matches:
-                        line_number = content[:match.start()].count('\n') + 1
-                        
-                        # Determine criticality based on gap type
-                        criticality = self._determine_gap_criticality(gap_type, match.group(0))
-                        
-                        gap = CriticalGap(
-                            gap_id="",  # Will be assigned later
-                            description=f"{gap_type.replace('_', ' ').title()} in {relative_path}:{line_number}: {match.group(0)[:100]}",
-                            criticality=criticality,
-                            affected_components=[relative_path],
-                            impact_assessment=self._assess_gap_impact(gap_type, match.group(0)),
-                            recommended_action=self._recommend_gap_action(gap_type, match.group(0)),
-                            estimated_effort=self._estimate_gap_effort(gap_type, match.group(0))
-                        )
-                        gaps.append(gap)
+            matches = find_gap_matches(content, freeze_rules(self._gap_detection_rules))
+            gaps = self._gaps_from_matches(relative_path, matches)
             
             return gaps
             
@@ -488,6 +443,27 @@ This report identifies {total_gaps_identified} gaps in the current system archit
             self._logger.warning(f"Error detecting gaps in file {file_path}: {e}")
             return gaps
     
+    def _gaps_from_matches(self, relative_path: str, matches: List[Tuple[str, int, str]]) -> List[CriticalGap]:
+        """Build CriticalGap objects from (gap_type, line_number, text) matches."""
+        gaps = []
+        
+        for gap_type, line_number, text in matches:
+            # Determine criticality based on gap type
+            criticality = self._determine_gap_criticality(gap_type, text)
+            
+            gap = CriticalGap(
+                gap_id="",  # Will be assigned later
+                description=f"{gap_type.replace('_', ' ').title()} in {relative_path}:{line_number}: {text[:100]}",
+                criticality=criticality,
+                affected_components=[relative_path],
+                impact_assessment=self._assess_gap_impact(gap_type, text),
+                recommended_action=self._recommend_gap_action(gap_type, text),
+                estimated_effort=self._estimate_gap_effort(gap_type, text)
+            )
+            gaps.append(gap)
+        
+        return gaps
+    
     def _determine_gap_criticality(self, gap_type: str, gap_content: str) -> CriticalityLevel:
         """Determine criticality level of a gap."""
         if "security" in gap_type.lower():
@@ -540,21 +516,13 @@ This report identifies {total_gaps_identified} gaps in the current system archit
         gaps = []
         
         try:
-            # Check for missing docstrings
-            workspace_path = Path(self._workspace_root)
-            python_files = list(workspace_path.rglob("*.py"))
-            
-            for file_path in python_files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Check for functions/classes without docstrings
-                    doc_gaps = self._check_missing_docstrings(file_path, content)
-                    gaps.extend(doc_gaps)
-                    
-                except Exception as e:
-                    self._logger.warning(f"Error checking documentation in {file_path}: {e}")
+            # Check for functions/classes without docstrings
+            for record in self._get_source_index().refresh():
+                if record.error:
+                    self._logger.warning(f"Error checking documentation in {record.path}: {record.error}")
+                    continue
+                
+                gaps.extend(self._docstring_gaps(record))
             
             return gaps
             
@@ -564,54 +532,32 @@ This report identifies {total_gaps_identified} gaps in the current system archit
     
     def _check_missing_docstrings(self, file_path: Path, content: str) -> List[CriticalGap]:
         """Check for missing docstrings in a file."""
-        gaps = []
-        
         try:
             relative_path = str(file_path.relative_to(Path(self._workspace_root))) if hasattr(self, '_workspace_root') else file_path.name
             
-            # Find function definitions without docstrings
-            func_pattern = r'def\s+(\w+)\s*\([^)]*\):\s*\n(?!\s*"""|\s*\'\'\')'
-            func_matches = re.finditer(func_pattern, content, re.MULTILINE)
-            
-            for match in func_matches:
-                line_number = content[:match.start()].count('\n') + 1
-                func_name = match.group(1)
-                
-                gap = CriticalGap(
-                    gap_id="",
-                    description=f"Missing docstring for function '{func_name}' in {relative_path}:{line_number}",
-                    criticality=CriticalityLevel.UX,
-                    affected_components=[relative_path],
-                    impact_assessment="Documentation incomplete, reduces code maintainability",
-                    recommended_action=f"Add comprehensive docstring to function '{func_name}'",
-                    estimated_effort="Low (1 hour)"
-                )
-                gaps.append(gap)
-            
-            # Find class definitions without docstrings
-            class_pattern = r'class\s+(\w+)[^:]*:\s*\n(?!\s*"""|\s*\'\'\')'
-            class_matches = re.finditer(class_pattern, content, re.MULTILINE)
-            
-            for match in class_matches:
-                line_number = content[:match.start()].count('\n') + 1
-                class_name = match.group(1)
-                
-                gap = CriticalGap(
-                    gap_id="",
-                    description=f"Missing docstring for class '{class_name}' in {relative_path}:{line_number}",
-                    criticality=CriticalityLevel.UX,
-                    affected_components=[relative_path],
-                    impact_assessment="Documentation incomplete, reduces code maintainability",
-                    recommended_action=f"Add comprehensive docstring to class '{class_name}'",
-                    estimated_effort="Low (1 hour)"
-                )
-                gaps.append(gap)
-            
-            return gaps
+            return self._docstring_gaps(analyze_source(str(file_path), relative_path, content))
             
         except Exception as e:
             self._logger.warning(f"Error checking docstrings in {file_path}: {e}")
-            return gaps
+            return []
+    
+    def _docstring_gaps(self, record: SourceFileRecord) -> List[CriticalGap]:
+        """Build documentation gaps for an indexed file's undocumented definitions."""
+        gaps = []
+        
+        for kind, name, line_number in record.missing_docstrings:
+            gap = CriticalGap(
+                gap_id="",
+                description=f"Missing docstring for {kind} '{name}' in {record.relative_path}:{line_number}",
+                criticality=CriticalityLevel.UX,
+                affected_components=[record.relative_path],
+                impact_assessment="Documentation incomplete, reduces code maintainability",
+                recommended_action=f"Add comprehensive docstring to {kind} '{name}'",
+                estimated_effort="Low (1 hour)"
+            )
+            gaps.append(gap)
+        
+        return gaps
     
     def _identify_testing_gaps(self) -> List[CriticalGap]:
         """Identify testing gaps."""
@@ -619,21 +565,19 @@ This report identifies {total_gaps_identified} gaps in the current system archit
         
         try:
             # Check for missing test files
-            workspace_path = Path(self._workspace_root)
-            python_files = list(workspace_path.rglob("*.py"))
-            test_files = list(workspace_path.rglob("test_*.py"))
+            records = self._get_source_index().refresh()
+            test_files = {record.name for record in records if record.name.startswith("test_")}
             
             # Find source files without corresponding test files
-            for file_path in python_files:
-                if "test" in str(file_path) or "__pycache__" in str(file_path):
+            for record in records:
+                if "test" in record.path:
                     continue
                 
                 # Check if there's a corresponding test file
-                expected_test_file = f"test_{file_path.stem}.py"
-                test_exists = any(expected_test_file in str(test_file) for test_file in test_files)
+                expected_test_file = f"test_{Path(record.name).stem}.py"
                 
-                if not test_exists:
-                    relative_path = str(file_path.relative_to(workspace_path)) if hasattr(self, '_workspace_root') else file_path.name
+                if expected_test_file not in test_files:
+                    relative_path = record.relative_path
                     
                     gap = CriticalGap(
                         gap_id="",
@@ -0,0 +1,357 @@
+"""
+Shared incremental index of the workspace's Python sources.
+
+Every analysis engine used to walk the workspace and re-read each file on
+its own. SourceIndex walks the tree once, parses every file once (ast plus
+pre-compiled regexes for the comment-level gap patterns) and keeps the
+per-file results keyed by (mtime, size), so refreshing after an edit only
+re-parses the files that changed.
+"""
+
+import ast
+import logging
+import os
+import re
+import threading
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Gap patterns, grouped by gap type (GapAnalysisEngine's default rules)
+GAP_DETECTION_RULES: Dict[str, List[str]] = {
+    "missing_implementation_patterns": [
+        r"TODO:\s*(.+)",
+        r"FIXME:\s*(.+)",
+        r"NotImplementedError",
+        r"pass\s*#\s*TODO",
+        r"raise\s+NotImplementedError"
+    ],
+    "security_gap_patterns": [
+        r"#\s*SECURITY:\s*(.+)",
+        r"#\s*UNSAFE:\s*(.+)",
+        r"#\s*VULNERABILITY:\s*(.+)",
+        r"password\s*=\s*[\"'].*[\"']",  # Hardcoded passwords
+        r"api_key\s*=\s*[\"'].*[\"']"   # Hardcoded API keys
+    ],
+    "stability_gap_patterns": [
+        r"#\s*HACK:\s*(.+)",
+        r"#\s*TEMPORARY:\s*(.+)",
+        r"#\s*WORKAROUND:\s*(.+)",
+        r"except:\s*pass",  # Bare except clauses
+        r"except\s+Exception:\s*pass"  # Overly broad exception handling
+    ],
+    "functionality_gap_patterns": [
+        r"#\s*INCOMPLETE:\s*(.+)",
+        r"#\s*PARTIAL:\s*(.+)",
+        r"#\s*STUB:\s*(.+)",
+        r"def\s+\w+\([^)]*\):\s*pass",  # Empty function definitions
+        r"class\s+\w+[^:]*:\s*pass"     # Empty class definitions
+    ]
+}
+
+# Regex fallbacks for files that ast cannot parse
+_CLASS_RE = re.compile(r"class\s+(\w+).*:")
+_INTERFACE_RE = re.compile(r"class\s+(\w+Interface).*:")
+_FUNCTION_RE = re.compile(r"def\s+(\w+)\s*\(")
+_IMPORT_RE = re.compile(r"from\s+(.+)\s+import\s+(.+)")
+_UNDOCUMENTED_FUNCTION_RE = re.compile(r'def\s+(\w+)\s*\([^)]*\):\s*\n(?!\s*"""|\s*\'\'\')', re.MULTILINE)
+_UNDOCUMENTED_CLASS_RE = re.compile(r'class\s+(\w+)[^:]*:\s*\n(?!\s*"""|\s*\'\'\')', re.MULTILINE)
+_NEWLINE_RE = re.compile(r"\n")
+
+# Below this many changed files the process pool costs more than it saves
+PARALLEL_THRESHOLD = 16
+BATCH_SIZE = 32
+
+RulesKey = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+@dataclass
+class SourceFileRecord:
+    """Everything the analysis engines need from one source file."""
+    path: str
+    relative_path: str
+    mtime_ns: int = 0
+    size: int = 0
+    file_size: int = 0
+    line_count: int = 0
+    classes: List[str] = field(default_factory=list)
+    interfaces: List[str] = field(default_factory=list)
+    functions: List[str] = field(default_factory=list)
+    imports: List[Tuple[str, str]] = field(default_factory=list)
+    # (gap_type, line_number, matched_text)
+    gap_matches: List[Tuple[str, int, str]] = field(default_factory=list)
+    # (kind, name, line_number), kind is "function" or "class"
+    missing_docstrings: List[Tuple[str, str, int]] = field(default_factory=list)
+    # Set when ast failed and the regex fallback was used
+    syntax_error: Optional[str] = None
+    # Set when the file could not be read at all
+    error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        """File name without directories."""
+        return os.path.basename(self.path)
+
+
+def freeze_rules(rules: Optional[Dict[str, List[str]]] = None) -> RulesKey:
+    """Convert a gap rules dict into a hashable key."""
+    rules = GAP_DETECTION_RULES if rules is None else rules
+    return tuple((gap_type, tuple(patterns)) for gap_type, patterns in rules.items())
+
+
+@lru_cache(maxsize=16)
+def compile_gap_rules(rules_key: RulesKey) -> Tuple[Tuple[str, Tuple["re.Pattern", ...]], ...]:
+    """
+    Compile every gap pattern once.
+
+    Patterns stay separate: a combined alternation is slower with the re
+    module (no shared literal prefix) and would drop overlapping matches.
+    """
+    return tuple(
+        (gap_type, tuple(re.compile(pattern, re.MULTILINE | re.IGNORECASE) for pattern in patterns))
+        for gap_type, patterns in rules_key
+    )
+
+
+def line_offsets(content: str) -> List[int]:
+    """Start offset of every line, for bisect-based line lookup."""
+    return [0] + [match.end() for match in _NEWLINE_RE.finditer(content)]
+
+
+def find_gap_matches(content: str, rules_key: Optional[RulesKey] = None,
+                     offsets: Optional[List[int]] = None) -> List[Tuple[str, int, str]]:
+    """Return (gap_type, line_number, text) for every gap pattern match."""
+    if offsets is None:
+        offsets = line_offsets(content)
+    matches = []
+    for gap_type, patterns in compile_gap_rules(rules_key or freeze_rules()):
+        for pattern in patterns:
+            for match in pattern.finditer(content):
+                matches.append((gap_type, bisect_right(offsets, match.start()), match.group(0)))
+    return matches
+
+
+def analyze_source(path: str, relative_path: str, content: str,
+                   rules_key: Optional[RulesKey] = None) -> SourceFileRecord:
+    """Parse one file's content into a SourceFileRecord."""
+    offsets = line_offsets(content)
+    record = SourceFileRecord(
+        path=path,
+        relative_path=relative_path,
+        file_size=len(content),
+        line_count=len(content.splitlines()),
+        gap_matches=find_gap_matches(content, rules_key, offsets)
+    )
+
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError) as e:
+        _analyze_with_regex(record, content, offsets)
+        record.syntax_error = str(e)
+        return record
+
+    definitions = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            definitions.append(node)
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            names = ", ".join(alias.name if not alias.asname else f"{alias.name} as {alias.asname}"
+                              for alias in node.names)
+            record.imports.append((node.lineno, module, names))
+
+    record.imports = [(module, names) for _, module, names in sorted(record.imports)]
+    definitions.sort(key=lambda node: (node.lineno, node.col_offset))
+    undocumented_classes = []
+    for node in definitions:
+        if isinstance(node, ast.ClassDef):
+            record.classes.append(node.name)
+            if node.name.endswith("Interface"):
+                record.interfaces.append(node.name)
+            if ast.get_docstring(node) is None:
+                undocumented_classes.append(("class", node.name, node.lineno))
+        else:
+            record.functions.append(node.name)
+            if ast.get_docstring(node) is None:
+                record.missing_docstrings.append(("function", node.name, node.lineno))
+    record.missing_docstrings.extend(undocumented_classes)
+    return record
+
+
+def _analyze_with_regex(record: SourceFileRecord, content: str, offsets: List[int]) -> None:
+    """Fill in the structural fields for files that are not valid Python 3."""
+    record.classes = _CLASS_RE.findall(content)
+    record.interfaces = _INTERFACE_RE.findall(content)
+    record.functions = _FUNCTION_RE.findall(content)
+    record.imports = _IMPORT_RE.findall(content)
+    for kind, pattern in (("function", _UNDOCUMENTED_FUNCTION_RE), ("class", _UNDOCUMENTED_CLASS_RE)):
+        for match in pattern.finditer(content):
+            record.missing_docstrings.append((kind, match.group(1), bisect_right(offsets, match.start())))
+
+
+def _index_file(path: str, relative_path: str, mtime_ns: int, size: int,
+                rules_key: RulesKey) -> SourceFileRecord:
+    """Read and analyze one file; errors are kept on the record."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        record = analyze_source(path, relative_path, content, rules_key)
+    except (OSError, UnicodeDecodeError) as e:
+        record = SourceFileRecord(path=path, relative_path=relative_path, error=str(e))
+    record.mtime_ns = mtime_ns
+    record.size = size
+    return record
+
+
+def _index_batch(batch: List[Tuple[str, str, int, int]], rules_key: RulesKey) -> List[SourceFileRecord]:
+    """Process pool entry point."""
+    return [_index_file(*entry, rules_key) for entry in batch]
+
+
+class SourceIndex:
+    """
+    Incremental, shareable index of the Python files under a workspace.
+
+    refresh() walks the workspace once, re-parses only files whose
+    (mtime, size) changed and drops deleted files. Parsing fans out across
+    a process pool when enough files changed.
+    """
+
+    def __init__(self, workspace_root, gap_rules: Optional[Dict[str, List[str]]] = None,
+                 max_workers: Optional[int] = None, use_processes: bool = True):
+        """
+        Initialize the index.
+
+        Args:
+            workspace_root: Directory to index
+            gap_rules: Gap patterns by gap type (defaults to GAP_DETECTION_RULES)
+            max_workers: Process pool size (defaults to the CPU count)
+            use_processes: Set to False to always parse in-process
+        """
+        self.workspace_root = Path(workspace_root)
+        self.rules_key = freeze_rules(gap_rules)
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self._records: Dict[str, SourceFileRecord] = {}
+        self._directories: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._refreshed = False
+        self.stats = {"refreshes": 0, "files": 0, "parsed": 0, "reused": 0, "removed": 0}
+
+    def refresh(self) -> List[SourceFileRecord]:
+        """Bring the index up to date with the filesystem and return all records."""
+        with self._lock:
+            files, directories = self._walk()
+            stale = []
+            for path, relative_path, mtime_ns, size in files:
+                cached = self._records.get(path)
+                if cached is None or cached.mtime_ns != mtime_ns or cached.size != size:
+                    stale.append((path, relative_path, mtime_ns, size))
+
+            for record in self._parse(stale):
+                self._records[record.path] = record
+
+            current = {entry[0] for entry in files}
+            removed = [path for path in self._records if path not in current]
+            for path in removed:
+                del self._records[path]
+
+            self._directories = directories
+            self._refreshed = True
+            self.stats["refreshes"] += 1
+            self.stats["files"] = len(files)
+            self.stats["parsed"] += len(stale)
+            self.stats["reused"] += len(files) - len(stale)
+            self.stats["removed"] += len(removed)
+            return [self._records[entry[0]] for entry in files]
+
+    def records(self) -> List[SourceFileRecord]:
+        """All records, refreshing first if the index was never built."""
+        with self._lock:
+            if not self._refreshed:
+                return self.refresh()
+            return sorted(self._records.values(), key=lambda record: record.relative_path)
+
+    def directory_structure(self) -> Dict[str, Dict[str, Any]]:
+        """Python-bearing directories (relative path -> counts and file names)."""
+        with self._lock:
+            if not self._refreshed:
+                self.refresh()
+            return {path: dict(info, files=list(info["files"])) for path, info in self._directories.items()}
+
+    def invalidate(self, path=None) -> None:
+        """Forget one file (or everything) so the next refresh re-parses it."""
+        with self._lock:
+            if path is None:
+                self._records.clear()
+                self._refreshed = False
+            else:
+                self._records.pop(str(Path(path)), None)
+
+    def _walk(self) -> Tuple[List[Tuple[str, str, int, int]], Dict[str, Dict[str, Any]]]:
+        """Single pass over the tree collecting .py files and directory info."""
+        root = str(self.workspace_root)
+        files = []
+        directories = {}
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            subdirectory_count = len(dirnames)
+            # Hidden directories (.git, .venv, ...) and bytecode caches are not sources
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d != '__pycache__')
+            python_files = sorted(name for name in filenames if name.endswith('.py'))
+
+            for name in python_files:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, os.path.relpath(path, root), stat.st_mtime_ns, stat.st_size))
+
+            if python_files and dirpath != root:
+                directories[os.path.relpath(dirpath, root)] = {
+                    "python_files": len(python_files),
+                    "subdirectories": subdirectory_count,
+                    "files": python_files
+                }
+
+        return files, directories
+
+    def _parse(self, entries: List[Tuple[str, str, int, int]]) -> List[SourceFileRecord]:
+        """Parse changed files, in a process pool when there are enough of them."""
+        if not entries:
+            return []
+
+        workers = self.max_workers or os.cpu_count() or 1
+        if self.use_processes and workers > 1 and len(entries) >= PARALLEL_THRESHOLD:
+            batches = [entries[i:i + BATCH_SIZE] for i in range(0, len(entries), BATCH_SIZE)]
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = executor.map(_index_batch, batches, [self.rules_key] * len(batches))
+                    return [record for batch in results for record in batch]
+            except (OSError, RuntimeError, ImportError) as e:
+                # Pools can be unavailable (sandboxes, frozen apps); parse in-process
+                logger.warning(f"Process pool unavailable, indexing serially: {e}")
+
+        return _index_batch(entries, self.rules_key)
+
+
+# Shared indexes, one per (workspace, gap rules)
+_source_indexes: Dict[Tuple[str, RulesKey], SourceIndex] = {}
+_source_indexes_lock = threading.Lock()
+
+
+def get_source_index(workspace_root, gap_rules: Optional[Dict[str, List[str]]] = None) -> SourceIndex:
+    """Return the shared SourceIndex for a workspace."""
+    key = (os.path.abspath(str(workspace_root)), freeze_rules(gap_rules))
+    with _source_indexes_lock:
+        index = _source_indexes.get(key)
+        if index is None:
+            index = SourceIndex(key[0], gap_rules)
+            _source_indexes[key] = index
+        return index
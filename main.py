@@ -43,6 +43,7 @@ try:
     from core.plugin_system_manager import PluginSystemManager
     from core.security_manager import SecurityManager, SecurityLevel
     from core.automated_testing_framework import AutomatedTestingFramework
+    from core.progress_bus import ProgressHistory, get_progress_bus
     
     # GUI imports
     from gui.modern_frontend_manager import ModernFrontendManager
@@ -53,6 +54,14 @@ except ImportError as e:
     print("Please ensure all required modules are installed and accessible.")
     sys.exit(1)
 
+try:
+    # Notifications live in the env_dev package; run without them if it is not importable
+    from env_dev.core.notification_manager import (
+        OperationCategory, initialize_notification_manager, shutdown_notification_manager
+    )
+except ImportError:
+    initialize_notification_manager = None
+
 
 class EnvironmentDevDeepEvaluation:
     """
@@ -79,6 +88,9 @@ class EnvironmentDevDeepEvaluation:
         self.running = False
         self.config = {}
         self.components = {}
+        self.notification_manager = None
+        self.progress_history = None
+        self._progress_subscriptions = []
         
         # Load configuration
         self.config_path = config_path or self._get_default_config_path()
@@ -203,6 +215,9 @@ class EnvironmentDevDeepEvaluation:
         try:
             self.logger.info("Initializing system components...")
             
+            # Subscribe to download progress before any downloader exists
+            self._initialize_progress_subscribers()
+            
             # Initialize security manager first
             self.components['security'] = SecurityManager()
             
@@ -265,6 +280,21 @@ class EnvironmentDevDeepEvaluation:
             self.logger.error(traceback.format_exc())
             raise
     
+    def _initialize_progress_subscribers(self):
+        """Attach notifications and progress history to the progress bus"""
+        # The downloaders import core.progress_bus; subscribe to that module's bus
+        # explicitly, not to the env_dev.core copy the notification manager sees
+        progress_bus = get_progress_bus()
+        self.progress_history = ProgressHistory()
+        self._progress_subscriptions.append(progress_bus.subscribe(self.progress_history))
+        
+        if initialize_notification_manager is None:
+            self.logger.warning("Notification manager unavailable; download progress is not notified")
+            return
+        
+        self.notification_manager = initialize_notification_manager()
+        self._progress_subscriptions.append(self.notification_manager.attach_progress_bus(progress_bus))
+    
     def _is_steam_deck(self) -> bool:
         """Check if running on Steam Deck"""
         try:
@@ -480,26 +510,48 @@ class EnvironmentDevDeepEvaluation:
     
     async def _download_component(self, component: str) -> Dict[str, Any]:
         """Download a specific component"""
+        operation_id = None
         try:
             # Get component download info
             download_info = self._get_component_download_info(component)
             if not download_info:
                 return {'success': False, 'error': f'Unknown component: {component}'}
             
-            # Download with verification
-            download_result = self.components['download_manager'].download_with_verification(
+            # Start the notification operation first; the downloader publishes
+            # its byte progress under the same id
+            if self.notification_manager:
+                operation_id = self.notification_manager.start_operation(
+                    OperationCategory.DOWNLOAD,
+                    f"Download {component}",
+                    f"Downloading {component}",
+                    metadata={'url': download_info['url']}
+                )
+            
+            destination = Path("downloads") / f"{component}.{download_info['extension']}"
+            destination.parent.mkdir(exist_ok=True)
+            
+            # Download with verification (raises on failure)
+            download_result = self.components['download_manager'].download_with_mandatory_hash_verification(
                 url=download_info['url'],
-                expected_hash=download_info['hash'],
-                destination=f"downloads/{component}.{download_info['extension']}"
+                expected_sha256=download_info['hash'],
+                destination_path=destination,
+                operation_id=operation_id
             )
             
+            if operation_id:
+                self.notification_manager.complete_operation(
+                    operation_id, success=True, result_data={'file_path': str(download_result.file_path)}
+                )
+            
             return {
-                'success': download_result.success,
-                'file_path': download_result.file_path if download_result.success else None,
-                'error': download_result.error_message if not download_result.success else None
+                'success': True,
+                'file_path': str(download_result.file_path),
+                'error': None
             }
             
         except Exception as e:
+            if operation_id:
+                self.notification_manager.complete_operation(operation_id, success=False, error_message=str(e))
             return {'success': False, 'error': str(e)}
     
     async def _install_component(self, component: str, file_path: str) -> Dict[str, Any]:
@@ -828,6 +880,15 @@ class EnvironmentDevDeepEvaluation:
                     except Exception as e:
                         self.logger.error(f"Error shutting down {component_name}: {e}")
             
+            # Detach progress subscribers and drain pending notifications
+            progress_bus = get_progress_bus()
+            for token in self._progress_subscriptions:
+                progress_bus.unsubscribe(token)
+            self._progress_subscriptions.clear()
+            if self.notification_manager:
+                shutdown_notification_manager()
+                self.notification_manager = None
+            
             # Save configuration
             self._save_configuration()
             
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the batched LogDatabase writer
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import time
+import types
+import unittest
+from contextlib import redirect_stderr
+from datetime import datetime
+from pathlib import Path
+
+import sys
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+
+# The repository is the env_dev package; alias it when checked out under another name
+try:
+    import env_dev  # noqa: F401
+except ImportError:
+    env_dev = types.ModuleType("env_dev")
+    env_dev.__path__ = [str(ROOT)]
+    sys.modules["env_dev"] = env_dev
+
+from env_dev.core.advanced_logging import LogCategory, LogDatabase, LogEntry, LogLevel
+
+
+def make_entry(message: str, level: LogLevel = LogLevel.INFO, component: str = None) -> LogEntry:
+    return LogEntry(timestamp=datetime.now(), level=level, category=LogCategory.SYSTEM,
+                    logger_name="tests", message=message, module="tests", function="test",
+                    line_number=1, thread_id=1, process_id=os.getpid(), component=component)
+
+
+def wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestLogDatabaseWriter(unittest.TestCase):
+    """Test cases for the LogDatabase background writer"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "logs.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _database(self, **kwargs) -> LogDatabase:
+        database = LogDatabase(self.db_path, **kwargs)
+        self.addCleanup(database.close)
+        return database
+
+    def test_rows_are_written_in_batches(self):
+        """Full batches are written at once; the remainder waits for the interval or a flush"""
+        database = self._database(batch_size=5, flush_interval=60)
+        for i in range(12):
+            database.add_log_entry(make_entry(f"entry {i}"))
+
+        self.assertTrue(wait_until(lambda: database.written_entries == 10))
+        time.sleep(0.1)
+        self.assertEqual(database.written_entries, 10)
+
+        self.assertTrue(database.flush())
+        self.assertEqual(database.written_entries, 12)
+        self.assertEqual(len(database.search_logs(limit=100)), 12)
+
+    def test_flush_interval_writes_partial_batch(self):
+        """A partial batch is written once flush_interval elapses"""
+        database = self._database(batch_size=100, flush_interval=0.05)
+        database.add_log_entry(make_entry("lonely"))
+
+        self.assertTrue(wait_until(lambda: database.written_entries == 1))
+
+    def test_full_queue_drops_and_flush_times_out(self):
+        """Entries are dropped and counted while the queue is full; flush gives up after its timeout"""
+        database = self._database(batch_size=1, max_queue_size=1, enqueue_timeout=0)
+
+        with database.lock:
+            # The writer takes the first row and blocks on the lock
+            database.add_log_entry(make_entry("first"))
+            self.assertTrue(wait_until(database._write_queue.empty))
+            for i in range(5):
+                database.add_log_entry(make_entry(f"extra {i}"))
+
+            self.assertEqual(database.dropped_entries, 4)
+            self.assertFalse(database.flush(timeout=0.1))
+
+        self.assertTrue(database.flush())
+        self.assertEqual(database.written_entries, 2)
+
+    def test_close_flushes_and_rejects_later_writes(self):
+        """close commits queued rows; later writes are counted as dropped with one warning"""
+        database = self._database(batch_size=100, flush_interval=60)
+        for i in range(3):
+            database.add_log_entry(make_entry(f"entry {i}"))
+
+        database.close()
+        self.assertEqual(database.written_entries, 3)
+        self.assertFalse(database._writer_thread.is_alive())
+
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            database.add_log_entry(make_entry("late"))
+            database.add_log_entry(make_entry("later"))
+
+        self.assertEqual(database.dropped_entries, 2)
+        self.assertEqual(stderr.getvalue().count("is closed"), 1)
+        self.assertFalse(database.flush())
+
+        reopened = self._database()
+        self.assertEqual(len(reopened.search_logs(limit=100)), 3)
+
+
+class TestLogDatabaseSearch(unittest.TestCase):
+    """Test cases for LogDatabase text search and pagination"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.database = LogDatabase(os.path.join(self.temp_dir, "logs.db"))
+        messages = [
+            "Installing git from mirror",
+            "Error: download failed",
+            "Installation finished",
+            "Network error while installing node",
+            "Catalog refreshed",
+        ]
+        for message in messages:
+            self.database.add_log_entry(make_entry(message))
+        self.assertTrue(self.database.flush())
+
+    def tearDown(self):
+        self.database.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _messages(self, **kwargs):
+        return sorted(row['message'] for row in self.database.search_logs(**kwargs))
+
+    def test_prefix_terms_use_fts(self):
+        """Word prefixes are matched through the FTS index, all words required"""
+        if not self.database.fts_enabled:
+            self.skipTest("SQLite without FTS5")
+        self.assertEqual(self._messages(query="instal"), [
+            "Installation finished", "Installing git from mirror", "Network error while installing node",
+        ])
+        self.assertEqual(self._messages(query="error install"), ["Network error while installing node"])
+        fts_query, like_terms = self.database._plan_text_search("error install")
+        self.assertEqual((fts_query, like_terms), ('"error"* "install"*', []))
+
+    def test_substring_terms_fall_back_to_like(self):
+        """Words that start no indexed word still match as substrings"""
+        self.assertEqual(self._messages(query="rror"), [
+            "Error: download failed", "Installing git from mirror", "Network error while installing node",
+        ])
+        self.assertEqual(self._messages(query="alog"), ["Catalog refreshed"])
+        # Mixed: "node" through FTS, "stall" through LIKE
+        self.assertEqual(self._messages(query="stall node"), ["Network error while installing node"])
+        self.assertEqual(self._messages(query="zzz"), [])
+
+    def test_pagination_by_time_and_relevance(self):
+        """Cursors walk every match exactly once in both orderings"""
+        for order_by in ("time", "relevance"):
+            seen, cursor = [], None
+            while True:
+                page = self.database.search_logs_page(query="instal", limit=2, cursor=cursor, order_by=order_by)
+                seen.extend(row['id'] for row in page['results'])
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+            self.assertEqual(len(seen), 3, order_by)
+            self.assertEqual(len(set(seen)), 3, order_by)
+
+        with self.assertRaises(ValueError):
+            self.database.search_logs_page(query="instal", cursor=cursor or "bad", order_by="time")
+
+    def test_like_only_without_fts(self):
+        """Without FTS5 the whole query is matched as a substring"""
+        database = LogDatabase(os.path.join(self.temp_dir, "plain.db"), enable_fts=False)
+        self.addCleanup(database.close)
+        database.add_log_entry(make_entry("Error: download failed"))
+        database.add_log_entry(make_entry("download finished"))
+
+        results = database.search_logs(query="ror: down")
+        self.assertEqual([row['message'] for row in results], ["Error: download failed"])
+
+
+if __name__ == '__main__':
+    unittest.main()
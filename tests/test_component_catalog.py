@@ -0,0 +1,120 @@
+"""Testes unitários para o catálogo compilado de componentes YAML."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.loader import ComponentCatalog
+
+
+class TestComponentCatalog(unittest.TestCase):
+    """Testes para a classe ComponentCatalog."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.components_dir = self.temp_dir / "components"
+        self.components_dir.mkdir()
+        self.cache_file = self.temp_dir / "cache" / "catalog.pickle"
+        self.yaml_file = self.components_dir / "tools.yaml"
+        self.yaml_file.write_text(
+            "_metadata:\n"
+            "  version: 1\n"
+            "Git:\n"
+            "  category: Dev\n"
+            "  description: Git\n"
+            "  install_method: exe\n"
+            "Broken:\n"
+            "  category: Dev\n",
+            encoding="utf-8"
+        )
+
+    def tearDown(self):
+        """Limpeza após cada teste."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _catalog(self):
+        return ComponentCatalog(components_dir=str(self.components_dir), cache_file=self.cache_file)
+
+    def test_valid_components_only(self):
+        """Testa que metadados e componentes inválidos são descartados."""
+        components = self._catalog().get_components()
+
+        self.assertEqual(list(components.keys()), ["Git"])
+        self.assertEqual(components["Git"]["install_method"], "exe")
+
+    def test_returned_components_are_independent_copies(self):
+        """Testa que alterações do chamador não afetam o catálogo."""
+        catalog = self._catalog()
+        catalog.get_components()["Git"]["category"] = "Changed"
+
+        self.assertEqual(catalog.get_components()["Git"]["category"], "Dev")
+
+    def test_persisted_catalog_skips_parsing(self):
+        """Testa que uma nova instância reutiliza o blob persistido."""
+        self._catalog().get_components()
+        self.assertTrue(self.cache_file.exists())
+
+        catalog = self._catalog()
+        components = catalog.get_components()
+
+        self.assertIn("Git", components)
+        self.assertEqual(catalog.stats["files_parsed"], 0)
+        self.assertEqual(catalog.stats["files_reused"], 1)
+
+    def test_touched_file_with_same_content_is_not_reparsed(self):
+        """Testa que mudança só de mtime é resolvida pelo hash do conteúdo."""
+        self._catalog().get_components()
+        later = time.time() + 5
+        os.utime(self.yaml_file, (later, later))
+
+        catalog = self._catalog()
+        catalog.get_components()
+
+        self.assertEqual(catalog.stats["files_parsed"], 0)
+
+    def test_modified_file_is_recompiled(self):
+        """Testa que alterações no YAML são detectadas."""
+        catalog = self._catalog()
+        catalog.get_components()
+
+        with open(self.yaml_file, "a", encoding="utf-8") as f:
+            f.write("  description: Agora válido\n  install_method: archive\n")
+        later = time.time() + 5
+        os.utime(self.yaml_file, (later, later))
+
+        components = catalog.get_components()
+
+        self.assertEqual(sorted(components.keys()), ["Broken", "Git"])
+        self.assertEqual(catalog.stats["files_parsed"], 2)
+
+    def test_deleted_file_is_dropped(self):
+        """Testa que componentes de um YAML removido deixam o catálogo e o blob."""
+        (self.components_dir / "extra.yaml").write_text(
+            "Node:\n  category: Dev\n  description: Node\n  install_method: exe\n", encoding="utf-8"
+        )
+        catalog = self._catalog()
+        self.assertEqual(sorted(catalog.get_components().keys()), ["Git", "Node"])
+
+        (self.components_dir / "extra.yaml").unlink()
+
+        self.assertEqual(list(catalog.get_components().keys()), ["Git"])
+        self.assertEqual(list(self._catalog().get_components().keys()), ["Git"])
+        self.assertEqual(len(catalog._entries), 1)
+
+    def test_load_file_returns_raw_data(self):
+        """Testa leitura do conteúdo bruto (sem validação) de um arquivo."""
+        data = self._catalog().load_file(str(self.yaml_file))
+
+        self.assertIn("_metadata", data)
+        self.assertIn("Broken", data)
+
+
+if __name__ == '__main__':
+    unittest.main()
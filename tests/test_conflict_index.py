@@ -0,0 +1,141 @@
+"""Testes unitários para o índice de conflitos e o índice de regras da matriz de compatibilidade."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.conflict_index import ConflictIndex
+from core.compatibility_matrix import (
+    CompatibilityMatrix, CompatibilityRule, CompatibilityLevel, ComponentProfile, VersionConstraint
+)
+
+
+class TestConflictIndex(unittest.TestCase):
+    """Testes para a classe ConflictIndex."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.index = ConflictIndex()
+        self.configs = {
+            "mysql": {"ports": [3306], "conflicts": ["mariadb"]},
+            "mariadb": {"ports": [3306]},
+            "jdk17": {"environment_variables": {"JAVA_HOME": "C:\\jdk17", "PATH": "C:\\jdk17\\bin"}},
+            "jdk21": {"environment_variables": {"JAVA_HOME": "C:\\jdk21", "PATH": "C:/jdk17/bin/"}},
+            "python311": {"base_software": "python", "version": "3.11"},
+            "python312": {"base_software": "python", "version": "3.12"},
+            "git": {"install_paths": ["C:\\Git"]},
+            "git-lfs": {"install_paths": ["C:\\Git"]},
+            "vscode": {},
+        }
+        for name, config in self.configs.items():
+            self.index.update(name, config)
+
+    def _conflicts(self, components):
+        return {(c.component1, c.component2): c for c in self.index.find_conflicts(components)}
+
+    def test_detects_each_conflict_type(self):
+        """Testa conflitos explícitos, de recursos e de versão."""
+        conflicts = self._conflicts(list(self.configs))
+
+        self.assertEqual(set(conflicts), {
+            ("mysql", "mariadb"), ("jdk17", "jdk21"), ("python311", "python312"), ("git", "git-lfs")
+        })
+        # Conflito explícito tem prioridade sobre a porta compartilhada
+        self.assertEqual(conflicts[("mysql", "mariadb")].conflict_type, "explicit")
+        self.assertEqual(conflicts[("jdk17", "jdk21")].conflict_type, "env_var")
+        self.assertEqual(conflicts[("python311", "python312")].conflict_type, "version")
+        self.assertEqual(conflicts[("git", "git-lfs")].resources, ["C:\\Git"])
+
+    def test_reverse_declaration_and_batch_order(self):
+        """Testa que o par segue a ordem do lote mesmo com declaração invertida."""
+        conflicts = self.index.find_conflicts(["vscode", "mariadb", "mysql"])
+
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual((conflicts[0].component1, conflicts[0].component2), ("mariadb", "mysql"))
+
+    def test_same_env_value_is_not_a_conflict(self):
+        """Testa que variáveis com o mesmo valor não conflitam."""
+        self.index.update("jdk21", {"environment_variables": {"JAVA_HOME": "C:\\jdk17"}})
+
+        self.assertEqual(self._conflicts(["jdk17", "jdk21"]), {})
+
+    def test_incremental_update(self):
+        """Testa que reindexar um componente remove conflitos antigos."""
+        self.assertFalse(self.index.update("mysql", dict(self.configs["mysql"])))
+        self.assertTrue(self.index.update("mysql", {"ports": [3307]}))
+
+        self.assertEqual(self._conflicts(["mysql", "mariadb"]), {})
+
+        self.index.update("mariadb", {"conflicts": ["mysql"]})
+        self.assertEqual(self._conflicts(["mysql", "mariadb"])[("mysql", "mariadb")].conflict_type, "explicit")
+
+
+class TestCompatibilityMatrixIndex(unittest.TestCase):
+    """Testes para o índice de regras da CompatibilityMatrix."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.matrix = CompatibilityMatrix(config_dir=self.temp_dir)
+
+    def tearDown(self):
+        """Limpeza após cada teste."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_rule_lookup_in_either_order(self):
+        """Testa que regras são encontradas para o par em qualquer ordem."""
+        self.matrix.add_compatibility_rule(CompatibilityRule(
+            component_a="node", component_b="npm",
+            version_a=VersionConstraint(">=18"), version_b=VersionConstraint("<9"),
+            compatibility=CompatibilityLevel.INCOMPATIBLE
+        ))
+
+        self.assertEqual(self.matrix.check_compatibility("npm", "8.0", "node", "20.1"),
+                         CompatibilityLevel.INCOMPATIBLE)
+        self.assertEqual(self.matrix.check_compatibility("node", "16.0", "npm", "8.0"),
+                         CompatibilityLevel.UNKNOWN)
+
+    def test_added_rule_invalidates_cached_result(self):
+        """Testa que add_compatibility_rule atualiza o índice e o cache."""
+        self.assertEqual(self.matrix.check_compatibility("cmake", "3.28", "ninja", "1.11"),
+                         CompatibilityLevel.UNKNOWN)
+
+        self.matrix.add_compatibility_rule(CompatibilityRule(
+            component_a="cmake", component_b="ninja", compatibility=CompatibilityLevel.COMPATIBLE
+        ))
+
+        self.assertEqual(self.matrix.check_compatibility("cmake", "3.28", "ninja", "1.11"),
+                         CompatibilityLevel.COMPATIBLE)
+
+    def test_detect_conflicts_uses_rules_and_profiles(self):
+        """Testa detecção de incompatibilidades por regra e por perfil."""
+        self.matrix.add_compatibility_rule(CompatibilityRule(
+            component_a="docker", component_b="virtualbox", compatibility=CompatibilityLevel.INCOMPATIBLE
+        ))
+        self.matrix.add_component_profile(ComponentProfile(
+            name="gradle", version="8.5", category="build", requires={"jdk": VersionConstraint(">=17")}
+        ))
+        self.matrix.add_component_profile(ComponentProfile(name="jdk", version="11.0.2", category="runtime"))
+        installed = {"virtualbox": "7.0", "gradle": "8.5", "git": "2.44", "docker": "25.0", "jdk": "11.0.2"}
+
+        conflicts = self.matrix.detect_conflicts(installed)
+
+        incompatible = [c.components for c in conflicts if c.detection_method == "matrix_analysis"]
+        self.assertEqual(incompatible, [["virtualbox", "docker"], ["gradle", "jdk"]])
+
+    def test_direct_list_changes_are_reindexed(self):
+        """Testa que regras adicionadas diretamente à lista também são consideradas."""
+        self.matrix.compatibility_rules.append(CompatibilityRule(
+            component_a="a", component_b="b", compatibility=CompatibilityLevel.DEPRECATED
+        ))
+
+        self.assertEqual(self.matrix.check_compatibility("b", "1.0", "a", "1.0"),
+                         CompatibilityLevel.DEPRECATED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -282,6 +282,49 @@ class TestDetectionCacheSQLite(unittest.TestCase):
         self.assertIsNotNone(cached_result)
         self.assertEqual(cached_result["version"], "1.0.0")
 
+    def test_lazy_loading(self):
+        """Testa que entradas persistidas só são carregadas quando pedidas."""
+        self.cache.cache_result("app1", {"version": "1"})
+        self.cache.cache_result("app2", {"version": "2"})
+
+        new_cache = DetectionCache(cache_dir=self.temp_dir, use_sqlite=True)
+        self.assertEqual(len(new_cache._memory_cache), 0)
+
+        self.assertEqual(new_cache.get_cached_result("app2")["version"], "2")
+        self.assertEqual(len(new_cache._memory_cache), 1)
+        self.assertEqual(new_cache.get_cache_stats()["lazy_loads"], 1)
+
+    def test_upsert_only_changed_rows(self):
+        """Testa que regravar uma entrada atualiza a linha existente."""
+        self.cache.cache_result("app1", {"version": "1"})
+        self.cache.cache_result("app1", {"version": "2"})
+
+        new_cache = DetectionCache(cache_dir=self.temp_dir, use_sqlite=True)
+        self.assertEqual(new_cache.get_cached_result("app1")["version"], "2")
+        self.assertEqual(new_cache.get_cache_stats()["total_entries"], 1)
+
+    def test_invalidate_persists_deletion(self):
+        """Testa que a invalidação remove a entrada da persistência."""
+        self.cache.cache_result("app1", {"version": "1"})
+        self.assertTrue(self.cache.invalidate_cache("app1"))
+
+        new_cache = DetectionCache(cache_dir=self.temp_dir, use_sqlite=True)
+        self.assertIsNone(new_cache.get_cached_result("app1"))
+
+    def test_lru_eviction(self):
+        """Testa limite LRU da memória sem perda de entradas persistidas."""
+        cache = DetectionCache(cache_dir=self.temp_dir, use_sqlite=True, max_memory_entries=2)
+        cache.cache_result("app1", {"n": 1})
+        cache.cache_result("app2", {"n": 2})
+        cache.get_cached_result("app1")  # app1 passa a ser a mais recente
+        cache.cache_result("app3", {"n": 3})
+
+        self.assertEqual(list(cache._memory_cache.keys()), ["app1", "app3"])
+        stats = cache.get_cache_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["total_entries"], 3)
+        self.assertEqual(cache.get_cached_result("app2")["n"], 2)
+
 
 class TestGlobalCacheInstance(unittest.TestCase):
     """Testes para instância global do cache."""
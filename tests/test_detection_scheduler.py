@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the concurrent detection scheduler.
+"""
+
+import time
+import unittest
+from pathlib import Path
+from typing import List, Optional
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.detection_base import DetectionStrategy, DetectedApplication, DetectionMethod
+from core.detection_scheduler import DetectionScheduler
+
+
+class FakeStrategy(DetectionStrategy):
+    """Strategy that reports every requested app after a fixed delay."""
+
+    def __init__(self, method: DetectionMethod, per_app: bool, delay: float, confidence: float):
+        super().__init__()
+        self.method = method
+        self.per_app_probes = per_app
+        self.delay = delay
+        self.confidence = confidence
+        self.calls: List[Optional[List[str]]] = []
+
+    def get_method_name(self) -> DetectionMethod:
+        return self.method
+
+    def detect_applications(self, target_apps: Optional[List[str]] = None) -> List[DetectedApplication]:
+        self.calls.append(target_apps)
+        time.sleep(self.delay)
+        return [DetectedApplication(name=app, confidence=self.confidence) for app in (target_apps or [])]
+
+
+class TestDetectionScheduler(unittest.TestCase):
+    """Test cases for DetectionScheduler."""
+
+    def test_per_app_probes(self):
+        """Per-app strategies are called once per target app."""
+        strategy = FakeStrategy(DetectionMethod.PATH_BASED, True, 0.0, 0.8)
+        runs = DetectionScheduler(max_probe_workers=2).run([strategy], ["git", "node"])
+
+        self.assertEqual(len(runs[0].detections), 2)
+        self.assertCountEqual(strategy.calls, [["git"], ["node"]])
+
+    def test_strategies_run_concurrently(self):
+        """Independent strategies overlap instead of running back to back."""
+        strategies = [
+            FakeStrategy(DetectionMethod.REGISTRY, False, 0.3, 0.9),
+            FakeStrategy(DetectionMethod.EXECUTABLE_SCAN, False, 0.3, 0.7),
+        ]
+        start = time.perf_counter()
+        runs = DetectionScheduler().run(strategies, ["git"])
+
+        self.assertLess(time.perf_counter() - start, 0.55)
+        self.assertTrue(all(run.elapsed_seconds >= 0.3 for run in runs))
+
+    def test_strategy_timeout(self):
+        """A strategy exceeding its timeout is reported and its results dropped."""
+        slow = FakeStrategy(DetectionMethod.REGISTRY, False, 1.0, 0.9)
+        fast = FakeStrategy(DetectionMethod.PATH_BASED, True, 0.0, 0.8)
+        scheduler = DetectionScheduler(strategy_timeouts={"registry": 0.2})
+
+        runs = scheduler.run([slow, fast], ["git"])
+
+        self.assertTrue(runs[0].timed_out)
+        self.assertEqual(runs[0].detections, [])
+        self.assertIn("timed out", runs[0].error)
+        self.assertEqual(len(runs[1].detections), 1)
+
+    def test_high_confidence_cuts_off_probes(self):
+        """Probes for an app already resolved with high confidence are skipped."""
+        confident = FakeStrategy(DetectionMethod.MANUAL_OVERRIDE, False, 0.0, 0.95)
+        slow = FakeStrategy(DetectionMethod.PATH_BASED, True, 0.2, 0.8)
+        targets = ["git", "python", "node"]
+
+        runs = DetectionScheduler(max_probe_workers=1).run([confident, slow], targets)
+
+        self.assertEqual(len(runs[0].detections), 3)
+        # At most the probe already running when the result arrived completes
+        self.assertGreaterEqual(runs[1].skipped_probes, 2)
+        self.assertLessEqual(len(slow.calls), 1)
+
+    def test_duck_typed_and_failing_strategies(self):
+        """Strategies without the base attributes run, and one failure does not abort the run."""
+
+        class DuckTypedStrategy:
+            def get_method_name(self):
+                return DetectionMethod.PACKAGE_MANAGER
+
+            def detect_applications(self, target_apps=None):
+                return [DetectedApplication(name="git", confidence=0.9)]
+
+        class FailingStrategy(FakeStrategy):
+            def detect_applications(self, target_apps=None):
+                raise RuntimeError("boom")
+
+        failing = FailingStrategy(DetectionMethod.REGISTRY, False, 0.0, 0.9)
+        fast = FakeStrategy(DetectionMethod.PATH_BASED, True, 0.0, 0.8)
+
+        runs = DetectionScheduler().run([DuckTypedStrategy(), failing, fast], ["git"])
+
+        self.assertEqual(len(runs[0].detections), 1)
+        self.assertIn("boom", runs[1].error)
+        self.assertEqual(len(runs[2].detections), 1)
+
+    def test_cut_off_requires_exact_name(self):
+        """A confident detection only resolves the app it names exactly."""
+
+        class DesktopStrategy(FakeStrategy):
+            def detect_applications(self, target_apps=None):
+                return [DetectedApplication(name="GitHub Desktop", confidence=0.99),
+                        DetectedApplication(name="Node.js", confidence=0.99)]
+
+        confident = DesktopStrategy(DetectionMethod.MANUAL_OVERRIDE, False, 0.0, 0.99)
+        probes = FakeStrategy(DetectionMethod.PATH_BASED, True, 0.1, 0.8)
+
+        runs = DetectionScheduler(max_probe_workers=1).run([confident, probes], ["python", "git", "nodejs"])
+
+        self.assertIn(["git"], probes.calls)
+        self.assertTrue(any(d.name == "git" for d in runs[1].detections))
+        self.assertNotIn(["nodejs"], probes.calls)
+
+    def test_strategies_sharing_a_method_are_independent(self):
+        """Strategies reporting the same method keep separate runs and timeouts."""
+
+        class YamlStrategy(FakeStrategy):
+            pass
+
+        slow = FakeStrategy(DetectionMethod.MANUAL_OVERRIDE, False, 1.0, 0.5)
+        slow.timeout_seconds = 0.2
+        fast = YamlStrategy(DetectionMethod.MANUAL_OVERRIDE, False, 0.0, 0.5)
+
+        runs = DetectionScheduler().run([slow, fast], ["git"])
+
+        self.assertTrue(runs[0].timed_out)
+        self.assertFalse(runs[1].timed_out)
+        self.assertIsNone(runs[1].error)
+        self.assertEqual(len(runs[1].detections), 1)
+        self.assertEqual([run.method for run in runs], ["manual_override", "manual_override"])
+        self.assertEqual([run.label for run in runs],
+                         ["manual_override:FakeStrategy", "manual_override:YamlStrategy"])
+
+
+if __name__ == '__main__':
+    unittest.main()
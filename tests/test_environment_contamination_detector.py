@@ -0,0 +1,117 @@
+"""Testes unitários para a análise de processos do detector de contaminação."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.environment_contamination_detector import (
+    ContaminationSignature, ContaminationType, EnvironmentContaminationDetector
+)
+
+SIGNATURE_FILE = """
+malicious_processes:
+  - name: "keylogger_patterns"
+    severity: "critical"
+    detection_method: "process_behavior"
+    patterns: ["*keylog*"]
+conflicting_software:
+  - name: "antivirus_conflicts"
+    severity: "medium"
+    detection_method: "process_name"
+    patterns: ["avast*", "norton*", "mcafee*"]
+    conflict_threshold: 2
+  - name: "editor_conflicts"
+    severity: "low"
+    detection_method: "process_name"
+    patterns: ["vim*", "emacs*"]
+  - name: "virtualization_conflicts"
+    severity: "medium"
+    detection_method: "process_name"
+    patterns: ["vmware*", "virtualbox*"]
+    exclusions:
+      - combination: ["vmware", "virtualbox"]
+"""
+
+
+def _process(pid, name, cpu=1.0):
+    return {'pid': pid, 'name': name, 'exe': None, 'cpu_percent': cpu, 'memory_percent': 1.0}
+
+
+class TestProcessAnalysis(unittest.TestCase):
+    """Testes para EnvironmentContaminationDetector._analyze_processes."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.config_dir = Path(tempfile.mkdtemp())
+        (self.config_dir / "contamination_signatures.yaml").write_text(SIGNATURE_FILE, encoding='utf-8')
+        self.detector = EnvironmentContaminationDetector(config_dir=self.config_dir)
+
+    def tearDown(self):
+        """Limpeza após cada teste."""
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
+    def _conflicts(self, processes):
+        return {d.evidence['signature_matched']: d for d in self.detector._analyze_processes(processes)
+                if d.type == ContaminationType.CONFLICTING_SOFTWARE}
+
+    def test_conflict_threshold_counts_distinct_programs(self):
+        """Testa que o limite conta programas distintos, não processos."""
+        processes = [_process(1, "avastsvc.exe"), _process(2, "avastui.exe"), _process(3, "norton.exe")]
+        self.assertNotIn("antivirus_conflicts", self._conflicts(processes))
+
+        conflicts = self._conflicts(processes + [_process(4, "mcafee.exe")])
+        detection = conflicts["antivirus_conflicts"]
+        self.assertEqual(detection.evidence['programs_matched'], ["avast*", "norton*", "mcafee*"])
+        self.assertEqual(detection.evidence['pids'], [1, 2, 3, 4])
+
+    def test_default_threshold(self):
+        """Testa o limite padrão (mais de um programa) e a whitelist."""
+        self.assertNotIn("editor_conflicts", self._conflicts([_process(1, "vim.exe")]))
+        self.assertIn("editor_conflicts", self._conflicts([_process(1, "vim.exe"), _process(2, "emacs.exe")]))
+
+        self.detector.whitelist.add("emacs.exe")
+        self.assertNotIn("editor_conflicts", self._conflicts([_process(1, "vim.exe"), _process(2, "emacs.exe")]))
+
+    def test_only_process_name_signatures_are_loaded(self):
+        """Testa que outros métodos e exclusões não suportadas não viram assinaturas de nome."""
+        names = {signature.name for signature in self.detector.contamination_signatures}
+        self.assertIn("antivirus_conflicts", names)
+        self.assertNotIn("keylogger_patterns", names)
+        self.assertNotIn("virtualization_conflicts", names)
+
+        processes = [_process(1, "keylogger.exe", cpu=95.0), _process(2, "vmware.exe"),
+                     _process(3, "virtualboxvm.exe")]
+        self.assertEqual([d.evidence['signature_matched'] for d in self.detector._analyze_processes(processes)
+                          if 'signature_matched' in d.evidence], [])
+
+    def test_stock_windows_processes_are_not_flagged(self):
+        """Testa que serviços padrão do Windows não disparam a assinatura embutida."""
+        self.detector.contamination_signatures.append(ContaminationSignature(
+            name="security_suites", type=ContaminationType.CONFLICTING_SOFTWARE,
+            patterns=["*security*", "msmpeng*", "acme*"]))
+        processes = [_process(1, "SecurityHealthService.exe"), _process(2, "MsMpEng.exe"),
+                     _process(3, "svchost.exe")]
+        self.assertEqual(self._conflicts(processes), {})
+        self.assertIn("security_suites", self._conflicts(processes + [_process(5, "acme.exe")]))
+        self.detector.contamination_signatures.pop()
+        # Indicadores declarados que a lista de processos não verifica impedem a detecção
+        self.assertEqual(self._conflicts([_process(4, "acme-antivirus.exe")]), {})
+
+    def test_matcher_recompiled_when_patterns_change(self):
+        """Testa a recompilação quando os padrões mudam sem alterar o número de assinaturas."""
+        miner = next(s for s in self.detector.contamination_signatures if s.name == "suspicious_miner")
+        processes = [_process(1, "hashworker.exe", cpu=95.0)]
+        self.assertEqual([d for d in self.detector._analyze_processes(processes)
+                          if d.detection_id.startswith("proc_")], [])
+
+        miner.patterns.append("hashworker*")
+        detections = [d for d in self.detector._analyze_processes(processes) if d.detection_id.startswith("proc_")]
+        self.assertEqual([d.evidence['signature_matched'] for d in detections], ["suspicious_miner"])
+
+
+if __name__ == '__main__':
+    unittest.main()
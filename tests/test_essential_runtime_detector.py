@@ -27,6 +27,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.essential_runtime_detector import EssentialRuntimeDetector, RuntimeDetectionResult, EnvironmentVariableInfo
 from core.detection_base import DetectionMethod
+from core.version_probe import ProbeResult
 
 
 class TestEssentialRuntimeDetector(unittest.TestCase):
@@ -217,19 +218,20 @@ class TestEssentialRuntimeDetector(unittest.TestCase):
             
             self.assertEqual(path, "C:\\Program Files\\Java")
     
-    @patch('subprocess.run')
-    def test_get_executable_version(self, mock_subprocess):
+    @patch('core.essential_runtime_detector.get_version_probe_service')
+    def test_get_executable_version(self, mock_probe_service):
         """Test getting version from executable."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "git version 2.47.1"
-        mock_result.stderr = ""
-        mock_subprocess.return_value = mock_result
+        mock_probe_service.return_value.probe.return_value = ProbeResult(
+            "C:\\Git\\git.exe", ("--version",), 0, stdout="git version 2.47.1"
+        )
         
         config = self.detector._runtime_configs["git"]
         version = self.detector._get_executable_version("C:\\Git\\git.exe", config)
         
         self.assertEqual(version, "2.47.1")
+        mock_probe_service.return_value.probe.assert_called_once_with(
+            "C:\\Git\\git.exe", config["version_command"][1:], timeout=10
+        )
     
     # Test individual runtime detection methods
     
@@ -0,0 +1,168 @@
+"""Testes unitários para o motor de extração de arquivos compactados."""
+
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import unittest
+import zipfile
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.extractor import ExtractionEngine, extract_archive, py7zr
+
+
+class TestExtractionEngine(unittest.TestCase):
+    """Testes para a classe ExtractionEngine."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.destination = self.temp_dir / "out"
+        self.engine = ExtractionEngine(max_workers=4, buffer_size=4096)
+
+    def tearDown(self):
+        """Limpeza após cada teste."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _create_zip(self, members, name="archive.zip") -> Path:
+        path = self.temp_dir / name
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for member_name, data in members.items():
+                archive.writestr(member_name, data)
+        return path
+
+    def _create_tar(self, members, name="archive.tar.gz", links=()) -> Path:
+        path = self.temp_dir / name
+        with tarfile.open(path, 'w:gz') as archive:
+            for member_name, data in members.items():
+                info = tarfile.TarInfo(member_name)
+                info.size = len(data)
+                info.mtime = time.time() - 3600
+                info.mode = 0o755
+                archive.addfile(info, io.BytesIO(data))
+            for link_name, link_target in links:
+                info = tarfile.TarInfo(link_name)
+                info.type = tarfile.SYMTYPE
+                info.linkname = link_target
+                archive.addfile(info)
+        return path
+
+    def test_zip_extracts_all_members(self):
+        """Testa a extração paralela de todos os membros de um zip."""
+        members = {f"dir/file_{i}.bin": os.urandom(10_000 + i) for i in range(20)}
+        archive = self._create_zip(members)
+
+        result = self.engine.extract(archive, self.destination)
+
+        self.assertTrue(result.success, result.error_message)
+        self.assertEqual(result.extracted_files, 20)
+        for name, data in members.items():
+            self.assertEqual((self.destination / name).read_bytes(), data)
+        self.assertEqual(list(self.destination.rglob("*.part")), [])
+
+    def test_reextraction_is_incremental(self):
+        """Testa que membros inalterados (tamanho e CRC) são pulados."""
+        archive = self._create_zip({"a.txt": b"alpha", "b.txt": b"beta"})
+        self.engine.extract(archive, self.destination)
+        (self.destination / "b.txt").write_bytes(b"BETA")
+
+        result = self.engine.extract(archive, self.destination)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.skipped_files, 1)
+        self.assertEqual(result.extracted_files, 1)
+        self.assertEqual((self.destination / "b.txt").read_bytes(), b"beta")
+
+    def test_unsafe_members_are_rejected(self):
+        """Testa a rejeição de nomes com '..' e caminhos absolutos."""
+        archive = self._create_zip({
+            "../escape.txt": b"x",
+            "/abs.txt": b"x",
+            "C:/drive.txt": b"x",
+            "ok/..\\..\\win.txt": b"x",
+            "ok/file.txt": b"ok",
+        })
+
+        result = self.engine.extract(archive, self.destination)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.extracted_files, 1)
+        self.assertEqual(len(result.rejected_members), 4)
+        self.assertFalse((self.temp_dir / "escape.txt").exists())
+        self.assertEqual(sorted(p.name for p in self.destination.rglob("*") if p.is_file()), ["file.txt"])
+
+    def test_subdir_filter_with_wildcard(self):
+        """Testa o filtro de subdiretório com curinga, mantendo o caminho."""
+        archive = self._create_zip({
+            "jdk-17.0.2/bin/java": b"java",
+            "jdk-17.0.2/lib/rt.jar": b"jar",
+            "docs/readme.txt": b"docs",
+        })
+
+        self.assertTrue(extract_archive(str(archive), str(self.destination), extract_subdir="jdk-*"))
+
+        self.assertTrue((self.destination / "jdk-17.0.2" / "bin" / "java").exists())
+        self.assertTrue((self.destination / "jdk-17.0.2" / "lib" / "rt.jar").exists())
+        self.assertFalse((self.destination / "docs").exists())
+
+    def test_corrupt_member_keeps_existing_file(self):
+        """Testa que um CRC divergente falha sem sobrescrever o destino."""
+        data = b"payload " * 1000
+        archive = self._create_zip({"data.bin": data}, name="stored.zip")
+        # Recria sem compressão para poder corromper os bytes do membro
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+            zf.writestr("data.bin", data)
+        raw = bytearray(archive.read_bytes())
+        offset = raw.index(b"payload")
+        raw[offset] ^= 0xFF
+        archive.write_bytes(bytes(raw))
+
+        self.destination.mkdir()
+        (self.destination / "data.bin").write_bytes(b"previous")
+
+        result = self.engine.extract(archive, self.destination)
+
+        self.assertFalse(result.success)
+        self.assertEqual((self.destination / "data.bin").read_bytes(), b"previous")
+        self.assertFalse((self.destination / "data.bin.part").exists())
+
+    def test_tar_extraction_and_skip_by_mtime(self):
+        """Testa extração de tar.gz e reextração incremental por tamanho e mtime."""
+        archive = self._create_tar({"pkg/tool": b"#!/bin/sh\n", "pkg/data.txt": b"data"},
+                                   links=[("pkg/tool-link", "tool"), ("pkg/evil", "../../outside")])
+
+        result = self.engine.extract(archive, self.destination)
+
+        self.assertTrue(result.success, result.error_message)
+        self.assertEqual((self.destination / "pkg" / "data.txt").read_bytes(), b"data")
+        self.assertEqual(result.rejected_members, ["pkg/evil"])
+        if os.name != 'nt':
+            self.assertTrue(os.access(self.destination / "pkg" / "tool", os.X_OK))
+            self.assertEqual(os.readlink(self.destination / "pkg" / "tool-link"), "tool")
+
+        result = self.engine.extract(archive, self.destination)
+        self.assertEqual(result.skipped_files, 2)
+
+    def test_unsupported_formats(self):
+        """Testa arquivos de formato desconhecido e 7z sem py7zr."""
+        unknown = self.temp_dir / "file.bin"
+        unknown.write_bytes(b"not an archive")
+
+        result = self.engine.extract(unknown, self.destination)
+        self.assertFalse(result.success)
+        self.assertFalse(self.engine.supports(unknown))
+
+        if py7zr is None:
+            seven_zip = self.temp_dir / "file.7z"
+            seven_zip.write_bytes(b"7z")
+            self.assertFalse(self.engine.supports(seven_zip))
+            self.assertIn("py7zr", self.engine.extract(seven_zip, self.destination).error_message)
+
+
+if __name__ == '__main__':
+    unittest.main()
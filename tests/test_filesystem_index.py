@@ -0,0 +1,75 @@
+"""Testes unitários para o índice incremental do sistema de arquivos."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.filesystem_index import FilesystemIndex
+
+
+class TestFilesystemIndex(unittest.TestCase):
+    """Testes para a classe FilesystemIndex."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.root = self.temp_dir / "root"
+        for sub in ["Git/bin", "node_modules/pkg", "Python", "deep/a/b"]:
+            (self.root / sub).mkdir(parents=True)
+        (self.root / "Git/bin/git.exe").write_text("x")
+        (self.root / "node_modules/pkg/git.exe").write_text("x")
+        (self.root / "Python/Python.EXE").write_text("x")
+        self.cache_file = self.temp_dir / "index.json"
+
+    def tearDown(self):
+        """Limpeza após cada teste."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_finds_all_names_in_one_walk(self):
+        """Testa busca simultânea de vários nomes, sem distinção de maiúsculas."""
+        index = FilesystemIndex(cache_file=self.cache_file)
+        matches = index.find([self.root], ["git.exe", "python.exe"])[self.root]
+
+        self.assertEqual(matches["git.exe"], [self.root / "Git/bin/git.exe"])
+        self.assertEqual(matches["python.exe"], [self.root / "Python/Python.EXE"])
+
+    def test_pruned_directories_are_skipped(self):
+        """Testa que subárvores irrelevantes não são percorridas."""
+        index = FilesystemIndex(cache_file=self.cache_file)
+        matches = index.find([self.root], ["git.exe"])[self.root]
+
+        self.assertNotIn(self.root / "node_modules/pkg/git.exe", matches["git.exe"])
+
+    def test_missing_roots_are_ignored(self):
+        """Testa que raízes inexistentes não geram resultado."""
+        index = FilesystemIndex(cache_file=self.cache_file)
+        results = index.find([self.root, self.temp_dir / "missing"], ["git.exe"])
+
+        self.assertEqual(list(results.keys()), [self.root])
+
+    def test_persisted_index_rescans_only_changed_directories(self):
+        """Testa reaproveitamento do índice persistido entre instâncias."""
+        FilesystemIndex(cache_file=self.cache_file).find([self.root], ["git.exe"])
+        self.assertTrue(self.cache_file.exists())
+
+        new_exe = self.root / "deep/a/b/git.exe"
+        new_exe.write_text("y")
+        later = time.time() + 5
+        os.utime(new_exe.parent, (later, later))
+
+        index = FilesystemIndex(cache_file=self.cache_file)
+        matches = index.find([self.root], ["git.exe"])[self.root]
+
+        self.assertIn(new_exe, matches["git.exe"])
+        self.assertEqual(index.metrics["directories_listed"], 1)
+        self.assertGreater(index.metrics["directories_reused"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
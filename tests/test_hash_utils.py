@@ -0,0 +1,136 @@
+"""Testes unitários para o serviço unificado de hashing."""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.hash_utils import HashingService
+
+
+class TestHashingService(unittest.TestCase):
+    """Testes para a classe HashingService."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache_file = self.temp_dir / "hashes.json"
+        self.service = HashingService(cache_file=self.cache_file,
+                                      buffer_size=4096, parallel_threshold=1)
+
+    def tearDown(self):
+        """Limpeza após cada teste."""
+        self.service.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _create_file(self, name: str, data: bytes) -> Path:
+        path = self.temp_dir / name
+        path.write_bytes(data)
+        # Envelhece o mtime para que o arquivo possa entrar no cache
+        old = time.time() - 60
+        os.utime(path, (old, old))
+        return path
+
+    def test_multiple_algorithms_single_pass(self):
+        """Testa cálculo de vários algoritmos numa única chamada."""
+        data = os.urandom(100_000)
+        path = self._create_file("data.bin", data)
+
+        digests = self.service.hash_file(path, ("sha256", "md5", "sha512"))
+
+        self.assertEqual(digests["sha256"], hashlib.sha256(data).hexdigest())
+        self.assertEqual(digests["md5"], hashlib.md5(data).hexdigest())
+        self.assertEqual(digests["sha512"], hashlib.sha512(data).hexdigest())
+
+    def test_unsupported_algorithm(self):
+        """Testa rejeição de algoritmo não suportado."""
+        path = self._create_file("data.bin", b"abc")
+        with self.assertRaises(ValueError):
+            self.service.hash_file(path, "crc32")
+
+    def test_missing_file(self):
+        """Testa erro para arquivo inexistente."""
+        with self.assertRaises(FileNotFoundError):
+            self.service.hash_file(self.temp_dir / "missing.bin")
+
+    def test_persistent_cache_hit(self):
+        """Testa reaproveitamento do cache persistente entre instâncias."""
+        path = self._create_file("data.bin", b"conteudo")
+        expected = self.service.hash_file(path)["sha256"]
+        self.service.save_cache()
+        self.assertTrue(self.cache_file.exists())
+
+        other = HashingService(cache_file=self.cache_file)
+        self.assertEqual(other.hash_file(path)["sha256"], expected)
+        self.assertEqual(other.stats["hits"], 1)
+        self.assertEqual(other.stats["bytes_hashed"], 0)
+
+    def test_cache_saved_in_batches(self):
+        """Testa que o cache é gravado uma vez por lote, não a cada hash."""
+        service = HashingService(cache_file=self.cache_file, save_interval=0.2)
+        paths = [self._create_file(f"f{i}.bin", os.urandom(100)) for i in range(3)]
+
+        for path in paths:
+            service.hash_file(path)
+        self.assertFalse(self.cache_file.exists())
+
+        deadline = time.time() + 5
+        while not self.cache_file.exists() and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertTrue(self.cache_file.exists())
+        self.assertEqual(HashingService(cache_file=self.cache_file).hash_files(paths).keys(),
+                         {str(p) for p in paths})
+
+    def test_shutdown_saves_pending_changes(self):
+        """Testa que shutdown grava alterações ainda não salvas."""
+        service = HashingService(cache_file=self.cache_file, save_interval=60)
+        path = self._create_file("data.bin", b"conteudo")
+        service.hash_file(path)
+        self.assertFalse(self.cache_file.exists())
+
+        service.shutdown()
+
+        other = HashingService(cache_file=self.cache_file)
+        other.hash_file(path)
+        self.assertEqual(other.stats["hits"], 1)
+
+    def test_cache_invalidated_on_change(self):
+        """Testa que alteração de tamanho/mtime invalida o cache."""
+        path = self._create_file("data.bin", b"versao 1")
+        self.service.hash_file(path)
+
+        path.write_bytes(b"versao 2 maior")
+        digests = self.service.hash_file(path)
+
+        self.assertEqual(digests["sha256"], hashlib.sha256(b"versao 2 maior").hexdigest())
+
+    def test_recently_modified_file_not_cached(self):
+        """Testa que arquivos recém-modificados não entram no cache."""
+        path = self.temp_dir / "fresh.bin"
+        path.write_bytes(b"recente")
+        self.service.hash_file(path)
+        self.service.hash_file(path)
+        self.assertEqual(self.service.stats["hits"], 0)
+
+    def test_hash_files_batch(self):
+        """Testa hashing em lote omitindo arquivos ilegíveis."""
+        paths = [self._create_file(f"f{i}.bin", os.urandom(1000 + i)) for i in range(5)]
+        missing = self.temp_dir / "missing.bin"
+
+        results = self.service.hash_files(paths + [missing], ("sha1", "sha256"))
+
+        self.assertEqual(len(results), 5)
+        self.assertNotIn(str(missing), results)
+        for path in paths:
+            self.assertEqual(results[str(path)]["sha1"],
+                             hashlib.sha1(path.read_bytes()).hexdigest())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Testes do cliente HTTP compartilhado.
+
+Um http.server local (HTTP/1.1, keep-alive) substitui os servidores remotos.
+"""
+
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.http_client import HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve server.content com ETag, Range e atraso opcional"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status, body=b"", extra=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Accept-Ranges", "bytes")
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(200, self.server.content)
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        try:
+            time.sleep(self.server.delay)
+            if self.path == "/missing":
+                self._respond(404, b"not found")
+            elif self.headers.get("If-None-Match") == self.server.etag:
+                self._respond(304)
+            elif self.headers.get("Range"):
+                start, end = self.headers["Range"][len("bytes="):].split("-")
+                body = self.server.content[int(start):int(end) + 1]
+                self._respond(206, body, {"Content-Range": f"bytes {start}-{end}/{len(self.server.content)}"})
+            else:
+                self._respond(200, self.server.content)
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+
+class TestHttpClient(unittest.TestCase):
+    """Testa HttpClient contra um servidor local"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.content = b"0123456789" * 100
+        self.server.etag = '"v1"'
+        self.server.delay = 0.0
+        self.server.active = 0
+        self.server.max_active = 0
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.client = HttpClient()
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        """Requisições sequenciais ao mesmo host usam uma única conexão"""
+        for _ in range(5):
+            self.assertEqual(self.client.get(f"{self.base_url}/file").content, self.server.content)
+        self.client.head(f"{self.base_url}/file")
+
+        stats = self.client.stats()
+        self.assertEqual(stats["requests"], 6)
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["connections_reused"], 5)
+
+    def test_revalidation_uses_etag(self):
+        """Resposta 304 devolve o corpo guardado; mudança de ETag baixa de novo"""
+        url = f"{self.base_url}/catalog.json"
+        first = self.client.get(url, revalidate=True)
+        second = self.client.get(url, revalidate=True)
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(self.client.stats()["not_modified"], 1)
+
+        self.server.etag = '"v2"'
+        self.server.content = b"new"
+        self.assertEqual(self.client.get(url, revalidate=True).content, b"new")
+
+    def test_range_request(self):
+        """get_range devolve 206 com o intervalo pedido"""
+        with self.client.get_range(f"{self.base_url}/file", 10, 19) as response:
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(response.content, self.server.content[10:20])
+        self.assertTrue(self.client.supports_ranges(f"{self.base_url}/file"))
+        self.assertEqual(self.client.stats()["range_requests"], 1)
+
+    def test_host_concurrency_limit(self):
+        """No máximo host_limit requisições simultâneas por host"""
+        self.client.set_host_limit("127.0.0.1", 2)
+        self.server.delay = 0.05
+        threads = [threading.Thread(target=self.client.get, args=(f"{self.base_url}/file",)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.server.max_active, 2)
+
+    def test_stream_holds_host_slot_until_closed(self):
+        """Respostas em stream liberam a vaga do host ao serem fechadas"""
+        self.client.set_host_limit("127.0.0.1", 1)
+        response = self.client.get(f"{self.base_url}/file", stream=True)
+        semaphore = self.client._host_semaphore(self.base_url)
+
+        self.assertFalse(semaphore.acquire(blocking=False))
+        response.close()
+        response.close()
+        self.assertTrue(semaphore.acquire(blocking=False))
+        semaphore.release()
+
+    def test_urllib_handler(self):
+        """OpenerDirector com o handler usa o pool e mantém os erros do urllib"""
+        opener = urllib.request.build_opener(self.client.urllib_handler())
+
+        for _ in range(3):
+            with opener.open(f"{self.base_url}/file") as response:
+                self.assertEqual(response.getcode(), 200)
+                self.assertEqual(response.headers.get("Content-Length"), str(len(self.server.content)))
+                self.assertEqual(response.read(), self.server.content)
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            opener.open(f"{self.base_url}/missing")
+        self.assertEqual(context.exception.code, 404)
+        context.exception.close()
+        with self.assertRaises(urllib.error.URLError):
+            opener.open("http://127.0.0.1:1/file", timeout=1)
+
+        self.assertEqual(self.client.stats()["hosts"][f"http://127.0.0.1:{self.server.server_address[1]}"]["connections"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,232 @@
+"""Testes unitários para o agendador de instalação orientado a dependências."""
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.install_scheduler import DependencyScheduler, SchedulerStage
+from core.installation_manager import (
+    InstallationManager, InstallationResult, InstallationStatus, StagedInstallation
+)
+
+
+class _Recorder:
+    """Registra início/fim de cada estágio e a concorrência máxima por estágio."""
+
+    def __init__(self, durations=None):
+        self.durations = durations or {}
+        self.events = {}
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def stage(self, name, fail=()):
+        def run(component, value):
+            with self.lock:
+                self.active[name] = self.active.get(name, 0) + 1
+                self.peak[name] = max(self.peak.get(name, 0), self.active[name])
+                self.events[(component, name, "start")] = time.perf_counter()
+            time.sleep(self.durations.get((component, name), 0.01))
+            with self.lock:
+                self.active[name] -= 1
+                self.events[(component, name, "end")] = time.perf_counter()
+            return component not in fail, f"{component}:{name}"
+        return run
+
+
+class TestDependencyScheduler(unittest.TestCase):
+    """Testes para a classe DependencyScheduler."""
+
+    def _scheduler(self, recorder, fail=(), workers=2):
+        return DependencyScheduler([
+            SchedulerStage("download", recorder.stage("download"), workers, wait_for_dependencies=False),
+            SchedulerStage("install", recorder.stage("install", fail), workers),
+            SchedulerStage("verify", recorder.stage("verify"), workers),
+        ])
+
+    def test_downloads_are_prefetched_while_dependencies_install(self):
+        """Testa que o download do dependente termina antes da instalação da dependência."""
+        recorder = _Recorder({("base", "install"): 0.2})
+        graph = {"base": [], "app": ["base"]}
+
+        report = self._scheduler(recorder).run(graph)
+
+        self.assertEqual(report.completed, ["base", "app"])
+        self.assertLess(recorder.events[("app", "download", "end")],
+                        recorder.events[("base", "install", "end")])
+        self.assertGreaterEqual(recorder.events[("app", "install", "start")],
+                                recorder.events[("base", "verify", "end")])
+        self.assertGreater(report.schedules["app"].dependency_wait, 0.1)
+
+    def test_component_starts_without_waiting_for_whole_level(self):
+        """Testa que um componente não espera componentes do nível anterior que não são dependências."""
+        recorder = _Recorder({("slow", "install"): 0.3})
+        graph = {"slow": [], "fast": [], "child": ["fast"]}
+
+        report = self._scheduler(recorder, workers=3).run(graph)
+
+        self.assertEqual(sorted(report.completed), ["child", "fast", "slow"])
+        self.assertLess(recorder.events[("child", "install", "start")],
+                        recorder.events[("slow", "install", "end")])
+
+    def test_stage_concurrency_limits(self):
+        """Testa que cada estágio respeita o seu próprio limite."""
+        recorder = _Recorder()
+        scheduler = DependencyScheduler([
+            SchedulerStage("download", recorder.stage("download"), 3, wait_for_dependencies=False),
+            SchedulerStage("install", recorder.stage("install"), 1),
+        ])
+
+        report = scheduler.run({f"c{i}": [] for i in range(6)})
+
+        self.assertEqual(len(report.completed), 6)
+        self.assertEqual(recorder.peak["install"], 1)
+        self.assertLessEqual(recorder.peak["download"], 3)
+        self.assertTrue(any(s.queue_waits["install"] > 0 for s in report.schedules.values()))
+
+    def test_failure_skips_only_dependents(self):
+        """Testa que a falha pula dependentes, mas não ramos independentes."""
+        recorder = _Recorder()
+        graph = {"base": [], "app": ["base"], "plugin": ["app"], "other": []}
+
+        report = self._scheduler(recorder, fail={"base"}).run(graph)
+
+        self.assertEqual(report.failed, ["base"])
+        self.assertEqual(sorted(report.skipped), ["app", "plugin"])
+        self.assertEqual(report.completed, ["other"])
+        self.assertEqual(report.outputs["base"], "base:install")
+
+    def test_critical_path(self):
+        """Testa que o caminho crítico segue a cadeia que atrasou o lote."""
+        recorder = _Recorder({("b", "install"): 0.15, ("side", "install"): 0.05})
+        graph = {"a": [], "b": ["a"], "c": ["b"], "side": []}
+
+        report = self._scheduler(recorder).run(graph)
+
+        self.assertEqual(report.critical_path, ["a", "b", "c"])
+        self.assertAlmostEqual(report.critical_path_time, report.schedules["c"].finished_at)
+
+    def test_should_stop_skips_pending_components(self):
+        """Testa interrupção do agendamento em falha crítica."""
+        recorder = _Recorder()
+        graph = {f"c{i}": [] for i in range(5)}
+        scheduler = DependencyScheduler([
+            SchedulerStage("install", recorder.stage("install", fail={"c0"}), 1),
+        ])
+
+        report = scheduler.run(graph, order=list(graph), should_stop=lambda c, out: True)
+
+        self.assertTrue(report.stopped)
+        self.assertEqual(report.failed, ["c0"])
+        # Apenas o estágio que já estava em execução pode terminar
+        self.assertLessEqual(len(report.completed), 1)
+        self.assertEqual(sorted(report.completed + report.skipped), ["c1", "c2", "c3", "c4"])
+
+
+class TestInstallMultipleScheduling(unittest.TestCase):
+    """Testes para InstallationManager.install_multiple com o agendador."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = InstallationManager(base_path=self.temp_dir)
+        self.configs = {
+            "git": {"dependencies": []},
+            "python": {"dependencies": []},
+            "pip": {"dependencies": ["python"]},
+        }
+
+    def tearDown(self):
+        """Limpeza após cada teste."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _staged(self, component, _start_time):
+        return True, StagedInstallation(component=component, start_time=_start_time,
+                                        component_data=self.configs[component], file_path=component)
+
+    def _verified(self, staged):
+        return True, InstallationResult(
+            success=True, status=InstallationStatus.COMPLETED,
+            message=f"Componente {staged.component} instalado com sucesso", details={}
+        )
+
+    def test_batch_result_reports_critical_path_and_queue_waits(self):
+        """Testa que o resultado em lote traz caminho crítico e esperas em fila."""
+        with patch.object(self.manager, "_load_component_config", side_effect=self.configs.get), \
+             patch.object(self.manager, "_stage_download", side_effect=self._staged), \
+             patch.object(self.manager, "_stage_install", side_effect=lambda staged: (True, staged)), \
+             patch.object(self.manager, "_stage_verify", side_effect=self._verified):
+            result = self.manager.install_multiple(["pip", "git", "python"])
+
+        self.assertTrue(result.overall_success)
+        self.assertEqual(sorted(result.completed_components), ["git", "pip", "python"])
+        self.assertLess(result.completed_components.index("python"),
+                        result.completed_components.index("pip"))
+        self.assertEqual(set(result.queue_wait_times), {"git", "pip", "python"})
+        self.assertIn(result.critical_path, (["python", "pip"], ["git"], ["python"]))
+        self.assertGreater(result.critical_path_time, 0)
+
+    def test_failed_dependency_skips_dependents(self):
+        """Testa que dependentes de um componente que falhou são pulados."""
+        failure = InstallationResult(success=False, status=InstallationStatus.FAILED,
+                                     message="Falha na instalação", details={"errors": []})
+
+        def install(staged):
+            return (False, failure) if staged.component == "python" else (True, staged)
+
+        with patch.object(self.manager, "_load_component_config", side_effect=self.configs.get), \
+             patch.object(self.manager, "_stage_download", side_effect=self._staged), \
+             patch.object(self.manager, "_stage_install", side_effect=install), \
+             patch.object(self.manager, "_stage_verify", side_effect=self._verified):
+            result = self.manager.install_multiple(["git", "python", "pip"])
+
+        self.assertFalse(result.overall_success)
+        self.assertEqual(result.failed_components, ["python"])
+        self.assertEqual(result.skipped_components, ["pip"])
+        self.assertEqual(result.completed_components, ["git"])
+        self.assertIs(result.installation_results["python"], failure)
+
+    def test_parallelism_is_decided_per_dependency_level(self):
+        """Testa que só o nível sem instalação paralela é serializado."""
+        configs = {
+            "a": {"dependencies": []},
+            "b": {"dependencies": [], "supports_parallel_install": False},
+            "c": {"dependencies": ["a"]},
+            "d": {"dependencies": ["a"]},
+        }
+        self.configs = configs
+        levels = {"a": 0, "b": 0, "c": 1, "d": 1}
+        active = {0: 0, 1: 0}
+        peak = {0: 0, 1: 0}
+        lock = threading.Lock()
+
+        def install(staged):
+            level = levels[staged.component]
+            with lock:
+                active[level] += 1
+                peak[level] = max(peak[level], active[level])
+            time.sleep(0.2 if staged.component == "b" else 0.05)
+            with lock:
+                active[level] -= 1
+            return True, staged
+
+        with patch.object(self.manager, "_load_component_config", side_effect=configs.get), \
+             patch.object(self.manager, "_stage_download", side_effect=self._staged), \
+             patch.object(self.manager, "_stage_install", side_effect=install), \
+             patch.object(self.manager, "_stage_verify", side_effect=self._verified):
+            result = self.manager.install_multiple(["a", "b", "c", "d"], max_parallel=4)
+
+        self.assertTrue(result.overall_success)
+        self.assertEqual(peak[0], 1)
+        self.assertEqual(peak[1], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
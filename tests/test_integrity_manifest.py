@@ -0,0 +1,118 @@
+"""Testes unitários para o motor de manifestos de integridade."""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.integrity_manifest import IntegrityManifestEngine, CHECKPOINT_SUFFIX
+
+
+class _Interrupt(Exception):
+    pass
+
+
+class TestIntegrityManifestEngine(unittest.TestCase):
+    """Testes para a classe IntegrityManifestEngine."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.tree = self.temp_dir / "sdk"
+        for index in range(20):
+            path = self.tree / f"dir{index % 4}" / f"file{index}.bin"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(os.urandom(1024 + index))
+        self.manifest = self.temp_dir / "manifest.jsonl"
+        self.engine = IntegrityManifestEngine(max_workers=4, checkpoint_interval=1)
+
+    def tearDown(self):
+        """Limpeza após cada teste."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_manifest_is_json_lines(self):
+        """Testa que o manifesto tem cabeçalho e uma linha por arquivo."""
+        path, count = self.engine.create_manifest(str(self.tree), str(self.manifest))
+
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+        self.assertEqual(count, 20)
+        self.assertEqual(len(lines), 21)
+        self.assertEqual(json.loads(lines[0])["type"], "header")
+        self.assertEqual({"path", "hash", "size", "mtime_ns", "modified"}, set(json.loads(lines[1])))
+
+    def test_verify_detects_changes(self):
+        """Testa detecção de arquivos alterados, ausentes e novos."""
+        self.engine.create_manifest(str(self.tree), str(self.manifest))
+        modified = self.tree / "dir0" / "file0.bin"
+        modified.write_bytes(b"changed")
+        (self.tree / "dir1" / "file1.bin").unlink()
+        (self.tree / "extra.bin").write_bytes(b"new")
+
+        results = self.engine.verify_manifest(str(self.manifest))
+
+        self.assertEqual(results["total_files"], 20)
+        self.assertEqual(results["summary"]["valid"], 18)
+        self.assertEqual(results["summary"]["invalid"], 1)
+        self.assertEqual(results["summary"]["missing"], 1)
+        self.assertEqual(results["summary"]["new_files"], 1)
+
+    def test_quick_mode_only_rehashes_changed_stat(self):
+        """Testa que o modo rápido só recalcula arquivos com stat alterado."""
+        self.engine.create_manifest(str(self.tree), str(self.manifest))
+        touched = self.tree / "dir2" / "file2.bin"
+        later = time.time() + 10
+        os.utime(touched, (later, later))
+
+        results = self.engine.verify_manifest(str(self.manifest), quick=True)
+
+        self.assertEqual(results["rehashed_files"], 1)
+        self.assertEqual(results["summary"]["valid"], 20)
+        self.assertEqual(results["summary"]["modified"], 1)
+
+    def test_interrupted_verification_resumes(self):
+        """Testa retomada da verificação a partir do checkpoint."""
+        self.engine.create_manifest(str(self.tree), str(self.manifest))
+        seen = []
+
+        def interrupt_after_five(result):
+            seen.append(result)
+            if len(seen) == 5:
+                raise _Interrupt()
+
+        with self.assertRaises(_Interrupt):
+            self.engine.verify_manifest(str(self.manifest), on_result=interrupt_after_five)
+        checkpoint = Path(str(self.manifest) + CHECKPOINT_SUFFIX)
+        self.assertTrue(checkpoint.exists())
+
+        results = self.engine.verify_manifest(str(self.manifest))
+
+        self.assertEqual(results["resumed_files"], 4)
+        self.assertEqual(results["rehashed_files"], 20)
+        self.assertEqual(results["summary"]["valid"], 20)
+        self.assertEqual(len(results["results"]), 20)
+        self.assertFalse(checkpoint.exists())
+
+    def test_legacy_json_manifest_is_supported(self):
+        """Testa verificação de manifestos JSON no formato antigo."""
+        path, _ = self.engine.create_manifest(str(self.tree), str(self.manifest))
+        lines = [json.loads(line) for line in Path(path).read_text(encoding="utf-8").splitlines()]
+        legacy = {key: value for key, value in lines[0].items() if key not in ("type", "format_version")}
+        legacy["files"] = {entry["path"]: {"hash": entry["hash"], "size": entry["size"],
+                                           "modified": entry["modified"]} for entry in lines[1:]}
+        legacy_file = self.temp_dir / "legacy.json"
+        legacy_file.write_text(json.dumps(legacy), encoding="utf-8")
+
+        results = self.engine.verify_manifest(str(legacy_file), quick=True)
+
+        self.assertEqual(results["summary"]["valid"], 20)
+        self.assertEqual(results["rehashed_files"], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
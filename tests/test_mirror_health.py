@@ -0,0 +1,174 @@
+"""
+Testes do serviço de saúde de mirrors.
+
+Servidores http.server locais fazem o papel de mirrors rápidos, lentos e
+com falha.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.http_client import HttpClient
+from utils.mirror_health import MirrorHealthService, PRIOR_TTFB, mirror_key
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    """Serve server.content após server.delay segundos (ou server.status)"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle(self):
+        # O perdedor do hedge é fechado no meio da resposta
+        try:
+            super().handle()
+        except ConnectionError:
+            pass
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        body = self.server.content if self.server.status == 200 else b"error"
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:
+            pass
+
+
+class FakeClock:
+    """Relógio de parede controlado pelo teste"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMirrorHealthService(unittest.TestCase):
+    """Testa MirrorHealthService"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.state_file = self.temp_dir / "mirror_health.json"
+        self.clock = FakeClock()
+        self.client = HttpClient()
+        self.service = MirrorHealthService(self.state_file, http_client=self.client, half_life=100.0,
+                                           clock=self.clock)
+        self.servers = []
+
+    def tearDown(self):
+        self.client.close()
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _mirror(self, delay=0.0, status=200):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _MirrorHandler)
+        server.daemon_threads = True
+        server.delay = delay
+        server.status = status
+        server.content = b"x" * (256 * 1024)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/file.zip"
+
+    def test_rank_orders_by_expected_time(self):
+        """Mirrors medidos como mais rápidos vêm primeiro; desconhecidos mantêm a ordem"""
+        urls = ["https://a.example/f", "https://b.example/f", "https://c.example/f", "https://d.example/f"]
+        self.service.record_success(urls[1], ttfb=0.05, bytes_count=10 * 2**20, seconds=1.0)
+        self.service.record_failure(urls[0])
+
+        self.assertEqual(self.service.rank(urls), [urls[1], urls[2], urls[3], urls[0]])
+
+    def test_ewma_and_decay(self):
+        """Novas medições pesam alpha e as antigas decaem para o valor neutro"""
+        url = "https://mirror.example/f"
+        self.service.record_success(url, ttfb=0.2)
+        self.service.record_success(url, ttfb=0.4)
+        self.assertAlmostEqual(self.service.score(url).ttfb, 0.2 + 0.3 * 0.2)
+
+        self.clock.now += 100.0  # uma meia-vida
+        decayed = self.service.score(url).ttfb
+        self.assertAlmostEqual(decayed, PRIOR_TTFB + 0.5 * (0.26 - PRIOR_TTFB))
+
+    def test_scores_persist_across_instances(self):
+        """As medições são gravadas e carregadas por outra instância"""
+        url = "https://mirror.example/file.zip"
+        self.service.record_success(url, ttfb=0.1)
+        self.service.save()
+
+        other = MirrorHealthService(self.state_file, clock=self.clock)
+        self.assertAlmostEqual(other.score("https://mirror.example/other.zip").ttfb, 0.1)
+        self.assertEqual(mirror_key(url), "https://mirror.example")
+
+    def test_probe_runs_concurrently(self):
+        """Probes de vários mirrors lentos rodam em paralelo"""
+        urls = [self._mirror(delay=0.3) for _ in range(3)] + [self._mirror(status=404)]
+
+        start = time.monotonic()
+        results = self.service.probe(urls, timeout=5)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(list(results.values()), [True, True, True, False])
+        self.assertLess(elapsed, 0.8)
+        self.assertGreaterEqual(self.service.score(urls[0]).ttfb, 0.3)
+        self.assertFalse(self.service.score(urls[3]).available)
+        self.assertTrue(self.state_file.exists())
+
+    def test_probe_stale_skips_recent_measurements(self):
+        """Mirrors com medição recente não são medidos de novo"""
+        url = self._mirror()
+        self.service.record_success(url, ttfb=0.01)
+
+        self.assertEqual(self.service.probe_stale([url]), {})
+        self.clock.now += 3600
+        self.assertEqual(self.service.probe_stale([url]), {url: True})
+
+    def test_open_fastest_hedges_slow_mirror(self):
+        """Se o melhor mirror demora, o segundo é acionado e vence"""
+        slow = self._mirror(delay=1.0)
+        fast = self._mirror()
+
+        start = time.monotonic()
+        with self.service.open_fastest([slow, fast], hedge_delay=0.1) as response:
+            body = b"".join(response)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(response.url, fast)
+        self.assertEqual(body, self.servers[1].content)
+        self.assertLess(elapsed, 0.9)
+        self.assertGreater(self.service.score(fast).throughput, 0)
+
+    def test_open_fastest_falls_back_on_error(self):
+        """Uma falha do primeiro mirror aciona o segundo sem esperar"""
+        broken = self._mirror(status=500)
+        good = self._mirror()
+
+        with self.service.open_fastest([broken, good], hedge_delay=10) as response:
+            self.assertEqual(response.url, good)
+            self.assertEqual(response.status_code, 200)
+
+        self.assertLess(self.service.score(broken).reliability, 1.0)
+
+    def test_open_fastest_raises_when_all_fail(self):
+        """Sem mirror disponível o último erro é propagado"""
+        with self.assertRaises(Exception):
+            self.service.open_fastest([self._mirror(status=404), self._mirror(status=503)], hedge_delay=0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
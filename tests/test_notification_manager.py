@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the event-driven NotificationManager
+"""
+
+import shutil
+import tempfile
+import threading
+import types
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import sys
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+
+# The repository is the env_dev package; alias it when checked out under another name
+try:
+    import env_dev  # noqa: F401
+except ImportError:
+    env_dev = types.ModuleType("env_dev")
+    env_dev.__path__ = [str(ROOT)]
+    sys.modules["env_dev"] = env_dev
+
+from env_dev.core.notification_manager import (
+    NotificationManager, NotificationSeverity, OperationCategory, OperationStatus
+)
+from env_dev.core.progress_bus import ProgressBus
+
+
+class TestNotificationManager(unittest.TestCase):
+    """Test cases for NotificationManager"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = NotificationManager(log_dir=self.temp_dir,
+                                           enable_gui_notifications=False,
+                                           max_history_size=5)
+
+    def tearDown(self):
+        self.manager.stop_processing()
+        # setup_logging attaches file handlers in temp_dir to a shared logger
+        for handler in list(self.manager.logger.handlers):
+            if getattr(handler, 'baseFilename', '').startswith(self.temp_dir):
+                self.manager.logger.removeHandler(handler)
+                handler.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _assert_indexes_consistent(self):
+        """Secondary indexes hold exactly the notifications in the history"""
+        history = list(self.manager.notification_history)
+        self.assertEqual(set(self.manager.notifications), {n.id for n in history})
+        for severity, bucket in self.manager._notifications_by_severity.items():
+            self.assertEqual(list(bucket), [n for n in history if n.severity == severity])
+        for operation_id, bucket in self.manager._notifications_by_operation.items():
+            self.assertEqual(list(bucket), [n for n in history if n.operation_id == operation_id])
+        self.assertEqual(sum(len(b) for b in self.manager._notifications_by_severity.values()), len(history))
+
+    def test_eviction_at_cap_keeps_indexes_consistent(self):
+        """Oldest notifications are evicted from the history and every index"""
+        for i in range(8):
+            severity = NotificationSeverity.ERROR if i % 2 else NotificationSeverity.INFO
+            self.manager.notify(severity, OperationCategory.SYSTEM, f"n{i}", "message",
+                                operation_id="op-a" if i < 4 else "op-b")
+        self.assertTrue(self.manager.flush(timeout=5))
+
+        self.assertEqual([n.title for n in self.manager.notification_history],
+                         ["n3", "n4", "n5", "n6", "n7"])
+        self._assert_indexes_consistent()
+        self.assertEqual([n.title for n in self.manager.get_notifications(operation_id="op-a")], ["n3"])
+        self.assertEqual([n.title for n in self.manager.get_notifications(severity=NotificationSeverity.ERROR)],
+                         ["n3", "n5", "n7"])
+        self.assertEqual(self.manager.get_statistics()['total_notifications'], 8)
+
+    def test_flush_returns_after_queue_drains(self):
+        """flush waits for storage and for the sinks to run"""
+        release = threading.Event()
+        delivered = []
+
+        def slow_sink(notification):
+            release.wait(5)
+            delivered.append(notification.title)
+
+        self.manager.subscribe(slow_sink, name="slow")
+        self.manager.info("first", "message")
+
+        self.assertFalse(self.manager.flush(timeout=0.2))
+        release.set()
+        self.assertTrue(self.manager.flush(timeout=5))
+        self.assertEqual(self.manager.notification_queue.unfinished_tasks, 0)
+        self.assertEqual(delivered, ["first"])
+
+    def test_stop_delivers_queued_notifications(self):
+        """stop_processing ends the consumer with the sentinel after queued work"""
+        received = []
+        self.manager.subscribe(lambda n: received.append(n.title), name="collector")
+        for i in range(3):
+            self.manager.info(f"n{i}", "message")
+
+        self.manager.stop_processing()
+
+        self.assertFalse(self.manager.processing_thread.is_alive())
+        self.assertEqual(received, ["n0", "n1", "n2"])
+        self.assertEqual(self.manager.notification_queue.unfinished_tasks, 0)
+        self.assertTrue(self.manager.flush(timeout=1))
+
+    def test_clear_history_rebuilds_indexes(self):
+        """Partial clears rebuild the indexes from the remaining history"""
+        self.manager.notify(NotificationSeverity.INFO, OperationCategory.DOWNLOAD, "download", "m",
+                            operation_id="op-a")
+        self.manager.notify(NotificationSeverity.ERROR, OperationCategory.INSTALLATION, "install", "m",
+                            operation_id="op-b")
+        self.manager.flush(timeout=5)
+
+        self.manager.clear_history(categories=[OperationCategory.DOWNLOAD])
+        self.assertEqual([n.title for n in self.manager.notification_history], ["install"])
+        self.assertEqual(self.manager.get_notifications(operation_id="op-a"), [])
+        self._assert_indexes_consistent()
+        self.assertEqual(self.manager.get_statistics()['total_notifications'], 1)
+
+        self.manager.clear_history(older_than=datetime.now() + timedelta(seconds=1))
+        self.assertEqual(len(self.manager.notification_history), 0)
+        self.assertEqual(self.manager._notifications_by_severity, {})
+        self.assertEqual(self.manager._notifications_by_operation, {})
+
+    def test_sink_fan_out(self):
+        """Each sink receives the notifications matching its filters"""
+        everything, errors, operation = [], [], []
+        self.manager.subscribe(lambda n: everything.append(n.title), name="all")
+        self.manager.subscribe(lambda n: errors.append(n.title),
+                               severities=[NotificationSeverity.ERROR], name="errors")
+        self.manager.subscribe(lambda n: operation.append(n.title), operation_id="op-a", name="op-a")
+
+        def broken(notification):
+            raise RuntimeError("boom")
+
+        self.manager.subscribe(broken, name="broken")
+        self.manager.info("info", "message", operation_id="op-a")
+        self.manager.error("error", "message")
+        self.assertTrue(self.manager.flush(timeout=5))
+
+        self.assertEqual(everything, ["info", "error"])
+        self.assertEqual(errors, ["error"])
+        self.assertEqual(operation, ["info"])
+
+    def test_progress_bus_updates_started_operation(self):
+        """Bus events under an operation's id update that operation only"""
+        bus = ProgressBus(publish_interval=0.0)
+        token = self.manager.attach_progress_bus(bus)
+        operation_id = self.manager.start_operation(OperationCategory.DOWNLOAD, "Download git", "Downloading git")
+
+        bus.begin(operation_id, total_bytes=200)
+        bus.report(operation_id, 50)
+        bus.report("download:unknown", 10, 20)
+        self.assertEqual(self.manager.operations[operation_id].progress, 25.0)
+
+        # The final bus event does not complete the operation; its owner does
+        bus.finish(operation_id, bytes_done=200)
+        self.assertEqual(self.manager.operations[operation_id].status, OperationStatus.RUNNING)
+
+        bus.unsubscribe(token)
+        bus.begin(operation_id, total_bytes=10)
+        bus.report(operation_id, 1)
+        self.assertEqual(self.manager.operations[operation_id].progress, 25.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
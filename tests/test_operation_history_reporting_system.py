@@ -6,6 +6,10 @@ Tests for Operation History and Reporting System
 import unittest
 import tempfile
 import os
+import json
+import sqlite3
+import zipfile
+import threading
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -23,7 +27,7 @@ with patch.dict('sys.modules', {
     from core.operation_history_reporting_system import (
         OperationHistoryReportingSystem, OperationStatus, ReportFormat,
         TimelineGranularity, OperationRecord, OperationSummary, TimelineEvent,
-        ReportExportResult, HistoryTrackingResult
+        ReportExportResult, HistoryTrackingResult, ReportExportJob
     )
 
 
@@ -475,6 +479,177 @@ class TestOperationHistoryReportingSystem(unittest.TestCase):
         results = self.system.search_operations("   ")  # Whitespace only
         self.assertEqual(len(results), 0)
     
+    def test_keyset_pagination(self):
+        """Test paging with an (start_time, operation_id) cursor"""
+        now = datetime.now()
+        for i in range(7):
+            mock_progress = self._create_mock_progress(f"test_op_{i}", "git")
+            mock_progress.start_time = now - timedelta(minutes=i % 3)
+            self.system.track_operation(mock_progress)
+        
+        expected = [r.operation_id for r in self.system.get_operation_history(limit=10)]
+        self.assertEqual(len(expected), 7)
+        
+        pages = []
+        cursor = None
+        while True:
+            page = self.system.get_operation_history(limit=3, after=cursor)
+            if not page:
+                break
+            pages.extend(r.operation_id for r in page)
+            cursor = (page[-1].start_time, page[-1].operation_id)
+        
+        self.assertEqual(pages, expected)
+        
+        # Records not in memory are loaded from the database
+        other = OperationHistoryReportingSystem(database_path=self.temp_db.name)
+        try:
+            self.assertEqual(len(other.operation_records), 0)
+            history = other.get_operation_history(limit=3, filters={"component": "git"})
+            self.assertEqual([r.operation_id for r in history], expected[:3])
+            self.assertEqual(history[0].details, ["Processing git"])
+        finally:
+            other.shutdown()
+    
+    def test_summary_uses_hourly_rollups(self):
+        """Test summaries over whole hours and partial edge hours"""
+        now = datetime.now()
+        offsets = [timedelta(minutes=1), timedelta(minutes=70), timedelta(hours=5),
+                   timedelta(hours=23, minutes=59), timedelta(hours=30)]
+        for i, offset in enumerate(offsets):
+            mock_progress = self._create_mock_progress(f"test_op_{i}", f"component_{i % 2}")
+            mock_progress.start_time = now - offset
+            mock_progress.is_completed = i % 2 == 0
+            self.system.track_operation(mock_progress)
+        
+        summary = self.system.get_operation_summary("24h")
+        self.assertEqual(summary.total_operations, 4)
+        self.assertEqual(summary.completed_operations, 2)
+        self.assertEqual(summary.operations_by_component, {"component_0": 2, "component_1": 2})
+        self.assertEqual(self.system.get_operation_summary("1h").total_operations, 1)
+        
+        # Rollups follow updates and deletes
+        mock_progress = self._create_mock_progress("test_op_1", "component_1")
+        mock_progress.start_time = now - offsets[1]
+        mock_progress.is_completed = True
+        self.system.track_operation(mock_progress)
+        self.assertEqual(self.system.get_operation_summary("24h").completed_operations, 3)
+        
+        self.assertEqual(self.system.cleanup_old_records(1), 1)
+        self.assertEqual(self.system._count_database_records(), 4)
+        
+        timeline = self.system.implement_operation_timeline_visualization(
+            time_range=(now - timedelta(days=1), now + timedelta(hours=1)))
+        self.assertEqual(timeline["statistics"]["total_operations"], 4)
+        self.assertEqual(timeline["timeline"]["total_events"], 4 + 3)
+    
+    def test_writes_are_batched(self):
+        """Test that tracked records are written in batches"""
+        for i in range(3):
+            self.system.track_operation(self._create_mock_progress(f"test_op_{i}", "git"))
+        self.system.track_operation(self._create_mock_progress("test_op_0", "git"))
+        
+        self.assertEqual(len(self.system._pending_writes), 3)
+        
+        # Reads see pending writes
+        self.assertEqual(len(self.system.search_operations("processing git")), 3)
+        self.assertEqual(len(self.system._pending_writes), 0)
+        self.assertEqual(self.system._count_database_records(), 3)
+    
+    def test_failed_write_keeps_records_queued(self):
+        """Test that records stay queued when the batched write fails"""
+        for i in range(2):
+            self.system.track_operation(self._create_mock_progress(f"test_op_{i}", "git"))
+        
+        with patch.object(self.system, '_get_connection',
+                          side_effect=sqlite3.OperationalError("database is locked")):
+            self.system._flush_pending_writes()
+        
+        self.assertEqual(len(self.system._pending_writes), 2)
+        
+        self.system._flush_pending_writes()
+        self.assertEqual(len(self.system._pending_writes), 0)
+        self.assertEqual(self.system._count_database_records(), 2)
+    
+    def test_streamed_json_export_is_valid(self):
+        """Test that the streamed JSON document matches the records"""
+        for i in range(3):
+            self.system.track_operation(self._create_mock_progress(f"test_op_{i}", "git"))
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "export.json")
+            result = self.system.create_report_export_functionality_for_troubleshooting(
+                ReportFormat.JSON, output_path=output_path)
+            
+            self.assertTrue(result.success)
+            self.assertEqual(result.records_exported, 3)
+            with open(output_path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.assertEqual(data["export_info"]["total_records"], 3)
+            self.assertEqual([r["operation_id"] for r in data["records"]], ["test_op_0", "test_op_1", "test_op_2"])
+            self.assertEqual(data["records"][0]["details"], ["Processing git"])
+            self.assertEqual(data["records"][0]["operation_type"], "installation")
+            
+            # Empty selections are still valid documents
+            result = self.system.create_report_export_functionality_for_troubleshooting(
+                ReportFormat.JSON, filters={"component": "missing"}, output_path=output_path)
+            with open(output_path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)["records"], [])
+            self.assertEqual(os.listdir(temp_dir), ["export.json"])
+    
+    def test_background_export_reports_progress(self):
+        """Test a ZIP export on the background worker"""
+        for i in range(5):
+            self.system.track_operation(self._create_mock_progress(f"test_op_{i}", "git"))
+        
+        progress = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "export.zip")
+            job = self.system.start_report_export(
+                ReportFormat.ZIP, output_path=output_path,
+                progress_callback=lambda job: progress.append(job.records_written))
+            
+            self.assertIsInstance(job, ReportExportJob)
+            result = job.result(timeout=10)
+            
+            self.assertTrue(result.success)
+            self.assertEqual(result.records_exported, 5)
+            self.assertEqual(job.progress_percentage, 100.0)
+            self.assertEqual(progress[-1], 5)
+            with zipfile.ZipFile(output_path) as archive:
+                self.assertEqual(len(json.loads(archive.read("operation_history.json"))), 5)
+                self.assertEqual(len(archive.read("operation_history.csv").decode().splitlines()), 6)
+                self.assertIn("running: 5", archive.read("summary.txt").decode())
+                # Streamed entries of unknown size are written as ZIP64 so they can exceed 2 GiB
+                for name in ("operation_history.json", "operation_history.csv"):
+                    self.assertGreaterEqual(archive.getinfo(name).extract_version, zipfile.ZIP64_VERSION)
+    
+    def test_cancelled_export_leaves_no_file(self):
+        """Test cancelling a background export"""
+        for i in range(3):
+            self.system.track_operation(self._create_mock_progress(f"test_op_{i}", "git"))
+        
+        # Hold the export until it has been cancelled
+        release = threading.Event()
+        open_connection = self.system._open_export_connection
+        
+        def delayed_open():
+            release.wait(5)
+            return open_connection()
+        
+        with patch.object(self.system, "_open_export_connection", side_effect=delayed_open):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                output_path = os.path.join(temp_dir, "export.csv")
+                job = self.system.start_report_export(ReportFormat.CSV, output_path=output_path)
+                job.cancel()
+                release.set()
+                result = job.result(timeout=10)
+                
+                self.assertTrue(job.cancelled)
+                self.assertFalse(result.success)
+                self.assertIn("cancelled", result.error_message)
+                self.assertEqual(os.listdir(temp_dir), [])
+    
     def _create_mock_progress(self, operation_id: str, component_name: str):
         """Helper method to create mock operation progress"""
         mock_progress = Mock()
@@ -0,0 +1,206 @@
+"""Testes do barramento de progresso"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.progress_bus import (
+    ProgressBus, ProgressHistory, STATUS_COMPLETED, STATUS_FAILED
+)
+from core.download_manager import DownloadManager
+
+
+class FakeClock:
+    """Relógio controlado pelo teste"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressBus(unittest.TestCase):
+    """Testa ProgressBus"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bus = ProgressBus(publish_interval=0.25, speed_smoothing=1.0, clock=self.clock)
+        self.events = []
+        self.bus.subscribe(self.events.append)
+
+    def test_updates_are_coalesced_per_interval(self):
+        """Relatórios dentro do intervalo não geram eventos"""
+        self.bus.begin("op", total_bytes=1000)
+        for i in range(1, 100):
+            self.clock.now = i * 0.01
+            self.bus.report("op", i * 10)
+
+        # begin + ticks em 0.25, 0.50, 0.75
+        self.assertEqual(len(self.events), 4)
+        self.assertEqual(self.bus.stats["reported"], 99)
+        self.assertEqual(self.events[-1].bytes_done, 750)
+
+    def test_operations_are_rate_limited_independently(self):
+        """Cada operação tem seu próprio intervalo"""
+        self.bus.begin("a")
+        self.bus.begin("b")
+        self.clock.now = 0.3
+        self.assertIsNotNone(self.bus.report("a", 10))
+        self.assertIsNotNone(self.bus.report("b", 10))
+        self.assertIsNone(self.bus.report("a", 20))
+
+    def test_speed_and_eta(self):
+        """Velocidade suavizada e ETA calculados no tick"""
+        self.bus.begin("op", total_bytes=1000)
+        self.clock.now = 1.0
+        event = self.bus.report("op", 100)
+        self.assertAlmostEqual(event.speed, 100.0)
+        self.assertAlmostEqual(event.eta, 9.0)
+
+        # Taxa dobra: a média se move apenas parte do caminho
+        self.clock.now = 2.0
+        event = self.bus.report("op", 300)
+        self.assertGreater(event.speed, 100.0)
+        self.assertLess(event.speed, 200.0)
+        self.assertAlmostEqual(event.eta, 700 / event.speed)
+        self.assertAlmostEqual(event.percentage, 30.0)
+
+    def test_finish_always_publishes(self):
+        """O evento final ignora o intervalo e encerra a operação"""
+        self.bus.begin("op", total_bytes=100)
+        self.clock.now = 0.1
+        self.bus.report("op", 50)
+        self.clock.now = 0.2
+        event = self.bus.finish("op", bytes_done=100)
+
+        self.assertEqual(event.status, STATUS_COMPLETED)
+        self.assertTrue(event.finished)
+        self.assertEqual(event.eta, 0.0)
+        self.assertAlmostEqual(event.speed, 500.0)
+        self.assertEqual(self.bus.active_operations(), [])
+        self.assertIsNone(self.bus.finish("op"))
+
+    def test_subscriber_filter_and_errors(self):
+        """Filtro por operação e isolamento de assinantes com erro"""
+        only_b = []
+
+        def broken(event):
+            raise RuntimeError("boom")
+
+        self.bus.subscribe(broken)
+        token = self.bus.subscribe(only_b.append, operation_id="b")
+        self.bus.begin("a")
+        self.bus.begin("b")
+        self.bus.unsubscribe(token)
+        self.bus.finish("b", STATUS_FAILED, "erro")
+
+        self.assertEqual([e.operation_id for e in only_b], ["b"])
+        self.assertEqual(len(self.events), 3)
+        self.assertEqual(self.events[-1].status, STATUS_FAILED)
+
+
+class TestProgressHistory(unittest.TestCase):
+    """Testa ProgressHistory"""
+
+    def test_keeps_latest_events_per_operation(self):
+        """Histórico limitado por operação"""
+        clock = FakeClock()
+        bus = ProgressBus(publish_interval=0.0, clock=clock)
+        history = ProgressHistory(max_events=3)
+        bus.subscribe(history)
+
+        bus.begin("op", total_bytes=10)
+        for i in range(1, 6):
+            clock.now = i
+            bus.report("op", i)
+
+        self.assertEqual([e.bytes_done for e in history.events("op")], [3, 4, 5])
+        self.assertEqual(history.latest("op").bytes_done, 5)
+        self.assertIsNone(history.latest("other"))
+        history.clear()
+        self.assertEqual(history.events("op"), [])
+
+
+class FakeResponse:
+    """Resposta HTTP em chunks; espera a barreira antes do segundo chunk"""
+
+    def __init__(self, chunks, barrier=None):
+        self.chunks = chunks
+        self.barrier = barrier
+        self.headers = {'content-length': str(sum(len(c) for c in chunks))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for index, chunk in enumerate(self.chunks):
+            if index == 1 and self.barrier:
+                self.barrier.wait(5)
+            yield chunk
+
+
+class FakeHttpClient:
+    def __init__(self, barrier=None):
+        self.barrier = barrier
+
+    def get(self, url, **kwargs):
+        return FakeResponse([b"a" * 100, b"b" * 100], self.barrier)
+
+
+class TestDownloadOperationIds(unittest.TestCase):
+    """Testa os operation_id publicados pelo DownloadManager"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.bus = ProgressBus(publish_interval=0.0)
+        self.events = []
+        self.bus.subscribe(self.events.append)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_concurrent_downloads_of_same_url_do_not_share_ids(self):
+        """Downloads simultâneos da mesma URL têm ids e bytes separados"""
+        manager = DownloadManager(progress_bus=self.bus, http_client=FakeHttpClient(threading.Barrier(2)))
+        url = "https://example.com/tool.zip"
+        threads = [
+            threading.Thread(target=manager._download_from_url,
+                             args=(url, os.path.join(self.temp_dir, f"tool{i}.zip"), "tool"))
+            for i in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        finished = [e for e in self.events if e.finished]
+        self.assertEqual(len({e.operation_id for e in finished}), 2)
+        self.assertTrue(all(e.status == STATUS_COMPLETED and e.bytes_done == 200 for e in finished))
+
+    def test_caller_operation_id_is_used(self):
+        """O id recebido (ex.: operação do NotificationManager) é o publicado"""
+        manager = DownloadManager(progress_bus=self.bus, http_client=FakeHttpClient())
+
+        success, _ = manager._download_from_url("https://example.com/tool.zip",
+                                                 os.path.join(self.temp_dir, "tool.zip"), "tool",
+                                                 operation_id="op-1")
+
+        self.assertTrue(success)
+        self.assertEqual({e.operation_id for e in self.events}, {"op-1"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Unit tests for segmented, resumable Range downloads.
+
+A local http.server stands in for the remote mirror.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.robust_download_manager import RobustDownloadManager, DownloadError, DownloadStatus
+from core.segmented_download import SegmentedDownloader, SegmentedDownloadConfig, STATE_SUFFIX
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serves server.content with optional Range support and truncation."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_headers(self, status, length, extra=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("ETag", '"v1"')
+        if self.server.support_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._send_headers(200, len(self.server.content))
+
+    def do_GET(self):
+        content = self.server.content
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if match and self.server.support_ranges:
+            start, end = int(match.group(1)), int(match.group(2))
+            body = content[start:end + 1]
+            self._send_headers(206, len(body), {"Content-Range": f"bytes {start}-{end}/{len(content)}"})
+            with self.server.lock:
+                self.server.range_requests.append((start, end))
+        else:
+            body = content
+            self._send_headers(200, len(body))
+
+        limit = self.server.max_bytes_per_response
+        sent = body[:limit] if limit is not None else body
+        try:
+            self.wfile.write(sent)
+        except OSError:
+            pass
+        if limit is not None and len(sent) < len(body):
+            self.close_connection = True
+
+
+class TestSegmentedDownload(unittest.TestCase):
+    """Test cases for SegmentedDownloader and its use in RobustDownloadManager."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+        self.server.daemon_threads = True
+        self.server.content = os.urandom(1024 * 1024 + 123)
+        self.server.support_ranges = True
+        self.server.max_bytes_per_response = None
+        self.server.range_requests = []
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/toolchain.zip"
+        self.expected_sha256 = hashlib.sha256(self.server.content).hexdigest()
+        self.config = SegmentedDownloadConfig(
+            min_segmented_size=64 * 1024,
+            min_segment_size=16 * 1024,
+            initial_segments=4,
+            max_segments=6,
+            chunk_size=8 * 1024,
+            request_timeout=5,
+            sample_interval=0.05,
+            state_save_interval=0.0
+        )
+        self.downloader = SegmentedDownloader(urllib.request.build_opener(), self.config)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_segmented_download_matches_content_and_hash(self):
+        """Segments are fetched in parallel and the digest is computed on the fly."""
+        destination = self.temp_dir / "toolchain.zip.tmp"
+        info = self.downloader.probe(self.url)
+
+        size, digest = self.downloader.download(self.url, destination, info)
+
+        self.assertEqual(size, len(self.server.content))
+        self.assertEqual(digest, self.expected_sha256)
+        self.assertEqual(destination.read_bytes(), self.server.content)
+        self.assertGreaterEqual(len(self.server.range_requests), 4)
+        self.assertFalse(Path(str(destination) + STATE_SUFFIX).exists())
+
+    def test_interrupted_download_resumes_from_state(self):
+        """A failed attempt leaves a state file; the next attempt only fetches the rest."""
+        destination = self.temp_dir / "toolchain.zip.tmp"
+        info = self.downloader.probe(self.url)
+        self.server.max_bytes_per_response = 100 * 1024
+
+        with self.assertRaises(Exception):
+            self.downloader.download(self.url, destination, info)
+        state_file = Path(str(destination) + STATE_SUFFIX)
+        self.assertTrue(state_file.exists())
+        completed = [(start, start + downloaded)
+                     for start, _, downloaded in json.loads(state_file.read_text())["segments"]]
+        self.assertGreater(sum(end - start for start, end in completed), 0)
+
+        self.server.max_bytes_per_response = None
+        self.server.range_requests = []
+        size, digest = self.downloader.download(self.url, destination, info)
+
+        # Nothing already on disk is requested again
+        for requested_start, _ in self.server.range_requests:
+            self.assertFalse(any(start <= requested_start < end for start, end in completed))
+        self.assertEqual(digest, self.expected_sha256)
+        self.assertEqual(destination.read_bytes(), self.server.content)
+
+    def test_probe_without_range_support(self):
+        """Servers that do not advertise byte ranges are not segmented."""
+        self.server.support_ranges = False
+
+        self.assertIsNone(self.downloader.probe(self.url))
+
+    def test_manager_uses_streamed_hash(self):
+        """RobustDownloadManager verifies the streamed digest without re-reading the file."""
+        manager = RobustDownloadManager(temp_dir=self.temp_dir, segmented_config=self.config)
+        destination = self.temp_dir / "toolchain.zip"
+
+        with patch.object(manager, "_is_secure_url", return_value=True), \
+             patch.object(manager, "_calculate_sha256", side_effect=AssertionError("file re-read")):
+            result = manager.download_with_mandatory_hash_verification(
+                self.url, self.expected_sha256, destination
+            )
+
+        self.assertEqual(result.status, DownloadStatus.COMPLETED)
+        self.assertEqual(destination.read_bytes(), self.server.content)
+
+    def test_manager_keeps_partial_download_for_resume(self):
+        """A network failure keeps the partial file so a retry can resume it."""
+        manager = RobustDownloadManager(temp_dir=self.temp_dir, segmented_config=self.config)
+        destination = self.temp_dir / "toolchain.zip"
+        self.server.max_bytes_per_response = 100 * 1024
+
+        with patch.object(manager, "_is_secure_url", return_value=True):
+            with self.assertRaises(DownloadError):
+                manager.download_with_mandatory_hash_verification(self.url, self.expected_sha256, destination)
+            self.assertTrue(Path(str(destination) + ".tmp" + STATE_SUFFIX).exists())
+
+            self.server.max_bytes_per_response = None
+            result = manager.download_with_mandatory_hash_verification(
+                self.url, self.expected_sha256, destination
+            )
+
+        self.assertEqual(result.status, DownloadStatus.COMPLETED)
+        self.assertEqual(result.sha256_hash, self.expected_sha256)
+
+
+if __name__ == '__main__':
+    unittest.main()
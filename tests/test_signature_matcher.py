@@ -0,0 +1,99 @@
+"""Testes unitários para o matcher compilado de assinaturas de contaminação."""
+
+import fnmatch
+import unittest
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.signature_matcher import SignatureMatcher, signature_fingerprint
+
+
+@dataclass
+class _Signature:
+    name: str
+    type: str
+    patterns: List = field(default_factory=list)
+    exclusions: List = field(default_factory=list)
+
+
+class TestSignatureMatcher(unittest.TestCase):
+    """Testes para a classe SignatureMatcher."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.signatures = [
+            _Signature("miner", "process", ["*miner*", "xmrig*", "*coin*"], ["coinbase*"]),
+            _Signature("keylogger", "process", ["*keylog*", "hook?.exe"]),
+            _Signature("exact", "process", ["evil.exe", {"port": 4444}]),
+            _Signature("temp", "file", ["*.tmp"]),
+        ]
+        self.matcher = SignatureMatcher(self.signatures)
+
+    def _names(self, *texts, signature_type="process"):
+        return [s.name for s in self.matcher.match(signature_type, *texts)]
+
+    def test_glob_and_literal_patterns(self):
+        """Testa padrões glob, literais e ignorados (não-string)."""
+        self.assertEqual(self._names("xmrig.exe"), ["miner"])
+        self.assertEqual(self._names("hook1.exe"), ["keylogger"])
+        self.assertEqual(self._names("evil.exe"), ["exact"])
+        self.assertEqual(self._names("notepad.exe"), [])
+        self.assertEqual(self._names("EVIL.EXE"), ["exact"])
+
+    def test_all_matching_signatures_in_registration_order(self):
+        """Testa que um texto pode casar com várias assinaturas."""
+        self.assertEqual(self._names("keylog-miner.exe"), ["miner", "keylogger"])
+        self.assertEqual(self._names("notepad.exe", "c:\\tools\\miner\\app.exe"), ["miner"])
+
+    def test_types_are_isolated(self):
+        """Testa que apenas assinaturas do tipo pedido são verificadas."""
+        self.assertEqual(self._names("miner.tmp", signature_type="file"), ["temp"])
+        self.assertEqual(self._names("miner.tmp", signature_type="registry"), [])
+        self.assertIn("file", self.matcher)
+
+    def test_exclusions_apply_to_the_whole_item(self):
+        """Testa que uma exclusão em qualquer texto descarta a assinatura."""
+        self.assertEqual(self._names("coinbase.exe", "c:\\program files\\coinbase\\coinbase.exe"), [])
+        self.assertEqual(self._names("bitcoin.exe"), ["miner"])
+
+    def test_equivalent_to_fnmatch(self):
+        """Testa equivalência com fnmatch para os padrões glob."""
+        texts = ["miner", "a[b].exe", "xmrig", "xxmrig", "coin", "hook12.exe", "", "keylog"]
+        for text in texts:
+            expected = [
+                s.name for s in self.signatures[:2]
+                if any(fnmatch.fnmatchcase(text, p) for p in s.patterns)
+                and not any(fnmatch.fnmatchcase(text, e) for e in s.exclusions)
+            ]
+            with self.subTest(text=text):
+                self.assertEqual([n for n in self._names(text) if n != "exact"], expected)
+
+
+class TestSignatureFingerprint(unittest.TestCase):
+    """Testes para a chave de conteúdo usada na recompilação."""
+
+    def test_fingerprint_tracks_content(self):
+        """Testa que alterar padrões ou trocar uma assinatura muda a chave."""
+        signatures = [_Signature("miner", "process", ["*miner*"]), _Signature("temp", "file", ["*.tmp"])]
+        matcher = SignatureMatcher(signatures)
+        self.assertEqual(matcher.fingerprint, signature_fingerprint(signatures))
+
+        signatures[0].patterns.append("xmrig*")
+        self.assertNotEqual(matcher.fingerprint, signature_fingerprint(signatures))
+
+        matcher = SignatureMatcher(signatures)
+        signatures[1] = _Signature("temp", "file", ["*.temp"])
+        self.assertNotEqual(matcher.fingerprint, signature_fingerprint(signatures))
+
+        # Padrões não-string são ignorados pelo matcher e pela chave
+        matcher = SignatureMatcher(signatures)
+        signatures[1].patterns.append({"port": 4444})
+        self.assertEqual(matcher.fingerprint, signature_fingerprint(signatures))
+
+
+if __name__ == '__main__':
+    unittest.main()
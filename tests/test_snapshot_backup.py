@@ -0,0 +1,176 @@
+"""Unit tests for the snapshot backup store used by AtomicTransaction."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.snapshot_backup import (
+    METHOD_COPY, METHOD_HARDLINK, SnapshotBackupStore, merge_directory, replace_file_contents
+)
+from core.advanced_installation_manager import AtomicOperation, AtomicTransaction
+
+
+class TestSnapshotBackupStore(unittest.TestCase):
+    """Test SnapshotBackupStore class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.store = SnapshotBackupStore(os.path.join(self.test_dir, "store"))
+        self.tree = os.path.join(self.test_dir, "sdk")
+        for rel, content in {"bin/tool.exe": "tool", "lib/a.dll": "same", "lib/b.dll": "same",
+                             "config.ini": "debug=0"}.items():
+            path = os.path.join(self.tree, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(content)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _backup(self, name):
+        return os.path.join(self.test_dir, name)
+
+    def test_directory_snapshot_deduplicates_content(self):
+        """Test identical content is stored once, also across snapshots"""
+        self.store.snapshot(self.tree, self._backup("first"))
+        self.assertEqual(self.store.stats["deduplicated"], 1)
+
+        self.store.snapshot(self.tree, self._backup("second"))
+
+        self.assertEqual(self.store.stats["deduplicated"], 5)
+        self.assertEqual(len(self.store._load_index()['objects']), 3)
+
+    def test_restore_rewrites_only_changed_files(self):
+        """Test rollback restores changed, removes added and keeps unchanged files"""
+        manifest = self.store.snapshot(self.tree, self._backup("sdk"))
+        replace_file_contents(os.path.join(self.tree, "config.ini"), "debug=1")
+        os.remove(os.path.join(self.tree, "lib", "a.dll"))
+        os.makedirs(os.path.join(self.tree, "plugins"))
+        Path(self.tree, "plugins", "new.dll").write_text("new")
+
+        stats = self.store.restore(manifest, self.tree)
+
+        self.assertTrue(stats.success)
+        self.assertEqual((stats.restored, stats.unchanged), (2, 2))
+        self.assertFalse(os.path.exists(os.path.join(self.tree, "plugins")))
+        self.assertEqual(Path(self.tree, "config.ini").read_text(), "debug=0")
+        self.assertEqual(Path(self.tree, "lib", "a.dll").read_text(), "same")
+
+    def test_hardlink_backup_survives_copy_on_modify(self):
+        """Test hardlinked backups are kept intact when files are replaced"""
+        store = SnapshotBackupStore(os.path.join(self.test_dir, "links"), methods=(METHOD_HARDLINK, METHOD_COPY))
+        target = os.path.join(self.tree, "config.ini")
+
+        backup = store.snapshot(target, self._backup("config.bak"), copy_on_modify=True)
+        self.assertEqual(store.stats[METHOD_HARDLINK], 1)
+        self.assertTrue(os.path.samefile(backup, target))
+
+        replace_file_contents(target, "debug=1")
+
+        self.assertEqual(Path(backup).read_text(), "debug=0")
+        store.restore(backup, target)
+        self.assertEqual(Path(target).read_text(), "debug=0")
+        # Restored file is a private copy, not another link to the backup
+        self.assertFalse(os.path.samefile(backup, target))
+
+    def test_without_copy_on_modify_hardlinks_are_not_used(self):
+        """Test in-place writers get an independent copy"""
+        store = SnapshotBackupStore(os.path.join(self.test_dir, "links"), methods=(METHOD_HARDLINK, METHOD_COPY))
+        target = os.path.join(self.tree, "config.ini")
+
+        backup = store.snapshot(target, self._backup("config.bak"))
+        with open(target, 'w') as f:
+            f.write("in place")
+
+        self.assertEqual(store.stats[METHOD_HARDLINK], 0)
+        self.assertEqual(Path(backup).read_text(), "debug=0")
+
+    def test_modified_object_is_not_reused(self):
+        """Test an object edited in place through a hardlink is detected"""
+        store = SnapshotBackupStore(os.path.join(self.test_dir, "links"), methods=(METHOD_HARDLINK, METHOD_COPY))
+        target = os.path.join(self.tree, "config.ini")
+        manifest = store.snapshot(self.tree, self._backup("sdk"), copy_on_modify=True)
+        with open(target, 'w') as f:
+            f.write("debug=2")
+
+        stats = store.restore(manifest, self.tree)
+
+        self.assertEqual(stats.failed, 1)
+
+    def test_merge_directory_replaces_by_rename(self):
+        """Test staging merge replaces files and removes staging"""
+        staging = os.path.join(self.test_dir, "staging")
+        os.makedirs(os.path.join(staging, "lib"))
+        Path(staging, "lib", "a.dll").write_text("v2")
+        original = os.stat(os.path.join(self.tree, "lib", "a.dll")).st_ino
+
+        moved, created = merge_directory(staging, self.tree)
+
+        self.assertEqual((moved, created), (1, 0))
+        self.assertEqual(Path(self.tree, "lib", "a.dll").read_text(), "v2")
+        self.assertNotEqual(os.stat(os.path.join(self.tree, "lib", "a.dll")).st_ino, original)
+        self.assertFalse(os.path.exists(staging))
+
+
+class TestAtomicTransactionSnapshots(unittest.TestCase):
+    """Test AtomicTransaction backups through the snapshot store"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.transaction = AtomicTransaction("tx_snapshot", "sdk", self.test_dir)
+        self.target = os.path.join(self.test_dir, "sdk")
+        os.makedirs(os.path.join(self.target, "bin"))
+        Path(self.target, "bin", "tool.exe").write_text("v1")
+        Path(self.target, "readme.txt").write_text("docs")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_extract_archive_rollback_restores_previous_tree(self):
+        """Test extract over an existing directory is fully rolled back"""
+        def fake_extract(archive_path, destination):
+            os.makedirs(os.path.join(destination, "bin"))
+            Path(destination, "bin", "tool.exe").write_text("v2")
+            Path(destination, "bin", "extra.dll").write_text("new")
+            return True
+
+        self.transaction.begin()
+        operation = AtomicOperation(operation_id="op1", operation_type="extract_archive",
+                                    target_path=self.target, metadata={"archive_path": "sdk.zip"})
+        with patch("utils.extractor.extract_archive", side_effect=fake_extract):
+            self.assertTrue(self.transaction.execute_operation(operation))
+        self.transaction.operations.append(operation)
+        self.assertEqual(Path(self.target, "bin", "tool.exe").read_text(), "v2")
+
+        self.assertTrue(self.transaction.rollback())
+
+        self.assertEqual(Path(self.target, "bin", "tool.exe").read_text(), "v1")
+        self.assertEqual(Path(self.target, "readme.txt").read_text(), "docs")
+        self.assertFalse(os.path.exists(os.path.join(self.target, "bin", "extra.dll")))
+
+    def test_modify_file_rollback(self):
+        """Test modify_file restores the original content"""
+        target = os.path.join(self.target, "readme.txt")
+        self.transaction.begin()
+        operation = AtomicOperation(operation_id="op1", operation_type="modify_file",
+                                    target_path=target, new_value="changed")
+        self.assertTrue(self.transaction.execute_operation(operation))
+        self.transaction.operations.append(operation)
+
+        self.assertTrue(self.transaction.rollback())
+
+        self.assertEqual(Path(target).read_text(), "docs")
+
+
+if __name__ == '__main__':
+    unittest.main()
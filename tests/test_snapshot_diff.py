@@ -0,0 +1,119 @@
+"""Testes unitários para snapshots incrementais (registros, diff e índice de diretórios)."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.snapshot_diff import (
+    DirectoryTreeIndex, RecordStore, SnapshotRecords, diff_sections, diff_snapshots
+)
+
+
+class TestSnapshotRecords(unittest.TestCase):
+    """Testes para SnapshotRecords, RecordStore e diff_snapshots."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.store = RecordStore()
+        self.old = SnapshotRecords.build(1.0, {
+            "env": {"PATH": "a", "HOME": "b", "TMP": "c"},
+            "processes": {"python.exe": [["c:\\py\\python.exe", "h1"]]},
+        }, self.store)
+
+    def test_records_are_sorted_and_deduplicated(self):
+        """Testa ordenação por chave e armazenamento único de registros iguais."""
+        self.assertEqual(self.old.keys("env"), ["HOME", "PATH", "TMP"])
+        SnapshotRecords.build(2.0, {"env": {"PATH": "a"}}, self.store)
+        self.assertEqual(len(self.store), 4)
+
+    def test_diff_reports_added_removed_changed(self):
+        """Testa diff por seção."""
+        new = SnapshotRecords.build(2.0, {
+            "env": {"PATH": "a;d", "HOME": "b", "JAVA_HOME": "j"},
+            "processes": {"python.exe": [["c:\\py\\python.exe", "h1"]]},
+        }, self.store)
+
+        diff = diff_snapshots(self.old, new)
+
+        self.assertEqual(diff["env"].added, ["JAVA_HOME"])
+        self.assertEqual(diff["env"].removed, ["TMP"])
+        self.assertEqual(diff["env"].changed, ["PATH"])
+        self.assertTrue(diff["processes"].unchanged)
+
+    def test_diff_sections_handles_tails(self):
+        """Testa chaves restantes no fim de qualquer lado."""
+        diff = diff_sections((("a", "1"), ("b", "2")), (("c", "3"),))
+        self.assertEqual((diff.added, diff.removed, diff.changed), (["c"], ["a", "b"], []))
+
+    def test_retain_drops_unreferenced_records(self):
+        """Testa a poda do armazenamento."""
+        new = SnapshotRecords.build(2.0, {"env": {"PATH": "z"}}, self.store)
+
+        removed = self.store.retain([new])
+
+        self.assertEqual(removed, 4)
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.store.get(new.sections["env"][0][1]), "z")
+
+
+class TestDirectoryTreeIndex(unittest.TestCase):
+    """Testes para a classe DirectoryTreeIndex."""
+
+    def setUp(self):
+        """Configuração para cada teste."""
+        self.root = Path(tempfile.mkdtemp())
+        (self.root / "sub" / "deep").mkdir(parents=True)
+        (self.root / "a.txt").write_bytes(b"12345")
+        (self.root / "sub" / "b.txt").write_bytes(b"123")
+        (self.root / "sub" / "deep" / "c.txt").write_bytes(b"1")
+        self.index = DirectoryTreeIndex()
+
+    def tearDown(self):
+        """Limpeza após cada teste."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_totals_match_full_walk(self):
+        """Testa contagem e tamanho iguais aos de uma varredura completa."""
+        result = self.index.scan(str(self.root))
+
+        self.assertEqual(result["file_count"], 3)
+        self.assertEqual(result["total_size"], 9)
+        self.assertEqual(self.index.stats["listed"], 3)
+
+    def test_unchanged_directories_are_reused(self):
+        """Testa que apenas o diretório alterado é relistado."""
+        self.index.scan(str(self.root))
+        deep = self.root / "sub" / "deep"
+        (deep / "d.txt").write_bytes(b"1234")
+        # Garante mtime diferente em sistemas de arquivos com baixa resolução
+        future = time.time() + 5
+        os.utime(deep, (future, future))
+
+        result = self.index.scan(str(self.root))
+
+        self.assertEqual(result["file_count"], 4)
+        self.assertEqual(result["total_size"], 13)
+        self.assertEqual(self.index.stats["listed"], 4)
+        self.assertEqual(self.index.stats["reused"], 2)
+
+    def test_removed_subtree_is_forgotten(self):
+        """Testa que subárvores removidas saem do índice e dos totais."""
+        self.index.scan(str(self.root))
+        shutil.rmtree(self.root / "sub")
+        future = time.time() + 5
+        os.utime(self.root, (future, future))
+
+        result = self.index.scan(str(self.root))
+
+        self.assertEqual((result["file_count"], result["total_size"]), (1, 5))
+        self.assertEqual(len(self.index._entries), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Unit tests for the shared source index.
+
+Tests incremental parsing, gap/docstring extraction and sharing between
+the analysis engines.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+from environment_dev_deep_evaluation.analysis.architecture_engine import ArchitectureAnalysisEngine
+from environment_dev_deep_evaluation.analysis.gap_analysis_engine import GapAnalysisEngine
+from environment_dev_deep_evaluation.analysis.source_index import (
+    SourceIndex,
+    analyze_source,
+    get_source_index
+)
+from environment_dev_deep_evaluation.core.config import ConfigurationManager
+
+
+ENGINE_SOURCE = '''"""Engine module."""
+from typing import List
+from .base import BaseInterface as Base
+
+
+class EngineInterface(Base):
+    """Engine contract."""
+
+    def run(self):
+        raise NotImplementedError
+
+
+class Engine:
+    def run(self):
+        # TODO: implement this
+        pass
+'''
+
+
+class TestSourceIndex(unittest.TestCase):
+    """Test cases for SourceIndex."""
+
+    def setUp(self):
+        """Create a small workspace."""
+        self.workspace = Path(tempfile.mkdtemp())
+        self._write("core/engine.py", ENGINE_SOURCE)
+        self._write("core/base.py", '"""Base."""\n\n\nclass BaseInterface:\n    """Base contract."""\n')
+        self._write("analysis/__init__.py", "")
+        self._write(".venv/lib/site.py", "# TODO: third party\n")
+        self._write("core/__pycache__/engine.py", "")
+
+    def tearDown(self):
+        """Remove the workspace."""
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def _write(self, relative_path, content):
+        path = self.workspace / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def _record(self, index, relative_path):
+        return next(r for r in index.records() if r.relative_path == os.path.normpath(relative_path))
+
+    def test_extracts_structure_gaps_and_docstrings(self):
+        """One parse yields components, imports, gaps and missing docstrings."""
+        index = SourceIndex(self.workspace, use_processes=False)
+        record = self._record(index, "core/engine.py")
+
+        self.assertEqual(record.classes, ["EngineInterface", "Engine"])
+        self.assertEqual(record.interfaces, ["EngineInterface"])
+        self.assertEqual(record.functions, ["run", "run"])
+        self.assertEqual(record.imports, [("typing", "List"), (".base", "BaseInterface as Base")])
+        self.assertIn(("missing_implementation_patterns", 15, "TODO: implement this"), record.gap_matches)
+        self.assertIn(("missing_implementation_patterns", 10, "raise NotImplementedError"), record.gap_matches)
+        self.assertEqual(record.missing_docstrings,
+                         [("function", "run", 9), ("function", "run", 14), ("class", "Engine", 13)])
+
+    def test_skips_hidden_and_cache_directories(self):
+        """Hidden directories and __pycache__ are not indexed."""
+        index = SourceIndex(self.workspace, use_processes=False)
+        paths = {record.relative_path for record in index.refresh()}
+
+        self.assertEqual(paths, {os.path.normpath(p) for p in ["core/engine.py", "core/base.py", "analysis/__init__.py"]})
+        structure = index.directory_structure()
+        self.assertEqual(structure["core"]["files"], ["base.py", "engine.py"])
+        self.assertEqual(structure["core"]["subdirectories"], 1)
+
+    def test_refresh_only_reparses_changed_files(self):
+        """Unchanged files are reused, edited files re-parsed, deleted files dropped."""
+        index = SourceIndex(self.workspace, use_processes=False)
+        index.refresh()
+        self.assertEqual(index.stats["parsed"], 3)
+
+        index.refresh()
+        self.assertEqual(index.stats["parsed"], 3)
+        self.assertEqual(index.stats["reused"], 3)
+
+        self._write("core/base.py", '"""Base."""\n\n\nclass BaseInterface:\n    pass\n')
+        (self.workspace / "analysis" / "__init__.py").unlink()
+        records = index.refresh()
+
+        self.assertEqual(index.stats["parsed"], 4)
+        self.assertEqual(index.stats["removed"], 1)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(self._record(index, "core/base.py").missing_docstrings, [("class", "BaseInterface", 4)])
+
+    def test_process_pool_matches_serial_parse(self):
+        """Parsing in a process pool gives the same records as in-process."""
+        for i in range(20):
+            self._write(f"pkg/module_{i}.py", f"def f{i}():\n    pass  # TODO\n")
+
+        parallel = SourceIndex(self.workspace, max_workers=2).refresh()
+        serial = SourceIndex(self.workspace, use_processes=False).refresh()
+
+        self.assertEqual(parallel, serial)
+
+    def test_syntax_errors_fall_back_to_regex(self):
+        """Files that ast cannot parse are still indexed."""
+        record = analyze_source("legacy.py", "legacy.py", "class Legacy:\n    print 'hi'\n\ndef helper(:\n")
+
+        self.assertIsNotNone(record.syntax_error)
+        self.assertEqual(record.classes, ["Legacy"])
+        self.assertEqual(record.functions, ["helper"])
+
+    def test_engines_share_one_index(self):
+        """Architecture and gap engines read from the same index."""
+        config_manager = Mock(spec=ConfigurationManager)
+        config = Mock(log_level="INFO", debug_mode=True, workspace_root=str(self.workspace))
+        config_manager.get_config.return_value = config
+
+        architecture_engine = ArchitectureAnalysisEngine(config_manager)
+        gap_engine = GapAnalysisEngine(config_manager)
+        architecture_engine.initialize()
+        gap_engine.initialize()
+
+        self.assertIs(architecture_engine._get_source_index(), gap_engine._get_source_index())
+        self.assertIs(get_source_index(self.workspace), gap_engine._get_source_index())
+
+        architecture = architecture_engine._map_current_architecture()
+        gaps = gap_engine._scan_codebase_for_gaps()
+
+        self.assertIn(os.path.normpath("core/engine.py"), architecture["components"])
+        self.assertIn("core", architecture["directory_structure"])
+        self.assertTrue(any("core/engine.py:15" in gap.description.replace(os.sep, "/") for gap in gaps))
+        self.assertEqual(gap_engine._get_source_index().stats["parsed"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
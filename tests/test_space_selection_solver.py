@@ -0,0 +1,194 @@
+"""Unit tests for the dependency-closed space selection solver."""
+
+import random
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.space_selection_solver import (
+    SelectionItem, SpaceSelectionSolver, dependency_closure, solve_space_selection
+)
+from core.storage_manager import SelectionCriteria, SelectiveInstallationManager
+
+
+class TestSolveSpaceSelection(unittest.TestCase):
+    """Test solve_space_selection function"""
+
+    def test_prefers_best_combination_over_greedy_order(self):
+        """Test two mid-value components beat one high-value component that blocks them"""
+        items = [
+            SelectionItem("ide", 600, 100),
+            SelectionItem("sdk", 500, 70),
+            SelectionItem("cli", 500, 70),
+        ]
+
+        result = solve_space_selection(items, 1000)
+
+        self.assertEqual(set(result.selected), {"sdk", "cli"})
+        self.assertEqual(result.total_value, 140)
+        self.assertTrue(result.optimal)
+
+    def test_dependencies_are_selected_with_dependents(self):
+        """Test a component is only selected together with its prerequisites"""
+        items = [
+            SelectionItem("runtime", 300, 0),
+            SelectionItem("tool", 100, 90, ("runtime",)),
+            SelectionItem("editor", 350, 60),
+        ]
+
+        result = solve_space_selection(items, 400)
+
+        self.assertEqual(result.selected, ("runtime", "tool"))
+
+    def test_value_less_dependencies_are_not_selected_alone(self):
+        """Test prerequisites without value are dropped when nothing needs them"""
+        items = [
+            SelectionItem("runtime", 100, 0),
+            SelectionItem("tool", 900, 90, ("runtime",)),
+            SelectionItem("cli", 50, 10),
+        ]
+
+        result = solve_space_selection(items, 500)
+
+        self.assertEqual(result.selected, ("cli",))
+
+    def test_circular_dependencies_are_reported(self):
+        """Test items in a dependency cycle are never selected"""
+        items = [
+            SelectionItem("a", 10, 10, ("b",)),
+            SelectionItem("b", 10, 10, ("a",)),
+            SelectionItem("c", 10, 10),
+        ]
+
+        result = solve_space_selection(items, 100)
+
+        self.assertEqual(result.selected, ("c",))
+        self.assertEqual(set(result.cyclic), {"a", "b"})
+
+    def test_matches_exhaustive_search(self):
+        """Test DP and branch-and-bound against brute force on small catalogs"""
+        rng = random.Random(7)
+        for _ in range(100):
+            items = []
+            for i in range(rng.randint(1, 9)):
+                dependencies = tuple(f"c{j}" for j in range(i) if rng.random() < 0.25)
+                items.append(SelectionItem(f"c{i}", rng.randint(0, 50), rng.choice([0, rng.randint(1, 100)]),
+                                           dependencies))
+            capacity = rng.randint(0, 150)
+            expected = self._brute_force(items, capacity)
+
+            for max_group_subsets in (512, 1):
+                result = solve_space_selection(items, capacity, max_group_subsets=max_group_subsets)
+                self.assertAlmostEqual(result.total_value, expected)
+                self.assertLessEqual(result.total_size_mb, capacity)
+
+    def test_large_catalog_is_fast(self):
+        """Test a catalog of 1500 components with dependency chains"""
+        rng = random.Random(3)
+        items = [SelectionItem(f"c{i}", rng.randint(5, 5000), rng.randint(1, 185),
+                               (f"c{i - 1}",) if i % 5 else ())
+                 for i in range(1500)]
+
+        start = time.perf_counter()
+        result = solve_space_selection(items, 64 * 1024)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertLessEqual(result.total_size_mb, 64 * 1024)
+        selected = set(result.selected)
+        for name in result.selected:
+            index = int(name[1:])
+            if index % 5:
+                self.assertIn(f"c{index - 1}", selected)
+
+    def _brute_force(self, items, capacity):
+        index = {item.name: item for item in items}
+        best = 0
+        for mask in range(1 << len(items)):
+            chosen = {items[i].name for i in range(len(items)) if mask >> i & 1}
+            if any(d not in chosen for name in chosen for d in index[name].dependencies):
+                continue
+            if sum(index[name].size_mb for name in chosen) <= capacity:
+                best = max(best, sum(index[name].value for name in chosen))
+        return best
+
+
+class TestSpaceSelectionSolver(unittest.TestCase):
+    """Test SpaceSelectionSolver class"""
+
+    def test_results_are_cached_per_space_bucket(self):
+        """Test capacities in the same bucket reuse the cached result"""
+        solver = SpaceSelectionSolver(max_buckets=100)
+        items = [SelectionItem(f"c{i}", 10 * (i + 1), i + 1) for i in range(20)]
+
+        first = solver.solve(items, 950)
+        second = solver.solve(items, 955)
+        solver.solve(items, 960)
+
+        self.assertIs(first, second)
+        self.assertEqual(solver.stats, {"hits": 1, "misses": 2})
+
+    def test_dependency_closure_order(self):
+        """Test prerequisites come before the component"""
+        closure = dependency_closure("app", {"app": ("lib", "sdk"), "lib": ("sdk",), "sdk": ()})
+        self.assertEqual(closure, ["sdk", "lib", "app"])
+
+
+class TestSelectComponentsBySpace(unittest.TestCase):
+    """Test SelectiveInstallationManager.select_components_by_space"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.manager = SelectiveInstallationManager(storage_manager=None)
+
+    def test_selection_includes_dependencies(self):
+        """Test dependencies below the priority threshold are pulled in by dependents"""
+        components = [
+            {'name': 'dotnet_sdk', 'size_mb': 500, 'dependencies': ['vcpp_redist']},
+            {'name': 'vcpp_redist', 'size_mb': 50},
+            {'name': 'unity', 'size_mb': 400},
+        ]
+        self.manager.component_priorities['vcpp_redist'] = self.manager.component_priorities['unity']
+        criteria = SelectionCriteria(priority_threshold=self.manager.component_priorities['dotnet_sdk'])
+
+        selection = self.manager.select_components_by_space(components, 1000, criteria)
+
+        self.assertEqual(selection.selected_components, ['vcpp_redist', 'dotnet_sdk'])
+        self.assertEqual(selection.selection_reason['vcpp_redist'], "Dependency of dotnet_sdk")
+        self.assertEqual(selection.deselected_components, ['unity'])
+        self.assertEqual(selection.total_size_mb, 550)
+
+    def test_required_component_brings_dependencies(self):
+        """Test required components are selected with their closure first"""
+        components = [
+            {'name': 'git', 'size_mb': 300, 'dependencies': ['vcpp_redist']},
+            {'name': 'vcpp_redist', 'size_mb': 50},
+            {'name': 'nodejs', 'size_mb': 200},
+        ]
+        criteria = SelectionCriteria(required_components=['git'])
+
+        selection = self.manager.select_components_by_space(components, 400, criteria)
+
+        self.assertEqual(selection.selected_components[:2], ['vcpp_redist', 'git'])
+        self.assertEqual(selection.selection_reason['git'], "Required component")
+        self.assertIn('nodejs', selection.deselected_components)
+
+    def test_dependency_on_excluded_component_is_deselected(self):
+        """Test components that depend on excluded ones are not selected"""
+        components = [
+            {'name': 'python', 'size_mb': 100, 'dependencies': ['anaconda']},
+            {'name': 'anaconda', 'size_mb': 100},
+        ]
+        criteria = SelectionCriteria(excluded_components=['anaconda'])
+
+        selection = self.manager.select_components_by_space(components, 1000, criteria)
+
+        self.assertEqual(selection.selected_components, [])
+        self.assertEqual(selection.selection_reason['python'], "Depends on unavailable component (anaconda)")
+
+
+if __name__ == '__main__':
+    unittest.main()
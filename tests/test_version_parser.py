@@ -0,0 +1,113 @@
+"""Testes unitários para o parser de versões unificado."""
+
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.version_parser import (
+    VersionKey, parse_version, compile_constraint, compare_keys, version_matches
+)
+
+
+class TestParseVersion(unittest.TestCase):
+    """Testes para parse_version e VersionKey."""
+
+    def test_same_string_returns_same_object(self):
+        """Testa que o cache devolve o mesmo objeto para a mesma string."""
+        self.assertIs(parse_version("1.2.3-beta+7"), parse_version("1.2.3-beta+7"))
+
+    def test_formats(self):
+        """Testa os formatos estritos reconhecidos."""
+        full = parse_version("1.0.0-alpha.1+20130313")
+        self.assertEqual((full.release, full.prerelease, full.build), ((1, 0, 0), "alpha.1", "20130313"))
+        windows = parse_version("2.47.1.windows.1")
+        self.assertEqual((windows.release, windows.prerelease, windows.build), ((2, 47, 1), None, "1"))
+        self.assertEqual(parse_version("3.8").precision, 2)
+        self.assertIsNone(parse_version("v1.2.3"))
+
+    def test_lenient_mode(self):
+        """Testa o modo tolerante (prefixo v e prefixo numérico)."""
+        self.assertEqual(parse_version("v1.2.3", lenient=True).release, (1, 2, 3))
+        self.assertEqual(parse_version("1.2.3.4", lenient=True).release, (1, 2, 3))
+        self.assertIsNone(parse_version("not-a-version", lenient=True))
+
+    def test_ordering_and_hashing(self):
+        """Testa precedência (prerelease < final, build ignorado) e hash."""
+        self.assertLess(parse_version("1.0.0-alpha"), parse_version("1.0.0"))
+        self.assertLess(parse_version("1.0.0-alpha"), parse_version("1.0.0-beta"))
+        self.assertEqual(parse_version("1.0.0+1"), parse_version("1.0.0"))
+        self.assertEqual(compare_keys(parse_version("2.0"), parse_version("1.9.9")), 1)
+        self.assertEqual(len({parse_version("1.2"), parse_version("1.2.0")}), 1)
+
+    def test_four_part_versions(self):
+        """Testa que o quarto componente numérico é parte da versão, não prerelease."""
+        key = parse_version("10.0.19041.1")
+        self.assertEqual((key.release, key.revision, key.prerelease), ((10, 0, 19041), 1, None))
+        self.assertEqual(str(key), "10.0.19041.1")
+        self.assertGreater(parse_version("1.2.3.4"), parse_version("1.2.3"))
+        self.assertLess(parse_version("1.2.3.4"), parse_version("1.2.4"))
+        self.assertEqual(parse_version("1.2.3.0"), parse_version("1.2.3"))
+        self.assertIsNone(parse_version("1.2.3.4.5"))
+
+        self.assertTrue(version_matches(">=10.0", "10.0.19041.1"))
+        self.assertTrue(version_matches(">=1.0", "1.2.3.4"))
+        self.assertTrue(version_matches(">1.2.3", "1.2.3.4"))
+        self.assertTrue(version_matches("~=10.0.19041.0", "10.0.19041.1"))
+        self.assertFalse(version_matches("~=10.0.19041.0", "10.0.19042.0"))
+        self.assertTrue(version_matches("==1.2.*", "1.2.3.4"))
+
+        # CompatibilityMatrix mantém a semântica do packaging para versões de arquivo
+        from core.compatibility_matrix import VersionConstraint
+        self.assertTrue(VersionConstraint(">=10.0").matches("10.0.19041.1"))
+        self.assertFalse(VersionConstraint("<10.0.19041").matches("10.0.19041.1"))
+
+    def test_keys_are_immutable(self):
+        """Testa que VersionKey não pode ser alterada."""
+        key = VersionKey(1, 2, 3)
+        with self.assertRaises(AttributeError):
+            key.major = 2
+
+
+class TestCompileConstraint(unittest.TestCase):
+    """Testes para compile_constraint e version_matches."""
+
+    def test_compiled_constraint_is_cached(self):
+        """Testa que a mesma restrição é compilada uma vez."""
+        self.assertIs(compile_constraint(">=1.0,<2.0"), compile_constraint(">=1.0,<2.0"))
+
+    def test_operators(self):
+        """Testa os operadores suportados."""
+        cases = [
+            (">=1.0,<2.0", "1.5.0", True), (">=1.0,<2.0", "2.0.0", False),
+            ("~=1.5", "1.9.0", True), ("~=1.5", "2.0.0", False), ("~=1.5.2", "1.6.0", False),
+            ("^1.2.3", "1.9.9", True), ("^1.2.3", "2.0.0", False), ("^0.2.3", "0.3.0", False),
+            ("~1.2.3", "1.2.9", True), ("~1.2.3", "1.3.0", False),
+            ("==1.2.*", "1.2.7", True), ("1.2.*", "1.3.0", False), ("!=1.2.3", "1.2.3", False),
+            ("1.2", "1.2.0", True),
+        ]
+        for specifier, version, expected in cases:
+            with self.subTest(specifier=specifier, version=version):
+                self.assertEqual(compile_constraint(specifier).contains(version), expected)
+
+    def test_prereleases_follow_pep440_by_default(self):
+        """Testa que prereleases só atendem restrições que citam prereleases."""
+        self.assertFalse(compile_constraint(">=1.0").contains("2.0.0-beta"))
+        self.assertTrue(compile_constraint(">=2.0.0-alpha").contains("2.0.0-beta"))
+        self.assertTrue(compile_constraint(">=1.0").contains("2.0.0-beta", prereleases=True))
+
+    def test_invalid_constraint(self):
+        """Testa que restrições inválidas geram ValueError."""
+        with self.assertRaises(ValueError):
+            compile_constraint(">=abc")
+
+    def test_version_matches_falls_back_to_pep440(self):
+        """Testa o fallback para versões PEP 440 fora da gramática."""
+        self.assertTrue(version_matches(">=1.0rc1", "1.0"))
+        self.assertTrue(version_matches("<2.0", "v1.5"))
+        self.assertFalse(version_matches(">=1.0", "not a version"))
+
+
+if __name__ == '__main__':
+    unittest.main()
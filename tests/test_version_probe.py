@@ -0,0 +1,141 @@
+"""Unit tests for the memoized version probe service."""
+
+import struct
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.version_probe import VersionProbeService, extract_version, read_file_version
+
+
+class TestVersionProbeService(unittest.TestCase):
+    """Tests for VersionProbeService."""
+
+    def setUp(self):
+        self.service = VersionProbeService(default_timeout=10)
+
+    def tearDown(self):
+        self.service.shutdown()
+
+    def test_probe_captures_output(self):
+        """The version command output is captured and parseable."""
+        result = self.service.probe(sys.executable, ["--version"])
+
+        self.assertTrue(result.ok)
+        self.assertFalse(result.cached)
+        expected = f"{sys.version_info.major}.{sys.version_info.minor}"
+        self.assertTrue(extract_version(result.output).startswith(expected))
+
+    def test_repeated_probe_is_cached(self):
+        """A second identical probe reuses the first result."""
+        first = self.service.probe(sys.executable, ["--version"])
+        second = self.service.probe(sys.executable, ["--version"])
+
+        self.assertTrue(second.cached)
+        self.assertEqual(first.output, second.output)
+        self.assertEqual(self.service.get_latency_stats()[0]["count"], 1)
+
+    def test_concurrent_identical_probes_are_deduplicated(self):
+        """Identical probes submitted while one is running share its process."""
+        args = ["-c", "import time; time.sleep(0.3); print('1.2.3')"]
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(lambda _: self.service.probe(sys.executable, args), range(6)))
+
+        self.assertEqual({result.stdout.strip() for result in results}, {"1.2.3"})
+        self.assertEqual(self.service.get_latency_stats()[0]["count"], 1)
+
+    def test_probe_many_runs_concurrently(self):
+        """Distinct probes run in parallel rather than back to back."""
+        requests = [(sys.executable, ["-c", f"import time; time.sleep(0.5); print({i})"])
+                    for i in range(4)]
+
+        start = time.perf_counter()
+        results = self.service.probe_many(requests)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([result.stdout.strip() for result in results], ["0", "1", "2", "3"])
+        self.assertLess(elapsed, 1.5)
+
+    def test_timeout_is_reported_and_not_cached(self):
+        """A probe that exceeds its timeout is killed and retried next time."""
+        args = ["-c", "import time; time.sleep(5)"]
+        result = self.service.probe(sys.executable, args, timeout=0.3)
+
+        self.assertFalse(result.ok)
+        self.assertIn("timed out", result.error)
+        self.assertFalse(self.service.probe(sys.executable, args, timeout=0.3).cached)
+        self.assertEqual(self.service.get_latency_stats()[0]["timeouts"], 2)
+
+    def test_missing_executable(self):
+        """Unknown executables fail without spawning anything."""
+        result = self.service.probe("definitely-not-a-real-tool-xyz")
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.error, "executable not found")
+
+
+
+def build_pe(file_version):
+    """Build a minimal PE image whose .rsrc section holds a VS_FIXEDFILEINFO."""
+    major, minor, build, revision = file_version
+    resources = (b"\0" * 32 + b"\xbd\x04\xef\xfe" + struct.pack("<I", 0x10000)
+                 + struct.pack("<II", (major << 16) | minor, (build << 16) | revision))
+    dos_header = b"MZ" + b"\0" * 58 + struct.pack("<I", 64)
+    file_header = b"PE\0\0" + struct.pack("<HHIIIHH", 0x14C, 1, 0, 0, 0, 0, 0)
+    raw_offset = 64 + 24 + 40
+    section = struct.pack("<8sIIIIIIHHI", b".rsrc", len(resources), 0x1000, len(resources),
+                          raw_offset, 0, 0, 0, 0, 0)
+    return dos_header + file_header + section + resources
+
+
+class TestFileVersion(unittest.TestCase):
+    """Tests for reading PE version resources without executing anything."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_reads_version_resource(self):
+        exe = self.path / "chrome.exe"
+        exe.write_bytes(build_pe((120, 0, 6099, 71)))
+
+        self.assertEqual(read_file_version(str(exe)), "120.0.6099.71")
+
+    def test_non_pe_files(self):
+        text = self.path / "notes.exe"
+        text.write_bytes(b"not an executable")
+
+        self.assertIsNone(read_file_version(str(text)))
+        self.assertIsNone(read_file_version(str(self.path / "missing.exe")))
+
+    def test_executable_scan_only_runs_cli_tools(self):
+        """GUI executables are versioned from metadata and never launched."""
+        from core.detection_engine import ExecutableScanStrategy
+
+        gui = self.path / "chrome.exe"
+        gui.write_bytes(build_pe((120, 0, 1, 2)))
+        strategy = ExecutableScanStrategy()
+
+        with patch("core.detection_engine.get_version_probe_service") as probe_service:
+            self.assertEqual(strategy._get_executable_version(gui), "120.0.1.2")
+            probe_service.assert_not_called()
+
+            cli = self.path / "git.exe"
+            cli.write_bytes(b"")
+            probe_service.return_value.probe.return_value.ok = True
+            probe_service.return_value.probe.return_value.output = "git version 2.47.1.windows.1"
+            self.assertEqual(strategy._get_executable_version(cli), "2.47.1")
+            probe_service.return_value.probe.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
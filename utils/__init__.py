@@ -10,7 +10,8 @@ Contém funções auxiliares utilizadas por diversos componentes do projeto.
 
 # Expõe as funções principais para facilitar a importação
 from .downloader import download_file
-from .hash_utils import get_file_hash, verify_file_hash
+from .hash_utils import get_file_hash, get_file_hashes, verify_file_hash, HashingService, hashing_service
+from .extractor import extract_archive, ExtractionEngine, ExtractionResult, extraction_engine
 from .network import test_internet_connection
 from .display_utils import get_display_type
 from .env_manager import add_to_path, get_path, is_admin
@@ -50,7 +51,16 @@ __all__ = [
     # Funções de download e hash
     'download_file',
     'get_file_hash',
+    'get_file_hashes',
     'verify_file_hash',
+    'HashingService',
+    'hashing_service',
+    
+    # Extração de arquivos compactados
+    'extract_archive',
+    'ExtractionEngine',
+    'ExtractionResult',
+    'extraction_engine',
     
     # Funções de rede
     'test_internet_connection',
@@ -6,12 +6,14 @@ Implementa verificação robusta de integridade de arquivos
 
 import hashlib
 import logging
-import requests
 import os
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
 from urllib.parse import urlparse
 
+from .hash_utils import hashing_service
+from .http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 class ChecksumManager:
@@ -50,15 +52,8 @@ class ChecksumManager:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
             
-        hash_func = self.SUPPORTED_ALGORITHMS[algorithm.lower()]()
-        
         try:
-            with open(file_path, 'rb') as f:
-                # Lê o arquivo em chunks para economizar memória
-                for chunk in iter(lambda: f.read(8192), b""):
-                    hash_func.update(chunk)
-                    
-            calculated_hash = hash_func.hexdigest()
+            calculated_hash = hashing_service.hash_file(file_path, algorithm.lower())[algorithm.lower()]
             logger.debug(f"Hash {algorithm} calculado para {file_path}: {calculated_hash}")
             return calculated_hash
             
@@ -108,7 +103,8 @@ class ChecksumManager:
         """
         try:
             logger.info(f"Baixando checksums de: {checksum_url}")
-            response = requests.get(checksum_url, timeout=timeout)
+            # Revalida com ETag/Last-Modified: arquivos de checksum raramente mudam
+            response = get_http_client().get(checksum_url, timeout=timeout, revalidate=True)
             response.raise_for_status()
             
             checksums = {}
@@ -195,11 +191,12 @@ class ChecksumManager:
             return checksums
             
         try:
-            for file_path in directory_path.rglob('*'):
-                if file_path.is_file():
+            files = [p for p in directory_path.rglob('*') if p.is_file()]
+            digests = hashing_service.hash_files(files, algorithm.lower())
+            for file_path in files:
+                if str(file_path) in digests:
                     relative_path = file_path.relative_to(directory_path)
-                    hash_value = self.calculate_file_hash(str(file_path), algorithm)
-                    checksums[str(relative_path)] = hash_value
+                    checksums[str(relative_path)] = digests[str(file_path)][algorithm.lower()]
                     
             logger.info(f"Gerados checksums para {len(checksums)} arquivos")
             return checksums
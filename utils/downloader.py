@@ -19,6 +19,10 @@ from .error_handler import (
     handle_exception, network_error, file_error
 )
 
+# Importa o cliente HTTP compartilhado (pools de conexões por host)
+from .http_client import get_http_client
+from .mirror_health import HEDGE_CANDIDATES, get_mirror_health_service
+
 # Importa o gestor de mirrors
 from .mirror_manager import (
     find_best_mirror, generate_alternative_urls,
@@ -168,12 +172,10 @@ def download_to_temp(url: str,
 
     headers = _get_download_headers()
 
-    # Se usar mirrors está habilitado, obtém a melhor URL
-    if use_mirrors:
-        best_url, alt_urls = find_best_mirror(url)
-        if best_url != url:
-            logger.info(f"Usando mirror para download: {best_url} (original: {url})")
-            url = best_url
+    # Com mirrors, as URLs vêm ordenadas pela vazão esperada (medições
+    # persistidas) e os dois melhores disputam os primeiros bytes
+    candidates = generate_alternative_urls(url) if use_mirrors else [url]
+    health = get_mirror_health_service()
 
     for attempt in range(retry_count):
         try:
@@ -185,8 +187,10 @@ def download_to_temp(url: str,
 
             logger.info(f"Download de '{url}' para arquivo temporário (tentativa {attempt+1}/{retry_count})")
 
-            with closing(requests.get(url, stream=True, timeout=timeout, headers=headers)) as r:
-                r.raise_for_status()  # Verifica erros HTTP
+            with health.open_fastest(candidates, timeout=timeout, headers=headers,
+                                     chunk_size=DEFAULT_CHUNK_SIZE) as r:
+                if r.url != url:
+                    logger.info(f"Usando mirror para download: {r.url} (original: {url})")
 
                 total_size = int(r.headers.get('content-length', 0))
                 downloaded_size = 0
@@ -195,7 +199,7 @@ def download_to_temp(url: str,
                     _print_progress(0, total_size, prefix='Progresso:', suffix='Completo', length=50, callback=progress_callback)
 
                 with open(temp_file, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
+                    for chunk in r:
                         if chunk:  # Filtra chunks de keep-alive
                             f.write(chunk)
                             downloaded_size += len(chunk)
@@ -228,20 +232,14 @@ def download_to_temp(url: str,
 
             # Se for a última tentativa e usar mirrors estiver habilitado, tenta com URLs alternativas
             if attempt == retry_count - 1 and use_mirrors:
-                # Obtém URLs alternativas (se ainda não obteve)
-                _, alt_urls = find_best_mirror(url)
-
-                # Tenta usar uma URL alternativa (ignorando a primeira que é a URL original/melhor)
-                for alt_url in alt_urls[1:]:
-                    if alt_url == url:
-                        continue
-
+                # Tenta as URLs alternativas que não participaram da disputa
+                for alt_url in candidates[HEDGE_CANDIDATES:]:
                     logger.info(f"Tentando URL alternativa: {alt_url}")
                     try:
                         # Delay para evitar sobrecarga
                         time.sleep(random.uniform(0.5, 2.0))
 
-                        with closing(requests.get(alt_url, stream=True, timeout=timeout, headers=headers)) as r:
+                        with closing(get_http_client().get(alt_url, stream=True, timeout=timeout, headers=headers)) as r:
                             r.raise_for_status()
 
                             total_size = int(r.headers.get('content-length', 0))
@@ -366,7 +364,7 @@ def download_file(url: str,
 
     # Tenta obter o tamanho do arquivo antes de baixar
     try:
-        with closing(requests.head(url, timeout=timeout)) as r:
+        with closing(get_http_client().head(url, timeout=timeout)) as r:
             r.raise_for_status()
             content_length = int(r.headers.get('content-length', 0))
 
@@ -653,7 +651,7 @@ def verify_url_status(url: str, use_mirrors: bool = True, timeout: int = 5) -> b
 
     try:
         # Tenta verificar a URL original primeiro
-        response = requests.head(url, timeout=timeout, allow_redirects=True)
+        response = get_http_client().head(url, timeout=timeout, allow_redirects=True)
         is_available = 200 <= response.status_code < 400
 
         if is_available:
@@ -665,7 +663,7 @@ def verify_url_status(url: str, use_mirrors: bool = True, timeout: int = 5) -> b
             if best_url != url:
                 # Testa o mirror encontrado
                 try:
-                    mirror_response = requests.head(best_url, timeout=timeout, allow_redirects=True)
+                    mirror_response = get_http_client().head(best_url, timeout=timeout, allow_redirects=True)
                     return 200 <= mirror_response.status_code < 400
                 except Exception:
                     pass
@@ -681,7 +679,7 @@ def verify_url_status(url: str, use_mirrors: bool = True, timeout: int = 5) -> b
                 best_url, _ = find_best_mirror(url, timeout=timeout)
                 if best_url != url:
                     try:
-                        mirror_response = requests.head(best_url, timeout=timeout, allow_redirects=True)
+                        mirror_response = get_http_client().head(best_url, timeout=timeout, allow_redirects=True)
                         return 200 <= mirror_response.status_code < 400
                     except Exception:
                         pass
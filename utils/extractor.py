@@ -1,27 +1,437 @@
-import subprocess
+"""
+Extração de arquivos compactados - Environment Dev
+
+Motor único de extração em Python puro, usado pelo instalador, pelos
+gerenciadores de devkits retro e pelo RobustDownloader. Suporta zip,
+tar (.tar, .tar.gz, .tar.bz2, .tar.xz) e 7z quando o py7zr está instalado.
+"""
+
+import fnmatch
 import logging
 import os
 import shutil
+import tarfile
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PureWindowsPath
+from typing import List, Optional, Sequence, Tuple, Union
+
+try:
+    import py7zr
+except ImportError:  # py7zr é opcional; sem ele arquivos .7z não são suportados
+    py7zr = None
+
+# Tamanho do bloco usado ao copiar dados de um membro para o disco (1MB)
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+
+# Sufixos reconhecidos por formato (comparados em minúsculas)
+ZIP_SUFFIXES = ('.zip',)
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+SEVEN_ZIP_SUFFIXES = ('.7z',)
+
+PathLike = Union[str, os.PathLike]
+
+
+class CorruptMemberError(Exception):
+    """Membro cujo tamanho ou CRC não confere com o registrado no arquivo"""
+
+
+@dataclass
+class ExtractionResult:
+    """Resultado de uma extração"""
+    success: bool
+    archive_path: str
+    destination: str
+    extracted_files: int = 0
+    skipped_files: int = 0
+    bytes_written: int = 0
+    rejected_members: List[str] = field(default_factory=list)
+    error_message: Optional[str] = None
+
+
+class ExtractionEngine:
+    """
+    Motor de extração de arquivos compactados.
+
+    - Membros de arquivos zip são extraídos em paralelo num pool de threads
+      (zlib e lzma liberam a GIL durante a descompressão);
+    - Nomes absolutos, com letra de unidade ou com '..' são rejeitados, assim
+      como links que apontem para fora do destino;
+    - O CRC de cada membro é verificado durante a cópia e o arquivo só é
+      movido para o destino se estiver íntegro;
+    - Membros cujo destino já tem o mesmo tamanho e CRC (ou mtime, no caso de
+      tar, que não guarda CRC) são pulados, tornando a reextração incremental.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 buffer_size: int = EXTRACT_BUFFER_SIZE):
+        """
+        Args:
+            max_workers: Número de threads para extração de membros zip.
+            buffer_size: Tamanho do bloco de cópia.
+        """
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self.buffer_size = buffer_size
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def detect_format(archive_path: PathLike) -> Optional[str]:
+        """
+        Identifica o formato do arquivo pela extensão ou, se ela não for
+        conhecida, pelo conteúdo.
+
+        Returns:
+            'zip', 'tar', '7z' ou None se o formato não for reconhecido
+        """
+        name = os.path.basename(str(archive_path)).lower()
+        if name.endswith(ZIP_SUFFIXES):
+            return 'zip'
+        if name.endswith(TAR_SUFFIXES):
+            return 'tar'
+        if name.endswith(SEVEN_ZIP_SUFFIXES):
+            return '7z'
+
+        try:
+            if zipfile.is_zipfile(archive_path):
+                return 'zip'
+            if tarfile.is_tarfile(archive_path):
+                return 'tar'
+            if py7zr is not None and py7zr.is_7zfile(archive_path):
+                return '7z'
+        except OSError:
+            pass
+        return None
+
+    def supports(self, archive_path: PathLike) -> bool:
+        """Indica se o arquivo pode ser extraído neste ambiente."""
+        archive_format = self.detect_format(archive_path)
+        return archive_format in ('zip', 'tar') or (archive_format == '7z' and py7zr is not None)
+
+    def extract(self, archive_path: PathLike, destination: PathLike,
+                extract_subdir: Optional[str] = None,
+                skip_unchanged: bool = True) -> ExtractionResult:
+        """
+        Extrai um arquivo compactado.
+
+        Args:
+            archive_path: Caminho do arquivo compactado
+            destination: Diretório de destino (criado se não existir)
+            extract_subdir: Extrai apenas membros sob este subdiretório, que
+                            mantêm o caminho completo (como '7z x arq dir/*').
+                            Aceita curingas por componente, ex.: 'jdk-*'.
+            skip_unchanged: Se False, reescreve todos os membros
+
+        Returns:
+            ExtractionResult com as contagens da extração
+        """
+        result = ExtractionResult(success=False, archive_path=str(archive_path),
+                                  destination=str(destination))
+        try:
+            if not os.path.isfile(archive_path):
+                result.error_message = f"Arquivo de origem não encontrado: {archive_path}"
+                return result
+
+            archive_format = self.detect_format(archive_path)
+            if archive_format == '7z' and py7zr is None:
+                result.error_message = "Extração de arquivos .7z requer o pacote py7zr"
+                return result
+            if archive_format is None:
+                result.error_message = f"Formato de arquivo não suportado: {os.path.basename(str(archive_path))}"
+                return result
+
+            os.makedirs(destination, exist_ok=True)
+            root = os.path.realpath(destination)
+            subdir_parts = _split_member_name(extract_subdir) if extract_subdir else ()
+
+            if archive_format == 'zip':
+                self._extract_zip(str(archive_path), root, subdir_parts, skip_unchanged, result)
+            elif archive_format == 'tar':
+                self._extract_tar(str(archive_path), root, subdir_parts, skip_unchanged, result)
+            else:
+                self._extract_7z(str(archive_path), root, subdir_parts, skip_unchanged, result)
+
+            for name in result.rejected_members:
+                logging.warning(f"Membro ignorado por segurança em '{os.path.basename(str(archive_path))}': {name}")
+            result.success = True
+
+        except Exception as e:
+            result.error_message = str(e)
+
+        return result
+
+    # ------------------------------------------------------------------
+    # Formatos
+    # ------------------------------------------------------------------
+
+    def _extract_zip(self, archive_path: str, root: str, subdir_parts: Tuple[str, ...],
+                     skip_unchanged: bool, result: ExtractionResult) -> None:
+        with zipfile.ZipFile(archive_path) as archive:
+            members = []
+            for info in archive.infolist():
+                target = self._plan_member(info.filename, root, subdir_parts, result)
+                if target is None:
+                    continue
+                if info.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                else:
+                    members.append((info, target))
+
+        # Maiores primeiro, para equilibrar a carga entre as threads
+        members.sort(key=lambda item: item[0].file_size, reverse=True)
+
+        # ZipFile não é seguro para leituras concorrentes: um handle por thread
+        local = threading.local()
+        handles: List[zipfile.ZipFile] = []
+        handles_lock = threading.Lock()
+        counters_lock = threading.Lock()
+
+        def worker(item: Tuple[zipfile.ZipInfo, str]) -> None:
+            info, target = item
+            if skip_unchanged and _file_matches(target, info.file_size, info.CRC, self.buffer_size):
+                with counters_lock:
+                    result.skipped_files += 1
+                return
+
+            handle = getattr(local, 'archive', None)
+            if handle is None:
+                handle = local.archive = zipfile.ZipFile(archive_path)
+                with handles_lock:
+                    handles.append(handle)
+
+            with handle.open(info) as source:
+                written = self._write_member(source, target, info.file_size, info.CRC)
+            with counters_lock:
+                result.extracted_files += 1
+                result.bytes_written += written
+
+        try:
+            if len(members) <= 1 or self.max_workers <= 1:
+                for item in members:
+                    worker(item)
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(members)),
+                                        thread_name_prefix="extract") as executor:
+                    # list() propaga a primeira exceção das threads
+                    list(executor.map(worker, members))
+        finally:
+            for handle in handles:
+                handle.close()
+
+    def _extract_tar(self, archive_path: str, root: str, subdir_parts: Tuple[str, ...],
+                     skip_unchanged: bool, result: ExtractionResult) -> None:
+        # tar comprimido só pode ser lido em sequência: os membros são
+        # processados conforme aparecem no fluxo
+        with tarfile.open(archive_path, 'r:*') as archive:
+            for member in archive:
+                target = self._plan_member(member.name, root, subdir_parts, result)
+                if target is None:
+                    continue
+
+                if member.isdir():
+                    os.makedirs(target, exist_ok=True)
+                elif member.isfile():
+                    if (skip_unchanged and os.path.isfile(target)
+                            and os.path.getsize(target) == member.size
+                            and int(os.path.getmtime(target)) == int(member.mtime)):
+                        result.skipped_files += 1
+                        continue
+                    source = archive.extractfile(member)
+                    written = self._write_member(source, target, member.size, None,
+                                                 mode=member.mode)
+                    os.utime(target, (member.mtime, member.mtime))
+                    result.extracted_files += 1
+                    result.bytes_written += written
+                elif member.issym():
+                    link_target = os.path.realpath(os.path.join(os.path.dirname(target), member.linkname))
+                    if not _is_within(root, link_target):
+                        result.rejected_members.append(member.name)
+                        continue
+                    try:
+                        _replace_with_symlink(target, member.linkname)
+                    except OSError:
+                        # Sem permissão para links simbólicos (Windows): copia o alvo
+                        if not os.path.isfile(link_target):
+                            result.rejected_members.append(member.name)
+                            continue
+                        shutil.copy2(link_target, target)
+                    result.extracted_files += 1
+                elif member.islnk():
+                    # Hardlinks referenciam outro membro, já extraído, pelo nome
+                    link_parts = _split_member_name(member.linkname)
+                    link_source = os.path.join(root, *link_parts) if link_parts else None
+                    if (link_source is None or not os.path.isfile(link_source)
+                            or not _is_within(root, os.path.realpath(link_source))):
+                        result.rejected_members.append(member.name)
+                        continue
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.copy2(link_source, target)
+                    result.extracted_files += 1
+                else:
+                    # Dispositivos, FIFOs etc. não fazem sentido numa instalação
+                    result.rejected_members.append(member.name)
+
+    def _extract_7z(self, archive_path: str, root: str, subdir_parts: Tuple[str, ...],
+                    skip_unchanged: bool, result: ExtractionResult) -> None:
+        # Blocos sólidos do 7z são descomprimidos em sequência; o py7zr já
+        # paraleliza entre blocos e verifica o CRC de cada membro
+        with py7zr.SevenZipFile(archive_path, 'r') as archive:
+            targets = []
+            for info in archive.list():
+                target = self._plan_member(info.filename, root, subdir_parts, result)
+                if target is None:
+                    continue
+                if info.is_directory:
+                    os.makedirs(target, exist_ok=True)
+                elif (skip_unchanged and info.crc32 is not None
+                        and _file_matches(target, info.uncompressed, info.crc32, self.buffer_size)):
+                    result.skipped_files += 1
+                else:
+                    targets.append(info.filename)
+                    result.bytes_written += info.uncompressed or 0
+
+            if targets:
+                archive.extract(path=root, targets=targets)
+            result.extracted_files += len(targets)
+
+    # ------------------------------------------------------------------
+    # Auxiliares
+    # ------------------------------------------------------------------
+
+    def _plan_member(self, name: str, root: str, subdir_parts: Tuple[str, ...],
+                     result: ExtractionResult) -> Optional[str]:
+        """
+        Retorna o caminho de destino de um membro, ou None se ele estiver fora
+        do subdiretório pedido ou for inseguro (neste caso é registrado em
+        result.rejected_members).
+        """
+        parts = _split_member_name(name)
+        if parts is None:
+            result.rejected_members.append(name)
+            return None
+        if not parts or not _matches_subdir(parts, subdir_parts):
+            return None
+
+        target = os.path.join(root, *parts)
+        # Protege contra links já existentes no destino que apontem para fora
+        if not _is_within(root, os.path.realpath(target)):
+            result.rejected_members.append(name)
+            return None
+        return target
+
+    def _write_member(self, source, target: str, expected_size: int,
+                      expected_crc: Optional[int], mode: Optional[int] = None) -> int:
+        """
+        Copia um membro para um arquivo temporário verificando tamanho e CRC
+        e só então o move para o destino.
+
+        Raises:
+            CorruptMemberError: Se o tamanho ou o CRC não conferirem
+        """
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp_path = f"{target}.part"
+        crc = 0
+        written = 0
+        try:
+            with open(temp_path, 'wb') as output:
+                while True:
+                    chunk = source.read(self.buffer_size)
+                    if not chunk:
+                        break
+                    crc = zlib.crc32(chunk, crc)
+                    written += len(chunk)
+                    output.write(chunk)
+
+            if written != expected_size or (expected_crc is not None and crc != expected_crc):
+                raise CorruptMemberError(f"Membro corrompido (tamanho ou CRC divergente): {target}")
+
+            if mode is not None:
+                os.chmod(temp_path, 0o644 | (mode & 0o111))
+            os.replace(temp_path, target)
+            return written
+
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+def _split_member_name(name: str) -> Optional[Tuple[str, ...]]:
+    """
+    Normaliza o nome de um membro em componentes de caminho.
+
+    Returns:
+        Tupla de componentes (vazia para a raiz) ou None se o nome for
+        absoluto, tiver letra de unidade ou contiver '..'
+    """
+    normalized = name.replace('\\', '/')
+    if normalized.startswith('/') or PureWindowsPath(normalized).drive:
+        return None
+    parts = tuple(part for part in normalized.split('/') if part not in ('', '.'))
+    if '..' in parts:
+        return None
+    return parts
+
+
+def _matches_subdir(parts: Sequence[str], subdir_parts: Sequence[str]) -> bool:
+    """Indica se o membro está sob o subdiretório pedido (com curingas)."""
+    if len(parts) < len(subdir_parts):
+        return False
+    return all(fnmatch.fnmatchcase(part, pattern) for part, pattern in zip(parts, subdir_parts))
+
+
+def _is_within(root: str, path: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def _file_matches(path: str, size: int, crc: int, buffer_size: int) -> bool:
+    """Indica se o arquivo existente já tem o tamanho e o CRC esperados."""
+    try:
+        if not os.path.isfile(path) or os.path.getsize(path) != size:
+            return False
+        current = 0
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(buffer_size)
+                if not chunk:
+                    break
+                current = zlib.crc32(chunk, current)
+        return current == crc
+    except OSError:
+        return False
+
+
+def _replace_with_symlink(target: str, link_name: str) -> None:
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.lexists(target):
+        if os.path.islink(target) and os.readlink(target) == link_name:
+            return
+        os.remove(target)
+    os.symlink(link_name, target)
+
+
+# Instância compartilhada usada pelas funções de conveniência
+extraction_engine = ExtractionEngine()
 
-# Tenta encontrar o executável do 7-Zip
-SEVEN_ZIP_PATH = None
-possible_paths = [
-    os.path.join(os.environ.get("ProgramFiles", "C:\\Program Files"), "7-Zip", "7z.exe"),
-    os.path.join(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"), "7-Zip", "7z.exe"),
-    "7z" # Tenta encontrar no PATH
-]
-for path in possible_paths:
-    if shutil.which(path): # shutil.which verifica no PATH e se o arquivo existe
-        SEVEN_ZIP_PATH = path
-        break
 
 def is_7zip_available():
-    """Verifica se o executável do 7-Zip foi encontrado."""
-    return SEVEN_ZIP_PATH is not None
+    """Verifica se arquivos .7z podem ser extraídos (requer py7zr)."""
+    return py7zr is not None
+
+
+def is_archive_supported(archive_path):
+    """Verifica se o formato do arquivo pode ser extraído neste ambiente."""
+    return extraction_engine.supports(archive_path)
+
 
 def extract_archive(archive_path, destination_path, extract_subdir=None):
     """
-    Extrai um arquivo compactado usando 7-Zip.
+    Extrai um arquivo compactado (zip, tar.* ou 7z).
 
     Args:
         archive_path (str): Caminho para o arquivo compactado.
@@ -31,97 +441,35 @@ def extract_archive(archive_path, destination_path, extract_subdir=None):
     Returns:
         bool: True se a extração for bem-sucedida, False caso contrário.
     """
-    if not is_7zip_available():
-        logging.error("Executável do 7-Zip não encontrado. Verifique a instalação e o PATH.")
-        return False
-
-    if not os.path.exists(archive_path):
-        logging.error(f"Arquivo de origem não encontrado: {archive_path}")
-        return False
-
-    # Garante que o diretório de destino exista
-    os.makedirs(destination_path, exist_ok=True)
-
-    # Comando do 7-Zip para extrair: 7z x [archive_path] -o[destination_path] -y
-    # x: extrai com caminhos completos
-    # -o: especifica o diretório de saída (sem espaço entre -o e o caminho)
-    # -y: assume 'Sim' para todas as perguntas (sobrescrever, etc.)
-    command = [
-        SEVEN_ZIP_PATH,
-        'x',
-        archive_path,
-        f'-o{destination_path}',
-        '-y'
-    ]
-
-    # Se um subdiretório específico foi solicitado, adiciona-o ao comando
     if extract_subdir:
         logging.info(f"Extraindo apenas subdiretório: {extract_subdir}")
-        command.append(f"{extract_subdir}\\*")
+    logging.info(f"Extraindo '{os.path.basename(str(archive_path))}' para '{destination_path}'...")
 
-    logging.info(f"Extraindo '{os.path.basename(archive_path)}' para '{destination_path}'...")
-    logging.debug(f"Executando comando: {' '.join(command)}")
+    result = extraction_engine.extract(archive_path, destination_path, extract_subdir=extract_subdir)
 
-    try:
-        # Usa subprocess.run para maior controle e captura de saída/erros
-        result = subprocess.run(command, capture_output=True, text=True, check=False, encoding='utf-8', errors='ignore')
-
-        if result.returncode == 0:
-            logging.info("Extração concluída com sucesso.")
-            logging.debug(f"Saída do 7-Zip:\n{result.stdout}")
-            return True
-        else:
-            logging.error(f"Erro durante a extração (Código: {result.returncode}).")
-            logging.error(f"Saída do 7-Zip (stdout):\n{result.stdout}")
-            logging.error(f"Saída de erro do 7-Zip (stderr):\n{result.stderr}")
-            return False
+    if result.success:
+        logging.info(f"Extração concluída com sucesso: {result.extracted_files} arquivo(s) extraído(s), "
+                     f"{result.skipped_files} já atualizado(s).")
+        return True
+
+    logging.error(f"Erro durante a extração de '{archive_path}': {result.error_message}")
+    return False
 
-    except FileNotFoundError:
-        logging.error(f"Erro: Comando '{SEVEN_ZIP_PATH}' não encontrado. Verifique a instalação do 7-Zip e o PATH.")
-        return False
-    except subprocess.SubprocessError as e:
-        logging.error(f"Erro ao executar o processo de extração: {e}")
-        return False
-    except Exception as e:
-        logging.error(f"Erro inesperado durante a extração: {e}")
-        return False
 
 if __name__ == '__main__':
-    # Teste rápido (requer um arquivo .zip ou .7z e 7-Zip instalado)
+    # Teste rápido de extração com um zip gerado na hora
+    import tempfile
+
     logging.basicConfig(level=logging.INFO)
+    print(f"Suporte a .7z (py7zr): {'sim' if is_7zip_available() else 'não'}")
 
-    if not is_7zip_available():
-        print("7-Zip não encontrado. Teste de extração não pode ser executado.")
-    else:
-        print(f"7-Zip encontrado em: {SEVEN_ZIP_PATH}")
-        # Crie um arquivo zip de teste manualmente ou use um existente
-        test_archive = "test_archive.zip"
-        test_extract_dir = "temp_extract"
-        if not os.path.exists(test_archive):
-             # Cria um zip simples para teste se não existir
-             import zipfile
-             try:
-                 with zipfile.ZipFile(test_archive, 'w') as zf:
-                     zf.writestr("test.txt", "Este é um arquivo de teste.")
-                 print(f"Arquivo de teste '{test_archive}' criado.")
-             except Exception as e:
-                 print(f"Falha ao criar arquivo de teste '{test_archive}': {e}")
-                 test_archive = None # Impede a execução do teste
-
-        if test_archive and os.path.exists(test_archive):
-            print(f"\nTestando extração de '{test_archive}' para '{test_extract_dir}'...")
-            success = extract_archive(test_archive, test_extract_dir)
-            if success:
-                print("Extração de teste concluída com sucesso.")
-                # Verifica se o arquivo foi extraído
-                if os.path.exists(os.path.join(test_extract_dir, "test.txt")):
-                    print("Arquivo 'test.txt' encontrado no diretório de extração.")
-                else:
-                    print("AVISO: Arquivo 'test.txt' não encontrado após extração.")
-                # Limpa
-                # shutil.rmtree(test_extract_dir, ignore_errors=True)
-                # os.remove(test_archive)
-            else:
-                print("Extração de teste falhou.")
-        else:
-            print(f"Arquivo de teste '{test_archive}' não encontrado ou não pôde ser criado. Pulando teste de extração.")
\ No newline at end of file
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_archive = os.path.join(temp_dir, "test_archive.zip")
+        test_extract_dir = os.path.join(temp_dir, "temp_extract")
+        with zipfile.ZipFile(test_archive, 'w') as zf:
+            zf.writestr("test.txt", "Este é um arquivo de teste.")
+
+        for attempt in (1, 2):
+            result = extraction_engine.extract(test_archive, test_extract_dir)
+            print(f"Extração {attempt}: sucesso={result.success}, "
+                  f"extraídos={result.extracted_files}, pulados={result.skipped_files}")
@@ -1,10 +1,349 @@
+import atexit
 import hashlib
 import os
+import json
+import time
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
 
 # Tamanho do buffer para leitura de arquivo durante cálculo de hash (8MB)
 HASH_BUFFER_SIZE = 8 * 1024 * 1024  # 8MB
 
+# Algoritmos suportados pelo serviço de hashing
+SUPPORTED_ALGORITHMS = ('md5', 'sha1', 'sha256', 'sha512')
+
+# Arquivos a partir deste tamanho têm os algoritmos atualizados em paralelo
+# (hashlib libera a GIL durante update() em blocos grandes)
+PARALLEL_HASH_THRESHOLD = 64 * 1024 * 1024  # 64MB
+
+# Arquivos modificados há menos que isto não entram no cache persistente:
+# uma nova escrita dentro da mesma resolução de mtime passaria despercebida
+CACHE_MTIME_GRACE_SECONDS = 2.0
+
+# Número máximo de entradas mantidas no cache persistente
+HASH_CACHE_MAX_ENTRIES = 20000
+
+# Alterações no cache são gravadas em lote, no máximo uma vez por intervalo (segundos)
+CACHE_SAVE_INTERVAL = 5.0
+
+PathLike = Union[str, os.PathLike]
+
+
+class HashingService:
+    """
+    Serviço único de cálculo de hash de arquivos.
+
+    - Calcula vários algoritmos numa única leitura do arquivo;
+    - Processa lotes de arquivos num pool de threads;
+    - Mantém cache persistente de digests indexado por (caminho, inode,
+      tamanho, mtime_ns), evitando reler arquivos inalterados.
+    """
+
+    def __init__(self, cache_file: Optional[PathLike] = None,
+                 max_workers: Optional[int] = None,
+                 buffer_size: int = HASH_BUFFER_SIZE,
+                 parallel_threshold: int = PARALLEL_HASH_THRESHOLD,
+                 max_cache_entries: int = HASH_CACHE_MAX_ENTRIES,
+                 save_interval: float = CACHE_SAVE_INTERVAL):
+        """
+        Args:
+            cache_file: Arquivo JSON do cache persistente. Se None, usa
+                        ``cache/file_hashes.json`` no diretório atual.
+            max_workers: Número de threads para hashing em lote.
+            buffer_size: Tamanho do bloco de leitura.
+            parallel_threshold: Tamanho mínimo para atualizar algoritmos em paralelo.
+            max_cache_entries: Limite de entradas do cache persistente.
+            save_interval: Atraso da gravação em lote do cache após uma alteração.
+        """
+        self.cache_file = Path(cache_file) if cache_file else Path.cwd() / "cache" / "file_hashes.json"
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self.buffer_size = buffer_size
+        self.parallel_threshold = parallel_threshold
+        self.max_cache_entries = max_cache_entries
+        self.save_interval = save_interval
+
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._cache_loaded = False
+        self._cache_dirty = False
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._algorithm_executor: Optional[ThreadPoolExecutor] = None
+
+        self.stats = {"hits": 0, "misses": 0, "bytes_hashed": 0}
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def hash_file(self, file_path: PathLike,
+                  algorithms: Union[str, Sequence[str]] = ('sha256',),
+                  use_cache: bool = True) -> Dict[str, str]:
+        """
+        Calcula os digests de um arquivo numa única passada.
+
+        Args:
+            file_path: Caminho do arquivo
+            algorithms: Algoritmo ou lista de algoritmos (md5, sha1, sha256, sha512)
+            use_cache: Se False, ignora e não atualiza o cache persistente
+
+        Returns:
+            Dicionário algoritmo -> hash hexadecimal (minúsculas)
+
+        Raises:
+            ValueError: Se algum algoritmo não for suportado
+            FileNotFoundError: Se o arquivo não existir
+        """
+        return self._hash_file(file_path, self._normalize_algorithms(algorithms), use_cache)
+
+    def hash_files(self, file_paths: Iterable[PathLike],
+                   algorithms: Union[str, Sequence[str]] = ('sha256',),
+                   use_cache: bool = True) -> Dict[str, Dict[str, str]]:
+        """
+        Calcula os digests de vários arquivos em paralelo.
+
+        Arquivos que não puderem ser lidos são omitidos do resultado
+        (o erro é registrado no log).
+
+        Returns:
+            Dicionário caminho -> {algoritmo: hash}
+        """
+        algos = self._normalize_algorithms(algorithms)
+        paths = [str(p) for p in file_paths]
+        results: Dict[str, Dict[str, str]] = {}
+
+        def worker(path: str) -> Tuple[str, Optional[Dict[str, str]]]:
+            try:
+                return path, self._hash_file(path, algos, use_cache)
+            except Exception as e:
+                logging.error(f"Erro ao calcular hash do arquivo '{path}': {e}")
+                return path, None
+
+        if len(paths) <= 1 or self.max_workers <= 1:
+            outcomes = map(worker, paths)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths)),
+                                    thread_name_prefix="hash") as executor:
+                outcomes = list(executor.map(worker, paths))
+
+        for path, digests in outcomes:
+            if digests is not None:
+                results[path] = digests
+
+        return results
+
+    def invalidate(self, file_path: PathLike) -> None:
+        """Remove um arquivo do cache de digests."""
+        key = self._cache_key(file_path)
+        with self._lock:
+            self._ensure_cache_loaded()
+            if self._cache.pop(key, None) is not None:
+                self._mark_dirty()
+
+    def clear_cache(self) -> None:
+        """Esvazia o cache de digests (memória e disco)."""
+        with self._lock:
+            self._cache.clear()
+            self._cache_loaded = True
+            self._cache_dirty = True
+        self.save_cache()
+
+    def save_cache(self) -> None:
+        """Grava o cache persistente se houver alterações pendentes."""
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._cache_dirty:
+                    return
+                entries = dict(self._cache)
+                self._cache_dirty = False
+
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = self.cache_file.with_suffix(self.cache_file.suffix + ".tmp")
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump({"version": 1, "entries": entries}, f)
+                os.replace(temp_file, self.cache_file)
+            except Exception as e:
+                logging.warning(f"Não foi possível salvar o cache de hashes: {e}")
+
+    def shutdown(self) -> None:
+        """Salva o cache e encerra o pool de threads interno."""
+        self.save_cache()
+        with self._lock:
+            executor, self._algorithm_executor = self._algorithm_executor, None
+        if executor:
+            executor.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # Implementação
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize_algorithms(algorithms: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+        if isinstance(algorithms, str):
+            algorithms = (algorithms,)
+        normalized = tuple(dict.fromkeys(a.lower() for a in algorithms))
+        if not normalized:
+            raise ValueError("Nenhum algoritmo de hash informado")
+        for algorithm in normalized:
+            if algorithm not in SUPPORTED_ALGORITHMS:
+                raise ValueError(f"Algoritmo {algorithm} não suportado. Use: {list(SUPPORTED_ALGORITHMS)}")
+        return normalized
+
+    @staticmethod
+    def _cache_key(file_path: PathLike) -> str:
+        return os.path.normcase(os.path.abspath(os.fspath(file_path)))
+
+    def _hash_file(self, file_path: PathLike, algorithms: Tuple[str, ...],
+                   use_cache: bool) -> Dict[str, str]:
+        path = os.fspath(file_path)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+        st = os.stat(path)
+        key = self._cache_key(path)
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+
+        cached: Dict[str, str] = {}
+        if use_cache:
+            cached = self._cache_lookup(key, signature)
+            if all(a in cached for a in algorithms):
+                with self._lock:
+                    self.stats["hits"] += 1
+                return {a: cached[a] for a in algorithms}
+
+        with self._lock:
+            self.stats["misses"] += 1
+
+        missing = tuple(a for a in algorithms if a not in cached)
+        computed = self._compute_digests(path, missing, st.st_size)
+
+        if use_cache:
+            # Revalida a assinatura: se o arquivo mudou durante a leitura, não guarda
+            st_after = os.stat(path)
+            if (st_after.st_ino, st_after.st_size, st_after.st_mtime_ns) == signature \
+                    and time.time() - st.st_mtime_ns / 1e9 > CACHE_MTIME_GRACE_SECONDS:
+                self._cache_store(key, signature, computed)
+
+        digests = dict(cached)
+        digests.update(computed)
+        return {a: digests[a] for a in algorithms}
+
+    def _compute_digests(self, path: str, algorithms: Tuple[str, ...], size: int) -> Dict[str, str]:
+        hashers = [hashlib.new(a) for a in algorithms]
+        parallel = len(hashers) > 1 and size >= self.parallel_threshold
+        executor = self._get_algorithm_executor() if parallel else None
+
+        with open(path, 'rb') as f:
+            if executor is None:
+                for chunk in iter(lambda: f.read(self.buffer_size), b""):
+                    for hasher in hashers:
+                        hasher.update(chunk)
+            else:
+                # Lê o próximo bloco enquanto os algoritmos processam o atual
+                pending = []
+                for chunk in iter(lambda: f.read(self.buffer_size), b""):
+                    for future in pending:
+                        future.result()
+                    pending = [executor.submit(hasher.update, chunk) for hasher in hashers]
+                for future in pending:
+                    future.result()
+
+        with self._lock:
+            self.stats["bytes_hashed"] += size
+
+        return {a: h.hexdigest().lower() for a, h in zip(algorithms, hashers)}
+
+    def _get_algorithm_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._algorithm_executor is None:
+                self._algorithm_executor = ThreadPoolExecutor(
+                    max_workers=len(SUPPORTED_ALGORITHMS), thread_name_prefix="hash-algo")
+            return self._algorithm_executor
+
+    def _mark_dirty(self) -> None:
+        """Marca o cache como alterado e agenda a gravação em lote (chamar com _lock)."""
+        self._cache_dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_interval, self.save_cache)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _ensure_cache_loaded(self) -> None:
+        if self._cache_loaded:
+            return
+        self._cache_loaded = True
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = data.get("entries", {}) if isinstance(data, dict) else {}
+            self._cache = OrderedDict(entries)
+        except Exception as e:
+            logging.warning(f"Cache de hashes inválido, será recriado: {e}")
+            self._cache = OrderedDict()
+
+    def _cache_lookup(self, key: str, signature: Tuple[int, int, int]) -> Dict[str, str]:
+        with self._lock:
+            self._ensure_cache_loaded()
+            entry = self._cache.get(key)
+            if not entry:
+                return {}
+            if (entry.get("inode"), entry.get("size"), entry.get("mtime_ns")) != signature:
+                del self._cache[key]
+                self._mark_dirty()
+                return {}
+            self._cache.move_to_end(key)
+            return dict(entry.get("digests", {}))
+
+    def _cache_store(self, key: str, signature: Tuple[int, int, int], digests: Dict[str, str]) -> None:
+        inode, size, mtime_ns = signature
+        with self._lock:
+            self._ensure_cache_loaded()
+            entry = self._cache.get(key)
+            if entry and (entry.get("inode"), entry.get("size"), entry.get("mtime_ns")) == signature:
+                entry["digests"].update(digests)
+            else:
+                self._cache[key] = {
+                    "inode": inode,
+                    "size": size,
+                    "mtime_ns": mtime_ns,
+                    "digests": dict(digests),
+                }
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cache_entries:
+                self._cache.popitem(last=False)
+            self._mark_dirty()
+
+
+# Instância global para uso em outros módulos
+hashing_service = HashingService()
+# Grava alterações ainda pendentes do cache ao encerrar o processo
+atexit.register(hashing_service.shutdown)
+
+
+def get_file_hashes(file_path, algorithms=("sha256",)):
+    """
+    Calcula vários hashes de um arquivo numa única leitura.
+
+    Returns:
+        dict: algoritmo -> hash, ou None se ocorrer erro.
+    """
+    try:
+        return hashing_service.hash_file(file_path, algorithms)
+    except Exception as e:
+        logging.error(f"Erro ao calcular hash do arquivo '{file_path}': {e}")
+        return None
+
+
 def get_file_hash(file_path, algorithm="sha256"):
     """
     Calcula o hash de um arquivo usando o algoritmo especificado.
@@ -21,31 +360,17 @@ def get_file_hash(file_path, algorithm="sha256"):
         logging.error(f"Arquivo não encontrado: {file_path}")
         return None
     
+    algorithm = algorithm.lower()
+    if algorithm not in SUPPORTED_ALGORITHMS:
+        logging.error(f"Algoritmo de hash não suportado: {algorithm}")
+        return None
+    if algorithm == "md5":
+        logging.warning("MD5 é um algoritmo de hash fraco e não recomendado para verificação de segurança.")
+    elif algorithm == "sha1":
+        logging.warning("SHA1 é um algoritmo de hash fraco e não recomendado para verificação de segurança.")
+
     try:
-        # Seleciona o algoritmo de hash apropriado
-        if algorithm.lower() == "md5":
-            hash_obj = hashlib.md5()
-            logging.warning("MD5 é um algoritmo de hash fraco e não recomendado para verificação de segurança.")
-        elif algorithm.lower() == "sha1":
-            hash_obj = hashlib.sha1()
-        elif algorithm.lower() == "sha256":
-            logging.warning("SHA1 é um algoritmo de hash fraco e não recomendado para verificação de segurança.")
-            hash_obj = hashlib.sha256()
-        elif algorithm.lower() == "sha512":
-            hash_obj = hashlib.sha512()
-        else:
-            logging.error(f"Algoritmo de hash não suportado: {algorithm}")
-            return None
-        
-        # Calcula o hash em blocos para ser eficiente com arquivos grandes
-        with open(file_path, 'rb') as file:
-            buffer = file.read(HASH_BUFFER_SIZE)
-            while len(buffer) > 0:
-                hash_obj.update(buffer)
-                buffer = file.read(HASH_BUFFER_SIZE)
-        
-        # Retorna o hash em formato hexadecimal (minúsculas)
-        file_hash = hash_obj.hexdigest().lower()
+        file_hash = hashing_service.hash_file(file_path, algorithm)[algorithm]
         logging.debug(f"Hash {algorithm} calculado para '{os.path.basename(file_path)}': {file_hash}")
         return file_hash
     
@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+Cliente HTTP compartilhado para o Environment Dev
+
+Todos os downloaders usam uma única sessão com pools de conexões por host
+(keep-alive), de modo que probes de mirrors e downloads em lote para o mesmo
+servidor reaproveitam conexões TCP/TLS em vez de repetir o handshake.
+
+Recursos:
+- Limite de requisições simultâneas por host (configurável por host)
+- HEAD e requisições com Range
+- Revalidação com ETag / If-Modified-Since para documentos pequenos
+- Contadores de reuso de conexões
+- Handler do urllib para código baseado em OpenerDirector
+"""
+
+import copy
+import http.client
+import logging
+import ssl
+import threading
+import urllib.error
+import urllib.request
+import urllib.response
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST_CONCURRENCY = 8   # Requisições simultâneas (e conexões mantidas) por host; cobre os segmentos de um download
+DEFAULT_MAX_HOSTS = 32         # Hosts com pool de conexões mantido
+DEFAULT_TIMEOUT = 30           # Timeout padrão (segundos)
+VALIDATOR_CACHE_SIZE = 128     # Respostas guardadas para revalidação
+USER_AGENT = "Environment-Dev/1.0"
+
+
+def _host_key(url: str) -> str:
+    """Chave do host (scheme://host:porta) usada para limites e estatísticas"""
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    return f"{parts.scheme}://{parts.hostname}:{port}"
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter que aceita um contexto SSL próprio"""
+
+    def __init__(self, ssl_context: Optional[ssl.SSLContext] = None, **kwargs):
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.ssl_context is not None:
+            kwargs['ssl_context'] = self.ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+
+class HttpClient:
+    """
+    Cliente HTTP thread-safe com pools de conexões por host.
+
+    Respostas com ``stream=True`` mantêm a vaga do host até serem fechadas;
+    use-as com ``with`` (ou ``contextlib.closing``).
+    """
+
+    def __init__(self, host_concurrency: int = DEFAULT_HOST_CONCURRENCY,
+                 host_limits: Optional[Dict[str, int]] = None,
+                 max_hosts: int = DEFAULT_MAX_HOSTS,
+                 ssl_context: Optional[ssl.SSLContext] = None,
+                 user_agent: str = USER_AGENT):
+        """
+        Args:
+            host_concurrency: Limite padrão de requisições simultâneas por host
+            host_limits: Limites específicos por hostname (ex.: {"github.com": 2})
+            max_hosts: Número de hosts com pool mantido (LRU)
+            ssl_context: Contexto SSL (padrão: verificação obrigatória, TLS 1.2+)
+            user_agent: User-Agent padrão das requisições
+        """
+        self.host_concurrency = host_concurrency
+        self._host_limits = dict(host_limits or {})
+        if ssl_context is None:
+            ssl_context = ssl.create_default_context()
+            ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+
+        # As retentativas ficam a cargo de cada downloader
+        pool_size = max([host_concurrency] + list(self._host_limits.values()))
+        self._adapter = _PooledAdapter(ssl_context=ssl_context, pool_connections=max_hosts,
+                                       pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._validated: "OrderedDict[str, requests.Response]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "range_requests": 0, "revalidated": 0, "not_modified": 0}
+
+    # ------------------------------------------------------------------
+    # Requisições
+    # ------------------------------------------------------------------
+
+    def request(self, method: str, url: str, revalidate: bool = False,
+                timeout: Optional[float] = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+        """
+        Executa uma requisição respeitando o limite do host
+
+        Args:
+            method: Método HTTP
+            url: URL
+            revalidate: Para GET sem stream, envia If-None-Match/If-Modified-Since
+                da última resposta e devolve a cópia guardada em caso de 304
+            timeout: Timeout em segundos
+            **kwargs: Argumentos de requests.Session.request
+
+        Returns:
+            requests.Response
+        """
+        stream = kwargs.get('stream', False)
+        revalidate = revalidate and method.upper() == 'GET' and not stream
+        cached = self._validated_response(url) if revalidate else None
+        if cached is not None:
+            headers = dict(kwargs.get('headers') or {})
+            if cached.headers.get('ETag'):
+                headers.setdefault('If-None-Match', cached.headers['ETag'])
+            if cached.headers.get('Last-Modified'):
+                headers.setdefault('If-Modified-Since', cached.headers['Last-Modified'])
+            kwargs['headers'] = headers
+
+        semaphore = self._host_semaphore(url)
+        semaphore.acquire()
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        with self._lock:
+            self._counters["requests"] += 1
+            if 'Range' in (kwargs.get('headers') or {}):
+                self._counters["range_requests"] += 1
+        if stream:
+            self._release_on_close(response, semaphore)
+        else:
+            semaphore.release()
+
+        if revalidate:
+            return self._apply_validation(url, response, cached)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET (aceita os mesmos argumentos de request)"""
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """HEAD (como requests.head, não segue redirecionamentos por padrão)"""
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def get_range(self, url: str, start: int, end: Optional[int] = None, **kwargs) -> requests.Response:
+        """
+        GET de um intervalo de bytes (inclusivo), em stream
+
+        O chamador deve verificar ``status_code == 206``; servidores sem
+        suporte a Range respondem 200 com o arquivo inteiro.
+        """
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers['Range'] = f"bytes={start}-{'' if end is None else end}"
+        kwargs.setdefault('stream', True)
+        return self.request('GET', url, headers=headers, **kwargs)
+
+    def supports_ranges(self, url: str, timeout: Optional[float] = DEFAULT_TIMEOUT) -> bool:
+        """Verifica via HEAD se o servidor anuncia Accept-Ranges: bytes"""
+        response = self.head(url, timeout=timeout, allow_redirects=True)
+        return response.ok and response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+
+    # ------------------------------------------------------------------
+    # Limites por host
+    # ------------------------------------------------------------------
+
+    def set_host_limit(self, hostname: str, limit: int) -> None:
+        """
+        Define o limite de requisições simultâneas de um host
+
+        Requisições já em andamento continuam contando no limite anterior.
+        """
+        with self._lock:
+            self._host_limits[hostname] = limit
+            for key in [key for key in self._semaphores if urlsplit(key).hostname == hostname]:
+                del self._semaphores[key]
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        key = _host_key(url)
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                limit = self._host_limits.get(urlsplit(url).hostname, self.host_concurrency)
+                semaphore = self._semaphores[key] = threading.BoundedSemaphore(limit)
+            return semaphore
+
+    @staticmethod
+    def _release_on_close(response: requests.Response, semaphore: threading.BoundedSemaphore) -> None:
+        """Devolve a vaga do host quando a resposta em stream é fechada"""
+        close = response.close
+        released = []
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if not released:
+                    released.append(True)
+                    semaphore.release()
+
+        response.close = close_and_release
+
+    # ------------------------------------------------------------------
+    # Revalidação
+    # ------------------------------------------------------------------
+
+    def _validated_response(self, url: str) -> Optional[requests.Response]:
+        with self._lock:
+            response = self._validated.get(url)
+            if response is not None:
+                self._validated.move_to_end(url)
+            return response
+
+    def _apply_validation(self, url: str, response: requests.Response,
+                          cached: Optional[requests.Response]) -> requests.Response:
+        if cached is not None:
+            with self._lock:
+                self._counters["revalidated"] += 1
+                if response.status_code == 304:
+                    self._counters["not_modified"] += 1
+            if response.status_code == 304:
+                # O corpo não mudou: devolve uma cópia da resposta guardada
+                return copy.copy(cached)
+
+        if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            with self._lock:
+                self._validated[url] = response
+                self._validated.move_to_end(url)
+                while len(self._validated) > VALIDATOR_CACHE_SIZE:
+                    self._validated.popitem(last=False)
+        return response
+
+    # ------------------------------------------------------------------
+    # Estatísticas
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Contadores de requisições e de reuso de conexões
+
+        Returns:
+            Dict com totais e, por host, conexões abertas, requisições e reusos
+        """
+        hosts: Dict[str, Dict[str, int]] = {}
+        pools = self._adapter.poolmanager.pools
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            if pool is None:
+                continue
+            host = hosts.setdefault(f"{pool.scheme}://{pool.host}:{pool.port}",
+                                    {"connections": 0, "requests": 0, "reused": 0})
+            host["connections"] += pool.num_connections
+            host["requests"] += pool.num_requests
+            host["reused"] += max(pool.num_requests - pool.num_connections, 0)
+
+        with self._lock:
+            result: Dict[str, Any] = dict(self._counters)
+        result["connections_opened"] = sum(host["connections"] for host in hosts.values())
+        result["connections_reused"] = sum(host["reused"] for host in hosts.values())
+        result["hosts"] = hosts
+        return result
+
+    # ------------------------------------------------------------------
+    # Integração com urllib
+    # ------------------------------------------------------------------
+
+    def urllib_handler(self) -> "PooledHTTPHandler":
+        """Handler para urllib.request.build_opener que usa este cliente"""
+        return PooledHTTPHandler(self)
+
+    def close(self) -> None:
+        """Fecha todas as conexões mantidas"""
+        self.session.close()
+
+
+class _ResponseStream:
+    """Arquivo (read/readline/close) sobre o corpo de uma resposta em stream"""
+
+    def __init__(self, response: requests.Response):
+        self._response = response
+        self._raw = response.raw
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._raw.read(amt)
+
+    def readline(self, *args) -> bytes:
+        return self._raw.readline(*args)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    @property
+    def closed(self) -> bool:
+        return self._raw.closed
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class PooledHTTPHandler(urllib.request.BaseHandler):
+    """
+    Handler do urllib que envia as requisições pelo HttpClient
+
+    Substitui HTTPHandler/HTTPSHandler (que abrem uma conexão por requisição
+    e enviam ``Connection: close``). Erros de transporte viram URLError e as
+    respostas >= 400 seguem para o HTTPErrorProcessor como de costume.
+    """
+
+    handler_order = 400  # Antes dos handlers padrão (500)
+
+    def __init__(self, client: HttpClient):
+        self.client = client
+
+    def http_open(self, req: urllib.request.Request):
+        headers = {name: value for name, value in req.header_items() if name.lower() != 'connection'}
+        timeout = req.timeout if isinstance(req.timeout, (int, float)) else DEFAULT_TIMEOUT
+        try:
+            response = self.client.request(req.get_method(), req.full_url, data=req.data,
+                                           headers=headers, timeout=timeout, stream=True,
+                                           allow_redirects=True)
+        except requests.exceptions.SSLError as e:
+            raise urllib.error.URLError(ssl.SSLError(str(e)))
+        except requests.exceptions.RequestException as e:
+            raise urllib.error.URLError(e)
+
+        message = http.client.HTTPMessage()
+        for name, value in response.headers.items():
+            message[name] = value
+        result = urllib.response.addinfourl(_ResponseStream(response), message, response.url,
+                                            response.status_code)
+        result.msg = result.reason = response.reason
+        return result
+
+    https_open = http_open
+
+
+# Instância global
+_http_client: Optional[HttpClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Obtém o cliente HTTP compartilhado"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient()
+    return _http_client
@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+"""
+Saúde de mirrors para o Environment Dev
+
+Mantém, por mirror (scheme://host), médias móveis exponenciais (EWMA) do
+tempo até o primeiro byte, da vazão e da taxa de sucesso. As medições vêm de
+probes concorrentes e dos próprios downloads, são gravadas em disco e, com o
+tempo, decaem de volta para valores neutros, de modo que medições antigas
+pesam menos que as recentes.
+
+Com essas medições os mirrors são ordenados pelo tempo esperado de
+transferência, e um download pode disputar os dois melhores mirrors pelos
+primeiros bytes (requisição "hedged"): o segundo só é acionado se o primeiro
+demorar mais que o esperado, e o perdedor é fechado.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+from .http_client import DEFAULT_TIMEOUT, HttpClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+EWMA_ALPHA = 0.3                        # Peso de cada nova medição
+SCORE_HALF_LIFE = 3 * 24 * 3600         # Meia-vida (s) das medições persistidas
+PROBE_MAX_AGE = 10 * 60                 # Medições mais novas que isso dispensam novo probe (s)
+PROBE_BYTES = 64 * 1024                 # Bytes lidos por probe para estimar a vazão
+MIN_THROUGHPUT_SAMPLE = 32 * 1024       # Amostras menores não atualizam a vazão
+MAX_PROBE_WORKERS = 8
+REFERENCE_TRANSFER_BYTES = 16 * 1024 * 1024  # Tamanho usado para ordenar mirrors
+HEDGE_CANDIDATES = 2                    # Mirrors disputando os primeiros bytes
+HEDGE_DELAY_FACTOR = 2.0                # Segundo mirror após 2x o TTFB esperado do primeiro
+MIN_HEDGE_DELAY = 0.2
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+MAX_TRACKED_MIRRORS = 512
+MIN_RELIABILITY = 0.05
+
+# Valores neutros (mirror desconhecido ou medição totalmente decaída)
+PRIOR_TTFB = 1.0
+PRIOR_THROUGHPUT = 1024 * 1024.0
+PRIOR_RELIABILITY = 1.0
+
+PathLike = Union[str, os.PathLike]
+
+
+def mirror_key(url: str) -> str:
+    """Identifica o mirror de uma URL (scheme://host[:porta])"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+@dataclass
+class MirrorScore:
+    """Medições de um mirror"""
+    ttfb: float = PRIOR_TTFB                # segundos
+    throughput: float = PRIOR_THROUGHPUT    # bytes/segundo
+    reliability: float = PRIOR_RELIABILITY  # EWMA de sucesso (1) / falha (0)
+    samples: int = 0
+    updated: float = 0.0                    # time.time() da última medição
+    available: bool = True                  # resultado da última medição
+
+    def expected_time(self, size_bytes: int = REFERENCE_TRANSFER_BYTES) -> float:
+        """Tempo esperado para transferir size_bytes, penalizado por falhas"""
+        seconds = self.ttfb + size_bytes / max(self.throughput, 1.0)
+        return seconds / max(self.reliability, MIN_RELIABILITY)
+
+
+class HedgedResponse:
+    """
+    Resposta do mirror vencedor de open_fastest
+
+    Iterar devolve o corpo (começando pelos bytes que decidiram a disputa);
+    ao final a vazão observada é registrada no serviço de saúde.
+    """
+
+    def __init__(self, service: "MirrorHealthService", url: str, response, first_chunk: bytes,
+                 chunks: Iterator[bytes], ttfb: float):
+        self.url = url
+        self.response = response
+        self.ttfb = ttfb
+        self._service = service
+        self._first_chunk = first_chunk
+        self._chunks = chunks
+
+    @property
+    def headers(self):
+        return self.response.headers
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    def __iter__(self) -> Iterator[bytes]:
+        start = time.monotonic()
+        received = 0
+        if self._first_chunk:
+            first, self._first_chunk = self._first_chunk, b""
+            received += len(first)
+            yield first
+        for chunk in self._chunks:
+            received += len(chunk)
+            yield chunk
+        self._service.record_success(self.url, bytes_count=received, seconds=time.monotonic() - start)
+        self._service.save()
+
+    def close(self) -> None:
+        self.response.close()
+
+    def __enter__(self) -> "HedgedResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class MirrorHealthService:
+    """
+    Serviço de saúde de mirrors.
+
+    - Probes concorrentes (GET com Range dos primeiros bytes);
+    - EWMA de TTFB, vazão e taxa de sucesso por mirror;
+    - Persistência em ``cache/mirror_health.json`` com decaimento por idade;
+    - Ordenação por tempo esperado e disputa "hedged" entre os dois melhores.
+    """
+
+    def __init__(self, state_file: Optional[PathLike] = None,
+                 http_client: Optional[HttpClient] = None,
+                 alpha: float = EWMA_ALPHA,
+                 half_life: float = SCORE_HALF_LIFE,
+                 clock=time.time):
+        """
+        Args:
+            state_file: Arquivo JSON das medições. Se None, usa
+                        ``cache/mirror_health.json`` no diretório atual.
+            http_client: Cliente HTTP (padrão: cliente compartilhado)
+            alpha: Peso de cada nova medição na EWMA
+            half_life: Meia-vida das medições (segundos)
+            clock: Relógio de parede usado nas idades das medições
+        """
+        self.state_file = Path(state_file) if state_file else Path.cwd() / "cache" / "mirror_health.json"
+        self.alpha = alpha
+        self.half_life = half_life
+        self._clock = clock
+        self._http_client = http_client
+        self._scores: Dict[str, MirrorScore] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+
+    @property
+    def http_client(self) -> HttpClient:
+        if self._http_client is None:
+            self._http_client = get_http_client()
+        return self._http_client
+
+    # ------------------------------------------------------------------
+    # Medições
+    # ------------------------------------------------------------------
+
+    def score(self, url: str) -> MirrorScore:
+        """Medições atuais (com decaimento) do mirror de uma URL"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._scores.get(mirror_key(url))
+            return self._decayed(entry, self._clock()) if entry else MirrorScore()
+
+    def expected_time(self, url: str, size_bytes: int = REFERENCE_TRANSFER_BYTES) -> float:
+        return self.score(url).expected_time(size_bytes)
+
+    def record_success(self, url: str, ttfb: Optional[float] = None,
+                       bytes_count: int = 0, seconds: float = 0.0) -> None:
+        """
+        Registra uma resposta bem-sucedida
+
+        Args:
+            url: URL atendida pelo mirror
+            ttfb: Tempo até o primeiro byte (s), se medido
+            bytes_count: Bytes transferidos, para estimar a vazão
+            seconds: Duração da transferência de bytes_count
+        """
+        throughput = None
+        if bytes_count >= MIN_THROUGHPUT_SAMPLE and seconds > 0:
+            throughput = bytes_count / seconds
+        self._update(url, True, ttfb, throughput)
+
+    def record_failure(self, url: str) -> None:
+        """Registra uma falha (erro de conexão, HTTP >= 400, timeout)"""
+        self._update(url, False, None, None)
+
+    def _update(self, url: str, success: bool, ttfb: Optional[float], throughput: Optional[float]) -> None:
+        now = self._clock()
+        key = mirror_key(url)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._scores.get(key)
+            current = self._decayed(entry, now) if entry else MirrorScore()
+            # A primeira medição substitui o valor neutro
+            alpha = self.alpha if entry else 1.0
+            if ttfb is not None:
+                current.ttfb += alpha * (ttfb - current.ttfb)
+            if throughput is not None:
+                current.throughput += alpha * (throughput - current.throughput)
+            current.reliability += self.alpha * ((1.0 if success else 0.0) - current.reliability)
+            current.samples += 1
+            current.updated = now
+            current.available = success
+            self._scores[key] = current
+            self._dirty = True
+
+    def _decayed(self, entry: MirrorScore, now: float) -> MirrorScore:
+        """Aproxima as medições dos valores neutros conforme envelhecem"""
+        weight = 0.5 ** (max(now - entry.updated, 0.0) / self.half_life)
+        return MirrorScore(
+            ttfb=PRIOR_TTFB + weight * (entry.ttfb - PRIOR_TTFB),
+            throughput=PRIOR_THROUGHPUT + weight * (entry.throughput - PRIOR_THROUGHPUT),
+            reliability=PRIOR_RELIABILITY + weight * (entry.reliability - PRIOR_RELIABILITY),
+            samples=entry.samples,
+            updated=entry.updated,
+            available=entry.available
+        )
+
+    # ------------------------------------------------------------------
+    # Ordenação e probes
+    # ------------------------------------------------------------------
+
+    def rank(self, urls: Iterable[str], size_bytes: int = REFERENCE_TRANSFER_BYTES) -> List[str]:
+        """
+        Ordena URLs pelo tempo esperado de transferência
+
+        A ordenação é estável: mirrors sem medições mantêm a ordem recebida.
+        """
+        urls = list(urls)
+        times = {url: self.expected_time(url, size_bytes) for url in urls}
+        return sorted(urls, key=times.__getitem__)
+
+    def probe(self, urls: Iterable[str], timeout: float = 5,
+              probe_bytes: int = PROBE_BYTES) -> Dict[str, bool]:
+        """
+        Mede vários mirrors em paralelo
+
+        Cada probe pede os primeiros probe_bytes com Range, medindo o tempo
+        até a resposta e a vazão da leitura.
+
+        Returns:
+            Dicionário URL -> disponível
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(MAX_PROBE_WORKERS, len(urls)),
+                                thread_name_prefix="mirror-probe") as executor:
+            results = dict(zip(urls, executor.map(lambda url: self._probe_one(url, timeout, probe_bytes), urls)))
+        self.save()
+        return results
+
+    def probe_stale(self, urls: Iterable[str], timeout: float = 5,
+                    max_age: float = PROBE_MAX_AGE) -> Dict[str, bool]:
+        """Mede apenas os mirrors sem medição nos últimos max_age segundos"""
+        now = self._clock()
+        stale = []
+        for url in urls:
+            score = self.score(url)
+            if score.samples == 0 or now - score.updated > max_age:
+                stale.append(url)
+        return self.probe(stale, timeout)
+
+    def _probe_one(self, url: str, timeout: float, probe_bytes: int) -> bool:
+        start = time.monotonic()
+        try:
+            with self.http_client.get_range(url, 0, probe_bytes - 1, timeout=timeout,
+                                            allow_redirects=True) as response:
+                if response.status_code >= 400:
+                    self.record_failure(url)
+                    return False
+                ttfb = time.monotonic() - start
+                received = 0
+                for chunk in response.iter_content(chunk_size=16 * 1024):
+                    received += len(chunk)
+                    if received >= probe_bytes:
+                        break
+                self.record_success(url, ttfb, received, time.monotonic() - start - ttfb)
+                return True
+        except Exception as e:
+            logger.debug(f"Probe do mirror {url} falhou: {e}")
+            self.record_failure(url)
+            return False
+
+    # ------------------------------------------------------------------
+    # Requisições "hedged"
+    # ------------------------------------------------------------------
+
+    def open_fastest(self, urls: Iterable[str], timeout: float = DEFAULT_TIMEOUT,
+                     headers: Optional[Dict[str, str]] = None,
+                     chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                     hedge_delay: Optional[float] = None) -> HedgedResponse:
+        """
+        Abre o download no mirror que entregar os primeiros bytes antes
+
+        O melhor mirror é acionado imediatamente; o segundo, se o primeiro
+        não responder em hedge_delay (padrão: 2x o TTFB esperado) ou falhar.
+        A resposta perdedora é fechada.
+
+        Raises:
+            Exception: O erro do último mirror, se todos falharem
+        """
+        candidates = self.rank(dict.fromkeys(urls))[:HEDGE_CANDIDATES]
+        if not candidates:
+            raise ValueError("Nenhuma URL para download")
+        if hedge_delay is None:
+            hedge_delay = max(MIN_HEDGE_DELAY, HEDGE_DELAY_FACTOR * self.score(candidates[0]).ttfb)
+
+        outcomes: "queue.Queue" = queue.Queue()
+        winner: List[str] = []
+        winner_lock = threading.Lock()
+
+        def attempt(url: str) -> None:
+            start = time.monotonic()
+            response = None
+            try:
+                response = self.http_client.get(url, stream=True, timeout=timeout, headers=headers)
+                response.raise_for_status()
+                chunks = response.iter_content(chunk_size=chunk_size)
+                first_chunk = next(chunks, b"")
+            except Exception as e:
+                if response is not None:
+                    response.close()
+                self.record_failure(url)
+                outcomes.put((url, None, e))
+                return
+
+            ttfb = time.monotonic() - start
+            self.record_success(url, ttfb=ttfb)
+            with winner_lock:
+                won = not winner
+                if won:
+                    winner.append(url)
+            if won:
+                outcomes.put((url, HedgedResponse(self, url, response, first_chunk, chunks, ttfb), None))
+            else:
+                logger.debug(f"Mirror {url} perdeu a disputa pelos primeiros bytes")
+                response.close()
+
+        def start_next() -> None:
+            threading.Thread(target=attempt, args=(pending.pop(0),), daemon=True,
+                             name="mirror-hedge").start()
+
+        pending = list(candidates)
+        running = 0
+        last_error: Optional[BaseException] = None
+        start_next()
+        running += 1
+        while running:
+            try:
+                url, result, error = outcomes.get(timeout=hedge_delay if pending else None)
+            except queue.Empty:
+                logger.debug(f"Sem resposta em {hedge_delay:.2f}s, acionando mirror {pending[0]}")
+                start_next()
+                running += 1
+                continue
+            running -= 1
+            if result is not None:
+                return result
+            last_error = error
+            logger.debug(f"Mirror {url} falhou: {error}")
+            if pending:
+                start_next()
+                running += 1
+        raise last_error
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    def save(self) -> None:
+        """Grava as medições se houver alterações pendentes"""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                recent = sorted(self._scores.items(), key=lambda item: item[1].updated,
+                                reverse=True)[:MAX_TRACKED_MIRRORS]
+                mirrors = {key: asdict(score) for key, score in recent}
+                self._dirty = False
+
+            try:
+                self.state_file.parent.mkdir(parents=True, exist_ok=True)
+                temp_file = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump({"version": 1, "mirrors": mirrors}, f)
+                os.replace(temp_file, self.state_file)
+            except Exception as e:
+                logger.warning(f"Não foi possível salvar a saúde dos mirrors: {e}")
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for key, values in data.get("mirrors", {}).items():
+                self._scores[key] = MirrorScore(**values)
+        except Exception as e:
+            logger.warning(f"Arquivo de saúde dos mirrors inválido, será recriado: {e}")
+            self._scores = {}
+
+
+# Instância global
+_mirror_health_service: Optional[MirrorHealthService] = None
+_mirror_health_lock = threading.Lock()
+
+
+def get_mirror_health_service() -> MirrorHealthService:
+    """Obtém o serviço global de saúde de mirrors"""
+    global _mirror_health_service
+    if _mirror_health_service is None:
+        with _mirror_health_lock:
+            if _mirror_health_service is None:
+                _mirror_health_service = MirrorHealthService()
+    return _mirror_health_service
@@ -20,6 +20,8 @@ from .error_handler import (
     network_error, config_error, handle_exception
 )
 from .network import test_internet_connection
+from .http_client import get_http_client
+from .mirror_health import get_mirror_health_service
 
 # Configuração do logger
 logger = logging.getLogger(__name__)
@@ -153,16 +155,19 @@ def save_mirrors_config(mirrors: Dict[str, List[str]], config_file: str = DEFAUL
         err.log()
         return False
 
-def generate_alternative_urls(url: str, mirrors_config: Optional[Dict[str, List[str]]] = None) -> List[str]:
+def generate_alternative_urls(url: str, mirrors_config: Optional[Dict[str, List[str]]] = None,
+                              rank: bool = True) -> List[str]:
     """
     Gera URLs alternativas para uma URL principal com base na configuração de mirrors.
     
     Args:
         url: URL principal
         mirrors_config: Configuração de mirrors (opcional)
+        rank: Se deve ordenar as URLs pela vazão esperada (medições de saúde dos mirrors)
         
     Returns:
-        Lista de URLs alternativas, incluindo a URL original como primeiro item
+        Lista de URLs, incluindo a original. Com rank=True, a mais rápida
+        esperada vem primeiro (sem medições, a original continua primeiro)
     """
     if mirrors_config is None:
         mirrors_config = load_mirrors_config()
@@ -197,6 +202,8 @@ def generate_alternative_urls(url: str, mirrors_config: Optional[Dict[str, List[
     # Se encontramos alternativas, log informativo
     if len(alt_urls) > 1:
         logger.info(f"Geradas {len(alt_urls)-1} URLs alternativas para {url}")
+        if rank:
+            alt_urls = get_mirror_health_service().rank(alt_urls)
     
     return alt_urls
 
@@ -214,10 +221,8 @@ def check_url_availability(url: str, timeout: int = 5) -> bool:
     Returns:
         True se a URL estiver disponível, False caso contrário
     """
-    import requests
-    
     try:
-        response = requests.head(url, timeout=timeout, allow_redirects=True)
+        response = get_http_client().head(url, timeout=timeout, allow_redirects=True)
         return 200 <= response.status_code < 400
     except Exception as e:
         logger.debug(f"URL {url} indisponível: {e}")
@@ -234,7 +239,7 @@ def find_best_mirror(url: str, mirrors_config: Optional[Dict[str, List[str]]] =
         timeout: Timeout em segundos para verificação
         
     Returns:
-        Tupla (melhor_url, todas_urls_alternativas)
+        Tupla (melhor_url, todas_urls_alternativas ordenadas pela vazão esperada)
     """
     # Verifica conexão com a internet primeiro
     if not test_internet_connection():
@@ -242,22 +247,22 @@ def find_best_mirror(url: str, mirrors_config: Optional[Dict[str, List[str]]] =
         return url, [url]
     
     # Gera URLs alternativas
-    alt_urls = generate_alternative_urls(url, mirrors_config)
+    alt_urls = generate_alternative_urls(url, mirrors_config, rank=False)
     
     # Se só temos a URL original, retorna imediatamente
     if len(alt_urls) == 1:
         return url, alt_urls
     
-    # Verifica a URL original primeiro
-    if check_url_availability(url, timeout):
-        logger.info(f"URL original disponível: {url}")
-        return url, alt_urls
+    # Mede em paralelo apenas os mirrors sem medição recente; as demais
+    # medições vêm do histórico persistido
+    health = get_mirror_health_service()
+    health.probe_stale(alt_urls, timeout=timeout)
+    alt_urls = health.rank(alt_urls)
     
-    # Tenta cada URL alternativa
-    for alt_url in alt_urls[1:]:  # Pula a primeira que é a original
-        if check_url_availability(alt_url, timeout):
-            logger.info(f"URL alternativa disponível: {alt_url}")
-            return alt_url, alt_urls
+    for candidate in alt_urls:
+        if health.score(candidate).available:
+            logger.info(f"Melhor URL disponível: {candidate}")
+            return candidate, alt_urls
     
     # Se nenhuma alternativa funcionar, retorna a URL original
     logger.warning(f"Nenhum mirror disponível para {url}. Usando URL original.")
@@ -1,8 +1,9 @@
-import requests
 import logging
 from requests.exceptions import RequestException
 import socket
 
+from .http_client import get_http_client
+
 def test_internet_connection(test_url="https://www.google.com", timeout=5):
     """
     Verifica se há conexão com a internet tentando acessar uma URL específica.
@@ -18,7 +19,7 @@ def test_internet_connection(test_url="https://www.google.com", timeout=5):
     
     # Primeiro método: Tenta fazer uma requisição HTTP
     try:
-        response = requests.get(test_url, timeout=timeout)
+        response = get_http_client().get(test_url, timeout=timeout)
         if response.status_code == 200:
             logging.info("Conexão com a internet confirmada (via HTTP)")
             return True